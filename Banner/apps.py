@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class BannerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Banner'
+
+    def ready(self):
+        import Banner.content  # noqa - connects the banner response invalidation signals
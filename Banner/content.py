@@ -0,0 +1,37 @@
+"""
+Home screen banners as a pre-rendered, conditional-GET response
+(see raggyBackend/static_content.py).
+Imported by BannerConfig.ready() so edits invalidate it in every process.
+
+The body is the same LimitOffsetPagination envelope the viewset returns
+({"count", "next", "previous", "results"}) for a request without
+limit/offset; when the banners don't fit the default page, the view
+paginates them as before.
+"""
+from rest_framework.settings import api_settings
+
+from raggyBackend.static_content import StaticContent
+
+from .models import Banner
+from .serializers import BannerSerializer
+
+
+# Same paginator as BannerViewSet (GenericAPIView.pagination_class)
+pagination_class = api_settings.DEFAULT_PAGINATION_CLASS
+
+
+def _build_banners():
+    banners = list(Banner.objects.filter(is_active=True).order_by('order', '-created_at'))
+    default_limit = getattr(pagination_class, 'default_limit', None)
+    if default_limit is not None and len(banners) > default_limit:
+        # "next" would be an absolute URL of the request's host: not pre-rendered
+        return None, 200, banners
+    return {
+        'count': len(banners),
+        'next': None,
+        'previous': None,
+        'results': BannerSerializer(banners, many=True).data,
+    }, 200, banners
+
+
+active_banners = StaticContent('banners', (Banner,), _build_banners)
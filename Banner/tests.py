@@ -1,3 +1,76 @@
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.pagination import LimitOffsetPagination
+
+from .content import active_banners
+from .models import Banner
+
+
+class BannerListTests(TestCase):
+    """GET /banners/ - pre-rendered default page with conditional GET"""
+
+    def setUp(self):
+        cache.clear()
+        active_banners._memo = None
+
+    def create_banner(self, title, order, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Banner.objects.create(
+                title=title, image_en=f'banners/{title}-en', image_ar=f'banners/{title}-ar', order=order, **kwargs
+            )
+
+    def test_list_keeps_paginated_envelope(self):
+        second = self.create_banner('second', order=2)
+        first = self.create_banner('first', order=1)
+        self.create_banner('hidden', order=0, is_active=False)
+
+        response = self.client.get('/banners/')
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(set(body), {'count', 'next', 'previous', 'results'})
+        self.assertEqual(body['count'], 2)
+        self.assertIsNone(body['next'])
+        self.assertIsNone(body['previous'])
+        self.assertEqual([banner['id'] for banner in body['results']], [first.id, second.id])
+        self.assertEqual(
+            set(body['results'][0]), {'id', 'title', 'image_en_url', 'image_ar_url', 'order', 'is_active'}
+        )
+
+    def test_unchanged_list_is_not_modified(self):
+        self.create_banner('first', order=1)
+        etag = self.client.get('/banners/')['ETag']
+
+        response = self.client.get('/banners/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.create_banner('second', order=2)
+        response = self.client.get('/banners/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 2)
+
+    def test_limit_offset_is_paginated_by_the_viewset(self):
+        for order in range(3):
+            self.create_banner(f'banner-{order}', order=order)
+
+        body = self.client.get('/banners/', {'limit': 1, 'offset': 1}).json()
+
+        self.assertEqual(body['count'], 3)
+        self.assertEqual([banner['order'] for banner in body['results']], [1])
+        self.assertIsNotNone(body['next'])
+        self.assertIsNotNone(body['previous'])
+
+    @mock.patch.object(LimitOffsetPagination, 'default_limit', 2)
+    def test_more_than_one_page_falls_back_to_viewset(self):
+        for order in range(3):
+            self.create_banner(f'banner-{order}', order=order)
+
+        response = self.client.get('/banners/')
 
-# Create your tests here.
+        body = response.json()
+        self.assertEqual(body['count'], 3)
+        self.assertEqual(len(body['results']), 2)
+        self.assertTrue(body['next'].endswith('/banners/?limit=2&offset=2'))
+        self.assertNotIn('ETag', response)
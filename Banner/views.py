@@ -2,6 +2,7 @@ from rest_framework import viewsets
 from rest_framework.permissions import AllowAny
 from .models import Banner
 from .serializers import BannerSerializer
+from .content import active_banners
 
 class BannerViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -12,3 +13,15 @@ class BannerViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Banner.objects.filter(is_active=True).order_by('order', '-created_at')
     serializer_class = BannerSerializer
     permission_classes = [AllowAny]  # No authentication required for viewing banners
+
+    def list(self, request, *args, **kwargs):
+        # Default page pre-rendered with ETag/Last-Modified; unchanged banners get a 304 (see content.py)
+        paginator = self.paginator
+        if paginator is None or not (
+            paginator.limit_query_param in request.query_params
+            or paginator.offset_query_param in request.query_params
+        ):
+            response = active_banners.response(request)
+            if response is not None:
+                return response
+        return super().list(request, *args, **kwargs)
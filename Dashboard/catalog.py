@@ -0,0 +1,254 @@
+"""
+Design Catalog Dashboard
+Data for the design components screen (designs_view) and its JSON rows endpoint.
+
+- CATALOG_FAMILIES: one entry per component tab (model, label, search fields,
+  ordering, related rows to join, editable fields), replacing per-tab
+  if/elif ladders here and in the editor views
+- catalog_counts(): the tab badges from a single UNION ALL of per-table
+  COUNTs, cached until the next design cache invalidation
+- catalog_page(): one page of a tab, fetched as page_size + 1 rows so "is
+  there a next page" needs no COUNT query
+- fabric_options(): fabric type dropdown + fabric color select options,
+  built with one query each and cached like the counts
+
+Both caches live in the 'dashboard_catalog' scope, invalidated on every
+component change (see Design/cache_invalidation.py).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import CharField, Count, Q, Value
+
+from Design.cache_invalidation import scoped_key
+from Design.design_stats import design_details_component_ids
+from Design.models import (
+    FabricColor, FabricType, GholaType, SleevesType,
+    PocketType, ButtonType, BodyType, HomePageSelectionCategory
+)
+
+COUNTS_CACHE_KEY = 'dashboard:design_catalog:counts'
+FABRIC_OPTIONS_CACHE_KEY = 'dashboard:design_catalog:fabric_options'
+DEFAULT_FAMILY = 'fabric_colors'
+
+
+class ComponentField:
+    """
+    One editable model field: `form_key` is its name in the dashboard forms,
+    `data_key` its name in the edit modal's JSON.
+    kind: 'value' (converted by the model field), 'checkbox' (present = True)
+    or 'fk' (an id, checked to exist before saving).
+    """
+
+    def __init__(self, attr, form_key=None, data_key=None, kind='value', default=None, on_update=True, in_data=True):
+        self.attr = attr
+        self.form_key = form_key or attr
+        self.data_key = data_key or self.form_key
+        self.kind = kind
+        self.default = default
+        self.on_update = on_update
+        self.in_data = in_data
+
+
+def _names(prefix):
+    return (ComponentField(f'{prefix}_name_eng', 'name_eng'), ComponentField(f'{prefix}_name_arb', 'name_arb'))
+
+
+def _price(attr):
+    return ComponentField(attr, 'price', data_key=attr)
+
+
+PRIORITY = ComponentField('priority', default=0)
+FABRIC_RELATIONS = (
+    ComponentField('fabric_type', 'fabric_type_id', kind='fk'),
+    ComponentField('fabric_color', 'fabric_color_id', kind='fk'),
+)
+
+
+class CatalogFamily:
+    def __init__(self, model, label, search_fields, fields, ordering=('priority', '-timestamp'),
+                 select_related=(), order_filter=None, image_fields=('cover',), status=None):
+        self.model = model
+        self.label = label
+        self.search_fields = search_fields
+        self.ordering = ordering
+        self.select_related = select_related
+        # Key in the order item's component ids that limits this tab (None: not filterable)
+        self.order_filter = order_filter
+        # Editor fields (see Dashboard/component_service.py)
+        self.fields = fields
+        self.image_fields = image_fields
+        # (boolean field, status value that sets it True, label when True, label when False)
+        self.status = status
+
+    @property
+    def name_field(self):
+        return next(field.attr for field in self.fields if field.form_key == 'name_eng')
+
+    @property
+    def relation_fields(self):
+        """Fabric type/color links editable from the table"""
+        return {field.attr: field for field in self.fields if field.kind == 'fk' and field.on_update}
+
+    def queryset(self):
+        items = self.model.objects.all()
+        if self.select_related:
+            items = items.select_related(*self.select_related)
+        return items
+
+
+IN_STOCK_STATUS = ('inStock', 'in_stock', 'In Stock', 'Out of Stock')
+HIDDEN_STATUS = ('isHidden', 'hidden', 'Hidden', 'Active')
+COMPONENT_IMAGES = ('cover', 'cover_option')
+
+CATALOG_FAMILIES = {
+    'fabric_colors': CatalogFamily(
+        FabricColor, 'Fabric Colors',
+        ('color_name_eng', 'color_name_arb', 'fabric_type__fabric_name_eng'),
+        fields=(
+            PRIORITY, *_names('color'), _price('price_adjustment'),
+            ComponentField('hex_color', default='#FFFFFF'),
+            ComponentField('quantity', default=0),
+            ComponentField('inStock', kind='checkbox'),
+            # Chosen when the color is created, not editable afterwards
+            ComponentField('fabric_type', kind='fk', on_update=False, in_data=False),
+        ),
+        select_related=('fabric_type',), order_filter='fabric_color', status=IN_STOCK_STATUS,
+    ),
+    'fabric_types': CatalogFamily(
+        FabricType, 'Fabric Types', ('fabric_name_eng', 'fabric_name_arb'),
+        fields=(PRIORITY, *_names('fabric'), _price('base_price'), ComponentField('isHidden', kind='checkbox')),
+        order_filter='fabric_color', status=HIDDEN_STATUS,
+    ),
+    'collars': CatalogFamily(
+        GholaType, 'Collar Types', ('ghola_type_name_eng', 'ghola_type_name_arb'),
+        fields=(PRIORITY, *_names('ghola_type'), _price('initial_price'), *FABRIC_RELATIONS),
+        select_related=('fabric_color',), order_filter='collar', image_fields=COMPONENT_IMAGES,
+    ),
+    'sleeves': CatalogFamily(
+        SleevesType, 'Sleeve Types', ('sleeves_type_name_eng', 'sleeves_type_name_arb'),
+        fields=(PRIORITY, *_names('sleeves_type'), _price('initial_price'), *FABRIC_RELATIONS),
+        select_related=('fabric_color',), order_filter='sleeves', image_fields=COMPONENT_IMAGES,
+    ),
+    'pockets': CatalogFamily(
+        PocketType, 'Pocket Types', ('pocket_type_name_eng', 'pocket_type_name_arb'),
+        fields=(PRIORITY, *_names('pocket_type'), _price('initial_price'), *FABRIC_RELATIONS),
+        select_related=('fabric_color',), order_filter='pocket', image_fields=COMPONENT_IMAGES,
+    ),
+    'buttons': CatalogFamily(
+        ButtonType, 'Button Types', ('button_type_name_eng', 'button_type_name_arb'),
+        fields=(
+            PRIORITY, *_names('button_type'), _price('initial_price'),
+            ComponentField('inStock', 'inStock_button', data_key='inStock', kind='checkbox'),
+            *FABRIC_RELATIONS,
+        ),
+        select_related=('fabric_color',), order_filter='button', image_fields=COMPONENT_IMAGES,
+        status=IN_STOCK_STATUS,
+    ),
+    'body': CatalogFamily(
+        BodyType, 'Body Types', ('body_type_name_eng', 'body_type_name_arb'),
+        fields=(*_names('body_type'), _price('initial_price'), *FABRIC_RELATIONS),
+        ordering=('-timestamp',), select_related=('fabric_color',), order_filter='body',
+        image_fields=COMPONENT_IMAGES,
+    ),
+    'main_categories': CatalogFamily(
+        HomePageSelectionCategory, 'Main Categories', ('main_category_name_eng', 'main_category_name_arb'),
+        fields=(
+            PRIORITY, *_names('main_category'), _price('initial_price'),
+            ComponentField('duration_delivery_period', default=''),
+            ComponentField('review_rate', default=5),
+            ComponentField('review_count', default=0),
+            ComponentField('isHidden', kind='checkbox'),
+            ComponentField('is_comming_soon', kind='checkbox'),
+        ),
+        status=HIDDEN_STATUS,
+    ),
+}
+
+
+def get_family(component_type):
+    """(component_type, CatalogFamily); unknown types fall back to fabric colors"""
+    if component_type not in CATALOG_FAMILIES:
+        component_type = DEFAULT_FAMILY
+    return component_type, CATALOG_FAMILIES[component_type]
+
+
+def catalog_counts():
+    """{component_type: row count} for every tab, from one query"""
+    cache_key = scoped_key('dashboard_catalog', COUNTS_CACHE_KEY)
+    counts = cache.get(cache_key)
+    if counts is None:
+        per_table = [
+            family.model.objects.order_by()
+            .annotate(family=Value(key, output_field=CharField()))
+            .values('family').annotate(total=Count('pk')).values_list('family', 'total')
+            for key, family in CATALOG_FAMILIES.items()
+        ]
+        counts = dict.fromkeys(CATALOG_FAMILIES, 0)
+        counts.update(per_table[0].union(*per_table[1:], all=True))
+        cache.set(cache_key, counts, settings.DASHBOARD_CATALOG_CACHE_TIMEOUT)
+    return counts
+
+
+def fabric_options():
+    """
+    {'fabric_types': [{id, fabric_name_eng}], 'fabric_colors': [{id, label}]}
+    for the visible fabric types, as used by the modals and the per-row fabric select
+    """
+    cache_key = scoped_key('dashboard_catalog', FABRIC_OPTIONS_CACHE_KEY)
+    options = cache.get(cache_key)
+    if options is None:
+        options = {
+            'fabric_types': list(
+                FabricType.objects.filter(isHidden=False).order_by('fabric_name_eng').values('id', 'fabric_name_eng')
+            ),
+            'fabric_colors': [
+                {'id': color.id, 'label': f"{color.fabric_type.fabric_name_eng} - {color.color_name_eng}"}
+                for color in FabricColor.objects.filter(fabric_type__isHidden=False).select_related('fabric_type')
+                .order_by('fabric_type__fabric_name_eng', 'fabric_type_id', 'priority', '-timestamp')
+            ],
+        }
+        cache.set(cache_key, options, settings.DASHBOARD_CATALOG_CACHE_TIMEOUT)
+    return options
+
+
+def order_item_component_ids(order_item_id):
+    """Component ids referenced by an order item's design_details (for the 'show this order's parts' filter)"""
+    from Purchase.models import Item
+
+    details = Item.objects.filter(id=order_item_id).values_list('design_details', flat=True).first()
+    return design_details_component_ids(details)
+
+
+def filtered_queryset(component_type, search_query='', order_item_id=None):
+    """The tab's rows after the search box and the order item filter"""
+    component_type, family = get_family(component_type)
+    items = family.queryset()
+
+    if order_item_id and family.order_filter:
+        component_id = order_item_component_ids(order_item_id).get(family.order_filter)
+        if not component_id:
+            # Component not in the order: show an empty table
+            items = items.none()
+        elif component_type == 'fabric_types':
+            items = items.filter(colors__id=component_id)
+        elif isinstance(component_id, list):
+            items = items.filter(id__in=component_id)
+        else:
+            items = items.filter(id=component_id)
+
+    if search_query:
+        condition = Q()
+        for field in family.search_fields:
+            condition |= Q(**{f'{field}__icontains': search_query})
+        items = items.filter(condition)
+
+    return items.order_by(*family.ordering)
+
+
+def catalog_page(component_type, search_query='', order_item_id=None, page=1, page_size=None):
+    """(rows, has_next) for one page of a tab, without counting the tab"""
+    page_size = page_size or settings.DASHBOARD_CATALOG_PAGE_SIZE
+    page = max(int(page), 1)
+    offset = (page - 1) * page_size
+    rows = list(filtered_queryset(component_type, search_query, order_item_id)[offset:offset + page_size + 1])
+    return rows[:page_size], len(rows) > page_size
@@ -0,0 +1,231 @@
+"""
+Design Component Editing
+Create/read/update/delete for the dashboard design editors, driven by the
+CATALOG_FAMILIES registry (Dashboard/catalog.py) instead of a per-view
+if/elif ladder over the eight component models.
+
+- All fabric type/color ids in a request are checked with one UNION ALL
+  query; the ids are then assigned directly, without fetching the rows
+- Updates only write fields whose value changed (save(update_fields=...)),
+  and skip the save entirely when nothing did
+- Every write runs in one transaction inside batched_invalidation(), so the
+  dirty design cache scopes are invalidated once after commit instead of once
+  per save signal
+
+Errors the admin can fix raise ComponentError; the views show them as messages.
+"""
+from decimal import Decimal
+from functools import wraps
+
+from django.db import transaction
+from django.db.models import CharField, TextField, Value
+
+from Design.cache_invalidation import batched_invalidation
+
+from .catalog import CATALOG_FAMILIES
+
+MAX_IMAGE_SIZE = 5 * 1024 * 1024  # 5MB in bytes
+ALLOWED_IMAGE_EXTENSIONS = ['jpg', 'jpeg', 'png', 'gif', 'webp']
+
+
+class ComponentError(Exception):
+    """Invalid editor request (unknown component type, bad upload, missing related row...)"""
+
+
+def catalog_write(func):
+    """Run a component write in one transaction with a single design cache invalidation"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with batched_invalidation(), transaction.atomic():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def get_editor_family(component_type):
+    family = CATALOG_FAMILIES.get(component_type)
+    if family is None:
+        raise ComponentError('Invalid component type')
+    return family
+
+
+def get_component(component_type, item_id):
+    family = get_editor_family(component_type)
+    return family, family.model.objects.get(id=item_id)
+
+
+def display_name(family, item):
+    return getattr(item, family.name_field)
+
+
+def validate_image(uploaded_file, label='Image'):
+    """Size and extension checks for cover/cover_option uploads"""
+    if uploaded_file.size > MAX_IMAGE_SIZE:
+        raise ComponentError(
+            f'{label} size exceeds 5MB limit. Current size: {uploaded_file.size / (1024 * 1024):.2f}MB'
+        )
+    file_ext = uploaded_file.name.split('.')[-1].lower()
+    if file_ext not in ALLOWED_IMAGE_EXTENSIONS:
+        raise ComponentError(f'Invalid {label.lower()} format. Allowed: {", ".join(ALLOWED_IMAGE_EXTENSIONS)}')
+
+
+def _check_related_ids(family, fk_values):
+    """Raise ComponentError unless every {attr: id} exists - one query for all of them"""
+    lookups = [
+        family.model._meta.get_field(attr).related_model.objects.filter(pk=pk).order_by()
+        .annotate(attr=Value(attr, output_field=CharField())).values_list('attr', 'pk')
+        for attr, pk in fk_values.items() if pk is not None
+    ]
+    if not lookups:
+        return
+    found = {attr for attr, _ in lookups[0].union(*lookups[1:], all=True)}
+    for attr, pk in fk_values.items():
+        if pk is not None and attr not in found:
+            verbose_name = family.model._meta.get_field(attr).related_model._meta.verbose_name
+            raise ComponentError(f'{verbose_name} #{pk} not found')
+
+
+def _form_values(family, data, creating):
+    """
+    {attr: python value} for the fields in a submitted editor form.
+    Checkboxes are always set; other fields absent from the form (or blank
+    non-text fields) keep their current value, or take the default on create.
+    """
+    values, fk_values = {}, {}
+    for field in family.fields:
+        if not creating and not field.on_update:
+            continue
+        model_field = family.model._meta.get_field(field.attr)
+
+        if field.kind == 'checkbox':
+            values[field.attr] = field.form_key in data
+            continue
+
+        raw = data.get(field.form_key)
+        is_text = isinstance(model_field, (CharField, TextField))
+        if raw is None or (raw == '' and not is_text and field.kind != 'fk'):
+            if creating and field.default is not None:
+                values[field.attr] = field.default
+            continue
+
+        if field.kind == 'fk':
+            fk_values[field.attr] = model_field.target_field.to_python(raw) if raw else None
+        else:
+            values[field.attr] = model_field.to_python(raw)
+
+    _check_related_ids(family, fk_values)
+    values.update({f'{attr}_id': pk for attr, pk in fk_values.items()})
+    return values
+
+
+def _attach_images(family, item, files):
+    """Validate and assign uploaded cover/cover_option files; returns the fields set"""
+    attached = []
+    for image_field in family.image_fields:
+        if image_field in files:
+            validate_image(files[image_field], f"{image_field.replace('_', ' ').capitalize()} image")
+            setattr(item, image_field, files[image_field])
+            attached.append(image_field)
+    return attached
+
+
+def component_data(component_type, item_id):
+    """JSON for the edit modal"""
+    family, item = get_component(component_type, item_id)
+    data = {}
+    for field in family.fields:
+        if not field.in_data:
+            continue
+        if field.kind == 'fk':
+            data[field.data_key] = getattr(item, f'{field.attr}_id')
+            continue
+        value = getattr(item, field.attr)
+        data[field.data_key] = float(value) if isinstance(value, Decimal) else value
+    for image_field in family.image_fields:
+        image = getattr(item, image_field)
+        data[f'{image_field}_url'] = image.url if image else None
+    return data
+
+
+@catalog_write
+def create_component(component_type, data, files):
+    family = get_editor_family(component_type)
+    item = family.model(**_form_values(family, data, creating=True))
+    _attach_images(family, item, files)
+    item.save()
+    return item
+
+
+@catalog_write
+def update_component(component_type, item_id, data, files):
+    """Apply an edit form; returns (item, names of the fields that changed)"""
+    family, item = get_component(component_type, item_id)
+    values = _form_values(family, data, creating=False)
+    changed = [attr for attr, value in values.items() if getattr(item, attr) != value]
+    for attr in changed:
+        setattr(item, attr, values[attr])
+    changed += _attach_images(family, item, files)
+    if changed:
+        item.save(update_fields=changed)
+    return item, changed
+
+
+@catalog_write
+def delete_component(component_type, item_id):
+    family, item = get_component(component_type, item_id)
+    item.delete()
+    return item
+
+
+@catalog_write
+def set_component_status(component_type, item_id, status):
+    """Table status dropdown; returns (item, new status label)"""
+    family, item = get_component(component_type, item_id)
+    if family.status is None:
+        raise ComponentError('Invalid component type')
+    attr, true_value, true_label, false_label = family.status
+    value = status == true_value
+    if getattr(item, attr) != value:
+        setattr(item, attr, value)
+        item.save(update_fields=[attr])
+    return item, true_label if value else false_label
+
+
+@catalog_write
+def set_fabric_relation(component_type, item_id, field, value):
+    """Table fabric type/color dropdown"""
+    family, item = get_component(component_type, item_id)
+    relation = family.relation_fields.get(field)
+    if relation is None:
+        raise ComponentError('Invalid field' if family.relation_fields else 'Invalid component type')
+    pk = item._meta.get_field(field).target_field.to_python(value) if value else None
+    _check_related_ids(family, {field: pk})
+    if getattr(item, f'{field}_id') != pk:
+        setattr(item, f'{field}_id', pk)
+        item.save(update_fields=[field])
+    return item
+
+
+@catalog_write
+def set_component_image(component_type, item_id, image_field, image_file):
+    family, item = get_component(component_type, item_id)
+    if image_field not in family.image_fields:
+        raise ComponentError('Invalid image field')
+    validate_image(image_file)
+    setattr(item, image_field, image_file)
+    item.save(update_fields=[image_field])
+    return item
+
+
+@catalog_write
+def delete_component_image(component_type, item_id, image_field):
+    """Returns (item, deleted) - False when there was no image to delete"""
+    family, item = get_component(component_type, item_id)
+    if image_field not in family.image_fields:
+        raise ComponentError('Invalid image field')
+    image = getattr(item, image_field)
+    if not image:
+        return item, False
+    image.delete(save=False)
+    setattr(item, image_field, None)
+    item.save(update_fields=[image_field])
+    return item, True
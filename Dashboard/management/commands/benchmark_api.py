@@ -0,0 +1,105 @@
+"""
+Management command to benchmark every GET endpoint against a seeded dataset
+
+Runs in a throwaway test database (never the configured one) with an isolated
+local-memory cache. Records query count, DB time, serialization time and
+p50/p95 latency per endpoint (see raggyBackend/api_benchmark.py).
+
+Usage:
+    python manage.py benchmark_api                                    # small dataset, print results
+    python manage.py benchmark_api --scale full --output benchmarks/api_baseline.json
+    python manage.py benchmark_api --scale full --baseline benchmarks/api_baseline.json --threshold 0.25
+    python manage.py benchmark_api --only /design/fetch/               # a subset of endpoints
+"""
+import contextlib
+import io
+import json
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from raggyBackend.api_benchmark import SCALES, discover_endpoints, find_regressions, measure_endpoints, seed_dataset
+
+
+class Command(BaseCommand):
+    help = 'Benchmark query count and latency of every GET endpoint over a seeded dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=sorted(SCALES), default='small',
+                            help='Dataset size (full: 100k orders, 1M notification logs)')
+        parser.add_argument('--iterations', type=int, default=10, help='Timed requests per endpoint (default: 10)')
+        parser.add_argument('--only', default=None, help='Only endpoints whose path contains this string')
+        parser.add_argument('--output', default=None, help='Write the results as a JSON baseline to this path')
+        parser.add_argument('--baseline', default=None, help='Fail if results regress against this baseline')
+        parser.add_argument('--threshold', type=float, default=0.25,
+                            help='Allowed p95 slowdown as a fraction of the baseline (default: 0.25)')
+        parser.add_argument('--min-delta-ms', type=float, default=2.0,
+                            help='Ignore p95 slowdowns smaller than this (default: 2.0)')
+        parser.add_argument('--query-slack', type=int, default=0,
+                            help='Extra queries allowed over the baseline (default: 0)')
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+
+        size = SCALES[options['scale']]
+        setup_test_environment()
+        # Data migrations print progress; keep it out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(CACHES={'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'api-benchmark',
+            }}):
+                context = seed_dataset(size, log=self.stdout.write)
+                paths = discover_endpoints(context.params, only=options['only'])
+                self.stdout.write(f"🏁 Benchmarking {len(paths)} endpoints x {options['iterations']} requests")
+                results = measure_endpoints(context, paths, iterations=options['iterations'], log=self._log_result)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options['output']:
+            os.makedirs(os.path.dirname(os.path.abspath(options['output'])), exist_ok=True)
+            with open(options['output'], 'w') as f:
+                json.dump({
+                    'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'scale': options['scale'],
+                    'dataset': size._asdict(),
+                    'iterations': options['iterations'],
+                    'database': settings.DATABASES['default']['ENGINE'],
+                    'endpoints': results,
+                }, f, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"💾 Baseline written to {options['output']}"))
+
+        if baseline is not None:
+            if baseline.get('scale') != options['scale']:
+                self.stdout.write(self.style.WARNING(
+                    f"⚠️ Baseline was recorded at scale '{baseline.get('scale')}', this run is '{options['scale']}'"
+                ))
+            regressions = find_regressions(
+                results, baseline['endpoints'],
+                threshold=options['threshold'],
+                min_delta_ms=options['min_delta_ms'],
+                query_slack=options['query_slack'],
+            )
+            if regressions:
+                for regression in regressions:
+                    self.stdout.write(self.style.ERROR(f"❌ {regression}"))
+                raise CommandError(f"{len(regressions)} performance regressions against {options['baseline']}")
+            self.stdout.write(self.style.SUCCESS(f"✅ No regressions against {options['baseline']}"))
+
+    def _log_result(self, path, metrics):
+        line = (
+            f"{metrics['status']} {path:<60} q={metrics['queries']:<4} (cold {metrics['cold_queries']:<4}) "
+            f"db={metrics['db_ms']:>7.2f}ms ser={metrics['serialize_ms']:>7.2f}ms "
+            f"p50={metrics['p50_ms']:>8.2f}ms p95={metrics['p95_ms']:>8.2f}ms"
+        )
+        self.stdout.write(line if metrics['status'] < 400 else self.style.WARNING(line))
@@ -0,0 +1,128 @@
+"""
+Management command to benchmark per-request tracing cost
+
+Replays the per-request trace of CustomJWTAuthentication.authenticate
+(successful login path) from concurrent threads, as:
+- print(): the previous unbuffered f-string prints
+- logger.debug(): the current traces with DEBUG off (the default)
+- logger.info() + StreamHandler: synchronous logging, for comparison
+- logger.info() + QueueListenerHandler: the current pipeline with the level on
+
+Output goes to a sink that blocks for --write-latency-us per write (a pipe to a
+busy log collector / container runtime); 0 writes straight to /dev/null.
+Timings are per request thread: the queue listener drains after the run.
+
+Usage:
+    python manage.py benchmark_logging
+    python manage.py benchmark_logging --requests 20000 --threads 16
+"""
+import contextlib
+import logging
+import os
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from raggyBackend.log_handlers import QueueListenerHandler, TextFormatter
+
+
+class SlowStream:
+    """Text stream whose writes block like a pipe to a slow consumer (sleep releases the GIL)"""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def write(self, text):
+        if self.latency:
+            time.sleep(self.latency)
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+class FakeUser:
+    id = 42
+    username = 'customer@example.com'
+
+
+def _print_trace(path, user):
+    print(f'🔍 CustomJWTAuthentication called for: {path}')
+    print(f'   JWT Auth result: {True}')
+    print(f'   ✅ User: {user.username} (ID: {user.id})')
+    print(f'   🔒 Force logout check: {False}')
+    print(f'   ↩️  Returning result')
+
+
+def _logger_trace(logger, level):
+    def trace(path, user):
+        logger.log(level, "🔍 CustomJWTAuthentication called for: %s", path)
+        logger.log(level, "✅ JWT user: %s (ID: %s)", user.username, user.id)
+    return trace
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-request cost of print() tracing vs leveled, queued logging'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=10000, help='Traced requests per run (default: 10000)')
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent request threads (default: 8)')
+        parser.add_argument('--write-latency-us', type=int, default=20,
+                            help='Blocking time per write to the log sink in µs (default: 20)')
+
+    def handle(self, *args, **options):
+        total, threads = options['requests'], options['threads']
+        latency = options['write_latency_us'] / 1_000_000
+
+        with open(os.devnull, 'w', buffering=1) as devnull:
+            # Unbuffered-ish, like stdout under a process manager with PYTHONUNBUFFERED
+            sink = SlowStream(latency) if latency else devnull
+            with contextlib.redirect_stdout(sink):
+                legacy = self._run(_print_trace, total, threads)
+
+            logger = logging.getLogger('benchmark.logging')
+            logger.propagate = False
+
+            logger.setLevel(logging.INFO)
+            debug_off = self._run(_logger_trace(logger, logging.DEBUG), total, threads)
+
+            stream_handler = logging.StreamHandler(sink)
+            stream_handler.setFormatter(TextFormatter())
+            logger.handlers = [stream_handler]
+            synchronous = self._run(_logger_trace(logger, logging.INFO), total, threads)
+
+            queue_handler = QueueListenerHandler(log_format='text', stream=sink)
+            logger.handlers = [queue_handler]
+            queued = self._run(_logger_trace(logger, logging.INFO), total, threads)
+            queue_handler.stop()
+            logger.handlers = []
+
+        self.stdout.write(f"⏱️ print() trace (previous):          {legacy:8.2f} µs/request")
+        self.stdout.write(f"⏱️ logger.debug(), DEBUG off (now):    {debug_off:8.2f} µs/request")
+        self.stdout.write(f"⏱️ logger.info(), StreamHandler:       {synchronous:8.2f} µs/request")
+        self.stdout.write(f"⏱️ logger.info(), QueueListenerHandler: {queued:7.2f} µs/request")
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Default config saves {legacy - debug_off:.2f} µs per request ({legacy / max(debug_off, 0.01):.0f}x)"
+        ))
+
+    def _run(self, trace, total, threads):
+        """Wall-clock µs per traced request with `threads` threads sharing the work"""
+        user = FakeUser()
+        per_thread = total // threads
+        barrier = threading.Barrier(threads + 1)
+
+        def worker():
+            barrier.wait()
+            for i in range(per_thread):
+                trace(f'/purchase/orders/{i}/', user)
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        barrier.wait()
+        started = time.perf_counter()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        return elapsed / (per_thread * threads) * 1_000_000
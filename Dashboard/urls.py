@@ -11,6 +11,7 @@ urlpatterns = [
     path('orders/<int:order_id>/', views.order_detail_view, name='order_detail'),
     path('orders/<int:order_id>/update-status/', views.update_order_status, name='update_order_status'),
     path('designs/', views.designs_view, name='designs'),
+    path('designs/items/', views.designs_items_view, name='designs_items'),
     path('designs/create/', views.create_design_item, name='create_design_item'),
     path('designs/get/<str:component_type>/<int:item_id>/', views.get_design_item, name='get_design_item'),
     path('designs/get-fabric-colors/<int:fabric_type_id>/', views.get_fabric_colors, name='get_fabric_colors'),
@@ -1,6 +1,7 @@
 
 
 from django.shortcuts import render, redirect
+from django.template.loader import render_to_string
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.models import User
@@ -18,7 +19,12 @@ from Design.models import (
     FabricColor, FabricType, GholaType, SleevesType,
     PocketType, ButtonType, BodyType, HomePageSelectionCategory
 )
-from Design.views import clear_design_cache
+from .catalog import catalog_counts, catalog_page, fabric_options, get_family
+from .component_service import (
+    ComponentError, component_data, create_component, delete_component, delete_component_image,
+    display_name, get_editor_family, set_component_image, set_component_status, set_fabric_relation,
+    update_component
+)
 from Coupon.models import Coupon
 
 
@@ -337,232 +343,68 @@ def order_detail_view(request, order_id):
 @login_required(login_url='/dashboard/login/')
 @user_passes_test(is_staff_user, login_url='/dashboard/login/')
 def designs_view(request):
-    # Get component type filter
-    component_type = request.GET.get('type', 'main_categories')
+    """
+    Design components screen: tab badges come from one cached counts query and
+    only the first page of the selected tab is rendered; further pages are
+    loaded from designs_items_view as the table is scrolled.
+    """
+    component_type, family = get_family(request.GET.get('type', 'main_categories'))
     search_query = request.GET.get('search', '')
-
-    # Check for order item filter
     order_item_id = request.GET.get('order_item')
-    filter_ids = {}
-
-    if order_item_id:
-        from Purchase.models import Item
-        try:
-            order_item = Item.objects.get(id=order_item_id)
-            if order_item.design_details:
-                details = order_item.design_details
-
-                # Fabric color - use exact key name
-                if details.get('design_color_id'):
-                    filter_ids['fabric_color'] = details.get('design_color_id')
-
-                # Extract all other component IDs from design_details using substring matching
-                for key, value in details.items():
-                    key_lower = key.lower()
-                    if 'id' in key_lower and value:
-                        # Skip fabric color as it's already handled
-                        if 'design_color' in key_lower:
-                            continue
-                        elif 'collar' in key_lower or 'coller' in key_lower:
-                            filter_ids['collar'] = value
-                        elif 'sleeve' in key_lower:
-                            if 'sleeves' not in filter_ids:
-                                filter_ids['sleeves'] = []
-                            filter_ids['sleeves'].append(value)
-                        elif 'pocket' in key_lower:
-                            filter_ids['pocket'] = value
-                        elif 'button' in key_lower:
-                            filter_ids['button'] = value
-
-                        elif 'body' in key_lower:
-                            filter_ids['body'] = value
-        except Item.DoesNotExist:
-            pass
-
-    # Get appropriate queryset based on component type
-    if component_type == 'fabric_colors':
-        items = FabricColor.objects.select_related('fabric_type').order_by('-timestamp')
-        # If order filter is active
-        if order_item_id:
-            if filter_ids.get('fabric_color'):
-                items = items.filter(id=filter_ids['fabric_color'])
-            else:
-                # No fabric color in order, show empty table
-                items = items.none()
-        if search_query:
-            items = items.filter(
-                Q(color_name_eng__icontains=search_query) |
-                Q(color_name_arb__icontains=search_query) |
-                Q(fabric_type__fabric_name_eng__icontains=search_query)
-            )
-        component_label = 'Fabric Colors'
-        total_items = FabricColor.objects.count()
-        items = items.order_by('priority', '-timestamp')
-
-    elif component_type == 'fabric_types':
-        items = FabricType.objects.all()
-        # If order filter is active
-        if order_item_id:
-            if filter_ids.get('fabric_color'):
-                try:
-                    fabric_color = FabricColor.objects.get(id=filter_ids['fabric_color'])
-                    if fabric_color.fabric_type:
-                        items = items.filter(id=fabric_color.fabric_type.id)
-                    else:
-                        items = items.none()
-                except FabricColor.DoesNotExist:
-                    items = items.none()
-            else:
-                # No fabric color in order, show empty table
-                items = items.none()
-        if search_query:
-            items = items.filter(
-                Q(fabric_name_eng__icontains=search_query) |
-                Q(fabric_name_arb__icontains=search_query)
-            )
-        component_label = 'Fabric Types'
-        total_items = FabricType.objects.count()
-        items = items.order_by('priority', '-timestamp')
-
-    elif component_type == 'collars':
-        items = GholaType.objects.all()
-        # If order filter is active
-        if order_item_id:
-            if filter_ids.get('collar'):
-                items = items.filter(id=filter_ids['collar'])
-            else:
-                items = items.none()
-        if search_query:
-            items = items.filter(
-                Q(ghola_type_name_eng__icontains=search_query) |
-                Q(ghola_type_name_arb__icontains=search_query)
-            )
-        component_label = 'Collar Types'
-        total_items = GholaType.objects.count()
-        items = items.order_by('priority', '-timestamp')
-
-    elif component_type == 'sleeves':
-        items = SleevesType.objects.all()
-        # If order filter is active
-        if order_item_id:
-            if filter_ids.get('sleeves'):
-                items = items.filter(id__in=filter_ids['sleeves'])
-            else:
-                items = items.none()
-        if search_query:
-            items = items.filter(
-                Q(sleeves_type_name_eng__icontains=search_query) |
-                Q(sleeves_type_name_arb__icontains=search_query)
-            )
-        component_label = 'Sleeve Types'
-        total_items = SleevesType.objects.count()
-        items = items.order_by('priority', '-timestamp')
-
-    elif component_type == 'pockets':
-        items = PocketType.objects.all()
-        # If order filter is active
-        if order_item_id:
-            if filter_ids.get('pocket'):
-                items = items.filter(id=filter_ids['pocket'])
-            else:
-                items = items.none()
-        if search_query:
-            items = items.filter(
-                Q(pocket_type_name_eng__icontains=search_query) |
-                Q(pocket_type_name_arb__icontains=search_query)
-            )
-        component_label = 'Pocket Types'
-        total_items = PocketType.objects.count()
-        items = items.order_by('priority', '-timestamp')
-
-    elif component_type == 'buttons':
-        items = ButtonType.objects.all()
-        # If order filter is active
-        if order_item_id:
-            if filter_ids.get('button'):
-                items = items.filter(id=filter_ids['button'])
-            else:
-                items = items.none()
-        if search_query:
-            items = items.filter(
-                Q(button_type_name_eng__icontains=search_query) |
-                Q(button_type_name_arb__icontains=search_query)
-            )
-        component_label = 'Button Types'
-        total_items = ButtonType.objects.count()
-        items = items.order_by('priority', '-timestamp')
-
-
-
-    elif component_type == 'body':
-        items = BodyType.objects.all()
-        # If order filter is active
-        if order_item_id:
-            if filter_ids.get('body'):
-                items = items.filter(id=filter_ids['body'])
-            else:
-                items = items.none()
-        if search_query:
-            items = items.filter(
-                Q(body_type_name_eng__icontains=search_query) |
-                Q(body_type_name_arb__icontains=search_query)
-            )
-        component_label = 'Body Types'
-        total_items = BodyType.objects.count()
-        items = items.order_by('-timestamp')
-
-    elif component_type == 'main_categories':
-        items = HomePageSelectionCategory.objects.all()
-        if search_query:
-            items = items.filter(
-                Q(main_category_name_eng__icontains=search_query) |
-                Q(main_category_name_arb__icontains=search_query)
-            )
-        component_label = 'Main Categories'
-        total_items = HomePageSelectionCategory.objects.count()
-        items = items.order_by('priority', '-timestamp')
-    else:
-        items = FabricColor.objects.select_related('fabric_type').order_by('priority', '-timestamp')
-        # If order filter is active
-        if order_item_id:
-            if filter_ids.get('fabric_color'):
-                items = items.filter(id=filter_ids['fabric_color'])
-            else:
-                items = items.none()
-        component_label = 'Fabric Colors'
-        total_items = FabricColor.objects.count()
-
-    # Component type counts
-    component_counts = {
-        'fabric_colors': FabricColor.objects.count(),
-        'fabric_types': FabricType.objects.count(),
-        'collars': GholaType.objects.count(),
-        'sleeves': SleevesType.objects.count(),
-        'pockets': PocketType.objects.count(),
-        'buttons': ButtonType.objects.count(),
-
-        'body': BodyType.objects.count(),
-        'main_categories': HomePageSelectionCategory.objects.count(),
-    }
 
-    # Get all fabric types for the add modal dropdown
-    all_fabric_types = FabricType.objects.filter(isHidden=False).order_by('fabric_name_eng')
+    items, has_next = catalog_page(component_type, search_query, order_item_id)
+    component_counts = catalog_counts()
+    options = fabric_options()
+    is_filtered = bool(search_query or order_item_id)
 
     context = {
         'items': items,
+        'has_next': has_next,
         'component_type': component_type,
-        'component_label': component_label,
+        'component_label': family.label,
         'component_counts': component_counts,
-        'total_items': total_items,
+        'total_items': component_counts[component_type],
         'search_query': search_query,
-        'current_count': items.count(),
-        'all_fabric_types': all_fabric_types,
+        # Rows matching the filter are counted as pages load (no COUNT query)
+        'current_count': len(items) if is_filtered else component_counts[component_type],
+        'is_filtered': is_filtered,
+        'all_fabric_types': options['fabric_types'],
+        'fabric_color_options': options['fabric_colors'],
         'season_choices': FabricType.SEASON_CHOICES,
         'category_type_choices': FabricType.CATEGORY_TYPE_CHOICES,
         'order_item_id': order_item_id,
     }
 
     return render(request, 'dashboard/designs.html', context)
+
+
+@login_required(login_url='/dashboard/login/')
+@user_passes_test(is_staff_user, login_url='/dashboard/login/')
+def designs_items_view(request):
+    """
+    GET: One page of table rows for a design components tab
+    Endpoint: /dashboard/designs/items/?type=collars&page=2&search=&order_item=
+    """
+    try:
+        component_type, _ = get_family(request.GET.get('type', 'main_categories'))
+        page = int(request.GET.get('page', 1))
+        items, has_next = catalog_page(
+            component_type, request.GET.get('search', ''), request.GET.get('order_item'), page
+        )
+        html = render_to_string('dashboard/partials/design_rows.html', {
+            'items': items,
+            'component_type': component_type,
+            'fabric_color_options': fabric_options()['fabric_colors'],
+        }, request=request)
+        return JsonResponse({
+            'type': component_type,
+            'page': page,
+            'rows': len(items),
+            'has_next': has_next,
+            'html': html,
+        })
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
 # Design CRUD views - to be appended to Dashboard/views.py
 
 @login_required(login_url='/dashboard/login/')
@@ -583,109 +425,9 @@ def get_fabric_colors(request, fabric_type_id):
 def get_design_item(request, component_type, item_id):
     """Get item data for editing"""
     try:
-        # Get the appropriate model and item
-        if component_type == 'fabric_colors':
-            item = FabricColor.objects.get(id=item_id)
-            data = {
-                'priority': item.priority,
-                'name_eng': item.color_name_eng,
-                'name_arb': item.color_name_arb,
-                'price_adjustment': float(item.price_adjustment),
-                'hex_color': item.hex_color,
-                'quantity': item.quantity,
-                'inStock': item.inStock,
-                'cover_url': item.cover.url if item.cover else None,
-            }
-        elif component_type == 'fabric_types':
-            item = FabricType.objects.get(id=item_id)
-            data = {
-                'priority': item.priority,
-                'name_eng': item.fabric_name_eng,
-                'name_arb': item.fabric_name_arb,
-                'base_price': float(item.base_price),
-                'isHidden': item.isHidden,
-                'cover_url': item.cover.url if item.cover else None,
-            }
-        elif component_type == 'collars':
-            item = GholaType.objects.get(id=item_id)
-            data = {
-                'priority': item.priority,
-                'name_eng': item.ghola_type_name_eng,
-                'name_arb': item.ghola_type_name_arb,
-                'initial_price': float(item.initial_price),
-                'fabric_type_id': item.fabric_type.id if item.fabric_type else None,
-                'fabric_color_id': item.fabric_color.id if item.fabric_color else None,
-                'cover_url': item.cover.url if item.cover else None,
-                'cover_option_url': item.cover_option.url if item.cover_option else None,
-            }
-        elif component_type == 'sleeves':
-            item = SleevesType.objects.get(id=item_id)
-            data = {
-                'priority': item.priority,
-                'name_eng': item.sleeves_type_name_eng,
-                'name_arb': item.sleeves_type_name_arb,
-                'initial_price': float(item.initial_price),
-                'fabric_type_id': item.fabric_type.id if item.fabric_type else None,
-                'fabric_color_id': item.fabric_color.id if item.fabric_color else None,
-                'cover_url': item.cover.url if item.cover else None,
-                'cover_option_url': item.cover_option.url if item.cover_option else None,
-            }
-        elif component_type == 'pockets':
-            item = PocketType.objects.get(id=item_id)
-            data = {
-                'priority': item.priority,
-                'name_eng': item.pocket_type_name_eng,
-                'name_arb': item.pocket_type_name_arb,
-                'initial_price': float(item.initial_price),
-                'fabric_type_id': item.fabric_type.id if item.fabric_type else None,
-                'fabric_color_id': item.fabric_color.id if item.fabric_color else None,
-                'cover_url': item.cover.url if item.cover else None,
-                'cover_option_url': item.cover_option.url if item.cover_option else None,
-            }
-        elif component_type == 'buttons':
-            item = ButtonType.objects.get(id=item_id)
-            data = {
-                'priority': item.priority,
-                'name_eng': item.button_type_name_eng,
-                'name_arb': item.button_type_name_arb,
-                'initial_price': float(item.initial_price),
-                'inStock': item.inStock,
-                'fabric_type_id': item.fabric_type.id if item.fabric_type else None,
-                'fabric_color_id': item.fabric_color.id if item.fabric_color else None,
-                'cover_url': item.cover.url if item.cover else None,
-                'cover_option_url': item.cover_option.url if item.cover_option else None,
-            }
-
-        elif component_type == 'body':
-            item = BodyType.objects.get(id=item_id)
-            data = {
-                'name_eng': item.body_type_name_eng,
-                'name_arb': item.body_type_name_arb,
-                'initial_price': float(item.initial_price),
-                'fabric_type_id': item.fabric_type.id if item.fabric_type else None,
-                'fabric_color_id': item.fabric_color.id if item.fabric_color else None,
-                'cover_url': item.cover.url if item.cover else None,
-                'cover_option_url': item.cover_option.url if item.cover_option else None,
-            }
-        elif component_type == 'main_categories':
-            item = HomePageSelectionCategory.objects.get(id=item_id)
-            data = {
-                'priority': item.priority,
-                'name_eng': item.main_category_name_eng,
-                'name_arb': item.main_category_name_arb,
-                'initial_price': float(item.initial_price),
-                'duration_delivery_period': item.duration_delivery_period,
-                'review_rate': item.review_rate,
-                'review_count': item.review_count,
-                'isHidden': item.isHidden,
-                'is_comming_soon': item.is_comming_soon,
-                'cover_url': item.cover.url if item.cover else None,
-            }
-        else:
-            return JsonResponse({'error': 'Invalid component type'}, status=400)
-
-        return JsonResponse(data)
-
+        return JsonResponse(component_data(component_type, item_id))
+    except ComponentError as e:
+        return JsonResponse({'error': str(e)}, status=400)
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=404)
 
@@ -695,146 +437,13 @@ def get_design_item(request, component_type, item_id):
 @require_http_methods(["POST"])
 def update_design_item(request):
     """Update design item"""
+    component_type = request.POST.get('component_type')
     try:
-        component_type = request.POST.get('component_type')
-        item_id = request.POST.get('item_id')
-        name_eng = request.POST.get('name_eng')
-        name_arb = request.POST.get('name_arb')
-        price = request.POST.get('price')
-        priority = request.POST.get('priority', 0)
-
-        # Get the item
-        if component_type == 'fabric_colors':
-            item = FabricColor.objects.get(id=item_id)
-            item.color_name_eng = name_eng
-            item.color_name_arb = name_arb
-            item.price_adjustment = price
-            item.hex_color = request.POST.get('hex_color', '#FFFFFF')
-            item.quantity = request.POST.get('quantity', 0)
-            item.inStock = 'inStock' in request.POST
-            item.priority = priority
-        elif component_type == 'fabric_types':
-            item = FabricType.objects.get(id=item_id)
-            item.fabric_name_eng = name_eng
-            item.fabric_name_arb = name_arb
-            item.base_price = price
-            item.isHidden = 'isHidden' in request.POST
-            item.priority = priority
-        elif component_type == 'collars':
-            item = GholaType.objects.get(id=item_id)
-            item.ghola_type_name_eng = name_eng
-            item.ghola_type_name_arb = name_arb
-            item.initial_price = price
-            # Handle fabric type and color
-            fabric_type_id = request.POST.get('fabric_type_id')
-            fabric_color_id = request.POST.get('fabric_color_id')
-            item.fabric_type = FabricType.objects.get(id=fabric_type_id) if fabric_type_id else None
-            item.fabric_color = FabricColor.objects.get(id=fabric_color_id) if fabric_color_id else None
-            item.priority = priority
-        elif component_type == 'sleeves':
-            item = SleevesType.objects.get(id=item_id)
-            item.sleeves_type_name_eng = name_eng
-            item.sleeves_type_name_arb = name_arb
-            item.initial_price = price
-            # Handle fabric type and color
-            fabric_type_id = request.POST.get('fabric_type_id')
-            fabric_color_id = request.POST.get('fabric_color_id')
-            item.fabric_type = FabricType.objects.get(id=fabric_type_id) if fabric_type_id else None
-            item.fabric_color = FabricColor.objects.get(id=fabric_color_id) if fabric_color_id else None
-            item.priority = priority
-        elif component_type == 'pockets':
-            item = PocketType.objects.get(id=item_id)
-            item.pocket_type_name_eng = name_eng
-            item.pocket_type_name_arb = name_arb
-            item.initial_price = price
-            # Handle fabric type and color
-            fabric_type_id = request.POST.get('fabric_type_id')
-            fabric_color_id = request.POST.get('fabric_color_id')
-            item.fabric_type = FabricType.objects.get(id=fabric_type_id) if fabric_type_id else None
-            item.fabric_color = FabricColor.objects.get(id=fabric_color_id) if fabric_color_id else None
-            item.priority = priority
-        elif component_type == 'buttons':
-            item = ButtonType.objects.get(id=item_id)
-            item.button_type_name_eng = name_eng
-            item.button_type_name_arb = name_arb
-            item.initial_price = price
-            item.inStock = 'inStock_button' in request.POST
-            # Handle fabric type and color
-            fabric_type_id = request.POST.get('fabric_type_id')
-            fabric_color_id = request.POST.get('fabric_color_id')
-            item.fabric_type = FabricType.objects.get(id=fabric_type_id) if fabric_type_id else None
-            item.fabric_color = FabricColor.objects.get(id=fabric_color_id) if fabric_color_id else None
-            item.priority = priority
-
-        elif component_type == 'body':
-            item = BodyType.objects.get(id=item_id)
-            item.body_type_name_eng = name_eng
-            item.body_type_name_arb = name_arb
-            item.initial_price = price
-            # Handle fabric type and color
-            fabric_type_id = request.POST.get('fabric_type_id')
-            fabric_color_id = request.POST.get('fabric_color_id')
-            item.fabric_type = FabricType.objects.get(id=fabric_type_id) if fabric_type_id else None
-            item.fabric_color = FabricColor.objects.get(id=fabric_color_id) if fabric_color_id else None
-
-        elif component_type == 'main_categories':
-            item = HomePageSelectionCategory.objects.get(id=item_id)
-            item.main_category_name_eng = name_eng
-            item.main_category_name_arb = name_arb
-            item.initial_price = price
-            item.priority = priority
-            item.duration_delivery_period = request.POST.get('duration_delivery_period', '')
-            item.review_rate = request.POST.get('review_rate', 5)
-            item.review_count = request.POST.get('review_count', 0)
-            item.isHidden = 'isHidden' in request.POST
-            item.is_comming_soon = 'is_comming_soon' in request.POST
-        else:
-            messages.error(request, 'Invalid component type')
-            return redirect(f'/dashboard/designs/?type={component_type}')
-
-        # Handle file uploads with validation
-        MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB in bytes
-        ALLOWED_EXTENSIONS = ['jpg', 'jpeg', 'png', 'gif', 'webp']
-
-        try:
-            if 'cover' in request.FILES:
-                cover_file = request.FILES['cover']
-                # Validate file size
-                if cover_file.size > MAX_FILE_SIZE:
-                    messages.error(request, f'Cover image size exceeds 5MB limit. Current size: {cover_file.size / (1024 * 1024):.2f}MB')
-                    return redirect(f'/dashboard/designs/?type={component_type}')
-                # Validate file extension
-                file_ext = cover_file.name.split('.')[-1].lower()
-                if file_ext not in ALLOWED_EXTENSIONS:
-                    messages.error(request, f'Invalid cover image format. Allowed: {", ".join(ALLOWED_EXTENSIONS)}')
-                    return redirect(f'/dashboard/designs/?type={component_type}')
-                item.cover = cover_file
-
-            if 'cover_option' in request.FILES and hasattr(item, 'cover_option'):
-                cover_option_file = request.FILES['cover_option']
-                # Validate file size
-                if cover_option_file.size > MAX_FILE_SIZE:
-                    messages.error(request, f'Cover option image size exceeds 5MB limit. Current size: {cover_option_file.size / (1024 * 1024):.2f}MB')
-                    return redirect(f'/dashboard/designs/?type={component_type}')
-                # Validate file extension
-                file_ext = cover_option_file.name.split('.')[-1].lower()
-                if file_ext not in ALLOWED_EXTENSIONS:
-                    messages.error(request, f'Invalid cover option image format. Allowed: {", ".join(ALLOWED_EXTENSIONS)}')
-                    return redirect(f'/dashboard/designs/?type={component_type}')
-                item.cover_option = cover_option_file
-        except AttributeError as e:
-            messages.error(request, f'File upload error: This component does not support image uploads')
-            return redirect(f'/dashboard/designs/?type={component_type}')
-
-        if hasattr(item, 'priority'):
-            item.priority = priority
-        item.save()
-
-        # Clear design cache so API returns fresh data
-        clear_design_cache()
-
-        messages.success(request, f'{name_eng} updated successfully')
-
+        family = get_editor_family(component_type)
+        item, _ = update_component(component_type, request.POST.get('item_id'), request.POST, request.FILES)
+        messages.success(request, f'{display_name(family, item)} updated successfully')
+    except ComponentError as e:
+        messages.error(request, str(e))
     except Exception as e:
         messages.error(request, f'Error updating item: {str(e)}')
 
@@ -846,39 +455,12 @@ def update_design_item(request):
 @require_http_methods(["POST"])
 def delete_design_item(request):
     """Delete design item"""
+    component_type = request.POST.get('component_type')
     try:
-        component_type = request.POST.get('component_type')
-        item_id = request.POST.get('item_id')
-
-        # Get and delete the item
-        if component_type == 'fabric_colors':
-            item = FabricColor.objects.get(id=item_id)
-        elif component_type == 'fabric_types':
-            item = FabricType.objects.get(id=item_id)
-        elif component_type == 'collars':
-            item = GholaType.objects.get(id=item_id)
-        elif component_type == 'sleeves':
-            item = SleevesType.objects.get(id=item_id)
-        elif component_type == 'pockets':
-            item = PocketType.objects.get(id=item_id)
-        elif component_type == 'buttons':
-            item = ButtonType.objects.get(id=item_id)
-
-        elif component_type == 'body':
-            item = BodyType.objects.get(id=item_id)
-        elif component_type == 'main_categories':
-            item = HomePageSelectionCategory.objects.get(id=item_id)
-        else:
-            messages.error(request, 'Invalid component type')
-            return redirect(f'/dashboard/designs/?type={component_type}')
-
-        item.delete()
-
-        # Clear design cache so API returns fresh data
-        clear_design_cache()
-
+        delete_component(component_type, request.POST.get('item_id'))
         messages.success(request, 'Item deleted successfully')
-
+    except ComponentError as e:
+        messages.error(request, str(e))
     except Exception as e:
         messages.error(request, f'Error deleting item: {str(e)}')
 
@@ -890,188 +472,13 @@ def delete_design_item(request):
 @require_http_methods(["POST"])
 def create_design_item(request):
     """Create new design item"""
+    component_type = request.POST.get('component_type')
     try:
-        component_type = request.POST.get('component_type')
-        name_eng = request.POST.get('name_eng')
-        name_arb = request.POST.get('name_arb')
-        price = request.POST.get('price')
-        priority = request.POST.get('priority', 0)
-
-        # File upload validation constants
-        MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB in bytes
-        ALLOWED_EXTENSIONS = ['jpg', 'jpeg', 'png', 'gif', 'webp']
-
-        # Validate files before processing
-        for file_field in ['cover', 'cover_option']:
-            if file_field in request.FILES:
-                uploaded_file = request.FILES[file_field]
-                # Validate file size
-                if uploaded_file.size > MAX_FILE_SIZE:
-                    messages.error(request, f'{file_field.replace("_", " ").title()} size exceeds 5MB limit. Current size: {uploaded_file.size / (1024 * 1024):.2f}MB')
-                    return redirect(f'/dashboard/designs/?type={component_type}')
-                # Validate file extension
-                file_ext = uploaded_file.name.split('.')[-1].lower()
-                if file_ext not in ALLOWED_EXTENSIONS:
-                    messages.error(request, f'Invalid {file_field.replace("_", " ")} format. Allowed: {", ".join(ALLOWED_EXTENSIONS)}')
-                    return redirect(f'/dashboard/designs/?type={component_type}')
-
-        # Create the item based on component type
-        if component_type == 'fabric_colors':
-            fabric_type_id = request.POST.get('fabric_type')
-            fabric_type = FabricType.objects.get(id=fabric_type_id)
-            item = FabricColor.objects.create(
-                priority=priority,
-                color_name_eng=name_eng,
-                color_name_arb=name_arb,
-                fabric_type=fabric_type,
-                price_adjustment=price,
-                hex_color=request.POST.get('hex_color', '#FFFFFF'),
-                quantity=request.POST.get('quantity', 0),
-                inStock='inStock' in request.POST
-            )
-        elif component_type == 'fabric_types':
-            item = FabricType.objects.create(
-                priority=priority,
-                fabric_name_eng=name_eng,
-                fabric_name_arb=name_arb,
-                base_price=price,
-                isHidden='isHidden' in request.POST
-            )
-        elif component_type == 'collars':
-            fabric_type_id = request.POST.get('fabric_type_id')
-            fabric_color_id = request.POST.get('fabric_color_id')
-            item = GholaType.objects.create(
-                priority=priority,
-                ghola_type_name_eng=name_eng,
-                ghola_type_name_arb=name_arb,
-                initial_price=price,
-                fabric_type=FabricType.objects.get(id=fabric_type_id) if fabric_type_id else None,
-                fabric_color=FabricColor.objects.get(id=fabric_color_id) if fabric_color_id else None
-            )
-            try:
-                if 'cover' in request.FILES:
-                    item.cover = request.FILES['cover']
-                if 'cover_option' in request.FILES:
-                    item.cover_option = request.FILES['cover_option']
-                item.save()
-            except AttributeError as e:
-                item.delete()
-                messages.error(request, f'Image upload error: This component does not support the uploaded image type')
-                return redirect(f'/dashboard/designs/?type={component_type}')
-        elif component_type == 'sleeves':
-            fabric_type_id = request.POST.get('fabric_type_id')
-            fabric_color_id = request.POST.get('fabric_color_id')
-            item = SleevesType.objects.create(
-                priority=priority,
-                sleeves_type_name_eng=name_eng,
-                sleeves_type_name_arb=name_arb,
-                initial_price=price,
-                fabric_type=FabricType.objects.get(id=fabric_type_id) if fabric_type_id else None,
-                fabric_color=FabricColor.objects.get(id=fabric_color_id) if fabric_color_id else None
-            )
-            try:
-                if 'cover' in request.FILES:
-                    item.cover = request.FILES['cover']
-                if 'cover_option' in request.FILES:
-                    item.cover_option = request.FILES['cover_option']
-                item.save()
-            except AttributeError as e:
-                item.delete()
-                messages.error(request, f'Image upload error: This component does not support the uploaded image type')
-                return redirect(f'/dashboard/designs/?type={component_type}')
-        elif component_type == 'pockets':
-            fabric_type_id = request.POST.get('fabric_type_id')
-            fabric_color_id = request.POST.get('fabric_color_id')
-            item = PocketType.objects.create(
-                priority=priority,
-                pocket_type_name_eng=name_eng,
-                pocket_type_name_arb=name_arb,
-                initial_price=price,
-                fabric_type=FabricType.objects.get(id=fabric_type_id) if fabric_type_id else None,
-                fabric_color=FabricColor.objects.get(id=fabric_color_id) if fabric_color_id else None
-            )
-            try:
-                if 'cover' in request.FILES:
-                    item.cover = request.FILES['cover']
-                if 'cover_option' in request.FILES:
-                    item.cover_option = request.FILES['cover_option']
-                item.save()
-            except AttributeError as e:
-                item.delete()
-                messages.error(request, f'Image upload error: This component does not support the uploaded image type')
-                return redirect(f'/dashboard/designs/?type={component_type}')
-        elif component_type == 'buttons':
-            fabric_type_id = request.POST.get('fabric_type_id')
-            fabric_color_id = request.POST.get('fabric_color_id')
-            item = ButtonType.objects.create(
-                priority=priority,
-                button_type_name_eng=name_eng,
-                button_type_name_arb=name_arb,
-                initial_price=price,
-                inStock='inStock_button' in request.POST,
-                fabric_type=FabricType.objects.get(id=fabric_type_id) if fabric_type_id else None,
-                fabric_color=FabricColor.objects.get(id=fabric_color_id) if fabric_color_id else None
-            )
-            try:
-                if 'cover' in request.FILES:
-                    item.cover = request.FILES['cover']
-                if 'cover_option' in request.FILES:
-                    item.cover_option = request.FILES['cover_option']
-                item.save()
-            except AttributeError as e:
-                item.delete()
-                messages.error(request, f'Image upload error: This component does not support the uploaded image type')
-                return redirect(f'/dashboard/designs/?type={component_type}')
-
-        elif component_type == 'body':
-            fabric_type_id = request.POST.get('fabric_type_id')
-            fabric_color_id = request.POST.get('fabric_color_id')
-            item = BodyType.objects.create(
-                body_type_name_eng=name_eng,
-                body_type_name_arb=name_arb,
-                initial_price=price,
-                fabric_type=FabricType.objects.get(id=fabric_type_id) if fabric_type_id else None,
-                fabric_color=FabricColor.objects.get(id=fabric_color_id) if fabric_color_id else None
-            )
-            try:
-                if 'cover' in request.FILES:
-                    item.cover = request.FILES['cover']
-                if 'cover_option' in request.FILES:
-                    item.cover_option = request.FILES['cover_option']
-                item.save()
-            except AttributeError as e:
-                item.delete()
-                messages.error(request, f'Image upload error: This component does not support the uploaded image type')
-                return redirect(f'/dashboard/designs/?type={component_type}')
-        elif component_type == 'main_categories':
-            item = HomePageSelectionCategory.objects.create(
-                priority=priority,
-                main_category_name_eng=name_eng,
-                main_category_name_arb=name_arb,
-                initial_price=price,
-                duration_delivery_period=request.POST.get('duration_delivery_period', ''),
-                review_rate=request.POST.get('review_rate', 5),
-                review_count=request.POST.get('review_count', 0),
-                isHidden='isHidden' in request.POST,
-                is_comming_soon='is_comming_soon' in request.POST
-            )
-            try:
-                if 'cover' in request.FILES:
-                    item.cover = request.FILES['cover']
-                item.save()
-            except AttributeError as e:
-                item.delete()
-                messages.error(request, f'Image upload error: This component does not support the uploaded image type')
-                return redirect(f'/dashboard/designs/?type={component_type}')
-        else:
-            messages.error(request, 'Invalid component type')
-            return redirect(f'/dashboard/designs/?type={component_type}')
-
-        # Clear design cache so API returns fresh data
-        clear_design_cache()
-
-        messages.success(request, f'{name_eng} created successfully')
-
+        family = get_editor_family(component_type)
+        item = create_component(component_type, request.POST, request.FILES)
+        messages.success(request, f'{display_name(family, item)} created successfully')
+    except ComponentError as e:
+        messages.error(request, str(e))
     except Exception as e:
         messages.error(request, f'Error creating item: {str(e)}')
 
@@ -1083,54 +490,15 @@ def create_design_item(request):
 @require_http_methods(["POST"])
 def update_design_status(request):
     """Update design item status"""
+    component_type = request.POST.get('component_type')
     try:
-        component_type = request.POST.get('component_type')
-        item_id = request.POST.get('item_id')
-        status = request.POST.get('status')
-
-        if component_type == 'fabric_colors':
-            item = FabricColor.objects.get(id=item_id)
-            item.inStock = (status == 'in_stock')
-            item.save()
-
-            # Clear design cache so API returns fresh data
-            clear_design_cache()
-
-            status_text = 'In Stock' if item.inStock else 'Out of Stock'
-            messages.success(request, f'{item.color_name_eng} status updated to {status_text}')
-        elif component_type == 'fabric_types':
-            item = FabricType.objects.get(id=item_id)
-            item.isHidden = (status == 'hidden')
-            item.save()
-
-            # Clear design cache so API returns fresh data
-            clear_design_cache()
-
-            status_text = 'Hidden' if item.isHidden else 'Active'
-            messages.success(request, f'{item.fabric_name_eng} status updated to {status_text}')
-        elif component_type == 'buttons':
-            item = ButtonType.objects.get(id=item_id)
-            item.inStock = (status == 'in_stock')
-            item.save()
-
-            # Clear design cache so API returns fresh data
-            clear_design_cache()
-
-            status_text = 'In Stock' if item.inStock else 'Out of Stock'
-            messages.success(request, f'{item.button_type_name_eng} status updated to {status_text}')
-        elif component_type == 'main_categories':
-            item = HomePageSelectionCategory.objects.get(id=item_id)
-            item.isHidden = (status == 'hidden')
-            item.save()
-
-            # Clear design cache so API returns fresh data
-            clear_design_cache()
-
-            status_text = 'Hidden' if item.isHidden else 'Active'
-            messages.success(request, f'{item.main_category_name_eng} status updated to {status_text}')
-        else:
-            messages.error(request, 'Invalid component type')
-
+        family = get_editor_family(component_type)
+        item, status_text = set_component_status(
+            component_type, request.POST.get('item_id'), request.POST.get('status')
+        )
+        messages.success(request, f'{display_name(family, item)} status updated to {status_text}')
+    except ComponentError as e:
+        messages.error(request, str(e))
     except Exception as e:
         messages.error(request, f'Error updating status: {str(e)}')
 
@@ -1142,55 +510,16 @@ def update_design_status(request):
 @require_http_methods(["POST"])
 def update_fabric_relation(request):
     """Update fabric type or fabric color for design items"""
+    component_type = request.POST.get('component_type')
     try:
-        component_type = request.POST.get('component_type')
-        item_id = request.POST.get('item_id')
-        field = request.POST.get('field')  # 'fabric_type' or 'fabric_color'
-        value = request.POST.get('value')  # ID of the fabric type or color
-
-        # Get the appropriate model
-        if component_type == 'collars':
-            item = GholaType.objects.get(id=item_id)
-            item_name = item.ghola_type_name_eng
-        elif component_type == 'sleeves':
-            item = SleevesType.objects.get(id=item_id)
-            item_name = item.sleeves_type_name_eng
-        elif component_type == 'pockets':
-            item = PocketType.objects.get(id=item_id)
-            item_name = item.pocket_type_name_eng
-        elif component_type == 'buttons':
-            item = ButtonType.objects.get(id=item_id)
-            item_name = item.button_type_name_eng
-
-        elif component_type == 'body':
-            item = BodyType.objects.get(id=item_id)
-            item_name = item.body_type_name_eng
-        else:
-            messages.error(request, 'Invalid component type')
-            return redirect(f'/dashboard/designs/?type={component_type}')
-
-        # Update the field
-        if field == 'fabric_type':
-            if value:
-                fabric_type = FabricType.objects.get(id=value)
-                item.fabric_type = fabric_type
-            else:
-                item.fabric_type = None
-        elif field == 'fabric_color':
-            if value:
-                fabric_color = FabricColor.objects.get(id=value)
-                item.fabric_color = fabric_color
-            else:
-                item.fabric_color = None
-        else:
-            messages.error(request, 'Invalid field')
-            return redirect(f'/dashboard/designs/?type={component_type}')
-
-        item.save()
-
-        # Clear design cache so API returns fresh data
-        clear_design_cache()
-
+        set_fabric_relation(
+            component_type,
+            request.POST.get('item_id'),
+            request.POST.get('field'),  # 'fabric_type' or 'fabric_color'
+            request.POST.get('value'),  # ID of the fabric type or color
+        )
+    except ComponentError as e:
+        messages.error(request, str(e))
     except Exception as e:
         messages.error(request, f'Error updating: {str(e)}')
 
@@ -1202,76 +531,19 @@ def update_fabric_relation(request):
 @require_http_methods(["POST"])
 def update_image(request):
     """Update cover or cover_option image for design items"""
+    component_type = request.POST.get('component_type')
     try:
-        component_type = request.POST.get('component_type')
-        item_id = request.POST.get('item_id')
         image_field = request.POST.get('image_field')  # 'cover' or 'cover_option'
         image_file = request.FILES.get('image')
-
         if not image_file:
-            messages.error(request, 'No image file provided')
-            return redirect(f'/dashboard/designs/?type={component_type}')
-
-        # Validate file size and type
-        MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB in bytes
-        ALLOWED_EXTENSIONS = ['jpg', 'jpeg', 'png', 'gif', 'webp']
-
-        if image_file.size > MAX_FILE_SIZE:
-            messages.error(request, f'Image size exceeds 5MB limit. Current size: {image_file.size / (1024 * 1024):.2f}MB')
-            return redirect(f'/dashboard/designs/?type={component_type}')
-
-        file_ext = image_file.name.split('.')[-1].lower()
-        if file_ext not in ALLOWED_EXTENSIONS:
-            messages.error(request, f'Invalid image format. Allowed: {", ".join(ALLOWED_EXTENSIONS)}')
-            return redirect(f'/dashboard/designs/?type={component_type}')
-
-        # Get the appropriate model
-        if component_type == 'collars':
-            item = GholaType.objects.get(id=item_id)
-            item_name = item.ghola_type_name_eng
-        elif component_type == 'sleeves':
-            item = SleevesType.objects.get(id=item_id)
-            item_name = item.sleeves_type_name_eng
-        elif component_type == 'pockets':
-            item = PocketType.objects.get(id=item_id)
-            item_name = item.pocket_type_name_eng
-        elif component_type == 'buttons':
-            item = ButtonType.objects.get(id=item_id)
-            item_name = item.button_type_name_eng
-
-        elif component_type == 'body':
-            item = BodyType.objects.get(id=item_id)
-            item_name = item.body_type_name_eng
-        else:
-            messages.error(request, 'Invalid component type')
-            return redirect(f'/dashboard/designs/?type={component_type}')
-
-        # Update the image field with attribute error handling
-        try:
-            if image_field == 'cover':
-                if not hasattr(item, 'cover'):
-                    messages.error(request, f'This component does not support cover images')
-                    return redirect(f'/dashboard/designs/?type={component_type}')
-                item.cover = image_file
-                messages.success(request, f'{item_name} cover image updated successfully')
-            elif image_field == 'cover_option':
-                if not hasattr(item, 'cover_option'):
-                    messages.error(request, f'This component does not support cover option images')
-                    return redirect(f'/dashboard/designs/?type={component_type}')
-                item.cover_option = image_file
-                messages.success(request, f'{item_name} cover option image updated successfully')
-            else:
-                messages.error(request, 'Invalid image field')
-                return redirect(f'/dashboard/designs/?type={component_type}')
-
-            item.save()
-        except AttributeError as e:
-            messages.error(request, f'Image upload error: This component does not support this image type')
-            return redirect(f'/dashboard/designs/?type={component_type}')
-
-        # Clear design cache so API returns fresh data
-        clear_design_cache()
-
+            raise ComponentError('No image file provided')
+
+        family = get_editor_family(component_type)
+        item = set_component_image(component_type, request.POST.get('item_id'), image_field, image_file)
+        label = 'cover option image' if image_field == 'cover_option' else 'cover image'
+        messages.success(request, f'{display_name(family, item)} {label} updated successfully')
+    except ComponentError as e:
+        messages.error(request, str(e))
     except Exception as e:
         messages.error(request, f'Error updating image: {str(e)}')
 
@@ -1283,53 +555,18 @@ def update_image(request):
 @require_http_methods(["POST"])
 def delete_image(request):
     """Delete cover or cover_option image for design items"""
+    component_type = request.POST.get('component_type')
     try:
-        component_type = request.POST.get('component_type')
-        item_id = request.POST.get('item_id')
         image_field = request.POST.get('image_field')  # 'cover' or 'cover_option'
-
-        # Get the appropriate model
-        if component_type == 'collars':
-            item = GholaType.objects.get(id=item_id)
-            item_name = item.ghola_type_name_eng
-        elif component_type == 'sleeves':
-            item = SleevesType.objects.get(id=item_id)
-            item_name = item.sleeves_type_name_eng
-        elif component_type == 'pockets':
-            item = PocketType.objects.get(id=item_id)
-            item_name = item.pocket_type_name_eng
-        elif component_type == 'buttons':
-            item = ButtonType.objects.get(id=item_id)
-            item_name = item.button_type_name_eng
-
-        elif component_type == 'body':
-            item = BodyType.objects.get(id=item_id)
-            item_name = item.body_type_name_eng
-        else:
-            messages.error(request, 'Invalid component type')
-            return redirect(f'/dashboard/designs/?type={component_type}')
-
-        # Delete the image field
-        if image_field == 'cover':
-            if item.cover:
-                item.cover.delete(save=False)
-                item.cover = None
-                item.save()
-                messages.success(request, f'{item_name} cover image deleted successfully')
-            else:
-                messages.warning(request, f'{item_name} has no cover image to delete')
-        elif image_field == 'cover_option':
-            if item.cover_option:
-                item.cover_option.delete(save=False)
-                item.cover_option = None
-                item.save()
-                messages.success(request, f'{item_name} cover option image deleted successfully')
-            else:
-                messages.warning(request, f'{item_name} has no cover option image to delete')
+        family = get_editor_family(component_type)
+        item, deleted = delete_component_image(component_type, request.POST.get('item_id'), image_field)
+        label = 'cover option image' if image_field == 'cover_option' else 'cover image'
+        if deleted:
+            messages.success(request, f'{display_name(family, item)} {label} deleted successfully')
         else:
-            messages.error(request, 'Invalid image field')
-            return redirect(f'/dashboard/designs/?type={component_type}')
-
+            messages.warning(request, f'{display_name(family, item)} has no {label} to delete')
+    except ComponentError as e:
+        messages.error(request, str(e))
     except Exception as e:
         messages.error(request, f'Error deleting image: {str(e)}')
 
@@ -1963,7 +1200,7 @@ def delete_banner(request, banner_id):
 @user_passes_test(is_staff_user, login_url='/dashboard/login/')
 def user_designs_view(request):
     """Display list of all user designs with search and filtering"""
-    from Design.models import UserDesign
+    from Design.models import DesignConfigurationStats, UserDesign
 
     search_query = request.GET.get('search', '')
     user_filter = request.GET.get('user', '')
@@ -1994,51 +1231,29 @@ def user_designs_view(request):
         designs = designs.filter(user_id=user_filter)
 
     # Get unique users who have designs
-    users_with_designs = User.objects.filter(
+    users_with_designs = list(User.objects.filter(
         id__in=UserDesign.objects.values_list('user_id', flat=True).distinct()
-    ).order_by('username')
-
-    # Statistics
-    total_designs = UserDesign.objects.count()
-    total_users = UserDesign.objects.values('user').distinct().count()
-    total_value = UserDesign.objects.aggregate(total=Sum('design_Total'))['total'] or 0
-
-    # Find duplicate design configurations (ignoring user and price)
-    duplicate_configs = UserDesign.objects.values(
-        'initial_size_selected',
-        'main_body_fabric_color',
-        'selected_coller_type',
-        'selected_sleeve_left_type',
-        'selected_sleeve_right_type',
-        'selected_pocket_type',
-        'selected_button_type',
-        'selected_body_type'
-    ).annotate(
-        count=Count('id')
-    ).filter(count__gt=1)
-
-    # Calculate total unique configurations
-    unique_configurations = UserDesign.objects.values(
-        'initial_size_selected',
-        'main_body_fabric_color',
-        'selected_coller_type',
-        'selected_sleeve_left_type',
-        'selected_sleeve_right_type',
-        'selected_pocket_type',
-        'selected_button_type',
-        'selected_body_type'
-    ).distinct().count()
+    ).order_by('username'))
+
+    # Statistics - read from the precomputed per-configuration rows (Design/design_stats.py)
+    # instead of grouping every UserDesign by its 8 component fields
+    stats = DesignConfigurationStats.objects.filter(design_count__gt=0).aggregate(
+        total_designs=Sum('design_count'),
+        total_value=Sum('design_value'),
+        unique_configurations=Count('id'),
+        duplicate_count=Count('id', filter=Q(design_count__gt=1)),
+    )
 
     context = {
         'designs': designs,
         'search_query': search_query,
         'user_filter': user_filter,
         'users_with_designs': users_with_designs,
-        'total_designs': total_designs,
-        'total_users': total_users,
-        'total_value': total_value,
-        'unique_configurations': unique_configurations,
-        'duplicate_count': duplicate_configs.count(),
+        'total_designs': stats['total_designs'] or 0,
+        'total_users': len(users_with_designs),
+        'total_value': stats['total_value'] or 0,
+        'unique_configurations': stats['unique_configurations'],
+        'duplicate_count': stats['duplicate_count'],
     }
 
     return render(request, 'dashboard/user_designs.html', context)
@@ -2285,7 +1500,9 @@ def force_logout_user(request, user_id):
 
         # Clear FCM token to stop push notifications
         try:
+            from User.device_tokens import deactivate_profile_tokens
             profile = user.profile
+            deactivate_profile_tokens([profile], reason='force_logout')
             profile.fcm_token = None
             profile.save()
         except Profile.DoesNotExist:
@@ -2332,6 +1549,12 @@ def force_logout_all_users(request):
             logout_count = 0  # Model not available yet (migration pending)
 
         # Clear FCM tokens for all users except current user
+        from User.device_tokens import deactivate_tokens
+        from User.models import DeviceToken
+        deactivate_tokens(
+            DeviceToken.objects.filter(is_active=True).exclude(profile__user=current_user).values_list('token', flat=True),
+            reason='force_logout'
+        )
         Profile.objects.exclude(user=current_user).update(fcm_token=None)
 
         # Try to delete JWT tokens if token blacklist is enabled
@@ -13,7 +13,7 @@ from .models import (
     HomePageSelectionCategory,
     FabricType, FabricColor,
     GholaType, SleevesType, PocketType, ButtonType, BodyType,
-    UserDesign, InventoryTransaction, DesignScreenshot
+    UserDesign, InventoryTransaction, InventorySnapshot, DesignConfigurationStats, DesignScreenshot
 )
 
 # Register your models here.
@@ -212,13 +212,29 @@ class InventoryTransactionAdmin(admin.ModelAdmin):
     get_fabric_color.short_description = 'Fabric Color'
 
 
+@admin.register(InventorySnapshot)
+class InventorySnapshotAdmin(admin.ModelAdmin):
+    list_display = ('id', 'fabric_color', 'taken_at', 'quantity', 'consumed_total', 'restocked_total')
+    list_filter = ('taken_at',)
+    search_fields = ('fabric_color__color_name_eng', 'fabric_color__fabric_type__fabric_name_eng')
+    list_select_related = ('fabric_color',)
+    readonly_fields = ('fabric_color', 'taken_at', 'quantity', 'consumed_total', 'restocked_total', 'last_transaction_id')
+
+
+@admin.register(DesignConfigurationStats)
+class DesignConfigurationStatsAdmin(admin.ModelAdmin):
+    list_display = ('config_key', 'design_count', 'order_count', 'revenue', 'last_used_at')
+    search_fields = ('config_key',)
+    readonly_fields = [field.name for field in DesignConfigurationStats._meta.fields]
+
+
 # Design Screenshot caching
 @admin.register(DesignScreenshot)
 class DesignScreenshotAdmin(admin.ModelAdmin):
-    list_display = ('design_hash_short', 'screenshot_url_preview', 'times_reused', 'created_at', 'last_accessed')
-    list_filter = ('created_at', 'last_accessed')
-    search_fields = ('design_hash', 'fabric_color_id', 'collar_id')
-    readonly_fields = ('design_hash', 'times_reused', 'created_at', 'last_accessed')
+    list_display = ('design_hash_short', 'screenshot_url_preview', 'upload_status', 'times_reused', 'created_at', 'last_accessed')
+    list_filter = ('upload_status', 'created_at', 'last_accessed')
+    search_fields = ('design_hash', 'content_hash', 'fabric_color_id', 'collar_id')
+    readonly_fields = ('design_hash', 'content_hash', 'upload_status', 'times_reused', 'created_at', 'last_accessed')
 
     def design_hash_short(self, obj):
         return f"{obj.design_hash[:16]}..."
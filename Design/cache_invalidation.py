@@ -0,0 +1,140 @@
+"""
+Design Cache Invalidation
+Scoped, batched invalidation for everything cached from the design catalog.
+
+- Cached catalog data belongs to a scope (SCOPES) and is tied to the scope's
+  current version: scoped_key() puts it in the cache key, catalog_cache.py
+  stores it with each response (so invalidation marks responses stale).
+  Invalidating a scope is one INCR of its version key - no cache.clear()
+  (which also dropped OTPs, payment callback locks and metrics) and no
+  Redis KEYS * scan. Entries under an old version expire with their TTL.
+- mark_dirty() records changed scopes. Versions are bumped after the
+  surrounding transaction commits, so a request can't re-cache the old rows
+  between the invalidation and the commit.
+- batched_invalidation() collects every mark_dirty() inside its block and
+  bumps each dirty scope once on exit. CacheInvalidationMiddleware
+  (raggyBackend/cache_invalidation_middleware.py) wraps every request in one,
+  so an admin save, an import-export upload or a dashboard edit costs one
+  bump per scope however many rows and signals it touched; management
+  commands wrap their writes in it directly. Async requests (ASGI) use
+  abatched_invalidation(), which schedules the flush off the event loop.
+"""
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+SCOPES = ('main_categories', 'fabrics', 'components', 'dashboard_catalog')
+VERSION_KEY = 'design_cache:version:{}'
+
+# Scopes built from each catalog model's rows
+MODEL_SCOPES = {
+    'HomePageSelectionCategory': ('main_categories', 'dashboard_catalog'),
+    'FabricType': ('fabrics', 'dashboard_catalog'),
+    'FabricColor': ('fabrics', 'dashboard_catalog'),
+    'GholaType': ('components', 'dashboard_catalog'),
+    'SleevesType': ('components', 'dashboard_catalog'),
+    'PocketType': ('components', 'dashboard_catalog'),
+    'ButtonType': ('components', 'dashboard_catalog'),
+    'BodyType': ('components', 'dashboard_catalog'),
+}
+
+# Set inside batched_invalidation(): the scopes marked dirty so far
+_batch = ContextVar('design_cache_batch', default=None)
+
+
+def _new_version():
+    # Time based, so a version key lost to eviction never restarts at a version already cached
+    return time.time_ns() // 1000
+
+
+def scope_version(scope):
+    key = VERSION_KEY.format(scope)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), None)
+        version = cache.get(key) or _new_version()
+    return version
+
+
+def scoped_key(scope, key):
+    """Cache key for `key` under the scope's current version"""
+    return f'{key}:v{scope_version(scope)}'
+
+
+def flush_scopes(scopes):
+    """Bump the version of every scope (runs after commit)"""
+    for scope in sorted(scopes):
+        key = VERSION_KEY.format(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Never read (or evicted): any fresh version is newer than the cached entries
+            cache.set(key, _new_version(), None)
+    logger.info("🔥 Design cache invalidated: %s", ', '.join(sorted(scopes)))
+
+
+def mark_dirty(*scopes):
+    """Invalidate the scopes after commit, or once at the end of the current batch"""
+    batch = _batch.get()
+    if batch is not None:
+        batch.update(scopes)
+    elif scopes:
+        transaction.on_commit(partial(flush_scopes, set(scopes)))
+
+
+def model_changed(model, deleted=False):
+    """Mark the scopes built from `model`; deleting a fabric also nulls component fabric links"""
+    scopes = MODEL_SCOPES.get(model.__name__, ())
+    if deleted and model.__name__ in ('FabricType', 'FabricColor'):
+        scopes += ('components',)
+    mark_dirty(*scopes)
+
+
+@contextmanager
+def batched_invalidation():
+    """
+    Collect the invalidations of every write inside the block and flush each
+    dirty scope once, after the transaction the block exits in commits
+    (immediately when not in a transaction). Nested blocks join the outer one.
+    """
+    if _batch.get() is not None:
+        yield
+        return
+
+    dirty = set()
+    token = _batch.set(dirty)
+    try:
+        yield
+    finally:
+        _batch.reset(token)
+        if dirty:
+            transaction.on_commit(partial(flush_scopes, dirty))
+
+
+@asynccontextmanager
+async def abatched_invalidation():
+    """
+    batched_invalidation() for async code. Writes made through sync_to_async
+    inside the block join it (the batch is copied into their context); the
+    flush is scheduled from a worker thread, as on_commit needs the database.
+    """
+    if _batch.get() is not None:
+        yield
+        return
+
+    dirty = set()
+    token = _batch.set(dirty)
+    try:
+        yield
+    finally:
+        _batch.reset(token)
+        if dirty:
+            await sync_to_async(transaction.on_commit)(partial(flush_scopes, dirty))
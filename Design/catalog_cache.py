@@ -0,0 +1,133 @@
+"""
+Catalog Response Cache
+Stale-while-revalidate cache for the public catalog endpoints (main categories,
+fabrics and the Fetch*APIView component lists), in place of cache_page.
+
+- An entry holds the response data, when it was built and the version of its
+  scope (see cache_invalidation.py) it was built under
+- Fresh (younger than CATALOG_CACHE_SOFT_TTL and its scope not invalidated
+  since): served as is
+- Stale (older, or its scope was invalidated): still served as is, while one
+  background refresh rebuilds it. A cache.add() lock keeps the refresh
+  single-flight across threads and processes
+- Missing (never built, or expired after CATALOG_CACHE_HARD_TTL): the lock
+  holder builds it inline; concurrent misses wait briefly for that build
+  instead of all querying the database. With the cache unavailable every
+  miss builds inline straight away
+
+Invalidation bumps the scope version, which marks entries stale rather than
+deleting them, so no request ever waits on a cold rebuild after an admin edit.
+"""
+import hashlib
+import logging
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from rest_framework.response import Response
+
+from raggyBackend.executors import lazy_executor
+
+from .cache_invalidation import scope_version
+
+logger = logging.getLogger(__name__)
+
+# How long a miss waits for another request's build before building itself
+MISS_WAIT_SECONDS = 2
+MISS_POLL_INTERVAL = 0.05
+
+get_executor = lazy_executor('CATALOG_CACHE_REFRESH_WORKERS', 'catalog-refresh')
+
+
+def entry_key(scope, request):
+    url = request.build_absolute_uri()
+    return f'catalog_response:{scope}:{hashlib.md5(url.encode()).hexdigest()}'
+
+
+def is_fresh(entry, scope):
+    return (
+        time.time() - entry['built_at'] < settings.CATALOG_CACHE_SOFT_TTL
+        and entry['version'] == scope_version(scope)
+    )
+
+
+def _respond(entry, state):
+    response = Response(entry['data'], status=entry['status'], content_type=entry['content_type'])
+    response['X-Catalog-Cache'] = state
+    return response
+
+
+def _build(key, scope, view_func, request, args, kwargs):
+    """Run the view and store a successful response"""
+    # Read before querying: a change committed during the build leaves the entry stale
+    version = scope_version(scope)
+    response = view_func(request, *args, **kwargs)
+    if response.status_code == 200:
+        cache.set(key, {
+            'data': response.data,
+            'status': response.status_code,
+            'content_type': response.content_type,
+            'built_at': time.time(),
+            'version': version,
+        }, settings.CATALOG_CACHE_HARD_TTL)
+    response['X-Catalog-Cache'] = 'miss'
+    return response
+
+
+def _refresh(key, lock_key, scope, view_func, request, args, kwargs):
+    """Worker: rebuild a stale entry, then release the refresh lock"""
+    try:
+        _build(key, scope, view_func, request, args, kwargs)
+    except Exception as e:
+        logger.warning("⚠️ Catalog cache refresh failed for %s: %s", request.path, e)
+    finally:
+        cache.delete(lock_key)
+        close_old_connections()
+
+
+def _wait_for(key):
+    deadline = time.monotonic() + MISS_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(MISS_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+    return None
+
+
+def catalog_response_cache(scope):
+    """Stale-while-revalidate cache for a GET handler whose data comes from `scope`"""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            key = entry_key(scope, request)
+            lock_key = f'{key}:lock'
+            lock_timeout = settings.CATALOG_CACHE_LOCK_TIMEOUT
+
+            entry = cache.get(key)
+            if entry is not None:
+                if is_fresh(entry, scope):
+                    return _respond(entry, 'fresh')
+                if cache.add(lock_key, 1, lock_timeout):
+                    get_executor().submit(_refresh, key, lock_key, scope, view_func, request, args, kwargs)
+                return _respond(entry, 'stale')
+
+            locked = cache.add(lock_key, 1, lock_timeout)
+            if locked is None:
+                # Cache unavailable (add() returns None): nobody else can be building it
+                return _build(key, scope, view_func, request, args, kwargs)
+            if locked:
+                try:
+                    return _build(key, scope, view_func, request, args, kwargs)
+                finally:
+                    cache.delete(lock_key)
+
+            # Another request is building it; build here only if it takes too long
+            entry = _wait_for(key)
+            if entry is not None:
+                return _respond(entry, 'fresh')
+            return _build(key, scope, view_func, request, args, kwargs)
+        return wrapper
+    return decorator
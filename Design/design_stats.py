@@ -0,0 +1,321 @@
+"""
+Design Configuration Stats
+Usage per distinct design configuration, kept in DesignConfigurationStats so
+dashboards read precomputed rows instead of grouping every UserDesign.
+
+- A configuration is the 8 component FKs of a UserDesign (user, name and price
+  ignored); config_key() is its canonical string form
+- UserDesign create/update/delete and order Item create/delete adjust the
+  matching row with F() expressions, inside the caller's transaction (receivers
+  in Design/signals.py and Purchase/signals.py)
+- Order items are created from the cart JSON with no UserDesign link
+  (CreateOrderAPIView): they are attributed from design_details instead - the
+  component ids parsed by design_details_component_ids(), and the size of the
+  buyer's saved design with those components (None if there is none)
+- The row an item was counted on is stored in Item.stats_config_key and the
+  item is uncounted from that exact row, even if the buyer's designs changed
+  in between
+- Deleting a component nulls UserDesign FKs with a plain UPDATE (no signals),
+  so rebuild_configuration_stats() recomputes every row; the scheduler runs it
+  nightly and `manage.py rebuild_design_stats` runs it on demand
+"""
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Sum
+from django.utils import timezone
+
+from .models import DesignConfigurationStats, UserDesign
+
+CONFIG_FIELDS = (
+    'initial_size_selected',
+    'main_body_fabric_color',
+    'selected_coller_type',
+    'selected_sleeve_left_type',
+    'selected_sleeve_right_type',
+    'selected_pocket_type',
+    'selected_button_type',
+    'selected_body_type',
+)
+ID_FIELDS = tuple(f'{field}_id' for field in CONFIG_FIELDS)
+
+
+def config_ids(obj):
+    """Component ids of a UserDesign (or stats row) as a tuple"""
+    return tuple(getattr(obj, field) for field in ID_FIELDS)
+
+
+def config_key(ids):
+    """(3, 12, None, ...) -> '3:12::...'"""
+    return ':'.join('' if value is None else str(value) for value in ids)
+
+
+def parse_config_key(key):
+    """'3:12::...' -> (3, 12, None, ...)"""
+    return tuple(int(value) if value else None for value in key.split(':'))
+
+
+def bump(ids, designs=0, design_value=0, orders=0, revenue=0, used_at=None):
+    """Add the deltas to the configuration's row, creating it on first use"""
+    changes = {}
+    if designs:
+        changes['design_count'] = F('design_count') + designs
+    if design_value:
+        changes['design_value'] = F('design_value') + design_value
+    if orders:
+        changes['order_count'] = F('order_count') + orders
+    if revenue:
+        changes['revenue'] = F('revenue') + revenue
+    if used_at:
+        changes['last_used_at'] = used_at
+    if not changes:
+        return
+
+    key = config_key(ids)
+    rows = DesignConfigurationStats.objects.filter(config_key=key)
+    if rows.update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            DesignConfigurationStats.objects.create(
+                config_key=key,
+                design_count=max(designs, 0),
+                design_value=max(design_value, 0),
+                order_count=max(orders, 0),
+                revenue=max(revenue, 0),
+                last_used_at=used_at,
+                **dict(zip(ID_FIELDS, ids)),
+            )
+    except IntegrityError:
+        # Created by a concurrent request - apply as an update
+        rows.update(**changes)
+
+
+def stored_state(design):
+    """(ids, design_Total) currently in the database for a design being saved, or None"""
+    if design._state.adding or design.pk is None:
+        return None
+    row = UserDesign.objects.filter(pk=design.pk).values_list(*ID_FIELDS, 'design_Total').first()
+    if row is None:
+        return None
+    return row[:-1], row[-1]
+
+
+def design_saved(design, created, before=None):
+    """Apply a UserDesign create/update (`before` from stored_state())"""
+    ids, total = config_ids(design), Decimal(design.design_Total or 0)
+    if created or before is None:
+        bump(ids, designs=1, design_value=total, used_at=design.timestamp or timezone.now())
+        return
+
+    old_ids, old_total = before
+    old_total = old_total or Decimal('0')
+    if old_ids != ids:
+        bump(old_ids, designs=-1, design_value=-old_total)
+        bump(ids, designs=1, design_value=total, used_at=timezone.now())
+    elif total != old_total:
+        bump(ids, design_value=total - old_total)
+
+
+def design_deleted(design):
+    bump(config_ids(design), designs=-1, design_value=-Decimal(design.design_Total or 0))
+
+
+# ================== ORDER ITEMS ==================
+def design_details_component_ids(details):
+    """
+    Component ids referenced by an order item's design_details, by family:
+    {'fabric_color': 5, 'collar': 2, 'sleeves': [3, 4], 'pocket': 1, 'button': 2, 'body': 6}
+    The client's key names vary, so keys are matched by substring.
+    """
+    component_ids = {}
+    if not details:
+        return component_ids
+
+    # Fabric color - use exact key name
+    if details.get('design_color_id'):
+        component_ids['fabric_color'] = details.get('design_color_id')
+
+    for key, value in details.items():
+        key_lower = key.lower()
+        if 'id' in key_lower and value:
+            # Skip fabric color as it's already handled
+            if 'design_color' in key_lower:
+                continue
+            elif 'collar' in key_lower or 'coller' in key_lower:
+                component_ids['collar'] = value
+            elif 'sleeve' in key_lower:
+                component_ids.setdefault('sleeves', []).append(value)
+            elif 'pocket' in key_lower:
+                component_ids['pocket'] = value
+            elif 'button' in key_lower:
+                component_ids['button'] = value
+            elif 'body' in key_lower:
+                component_ids['body'] = value
+    return component_ids
+
+
+def _as_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def details_components(details):
+    """ID_FIELDS[1:] values from design_details (left sleeve first), or None without a fabric color"""
+    found = design_details_component_ids(details)
+    fabric_color = _as_id(found.get('fabric_color'))
+    if fabric_color is None:
+        return None
+    sleeves = found.get('sleeves') or [None]
+    return (
+        fabric_color,
+        _as_id(found.get('collar')),
+        _as_id(sleeves[0]),
+        _as_id(sleeves[-1]),
+        _as_id(found.get('pocket')),
+        _as_id(found.get('button')),
+        _as_id(found.get('body')),
+    )
+
+
+def _saved_size(user_id, components):
+    """Size of the buyer's latest saved design with these components"""
+    if not user_id:
+        return None
+    return (
+        UserDesign.objects.filter(user_id=user_id, **dict(zip(ID_FIELDS[1:], components)))
+        .order_by('-id').values_list(ID_FIELDS[0], flat=True).first()
+    )
+
+
+def _item_config_ids(item):
+    """Configuration an order item counts towards, or None"""
+    if item.user_design_id:
+        if 'user_design' in item._state.fields_cache and item.user_design is not None:
+            return config_ids(item.user_design)
+        return UserDesign.objects.filter(pk=item.user_design_id).values_list(*ID_FIELDS).first()
+
+    components = details_components(item.design_details)
+    if components is None:
+        return None
+    from Purchase.models import Purchase
+
+    user_id = Purchase.objects.filter(pk=item.invoice_id).values_list('user_id', flat=True).first()
+    return (_saved_size(user_id, components),) + components
+
+
+def item_ordered(item):
+    """Count an order item towards its design configuration and remember which one"""
+    ids = _item_config_ids(item)
+    if ids is None:
+        return
+    bump(ids, orders=1, revenue=Decimal(item.net_amount or 0), used_at=item.created_date or timezone.now())
+    item.stats_config_key = config_key(ids)
+    from Purchase.models import Item
+
+    Item.objects.filter(pk=item.pk).update(stats_config_key=item.stats_config_key)
+
+
+def item_removed(item):
+    """Uncount an order item; called before the delete so its design is still readable"""
+    if item.stats_config_key:
+        ids = parse_config_key(item.stats_config_key)
+    else:
+        # Ordered before the key was stored
+        ids = _item_config_ids(item)
+    if ids is not None:
+        bump(ids, orders=-1, revenue=-Decimal(item.net_amount or 0))
+
+
+# ================== REBUILD ==================
+def rebuild_configuration_stats():
+    """Recompute every row from UserDesign and order items. Returns the number of configurations."""
+    from Purchase.models import Item
+
+    rows = compute_configuration_stats()
+    with transaction.atomic():
+        DesignConfigurationStats.objects.all().delete()
+        DesignConfigurationStats.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def compute_configuration_stats():
+    """
+    Unsaved DesignConfigurationStats rows for every configuration.
+    Items are counted on their stored stats_config_key, so a later item_removed()
+    uncounts them from the same row; older items are attributed as _item_config_ids() does.
+    """
+    from Purchase.models import Item
+
+    rows = {}
+
+    def row(ids):
+        key = config_key(ids)
+        if key not in rows:
+            rows[key] = DesignConfigurationStats(
+                config_key=key, design_value=Decimal('0'), revenue=Decimal('0'), **dict(zip(ID_FIELDS, ids))
+            )
+        return rows[key]
+
+    def count_order(stats, orders, revenue, last_ordered):
+        stats.order_count += orders
+        stats.revenue += revenue or 0
+        if last_ordered and (stats.last_used_at is None or last_ordered > stats.last_used_at):
+            stats.last_used_at = last_ordered
+
+    designs = (
+        UserDesign.objects.values(*ID_FIELDS)
+        .annotate(designs=Count('id'), value=Sum('design_Total'), last_used=Max('timestamp'))
+        .order_by()
+    )
+    for values in designs:
+        stats = row(tuple(values[field] for field in ID_FIELDS))
+        stats.design_count = values['designs']
+        stats.design_value = values['value'] or 0
+        stats.last_used_at = values['last_used']
+
+    counted = (
+        Item.objects.filter(stats_config_key__isnull=False).values('stats_config_key')
+        .annotate(orders=Count('id'), revenue=Sum('net_amount'), last_ordered=Max('created_date'))
+        .order_by()
+    )
+    for values in counted:
+        stats = row(parse_config_key(values['stats_config_key']))
+        count_order(stats, values['orders'], values['revenue'], values['last_ordered'])
+
+    unkeyed = Item.objects.filter(stats_config_key__isnull=True)
+    item_fields = tuple(f'user_design__{field}' for field in ID_FIELDS)
+    items = (
+        unkeyed.filter(user_design__isnull=False).values(*item_fields)
+        .annotate(orders=Count('id'), revenue=Sum('net_amount'), last_ordered=Max('created_date'))
+        .order_by()
+    )
+    for values in items:
+        stats = row(tuple(values[field] for field in item_fields))
+        count_order(stats, values['orders'], values['revenue'], values['last_ordered'])
+
+    # Items ordered from the cart JSON (see _item_config_ids), sizes looked up in one pass
+    detail_items = []
+    for user_id, details, net_amount, created_date in (
+        unkeyed.filter(user_design__isnull=True, design_details__isnull=False)
+        .values_list('invoice__user_id', 'design_details', 'net_amount', 'created_date')
+        .iterator(chunk_size=2000)
+    ):
+        components = details_components(details)
+        if components is not None:
+            detail_items.append((user_id, components, net_amount, created_date))
+
+    saved_sizes = {}
+    buyer_ids = {user_id for user_id, *_ in detail_items if user_id}
+    if buyer_ids:
+        for user_id, *ids in (
+            UserDesign.objects.filter(user_id__in=buyer_ids).order_by('id').values_list('user_id', *ID_FIELDS)
+        ):
+            saved_sizes[(user_id, tuple(ids[1:]))] = ids[0]
+    for user_id, components, net_amount, created_date in detail_items:
+        stats = row((saved_sizes.get((user_id, components)),) + components)
+        count_order(stats, 1, net_amount, created_date)
+
+    return list(rows.values())
@@ -4,69 +4,124 @@ Fabric Update Notifications via Firebase Cloud Messaging (FCM)
 This module sends real-time signals to Flutter app when fabric data changes.
 Firebase is used ONLY for signaling - the app fetches actual data from REST API.
 
+Signals are published to a single FCM topic (settings.FCM_CATALOG_TOPIC), so a
+broadcast is one API call no matter how many devices are registered. Tokens are
+subscribed to the topic when the app registers them (UpdateFCMTokenAPIView).
+
+Repeated signals are debounced per update type: the first signal of a type
+opens a short window (settings.FCM_CATALOG_DEBOUNCE_SECONDS) and one broadcast
+is sent when it closes, so a burst of admin edits produces a single message.
+The pending broadcast is a notification outbox entry (event 'catalog_signal')
+whose available_at is the end of the window: signals from any worker process
+within the window merge into it, and if the process that opened the window
+restarts, the outbox drain still sends it. Edits to several fabrics in one
+window are sent as one fabric_detail_update with `fabric_ids` ("1,2,3")
+instead of `fabric_id`.
+
 Update Types:
 - fabric_list_update: When fabrics are added/removed/hidden
 - fabric_detail_update: When specific fabric details change (price, name, etc.)
 - fabric_color_update: When fabric colors are updated
+- main_category_update: When home page categories change
 """
 
-from firebase_admin import messaging
-from User.models import Profile
 import logging
 
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from firebase_admin import messaging
+
 logger = logging.getLogger(__name__)
 
+# FCM accepts at most 1000 tokens per topic subscription request
+TOPIC_SUBSCRIPTION_BATCH_SIZE = 1000
 
-def send_fabric_list_update_notification():
-    """
-    Send notification when fabric list changes (add/remove/hide fabric).
 
-    Use cases:
-    - New fabric added
-    - Fabric deleted
-    - Fabric hidden/shown (isHidden field changed)
-    - Fabric order changed
+def send_to_catalog_topic(data):
+    """Publish one data-only (silent) message to the catalog topic (outbox handler)"""
+    from Notification.notification_utils import initialize_firebase
 
-    The Flutter app will fetch fresh fabric list from API when receiving this signal.
-    """
     try:
-        # Get all active FCM tokens
-        tokens = Profile.objects.filter(
-            fcm_token__isnull=False
-        ).exclude(
-            fcm_token=''
-        ).values_list('fcm_token', flat=True)
+        initialize_firebase()
+        response = messaging.send(messaging.Message(data=data, topic=settings.FCM_CATALOG_TOPIC))
+        logger.info(f"✅ Catalog signal '{data['type']}' sent to topic {settings.FCM_CATALOG_TOPIC}: {response}")
+        return response
+    except Exception as e:
+        logger.error(f"❌ Error sending catalog signal '{data['type']}': {e}")
+        return None
 
-        tokens = list(tokens)
 
-        if not tokens:
-            logger.warning("No FCM tokens found for fabric list update notification")
+def _merge_signal(payload, data):
+    """Fold a signal's extras into a pending broadcast (differing values become a `<key>s` list)"""
+    merged = dict(payload)
+    for key, value in data.items():
+        if key == 'type':
+            continue
+        plural = f'{key}s'
+        if plural in merged:
+            values = merged[plural].split(',')
+        else:
+            values = [merged[key]] if key in merged else []
+        if value not in values:
+            values.append(value)
+        if len(values) == 1:
+            merged[key] = values[0]
+        else:
+            merged.pop(key, None)
+            merged[plural] = ','.join(values)
+    return merged
+
+
+def _schedule(data):
+    """Merge into the open debounce window for this update type, or open one"""
+    from Notification.models import NotificationOutbox
+    from Notification.outbox import enqueue_notification
+
+    window = settings.FCM_CATALOG_DEBOUNCE_SECONDS
+    if window <= 0:
+        enqueue_notification('catalog_signal', data)
+        return
+
+    with transaction.atomic():
+        pending = NotificationOutbox.objects.select_for_update().filter(
+            event_type='catalog_signal',
+            status=NotificationOutbox.STATUS_PENDING,
+            available_at__gt=timezone.now(),
+            payload__type=data['type'],
+        ).order_by('available_at').first()
+
+        if pending is None:
+            enqueue_notification('catalog_signal', data, delay=window)
             return
 
-        # Create FCM message with data payload (silent notification)
-        message = messaging.MulticastMessage(
-            tokens=tokens,
-            data={
-                'type': 'fabric_list_update',
-            },
-        )
+        pending.payload = _merge_signal(pending.payload, data)
+        pending.save(update_fields=['payload', 'updated_at'])
+    logger.info(f"⏳ Catalog signal '{data['type']}' coalesced into pending broadcast")
 
-        # Send to all devices
-        response = messaging.send_multicast(message)
 
-        logger.info(
-            f'✅ Fabric list update notification sent successfully: '
-            f'{response.success_count}/{len(tokens)} devices'
-        )
+def broadcast_catalog_signal(update_type, **extra):
+    """
+    Queue a debounced catalog-change broadcast.
+    Scheduled after commit so the app never refetches uncommitted data.
+    """
+    data = {'type': update_type, **{k: str(v) for k, v in extra.items()}}
+    transaction.on_commit(lambda: _schedule(data))
 
-        if response.failure_count > 0:
-            logger.warning(f'⚠️ Failed to send to {response.failure_count} devices')
 
-        return response
+def send_fabric_list_update_notification():
+    """
+    Send notification when fabric list changes (add/remove/hide fabric).
 
-    except Exception as e:
-        logger.error(f'❌ Error sending fabric list update notification: {e}')
-        return None
+    Use cases:
+    - New fabric added
+    - Fabric deleted
+    - Fabric hidden/shown (isHidden field changed)
+    - Fabric order changed
+
+    The Flutter app will fetch fresh fabric list from API when receiving this signal.
+    """
+    broadcast_catalog_signal('fabric_list_update')
 
 
 def send_fabric_detail_update_notification(fabric_id):
@@ -84,45 +139,7 @@ def send_fabric_detail_update_notification(fabric_id):
 
     The Flutter app will fetch fresh details for this specific fabric from API.
     """
-    try:
-        # Get all active FCM tokens
-        tokens = Profile.objects.filter(
-            fcm_token__isnull=False
-        ).exclude(
-            fcm_token=''
-        ).values_list('fcm_token', flat=True)
-
-        tokens = list(tokens)
-
-        if not tokens:
-            logger.warning(f"No FCM tokens found for fabric {fabric_id} update notification")
-            return
-
-        # Create FCM message with data payload
-        message = messaging.MulticastMessage(
-            tokens=tokens,
-            data={
-                'type': 'fabric_detail_update',
-                'fabric_id': str(fabric_id),
-            },
-        )
-
-        # Send to all devices
-        response = messaging.send_multicast(message)
-
-        logger.info(
-            f'✅ Fabric #{fabric_id} detail update notification sent successfully: '
-            f'{response.success_count}/{len(tokens)} devices'
-        )
-
-        if response.failure_count > 0:
-            logger.warning(f'⚠️ Failed to send to {response.failure_count} devices')
-
-        return response
-
-    except Exception as e:
-        logger.error(f'❌ Error sending fabric detail update notification: {e}')
-        return None
+    broadcast_catalog_signal('fabric_detail_update', fabric_id=fabric_id)
 
 
 def send_fabric_color_update_notification():
@@ -137,91 +154,65 @@ def send_fabric_color_update_notification():
 
     The Flutter app will refresh fabric data to get updated color information.
     """
-    try:
-        # Get all active FCM tokens
-        tokens = Profile.objects.filter(
-            fcm_token__isnull=False
-        ).exclude(
-            fcm_token=''
-        ).values_list('fcm_token', flat=True)
-
-        tokens = list(tokens)
-
-        if not tokens:
-            logger.warning("No FCM tokens found for fabric color update notification")
-            return
-
-        # Create FCM message with data payload
-        message = messaging.MulticastMessage(
-            tokens=tokens,
-            data={
-                'type': 'fabric_color_update',
-            },
-        )
-
-        # Send to all devices
-        response = messaging.send_multicast(message)
-
-        logger.info(
-            f'✅ Fabric color update notification sent successfully: '
-            f'{response.success_count}/{len(tokens)} devices'
-        )
-
-        if response.failure_count > 0:
-            logger.warning(f'⚠️ Failed to send to {response.failure_count} devices')
-
-        return response
-
-    except Exception as e:
-        logger.error(f'❌ Error sending fabric color update notification: {e}')
-        return None
+    broadcast_catalog_signal('fabric_color_update')
 
 
 def send_main_category_update_notification():
     """
     Send notification when main categories (home page) change.
-    
+
     Use cases:
     - New category added
     - Category deleted
     - Category hidden/shown
     - Category fields (name, price, duration) changed
     """
-    try:
-        # Get all active FCM tokens
-        tokens = Profile.objects.filter(
-            fcm_token__isnull=False
-        ).exclude(
-            fcm_token=''
-        ).values_list('fcm_token', flat=True)
-
-        tokens = list(tokens)
-
-        if not tokens:
-            logger.warning("No FCM tokens found for main category update notification")
-            return
+    broadcast_catalog_signal('main_category_update')
 
-        # Create FCM message with data payload
-        message = messaging.MulticastMessage(
-            tokens=tokens,
-            data={
-                'type': 'main_category_update',
-            },
-        )
 
-        # Send to all devices
-        response = messaging.send_multicast(message)
-
-        logger.info(
-            f'✅ Main category update notification sent successfully: '
-            f'{response.success_count}/{len(tokens)} devices'
-        )
-
-        return response
+# ============================================================================
+# Topic Subscriptions
+# ============================================================================
 
-    except Exception as e:
-        logger.error(f'❌ Error sending main category update notification: {e}')
-        return None
+def update_catalog_topic_subscription(token, old_token=None):
+    """
+    Subscribe a newly registered token to the catalog topic (and drop the token
+    it replaces). Returns True when FCM accepted the subscription.
+    """
+    from Notification.notification_utils import initialize_firebase
+
+    initialize_firebase()
+    topic = settings.FCM_CATALOG_TOPIC
+    if old_token and old_token != token:
+        try:
+            messaging.unsubscribe_from_topic([old_token], topic)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not unsubscribe old token from {topic}: {e}")
+
+    response = messaging.subscribe_to_topic([token], topic)
+    if response.failure_count:
+        logger.warning(f"⚠️ Topic subscription failed: {response.errors[0].reason}")
+        return False
+    return True
+
+
+def subscribe_tokens_to_catalog_topic(tokens):
+    """Subscribe existing tokens in batches of 1000 (backfill). Returns (success, failure)."""
+    from Notification.notification_utils import initialize_firebase
+
+    initialize_firebase()
+    success = failure = 0
+    batch = []
+    for token in tokens:
+        batch.append(token)
+        if len(batch) == TOPIC_SUBSCRIPTION_BATCH_SIZE:
+            response = messaging.subscribe_to_topic(batch, settings.FCM_CATALOG_TOPIC)
+            success, failure = success + response.success_count, failure + response.failure_count
+            batch = []
+    if batch:
+        response = messaging.subscribe_to_topic(batch, settings.FCM_CATALOG_TOPIC)
+        success, failure = success + response.success_count, failure + response.failure_count
+    return success, failure
 
 
 # ============================================================================
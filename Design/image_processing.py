@@ -0,0 +1,354 @@
+"""
+Catalog Image Ingestion
+Generates small WebP/JPEG size variants and a blurhash placeholder for every
+catalog image (fabric, color, collar, sleeve, pocket, button, body, main category).
+
+The original upload is left untouched. When a cover image changes, a background
+worker downloads the original once, strips metadata (EXIF/ICC), renders the
+variants with Pillow, uploads them to Cloudinary and records the URLs in the
+model's `image_variants` JSON field:
+
+    {
+        "cover": {
+            "source": "FabricType/abc123",
+            "width": 1200, "height": 1600,
+            "blurhash": "LEHV6nWB2yk8pyo0adR*.7kCMdnj",
+            "webp": {"thumb": "https://...", "small": "https://...", "medium": "https://..."},
+            "jpeg": {"thumb": "https://...", "small": "https://...", "medium": "https://..."}
+        }
+    }
+
+List endpoints can then serve `thumb`/`small` instead of the full-resolution asset.
+
+While a job is queued the entry is a marker, `{"source": ..., "status": "pending"}`,
+and a job that fails leaves `"status": "failed"`. Saves of the same image never
+queue another job for a source that already has an entry; the backfill command
+(generate_image_variants) retries pending and failed entries. Serializers only
+render finished entries (see serializer_fields.ImageVariantsField).
+"""
+import hashlib
+import logging
+import math
+from io import BytesIO
+
+import requests
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps
+
+from raggyBackend.executors import lazy_executor
+
+from .cache_invalidation import model_changed
+
+logger = logging.getLogger(__name__)
+
+# Target widths (px). Images are never upscaled.
+VARIANT_WIDTHS = {
+    'thumb': 160,
+    'small': 400,
+    'medium': 800,
+}
+
+# `status` of an image_variants entry that has no variants yet
+STATUS_PENDING = 'pending'
+STATUS_FAILED = 'failed'
+
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+VARIANTS_FOLDER = 'Variants'
+
+_http = requests.Session()
+
+get_executor = lazy_executor('IMAGE_PROCESSING_WORKERS', 'image-variants')
+
+
+# ================== BLURHASH ==================
+BASE83_CHARS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+
+def _encode83(value, length):
+    result = ''
+    for i in range(1, length + 1):
+        digit = (value // (83 ** (length - i))) % 83
+        result += BASE83_CHARS[digit]
+    return result
+
+
+def _srgb_to_linear(value):
+    v = value / 255.0
+    if v <= 0.04045:
+        return v / 12.92
+    return ((v + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(value):
+    v = max(0.0, min(1.0, value))
+    if v <= 0.0031308:
+        return int(v * 12.92 * 255 + 0.5)
+    return int((1.055 * (v ** (1 / 2.4)) - 0.055) * 255 + 0.5)
+
+
+def _sign_pow(value, exp):
+    return math.copysign(abs(value) ** exp, value)
+
+
+def blurhash_encode(image, x_components=4, y_components=3):
+    """
+    Encode a blurhash placeholder (https://blurha.sh).
+    Works on a 32px downscale, so the cost is independent of the source size.
+    """
+    small = image.convert('RGB')
+    small.thumbnail((32, 32))
+    width, height = small.size
+    pixels = [tuple(_srgb_to_linear(c) for c in px) for px in small.getdata()]
+
+    cos_x = [[math.cos(math.pi * i * x / width) for x in range(width)] for i in range(x_components)]
+    cos_y = [[math.cos(math.pi * j * y / height) for y in range(height)] for j in range(y_components)]
+
+    factors = []
+    scale = 1.0 / (width * height)
+    for j in range(y_components):
+        for i in range(x_components):
+            normalisation = 1 if (i == 0 and j == 0) else 2
+            r = g = b = 0.0
+            for y in range(height):
+                row = y * width
+                cy = cos_y[j][y]
+                for x in range(width):
+                    basis = normalisation * cos_x[i][x] * cy
+                    pr, pg, pb = pixels[row + x]
+                    r += basis * pr
+                    g += basis * pg
+                    b += basis * pb
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = _encode83((x_components - 1) + (y_components - 1) * 9, 1)
+
+    if ac:
+        actual_max = max(abs(v) for factor in ac for v in factor)
+        quantised_max = max(0, min(82, int(actual_max * 166 - 0.5)))
+        maximum_value = (quantised_max + 1) / 166
+        result += _encode83(quantised_max, 1)
+    else:
+        maximum_value = 1
+        result += _encode83(0, 1)
+
+    dc_value = (_linear_to_srgb(dc[0]) << 16) + (_linear_to_srgb(dc[1]) << 8) + _linear_to_srgb(dc[2])
+    result += _encode83(dc_value, 4)
+
+    for factor in ac:
+        quant = [
+            max(0, min(18, int(math.floor(_sign_pow(v / maximum_value, 0.5) * 9 + 9.5))))
+            for v in factor
+        ]
+        result += _encode83(quant[0] * 19 * 19 + quant[1] * 19 + quant[2], 2)
+
+    return result
+
+
+# ================== PILLOW PROCESSING ==================
+def decode_image(image_bytes):
+    """Decode, apply EXIF orientation and drop all metadata"""
+    image = Image.open(BytesIO(image_bytes))
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'P') else 'RGB')
+    image.info = {}
+    return image
+
+
+def _encode(image, fmt):
+    buffer = BytesIO()
+    if fmt == 'jpeg':
+        if image.mode == 'RGBA':
+            # JPEG has no alpha channel - flatten onto white
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+        image.save(buffer, format='JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    else:
+        image.save(buffer, format='WEBP', quality=WEBP_QUALITY, method=4)
+    return buffer.getvalue()
+
+
+def render_variants(image_bytes):
+    """
+    Render all size variants for an image.
+    Returns (metadata, files) where files maps (format, size_name) -> bytes.
+    """
+    image = decode_image(image_bytes)
+    width, height = image.size
+
+    files = {}
+    for size_name, target_width in VARIANT_WIDTHS.items():
+        if width > target_width:
+            target_height = max(1, round(height * target_width / width))
+            resized = image.resize((target_width, target_height), Image.LANCZOS)
+        else:
+            resized = image
+        resized.info = {}
+        for fmt in ('webp', 'jpeg'):
+            files[(fmt, size_name)] = _encode(resized, fmt)
+
+    metadata = {
+        'width': width,
+        'height': height,
+        'blurhash': blurhash_encode(image),
+    }
+    return metadata, files
+
+
+# ================== CLOUDINARY ==================
+def public_id_of(value):
+    """Public ID of a CloudinaryField value (CloudinaryResource or raw public_id string)"""
+    if not value:
+        return None
+    if hasattr(value, 'public_id'):
+        return value.public_id
+    return str(value)
+
+
+def url_of(value):
+    if hasattr(value, 'url'):
+        return value.url
+    from cloudinary import CloudinaryImage
+    return CloudinaryImage(str(value)).build_url()
+
+
+def upload_variants(files, folder, content_hash):
+    """Upload rendered variants (content-addressed public IDs) and return the URL map"""
+    import cloudinary.uploader
+
+    urls = {'webp': {}, 'jpeg': {}}
+    for (fmt, size_name), data in files.items():
+        result = cloudinary.uploader.upload(
+            data,
+            folder=folder,
+            public_id=f"{content_hash}_{size_name}",
+            format='webp' if fmt == 'webp' else 'jpg',
+            overwrite=True,
+            resource_type='image'
+        )
+        urls[fmt][size_name] = result['secure_url']
+    return urls
+
+
+# ================== PIPELINE ==================
+def build_variants_entry(source_value, folder):
+    """Download the original once and produce the `image_variants` entry for it"""
+    response = _http.get(url_of(source_value), timeout=(3.05, 30))
+    response.raise_for_status()
+    image_bytes = response.content
+
+    content_hash = hashlib.sha256(image_bytes).hexdigest()[:32]
+    metadata, files = render_variants(image_bytes)
+    urls = upload_variants(files, folder, content_hash)
+
+    return {
+        'source': public_id_of(source_value),
+        **metadata,
+        **urls,
+    }
+
+
+def process_image_field(model, pk, field_name):
+    """
+    Worker: generate variants for one image field and store them on the row.
+    Skips the write if the image was replaced while we were processing.
+    """
+    close_old_connections()
+    source = None
+    try:
+        instance = model.objects.only('id', field_name).filter(pk=pk).first()
+        if not instance:
+            return
+        source_value = getattr(instance, field_name)
+        if not source_value:
+            return
+        source = public_id_of(source_value)
+
+        folder = f"{VARIANTS_FOLDER}/{model.__name__}"
+        entry = build_variants_entry(source_value, folder)
+
+        with transaction.atomic():
+            locked = model.objects.select_for_update().only('id', field_name, 'image_variants').get(pk=pk)
+            if public_id_of(getattr(locked, field_name)) != entry['source']:
+                logger.info(f"{model.__name__} #{pk} {field_name} changed during processing, skipping")
+                return
+            variants = dict(locked.image_variants or {})
+            variants[field_name] = entry
+            model.objects.filter(pk=pk).update(image_variants=variants)
+            # update() sends no post_save: serve the new variants from the cached catalog too
+            model_changed(model)
+
+        logger.info(f"🖼️ Generated variants for {model.__name__} #{pk} {field_name}")
+
+    except Exception as e:
+        logger.error(f"Image variant generation failed for {model.__name__} #{pk} {field_name}: {e}", exc_info=True)
+        if source:
+            _mark_failed(model, pk, field_name, source)
+    finally:
+        close_old_connections()
+
+
+def _mark_failed(model, pk, field_name, source):
+    """Record the failure on the pending marker, so later saves don't queue the image again"""
+    try:
+        with transaction.atomic():
+            locked = model.objects.select_for_update().only('id', 'image_variants').filter(pk=pk).first()
+            variants = dict(locked.image_variants or {}) if locked else {}
+            entry = variants.get(field_name) or {}
+            if entry.get('source') != source or entry.get('status') != STATUS_PENDING:
+                return
+            variants[field_name] = {'source': source, 'status': STATUS_FAILED}
+            model.objects.filter(pk=pk).update(image_variants=variants)
+    except Exception as e:
+        logger.error(f"Could not record variant failure for {model.__name__} #{pk} {field_name}: {e}")
+
+
+def schedule_image_variants(instance, field_names, force=False, retry=False, synchronous=False):
+    """
+    Queue variant generation for every image field whose source changed.
+    A pending marker is recorded for the source before queueing, so saving the
+    row again doesn't queue it twice; `retry` also re-queues pending and failed
+    entries, `force` every image.
+    Fields that were cleared have their variants dropped immediately.
+    Called from post_save (see signals.py) and from the backfill command.
+    """
+    model = type(instance)
+    variants = dict(instance.image_variants or {})
+    stale_fields = []
+    changed = False
+
+    for field_name in field_names:
+        current = public_id_of(getattr(instance, field_name, None))
+        entry = variants.get(field_name) or {}
+
+        if not current:
+            if field_name in variants:
+                variants.pop(field_name)
+                changed = True
+            continue
+
+        if current != entry.get('source') or (retry and entry.get('status')):
+            variants[field_name] = {'source': current, 'status': STATUS_PENDING}
+            changed = True
+            stale_fields.append(field_name)
+        elif force:
+            # Finished variants stay served until they are regenerated
+            stale_fields.append(field_name)
+
+    if changed:
+        model.objects.filter(pk=instance.pk).update(image_variants=variants)
+        instance.image_variants = variants
+        model_changed(model)
+
+    for field_name in stale_fields:
+        if synchronous:
+            process_image_field(model, instance.pk, field_name)
+        else:
+            transaction.on_commit(
+                lambda field_name=field_name: get_executor().submit(process_image_field, model, instance.pk, field_name)
+            )
+
+    return len(stale_fields)
@@ -0,0 +1,379 @@
+"""
+Set-Based Inventory Updates
+Applies many absolute stock levels ({fabric_color_id, quantity, notes}) at once.
+
+- Updates are processed in chunks of INVENTORY_BULK_CHUNK_SIZE, each in its own
+  short transaction: one locked `in_bulk` read (SELECT ... FOR UPDATE, ordered
+  by id so concurrent bulk updates can't deadlock), one `bulk_update` of
+  quantity/inStock and one `bulk_create` of InventoryTransaction ledger rows
+- iter_csv_updates() streams an uploaded CSV into such chunks, so a file of any
+  size is never held in memory as a whole
+
+bulk_update doesn't send post_save, so callers clear the design cache once
+after the last chunk instead of once per fabric color.
+
+Snapshots (InventorySnapshot, taken daily by the scheduler) hold each color's
+stock and running consumption/restock totals. stock_at(), cumulative_at() and
+forecast_stockouts() start from the nearest snapshot batch and only read the
+ledger rows after it, so their cost doesn't grow with the ledger.
+A snapshot only folds in ledger rows older than INVENTORY_SNAPSHOT_LAG_SECONDS:
+ids are assigned at INSERT, so a row from a transaction still open when the
+snapshot is taken can commit later with an id below the newest one, and a
+watermark on the newest id would skip it forever.
+"""
+import csv
+import io
+import math
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Min, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import FabricColor, InventorySnapshot, InventoryTransaction
+
+# Ledger types counted as consumption (orders, net of cancellations); the rest are restocks/adjustments
+CONSUMPTION_TYPES = ('ORDER', 'CANCEL')
+# Above this many colors per ledger-tail query, filter by id range only (keeps under SQLite's parameter limit)
+MAX_IN_FILTER = 500
+
+CSV_COLUMNS = ('fabric_color_id', 'quantity')
+
+
+def _parse_update(raw):
+    """(fabric_color_id, quantity, notes) from a payload/CSV row, or raise ValueError"""
+    fabric_color_id = raw.get('fabric_color_id')
+    quantity = raw.get('quantity')
+    if fabric_color_id in (None, '') or quantity in (None, ''):
+        raise ValueError('Missing fabric_color_id or quantity')
+    try:
+        fabric_color_id = int(fabric_color_id)
+        quantity = int(quantity)
+    except (TypeError, ValueError):
+        raise ValueError('fabric_color_id and quantity must be integers')
+    return fabric_color_id, quantity, (raw.get('notes') or '').strip()
+
+
+def apply_inventory_updates(rows, user=None, default_notes='Bulk update by admin'):
+    """
+    Apply one chunk of updates in a single transaction.
+    If a fabric color appears more than once in the chunk, the last row wins.
+    Returns (updated, errors): per-color results and per-row errors.
+    """
+    errors = []
+    wanted = {}
+    for raw in rows:
+        try:
+            fabric_color_id, quantity, notes = _parse_update(raw)
+        except ValueError as e:
+            errors.append({**_row_ref(raw), 'error': str(e)})
+            continue
+        wanted[fabric_color_id] = (quantity, notes)
+
+    if not wanted:
+        return [], errors
+
+    updated, changed, ledger = [], [], []
+    with transaction.atomic():
+        colors = FabricColor.objects.select_for_update().order_by('id').in_bulk(list(wanted))
+
+        for fabric_color_id, (quantity, notes) in wanted.items():
+            fabric_color = colors.get(fabric_color_id)
+            if fabric_color is None:
+                errors.append({'fabric_color_id': fabric_color_id, 'error': 'Fabric color not found'})
+                continue
+
+            quantity_before = fabric_color.quantity
+            quantity_change = quantity - quantity_before
+            in_stock = quantity > 0
+
+            if quantity_change or fabric_color.inStock != in_stock:
+                fabric_color.quantity = quantity
+                fabric_color.inStock = in_stock
+                changed.append(fabric_color)
+            if quantity_change:
+                ledger.append(InventoryTransaction(
+                    fabric_color=fabric_color,
+                    transaction_type='RESTOCK' if quantity_change > 0 else 'ADJUSTMENT',
+                    quantity_change=quantity_change,
+                    quantity_before=quantity_before,
+                    quantity_after=quantity,
+                    notes=notes or default_notes,
+                    created_by=user
+                ))
+
+            updated.append({
+                'id': fabric_color.id,
+                'name': fabric_color.color_name_eng,
+                'quantity_before': quantity_before,
+                'quantity_after': quantity,
+                'change': quantity_change
+            })
+
+        if changed:
+            FabricColor.objects.bulk_update(changed, ['quantity', 'inStock'])
+        if ledger:
+            InventoryTransaction.objects.bulk_create(ledger)
+
+    return updated, errors
+
+
+def _row_ref(raw):
+    ref = {'fabric_color_id': raw.get('fabric_color_id')}
+    if 'row' in raw:
+        ref['row'] = raw['row']
+    return ref
+
+
+def chunked(rows, size=None):
+    size = size or settings.INVENTORY_BULK_CHUNK_SIZE
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_csv_updates(uploaded_file, size=None):
+    """
+    Stream an uploaded CSV (header: fabric_color_id,quantity[,notes]) as chunks of
+    row dicts. Each row carries its 1-based line number under 'row' for errors.
+    Raises ValueError if the header is missing a required column.
+    """
+    text = io.TextIOWrapper(uploaded_file.file, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text)
+    header = [name.strip() for name in (reader.fieldnames or [])]
+    missing = [column for column in CSV_COLUMNS if column not in header]
+    if missing:
+        raise ValueError(f"CSV is missing column(s): {', '.join(missing)}")
+    reader.fieldnames = header
+
+    rows = ({**row, 'row': reader.line_num} for row in reader)
+    yield from chunked(rows, size)
+
+
+# ================== SNAPSHOTS ==================
+def _snapshot_batch(at=None):
+    """{color_id: snapshot} from the latest snapshot batch taken at or before `at`"""
+    batches = InventorySnapshot.objects.all()
+    if at is not None:
+        batches = batches.filter(taken_at__lte=at)
+    taken_at = batches.aggregate(latest=Max('taken_at'))['latest']
+    if taken_at is None:
+        return {}
+    return {snapshot.fabric_color_id: snapshot for snapshot in InventorySnapshot.objects.filter(taken_at=taken_at)}
+
+
+def _by_cutoff(color_ids, snapshots):
+    """Group colors by the ledger id their snapshot already covers (0 = no snapshot)"""
+    groups = defaultdict(list)
+    for color_id in color_ids:
+        snapshot = snapshots.get(color_id)
+        groups[snapshot.last_transaction_id if snapshot else 0].append(color_id)
+    return groups
+
+
+def _ledger_tail(cutoff, color_ids, **filters):
+    """Ledger rows after `cutoff` for the given colors"""
+    tail = InventoryTransaction.objects.filter(id__gt=cutoff, **filters).order_by()
+    if len(color_ids) <= MAX_IN_FILTER:
+        tail = tail.filter(fabric_color_id__in=color_ids)
+    return tail
+
+
+def _tail_totals(cutoff, color_ids, **filters):
+    """{color_id: (consumed, restocked, last_id)} over the ledger tail after `cutoff`"""
+    consumption = Q(transaction_type__in=CONSUMPTION_TYPES)
+    rows = _ledger_tail(cutoff, color_ids, **filters).values('fabric_color_id').annotate(
+        consumed=Coalesce(Sum('quantity_change', filter=consumption), 0),
+        restocked=Coalesce(Sum('quantity_change', filter=~consumption), 0),
+        last_id=Max('id'),
+    )
+    wanted = set(color_ids)
+    return {
+        row['fabric_color_id']: (-row['consumed'], row['restocked'], row['last_id'])
+        for row in rows if row['fabric_color_id'] in wanted
+    }
+
+
+def take_inventory_snapshot(now=None):
+    """
+    Snapshot every fabric color: current quantity plus running totals folded
+    forward from the previous snapshot over the new ledger rows.
+    The watermark is the newest ledger id older than the safety lag; later rows
+    stay in the tail that readers add on top of the snapshot.
+    Also drops snapshots older than INVENTORY_SNAPSHOT_RETENTION_DAYS.
+    Returns the number of snapshots written.
+    """
+    now = now or timezone.now()
+    settled_before = now - timedelta(seconds=settings.INVENTORY_SNAPSHOT_LAG_SECONDS)
+    with transaction.atomic():
+        quantities = dict(FabricColor.objects.values_list('id', 'quantity'))
+        previous = _snapshot_batch()
+        # Walks the primary key backwards from the newest row: only the lag window is read
+        max_id = max(
+            InventoryTransaction.objects.filter(timestamp__lte=settled_before)
+            .order_by('-id').values_list('id', flat=True).first() or 0,
+            max((snapshot.last_transaction_id for snapshot in previous.values()), default=0),
+        )
+
+        snapshots = []
+        for cutoff, color_ids in _by_cutoff(quantities, previous).items():
+            tails = _tail_totals(cutoff, color_ids, id__lte=max_id)
+            for color_id in color_ids:
+                base = previous.get(color_id)
+                consumed, restocked, _ = tails.get(color_id, (0, 0, None))
+                snapshots.append(InventorySnapshot(
+                    fabric_color_id=color_id,
+                    taken_at=now,
+                    quantity=quantities[color_id],
+                    consumed_total=(base.consumed_total if base else 0) + consumed,
+                    restocked_total=(base.restocked_total if base else 0) + restocked,
+                    last_transaction_id=max_id,
+                ))
+        InventorySnapshot.objects.bulk_create(snapshots, batch_size=1000)
+
+    retention_cutoff = now - timedelta(days=settings.INVENTORY_SNAPSHOT_RETENTION_DAYS)
+    InventorySnapshot.objects.filter(taken_at__lt=retention_cutoff).delete()
+    return len(snapshots)
+
+
+def _color_ids(color_ids):
+    if color_ids is None:
+        return list(FabricColor.objects.values_list('id', flat=True))
+    return list(color_ids)
+
+
+def cumulative_at(at, color_ids=None):
+    """{color_id: (consumed_total, restocked_total)} as of `at`"""
+    color_ids = _color_ids(color_ids)
+    snapshots = _snapshot_batch(at)
+
+    totals = {}
+    for cutoff, group in _by_cutoff(color_ids, snapshots).items():
+        tails = _tail_totals(cutoff, group, timestamp__lte=at)
+        for color_id in group:
+            base = snapshots.get(color_id)
+            consumed, restocked, _ = tails.get(color_id, (0, 0, None))
+            totals[color_id] = (
+                (base.consumed_total if base else 0) + consumed,
+                (base.restocked_total if base else 0) + restocked,
+            )
+    return totals
+
+
+def consumption_between(start, end, color_ids=None):
+    """{color_id: units consumed by orders (net of cancellations) between start and end}"""
+    color_ids = _color_ids(color_ids)
+    before = cumulative_at(start, color_ids)
+    after = cumulative_at(end, color_ids)
+    return {color_id: after[color_id][0] - before[color_id][0] for color_id in color_ids}
+
+
+def stock_at(at, color_ids=None):
+    """{color_id: quantity in stock at `at`}"""
+    color_ids = _color_ids(color_ids)
+    snapshots = _snapshot_batch(at)
+
+    # Latest ledger entry per color between its snapshot and `at`
+    last_ids = {}
+    for cutoff, group in _by_cutoff(color_ids, snapshots).items():
+        wanted = set(group)
+        for row in _ledger_tail(cutoff, group, timestamp__lte=at).values('fabric_color_id').annotate(last=Max('id')):
+            if row['fabric_color_id'] in wanted:
+                last_ids[row['fabric_color_id']] = row['last']
+    quantity_after = {
+        entry.fabric_color_id: entry.quantity_after
+        for entry in InventoryTransaction.objects.only('fabric_color_id', 'quantity_after').in_bulk(last_ids.values()).values()
+    }
+
+    stock = {}
+    unknown = []
+    for color_id in color_ids:
+        if color_id in quantity_after:
+            stock[color_id] = quantity_after[color_id]
+        elif color_id in snapshots:
+            stock[color_id] = snapshots[color_id].quantity
+        else:
+            unknown.append(color_id)
+
+    if unknown:
+        # No snapshot or ledger entry before `at`: the first later entry's starting quantity,
+        # or the current quantity if the color has never moved since
+        first_ids = (
+            _ledger_tail(0, unknown, timestamp__gt=at)
+            .values('fabric_color_id').annotate(first=Min('id')).values_list('first', flat=True)
+        )
+        first_ids = list(first_ids)
+        quantity_before = {
+            entry.fabric_color_id: entry.quantity_before
+            for entry in InventoryTransaction.objects.only('fabric_color_id', 'quantity_before').in_bulk(first_ids).values()
+        }
+        current = {color.id: color.quantity for color in FabricColor.objects.only('quantity').in_bulk(unknown).values()}
+        for color_id in unknown:
+            stock[color_id] = quantity_before.get(color_id, current.get(color_id, 0))
+    return stock
+
+
+def parse_report_time(value):
+    """'2025-01-31' (end of that day) or an ISO datetime -> aware datetime; raises ValueError"""
+    day = parse_date(value)
+    moment = datetime.combine(day, time.max) if day else parse_datetime(value)
+    if moment is None:
+        raise ValueError(f"Invalid date: {value}")
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+# ================== FORECAST ==================
+def forecast_stockouts(lookback_days=None, horizon_days=None, threshold=None, now=None):
+    """
+    Fabric colors at risk of running out: daily order velocity over the last
+    `lookback_days`, days of stock left at that rate, and how much to reorder
+    to cover `horizon_days`. Returns colors that are at or below `threshold` or
+    projected to run out within the horizon, soonest first.
+    """
+    lookback_days = lookback_days or settings.INVENTORY_FORECAST_LOOKBACK_DAYS
+    horizon_days = horizon_days or settings.INVENTORY_FORECAST_HORIZON_DAYS
+    threshold = threshold if threshold is not None else 0
+    now = now or timezone.now()
+
+    colors = list(FabricColor.objects.select_related('fabric_type').only(
+        'id', 'color_name_eng', 'quantity', 'inStock', 'fabric_type__fabric_name_eng'
+    ))
+    consumed = consumption_between(now - timedelta(days=lookback_days), now, [color.id for color in colors])
+
+    forecast = []
+    for color in colors:
+        velocity = max(consumed.get(color.id, 0), 0) / lookback_days
+        days_left = round(color.quantity / velocity, 1) if velocity > 0 else None
+        at_risk = days_left is not None and days_left <= horizon_days
+        if not at_risk and color.quantity > threshold:
+            continue
+        forecast.append({
+            'id': color.id,
+            'fabric_type_name': color.fabric_type.fabric_name_eng,
+            'color_name': color.color_name_eng,
+            'current_quantity': color.quantity,
+            'inStock': color.inStock,
+            'consumed': consumed.get(color.id, 0),
+            'daily_velocity': round(velocity, 2),
+            'days_until_stockout': days_left,
+            'projected_stockout': (now + timedelta(days=days_left)).date() if days_left is not None else None,
+            'reorder_quantity': max(math.ceil(velocity * horizon_days) - color.quantity, 0),
+        })
+
+    forecast.sort(key=lambda row: (
+        row['days_until_stockout'] is None,
+        row['days_until_stockout'] or 0,
+        row['current_quantity'],
+    ))
+    return forecast
@@ -0,0 +1,93 @@
+"""
+Management command to benchmark image URL serialization per row
+
+Serializes in-memory DefaultMeasurement rows (16 Cloudinary images each, no
+database access) with the previous one-SerializerMethodField-per-image
+serializer and with the current CloudinaryURLMixin serializer.
+
+Usage:
+    python manage.py benchmark_image_serializers
+    python manage.py benchmark_image_serializers --rows 2000 --repeat 5
+"""
+import time
+
+from cloudinary import CloudinaryResource
+from django.core.management.base import BaseCommand
+from rest_framework import serializers
+
+from Design.serializer_fields import _build_url, _build_url_from_public_id, cloudinary_field_names
+from Sizes.models import DefaultMeasurement
+from Sizes.serializers import DefaultMeasurementSerializer
+
+
+def _legacy_getter(name):
+    def getter(self, obj):
+        value = getattr(obj, name)
+        return value.url if value else None
+    return getter
+
+
+class LegacyDefaultMeasurementSerializer(serializers.ModelSerializer):
+    """The previous serializer: one SerializerMethodField + .url call per image"""
+
+    class Meta:
+        model = DefaultMeasurement
+        fields = "__all__"
+
+
+for _name in sorted(cloudinary_field_names(DefaultMeasurement)):
+    LegacyDefaultMeasurementSerializer._declared_fields[_name] = serializers.SerializerMethodField()
+    setattr(LegacyDefaultMeasurementSerializer, f'get_{_name}', _legacy_getter(_name))
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-row serialization cost of Cloudinary image fields (before/after)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Rows to serialize (default: 1000)')
+        parser.add_argument('--distinct-images', type=int, default=64,
+                            help='Distinct instruction images shared by the rows (default: 64)')
+        parser.add_argument('--repeat', type=int, default=3, help='Timed runs per serializer (default: 3)')
+
+    def handle(self, *args, **options):
+        rows = self._build_rows(options['rows'], options['distinct_images'])
+
+        # Same output, apart from key order
+        assert LegacyDefaultMeasurementSerializer(rows[:5], many=True).data == \
+            DefaultMeasurementSerializer(rows[:5], many=True).data
+
+        legacy = self._measure(LegacyDefaultMeasurementSerializer, rows, options['repeat'])
+        self.stdout.write(f"⏱️ SerializerMethodField + .url (previous): {legacy:.1f} µs/row")
+
+        _build_url.cache_clear()
+        _build_url_from_public_id.cache_clear()
+        cold = self._measure(DefaultMeasurementSerializer, rows, 1)
+        warm = self._measure(DefaultMeasurementSerializer, rows, options['repeat'])
+        self.stdout.write(f"⏱️ CloudinaryURLMixin, cold URL cache: {cold:.1f} µs/row")
+        self.stdout.write(f"⏱️ CloudinaryURLMixin, warm URL cache: {warm:.1f} µs/row")
+        self.stdout.write(self.style.SUCCESS(f"✅ {legacy / warm:.1f}x faster per row (warm)"))
+
+    def _build_rows(self, count, distinct_images):
+        image_fields = sorted(cloudinary_field_names(DefaultMeasurement))
+        rows = []
+        for i in range(count):
+            row = DefaultMeasurement(id=i + 1, size_name=f"size-{i}")
+            for j, name in enumerate(image_fields):
+                setattr(row, name, CloudinaryResource(
+                    public_id=f"Measurements/Instructions/{(i + j) % distinct_images}",
+                    format='jpg',
+                    version='1700000000',
+                    type='upload',
+                    resource_type='image',
+                ))
+            rows.append(row)
+        return rows
+
+    def _measure(self, serializer_class, rows, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            serializer_class(rows, many=True).data
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best / len(rows) * 1_000_000
@@ -0,0 +1,55 @@
+"""
+Management command to (re)generate thumbnail variants and blurhash placeholders
+for catalog images that were uploaded before variant generation existed
+
+Usage:
+    python manage.py generate_image_variants
+    python manage.py generate_image_variants --model FabricType --force
+
+Images whose background job is still pending (e.g. lost on a restart) or
+failed are retried on every run.
+"""
+
+from django.core.management.base import BaseCommand
+from Design.cache_invalidation import batched_invalidation
+from Design.signals import CATALOG_IMAGE_FIELDS
+from Design.image_processing import schedule_image_variants
+
+
+class Command(BaseCommand):
+    help = 'Generate WebP/JPEG size variants and blurhash placeholders for catalog images'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            type=str,
+            help='Only process one model (e.g. FabricType, GholaType)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate variants even if they are up to date',
+        )
+
+    def handle(self, *args, **options):
+        # Invalidate the cached catalog once at the end, not once per image
+        with batched_invalidation():
+            total = self.generate(options)
+        self.stdout.write(self.style.SUCCESS(f'\n✅ Generated variants for {total} images'))
+
+    def generate(self, options):
+        total = 0
+
+        for model, field_names in CATALOG_IMAGE_FIELDS.items():
+            if options['model'] and model.__name__ != options['model']:
+                continue
+
+            processed = 0
+            for instance in model.objects.only('id', 'image_variants', *field_names).iterator(chunk_size=200):
+                processed += schedule_image_variants(
+                    instance, field_names, force=options['force'], retry=True, synchronous=True
+                )
+
+            self.stdout.write(f'🖼️  {model.__name__}: processed {processed} images')
+            total += processed
+        return total
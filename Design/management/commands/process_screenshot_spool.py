@@ -0,0 +1,30 @@
+"""
+Management command to retry design screenshot uploads stuck in the local spool
+(e.g. after a worker restart or a Cloudinary outage)
+
+Usage:
+    python manage.py process_screenshot_spool
+    python manage.py process_screenshot_spool --older-than 0
+"""
+
+from django.core.management.base import BaseCommand
+from Design.screenshot_pipeline import resume_pending_uploads
+
+
+class Command(BaseCommand):
+    help = 'Upload design screenshots that are still pending or failed in the local spool'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            default=5,
+            help='Only retry screenshots created at least this many minutes ago (default: 5)',
+        )
+
+    def handle(self, *args, **options):
+        resumed = resume_pending_uploads(
+            older_than_minutes=options['older_than'],
+            synchronous=True
+        )
+        self.stdout.write(self.style.SUCCESS(f'✅ Processed {resumed} spooled screenshots'))
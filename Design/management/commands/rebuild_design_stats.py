@@ -0,0 +1,20 @@
+"""
+Management command to recompute design configuration stats
+
+Normally run nightly by the scheduler (start_scheduler); the stats are kept
+current between runs by UserDesign/order item signals.
+
+Usage:
+    python manage.py rebuild_design_stats
+"""
+
+from django.core.management.base import BaseCommand
+from Design.design_stats import rebuild_configuration_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute DesignConfigurationStats from UserDesign rows and order items'
+
+    def handle(self, *args, **options):
+        count = rebuild_configuration_stats()
+        self.stdout.write(self.style.SUCCESS(f"✅ Rebuilt stats for {count} design configurations"))
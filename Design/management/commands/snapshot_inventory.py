@@ -0,0 +1,20 @@
+"""
+Management command to snapshot fabric color stock levels
+
+Normally run daily by the scheduler (start_scheduler). Run it once after
+deploying to seed the first snapshot batch.
+
+Usage:
+    python manage.py snapshot_inventory
+"""
+
+from django.core.management.base import BaseCommand
+from Design.inventory import take_inventory_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Snapshot stock levels and consumption totals for every fabric color'
+
+    def handle(self, *args, **options):
+        count = take_inventory_snapshot()
+        self.stdout.write(self.style.SUCCESS(f"✅ Took inventory snapshots for {count} fabric colors"))
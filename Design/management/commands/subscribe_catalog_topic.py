@@ -0,0 +1,27 @@
+"""
+Management command to subscribe already registered FCM tokens to the catalog
+update topic (new tokens are subscribed by UpdateFCMTokenAPIView)
+
+Usage:
+    python manage.py subscribe_catalog_topic
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from Design.fabric_notifications import subscribe_tokens_to_catalog_topic
+from User.models import DeviceToken
+
+
+class Command(BaseCommand):
+    help = 'Subscribe all active device tokens to the catalog update topic'
+
+    def handle(self, *args, **options):
+        tokens = (
+            DeviceToken.objects.filter(is_active=True)
+            .values_list('token', flat=True)
+            .iterator(chunk_size=1000)
+        )
+        success, failure = subscribe_tokens_to_catalog_topic(tokens)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Subscribed {success} tokens to '{settings.FCM_CATALOG_TOPIC}' ({failure} failed)"
+        ))
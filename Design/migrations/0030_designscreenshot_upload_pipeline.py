@@ -0,0 +1,28 @@
+# Generated by Django 5.1.4 on 2026-10-19 00:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Design', '0029_alter_fabriccolor_fabric_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='designscreenshot',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='SHA-256 of the image bytes, used to dedup identical images across configurations', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='designscreenshot',
+            name='upload_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('uploaded', 'Uploaded'), ('failed', 'Failed')], db_index=True, default='uploaded', help_text='Background upload state', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='designscreenshot',
+            name='screenshot_url',
+            field=models.URLField(blank=True, help_text='Cloudinary URL of the design screenshot (empty while upload is pending)', max_length=500),
+        ),
+    ]
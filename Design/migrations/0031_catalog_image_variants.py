@@ -0,0 +1,53 @@
+# Generated by Django 5.1.4 on 2026-10-19 00:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Design', '0030_designscreenshot_upload_pipeline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bodytype',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Generated thumbnail/size variants and blurhash per image field'),
+        ),
+        migrations.AddField(
+            model_name='buttontype',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Generated thumbnail/size variants and blurhash per image field'),
+        ),
+        migrations.AddField(
+            model_name='fabriccolor',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Generated thumbnail/size variants and blurhash per image field'),
+        ),
+        migrations.AddField(
+            model_name='fabrictype',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Generated thumbnail/size variants and blurhash per image field'),
+        ),
+        migrations.AddField(
+            model_name='gholatype',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Generated thumbnail/size variants and blurhash per image field'),
+        ),
+        migrations.AddField(
+            model_name='homepageselectioncategory',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Generated thumbnail/size variants and blurhash per image field'),
+        ),
+        migrations.AddField(
+            model_name='pockettype',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Generated thumbnail/size variants and blurhash per image field'),
+        ),
+        migrations.AddField(
+            model_name='sleevestype',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Generated thumbnail/size variants and blurhash per image field'),
+        ),
+    ]
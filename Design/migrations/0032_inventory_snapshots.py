@@ -0,0 +1,45 @@
+# Generated by Django 5.1.4 on 2026-10-19 00:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Design', '0031_catalog_image_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventorySnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('taken_at', models.DateTimeField(db_index=True)),
+                ('quantity', models.IntegerField(help_text='FabricColor.quantity when the snapshot was taken')),
+                ('consumed_total', models.IntegerField(default=0, help_text='Units consumed by orders (net of cancellations) since tracking began')),
+                ('restocked_total', models.IntegerField(default=0, help_text='Net units added by restocks and manual adjustments since tracking began')),
+                ('last_transaction_id', models.BigIntegerField(default=0, help_text='Highest InventoryTransaction id included in the totals')),
+            ],
+            options={
+                'verbose_name': 'Inventory Snapshot',
+                'verbose_name_plural': 'Inventory Snapshots',
+                'ordering': ['-taken_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='inventorytransaction',
+            index=models.Index(fields=['fabric_color', 'timestamp'], name='design_invtx_color_time_idx'),
+        ),
+        migrations.AddField(
+            model_name='inventorysnapshot',
+            name='fabric_color',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inventory_snapshots', to='Design.fabriccolor'),
+        ),
+        migrations.AddIndex(
+            model_name='inventorysnapshot',
+            index=models.Index(fields=['fabric_color', 'taken_at'], name='design_invsnap_color_time_idx'),
+        ),
+    ]
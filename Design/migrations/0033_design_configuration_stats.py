@@ -0,0 +1,152 @@
+# Generated by Django 5.1.4 on 2026-10-19 01:03
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Sum
+
+# Frozen copy of design_stats' attribution at the time of this migration: a
+# migration must not import application code that follows the live models
+ID_FIELDS = (
+    'initial_size_selected_id', 'main_body_fabric_color_id', 'selected_coller_type_id',
+    'selected_sleeve_left_type_id', 'selected_sleeve_right_type_id', 'selected_pocket_type_id',
+    'selected_button_type_id', 'selected_body_type_id',
+)
+
+
+def _as_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _details_components(details):
+    """ID_FIELDS[1:] values from an order item's design_details, or None without a fabric color"""
+    if not details or not _as_id(details.get('design_color_id')):
+        return None
+    found = {}
+    for key, value in details.items():
+        key = key.lower()
+        if 'id' not in key or not value or 'design_color' in key:
+            continue
+        if 'collar' in key or 'coller' in key:
+            found['collar'] = value
+        elif 'sleeve' in key:
+            found.setdefault('sleeves', []).append(value)
+        elif 'pocket' in key:
+            found['pocket'] = value
+        elif 'button' in key:
+            found['button'] = value
+        elif 'body' in key:
+            found['body'] = value
+    sleeves = found.get('sleeves') or [None]
+    return (
+        _as_id(details['design_color_id']), _as_id(found.get('collar')), _as_id(sleeves[0]), _as_id(sleeves[-1]),
+        _as_id(found.get('pocket')), _as_id(found.get('button')), _as_id(found.get('body')),
+    )
+
+
+def backfill_configuration_stats(apps, schema_editor):
+    """One row per distinct design configuration (same totals as design_stats.rebuild_configuration_stats)"""
+    UserDesign = apps.get_model('Design', 'UserDesign')
+    Item = apps.get_model('Purchase', 'Item')
+    DesignConfigurationStats = apps.get_model('Design', 'DesignConfigurationStats')
+
+    rows = {}
+
+    def row(ids):
+        key = ':'.join('' if value is None else str(value) for value in ids)
+        if key not in rows:
+            rows[key] = DesignConfigurationStats(
+                config_key=key, design_value=Decimal('0'), revenue=Decimal('0'), **dict(zip(ID_FIELDS, ids))
+            )
+        return rows[key]
+
+    def count_order(stats, orders, revenue, last_ordered):
+        stats.order_count += orders
+        stats.revenue += revenue or 0
+        if last_ordered and (stats.last_used_at is None or last_ordered > stats.last_used_at):
+            stats.last_used_at = last_ordered
+
+    designs = (
+        UserDesign.objects.values(*ID_FIELDS)
+        .annotate(designs=Count('id'), value=Sum('design_Total'), last_used=Max('timestamp'))
+        .order_by()
+    )
+    for values in designs:
+        stats = row(tuple(values[field] for field in ID_FIELDS))
+        stats.design_count = values['designs']
+        stats.design_value = values['value'] or 0
+        stats.last_used_at = values['last_used']
+
+    item_fields = tuple(f'user_design__{field}' for field in ID_FIELDS)
+    items = (
+        Item.objects.filter(user_design__isnull=False).values(*item_fields)
+        .annotate(orders=Count('id'), revenue=Sum('net_amount'), last_ordered=Max('created_date'))
+        .order_by()
+    )
+    for values in items:
+        stats = row(tuple(values[field] for field in item_fields))
+        count_order(stats, values['orders'], values['revenue'], values['last_ordered'])
+
+    # Items ordered from the cart JSON: sized by the buyer's latest saved design with those components
+    detail_items = []
+    for user_id, details, net_amount, created_date in (
+        Item.objects.filter(user_design__isnull=True, design_details__isnull=False)
+        .values_list('invoice__user_id', 'design_details', 'net_amount', 'created_date')
+        .iterator(chunk_size=2000)
+    ):
+        components = _details_components(details)
+        if components is not None:
+            detail_items.append((user_id, components, net_amount, created_date))
+
+    saved_sizes = {}
+    buyer_ids = {user_id for user_id, *_ in detail_items if user_id}
+    if buyer_ids:
+        for user_id, *ids in (
+            UserDesign.objects.filter(user_id__in=buyer_ids).order_by('id').values_list('user_id', *ID_FIELDS)
+        ):
+            saved_sizes[(user_id, tuple(ids[1:]))] = ids[0]
+    for user_id, components, net_amount, created_date in detail_items:
+        count_order(row((saved_sizes.get((user_id, components)),) + components), 1, net_amount, created_date)
+
+    DesignConfigurationStats.objects.bulk_create(rows.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Design', '0032_inventory_snapshots'),
+        ('Purchase', '0026_alter_item_selected_size'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DesignConfigurationStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('config_key', models.CharField(help_text="Canonical 'id:id:...' form of the component ids", max_length=200, unique=True)),
+                ('initial_size_selected_id', models.BigIntegerField(blank=True, null=True)),
+                ('main_body_fabric_color_id', models.BigIntegerField(blank=True, null=True)),
+                ('selected_coller_type_id', models.BigIntegerField(blank=True, null=True)),
+                ('selected_sleeve_left_type_id', models.BigIntegerField(blank=True, null=True)),
+                ('selected_sleeve_right_type_id', models.BigIntegerField(blank=True, null=True)),
+                ('selected_pocket_type_id', models.BigIntegerField(blank=True, null=True)),
+                ('selected_button_type_id', models.BigIntegerField(blank=True, null=True)),
+                ('selected_body_type_id', models.BigIntegerField(blank=True, null=True)),
+                ('design_count', models.IntegerField(default=0, help_text='UserDesign rows with this configuration')),
+                ('design_value', models.DecimalField(decimal_places=3, default=0.0, help_text='Sum of design_Total', max_digits=12)),
+                ('order_count', models.IntegerField(default=0, help_text='Order items linked to designs with this configuration')),
+                ('revenue', models.DecimalField(decimal_places=3, default=0.0, help_text='Sum of order item net_amount', max_digits=12)),
+                ('last_used_at', models.DateTimeField(blank=True, help_text='Last design saved or ordered', null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Design Configuration Stats',
+                'verbose_name_plural': 'Design Configuration Stats',
+                'ordering': ['-design_count'],
+            },
+        ),
+        migrations.RunPython(backfill_configuration_stats, migrations.RunPython.noop),
+    ]
@@ -11,6 +11,7 @@ class HomePageSelectionCategory(models.Model):
     duration_delivery_period = models.CharField(max_length=80, default="")
     initial_price = models.DecimalField(max_digits=9, decimal_places=3)
     cover = CloudinaryField('image', blank=True, null=True, folder="MainCat")
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Generated thumbnail/size variants and blurhash per image field")
     review_rate = models.IntegerField(default=5, help_text="Rating from 1 to 5")
     review_count = models.IntegerField(default=0, help_text="Total number of reviews")
     isHidden = models.BooleanField(default=False)
@@ -53,6 +54,7 @@ class FabricType(models.Model):
     fabric_name_arb = models.CharField(max_length=300)
     base_price = models.DecimalField(max_digits=9, decimal_places=3)
     cover = CloudinaryField('image', blank=True, null=True, folder="FabricType")
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Generated thumbnail/size variants and blurhash per image field")
     isHidden = models.BooleanField(default=False)
     priority = models.IntegerField(default=0, help_text="Lower value = higher priority (appears first)")
     timestamp = models.DateTimeField(auto_now_add=True)
@@ -86,6 +88,7 @@ class FabricColor(models.Model):
     color_name_arb = models.CharField(max_length=100)
     hex_color = models.CharField(max_length=7, default='#FFFFFF', help_text="Hex color code (e.g., #FFFFFF)")
     cover = CloudinaryField('image', blank=True, null=True, folder="FabricColors")
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Generated thumbnail/size variants and blurhash per image field")
     quantity = models.IntegerField(default=0)
     inStock = models.BooleanField(default=True)
     price_adjustment = models.DecimalField(
@@ -130,6 +133,7 @@ class GholaType(models.Model):
     initial_price = models.DecimalField(max_digits=9, decimal_places=3)
     cover = CloudinaryField('image', blank=True, null=True, folder="GholaType", help_text="Image shown on dishdasha preview")
     cover_option = CloudinaryField('image', blank=True, null=True, folder="GholaType/Options", help_text="Image shown in selection cards/options")
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Generated thumbnail/size variants and blurhash per image field")
     is_button_hidden = models.BooleanField(default=False, help_text="If True, button will be rendered below collar (hidden)")
 
     def __str__(self):
@@ -160,6 +164,7 @@ class SleevesType(models.Model):
     initial_price = models.DecimalField(max_digits=9, decimal_places=3)
     cover = CloudinaryField('image', blank=True, null=True, folder="SleevesType", help_text="Image shown on dishdasha preview")
     cover_option = CloudinaryField('image', blank=True, null=True, folder="SleevesType/Options", help_text="Image shown in selection cards/options")
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Generated thumbnail/size variants and blurhash per image field")
 
     def __str__(self):
         color_name = self.fabric_color.color_name_eng if self.fabric_color else "No Color"
@@ -187,6 +192,7 @@ class PocketType(models.Model):
     initial_price = models.DecimalField(max_digits=9, decimal_places=3)
     cover = CloudinaryField('image', blank=True, null=True, folder="PocketType", help_text="Image shown on dishdasha preview")
     cover_option = CloudinaryField('image', blank=True, null=True, folder="PocketType/Options", help_text="Image shown in selection cards/options")
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Generated thumbnail/size variants and blurhash per image field")
 
     def __str__(self):
         color_name = self.fabric_color.color_name_eng if self.fabric_color else "No Color"
@@ -215,6 +221,7 @@ class ButtonType(models.Model):
     initial_price = models.DecimalField(max_digits=9, decimal_places=3)
     cover = CloudinaryField('image', blank=True, null=True, folder="ButtonType", help_text="Image shown on dishdasha preview")
     cover_option = CloudinaryField('image', blank=True, null=True, folder="ButtonType/Options", help_text="Image shown in selection cards/options")
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Generated thumbnail/size variants and blurhash per image field")
 
     def __str__(self):
         color_name = self.fabric_color.color_name_eng if self.fabric_color else "No Color"
@@ -243,6 +250,7 @@ class BodyType(models.Model):
     initial_price = models.DecimalField(max_digits=9, decimal_places=3)
     cover = CloudinaryField('image', blank=True, null=True, folder="BodyType", help_text="Image shown on dishdasha preview")
     cover_option = CloudinaryField('image', blank=True, null=True, folder="BodyType/Options", help_text="Image shown in selection cards/options")
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, help_text="Generated thumbnail/size variants and blurhash per image field")
 
     def __str__(self):
         color_name = self.fabric_color.color_name_eng if self.fabric_color else "No Color"
@@ -317,6 +325,82 @@ class InventoryTransaction(models.Model):
         ordering = ['-timestamp']
         verbose_name = "Inventory Transaction"
         verbose_name_plural = "Inventory Transactions"
+        indexes = [
+            # "Latest ledger entry for a color up to time X" (stock-at-date queries)
+            models.Index(fields=['fabric_color', 'timestamp'], name='design_invtx_color_time_idx'),
+        ]
+
+
+class InventorySnapshot(models.Model):
+    """
+    Periodic per-fabric-color stock snapshot (see Design/inventory.py).
+    Stock and cumulative consumption at any date = nearest snapshot + the short
+    ledger tail after `last_transaction_id`, instead of a scan of the full ledger.
+    """
+    fabric_color = models.ForeignKey(
+        FabricColor,
+        on_delete=models.CASCADE,
+        related_name='inventory_snapshots'
+    )
+    taken_at = models.DateTimeField(db_index=True)
+    quantity = models.IntegerField(help_text="FabricColor.quantity when the snapshot was taken")
+    consumed_total = models.IntegerField(
+        default=0,
+        help_text="Units consumed by orders (net of cancellations) since tracking began"
+    )
+    restocked_total = models.IntegerField(
+        default=0,
+        help_text="Net units added by restocks and manual adjustments since tracking began"
+    )
+    last_transaction_id = models.BigIntegerField(
+        default=0,
+        help_text="Highest InventoryTransaction id included in the totals"
+    )
+
+    def __str__(self):
+        return f"{self.fabric_color.color_name_eng} - {self.quantity} @ {self.taken_at}"
+
+    class Meta:
+        ordering = ['-taken_at']
+        verbose_name = "Inventory Snapshot"
+        verbose_name_plural = "Inventory Snapshots"
+        indexes = [
+            models.Index(fields=['fabric_color', 'taken_at'], name='design_invsnap_color_time_idx'),
+        ]
+
+
+#======================= DESIGN CONFIGURATION STATS ========================
+class DesignConfigurationStats(models.Model):
+    """
+    Precomputed usage of one design configuration - the 8 component FKs of
+    UserDesign, ignoring user, name and price (see Design/design_stats.py).
+    Component ids are plain integers so deleting a component doesn't merge rows.
+    """
+    config_key = models.CharField(max_length=200, unique=True, help_text="Canonical 'id:id:...' form of the component ids")
+
+    initial_size_selected_id = models.BigIntegerField(null=True, blank=True)
+    main_body_fabric_color_id = models.BigIntegerField(null=True, blank=True)
+    selected_coller_type_id = models.BigIntegerField(null=True, blank=True)
+    selected_sleeve_left_type_id = models.BigIntegerField(null=True, blank=True)
+    selected_sleeve_right_type_id = models.BigIntegerField(null=True, blank=True)
+    selected_pocket_type_id = models.BigIntegerField(null=True, blank=True)
+    selected_button_type_id = models.BigIntegerField(null=True, blank=True)
+    selected_body_type_id = models.BigIntegerField(null=True, blank=True)
+
+    design_count = models.IntegerField(default=0, help_text="UserDesign rows with this configuration")
+    design_value = models.DecimalField(max_digits=12, decimal_places=3, default=0.000, help_text="Sum of design_Total")
+    order_count = models.IntegerField(default=0, help_text="Order items linked to designs with this configuration")
+    revenue = models.DecimalField(max_digits=12, decimal_places=3, default=0.000, help_text="Sum of order item net_amount")
+    last_used_at = models.DateTimeField(null=True, blank=True, help_text="Last design saved or ordered")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.config_key} ({self.design_count} designs, {self.order_count} orders)"
+
+    class Meta:
+        ordering = ['-design_count']
+        verbose_name = "Design Configuration Stats"
+        verbose_name_plural = "Design Configuration Stats"
 
 
 #======================= DESIGN SCREENSHOT MODEL ========================
@@ -324,17 +408,43 @@ class DesignScreenshot(models.Model):
     """
     Store screenshots for design configurations to avoid regenerating identical designs.
     Uses a hash of component IDs to identify unique designs.
+    Uploads run in the background (see screenshot_pipeline.py); until then the
+    row is 'pending' and the image is served from the local spool.
     """
 
+    UPLOAD_STATUS_PENDING = 'pending'
+    UPLOAD_STATUS_UPLOADED = 'uploaded'
+    UPLOAD_STATUS_FAILED = 'failed'
+    UPLOAD_STATUS_CHOICES = (
+        (UPLOAD_STATUS_PENDING, 'Pending'),
+        (UPLOAD_STATUS_UPLOADED, 'Uploaded'),
+        (UPLOAD_STATUS_FAILED, 'Failed'),
+    )
+
     design_hash = models.CharField(
         max_length=64,
         unique=True,
         db_index=True,
         help_text="MD5 hash of all component IDs to uniquely identify design configuration"
     )
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        db_index=True,
+        help_text="SHA-256 of the image bytes, used to dedup identical images across configurations"
+    )
     screenshot_url = models.URLField(
         max_length=500,
-        help_text="Cloudinary URL of the design screenshot"
+        blank=True,
+        help_text="Cloudinary URL of the design screenshot (empty while upload is pending)"
+    )
+    upload_status = models.CharField(
+        max_length=10,
+        choices=UPLOAD_STATUS_CHOICES,
+        default=UPLOAD_STATUS_UPLOADED,
+        db_index=True,
+        help_text="Background upload state"
     )
     cloudinary_public_id = models.CharField(
         max_length=255,
@@ -0,0 +1,391 @@
+"""
+Design Screenshot Upload Pipeline
+Accepts design screenshots from the app, spools them to local disk and uploads
+them to Cloudinary on a background worker pool, so the request returns immediately.
+
+Dedup happens at two levels:
+- design_hash: MD5 of the component IDs (same configuration -> same screenshot)
+- content_hash: SHA-256 of the image bytes (identical image for another
+  configuration -> reuse the already uploaded asset, no second upload)
+
+The uploader is pluggable via settings.SCREENSHOT_UPLOADER so the worker can run
+against LocalStubScreenshotUploader in tests and offline development.
+
+Under ASGI (settings.ASYNC_IO_VIEWS) the async upload view schedules the upload
+as a task on the server's event loop instead (process_screenshot_async), using
+settings.SCREENSHOT_ASYNC_UPLOADER, so a slow Cloudinary round trip parks a
+coroutine rather than occupying one of the SCREENSHOT_UPLOAD_WORKERS threads.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from datetime import timedelta
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from raggyBackend.executors import lazy_executor
+
+from .models import DesignScreenshot
+
+logger = logging.getLogger(__name__)
+
+SCREENSHOT_FOLDER = 'user_designs'
+
+COMPONENT_FIELDS = (
+    'fabric_color_id',
+    'collar_id',
+    'sleeve_left_id',
+    'sleeve_right_id',
+    'pocket_id',
+    'button_id',
+    'body_id',
+)
+
+
+# ================== UPLOADERS ==================
+class CloudinaryScreenshotUploader:
+    """
+    Production uploader.
+    The content hash is used as the Cloudinary public_id, so re-uploading the
+    same image (e.g. after a worker restart) overwrites the same asset.
+    """
+
+    def upload(self, image_bytes, content_hash):
+        import cloudinary.uploader
+
+        result = cloudinary.uploader.upload(
+            image_bytes,
+            folder=SCREENSHOT_FOLDER,
+            public_id=content_hash,
+            overwrite=True,
+            resource_type='image'
+        )
+        return {'url': result['secure_url'], 'public_id': result['public_id']}
+
+
+class LocalStubScreenshotUploader:
+    """
+    Offline uploader for tests and local development.
+    Writes the image under MEDIA_ROOT instead of calling Cloudinary and keeps a
+    record of every upload so tests can assert on the number of uploads.
+    """
+    uploads = []
+
+    def upload(self, image_bytes, content_hash):
+        public_id = f"{SCREENSHOT_FOLDER}/{content_hash}"
+        target_dir = os.path.join(settings.MEDIA_ROOT, SCREENSHOT_FOLDER)
+        os.makedirs(target_dir, exist_ok=True)
+        with open(os.path.join(target_dir, content_hash), 'wb') as f:
+            f.write(image_bytes)
+
+        self.uploads.append(public_id)
+        return {'url': f"{settings.MEDIA_URL}{public_id}", 'public_id': public_id}
+
+
+class AsyncCloudinaryScreenshotUploader:
+    """
+    Production uploader for the async path.
+    Calls Cloudinary's upload REST endpoint directly over httpx with the same
+    signed parameters cloudinary.uploader.upload sends (the SDK is blocking).
+    """
+    UPLOAD_URL = 'https://api.cloudinary.com/v1_1/{cloud_name}/image/upload'
+    TIMEOUT = httpx.Timeout(60, connect=5)
+
+    def __init__(self):
+        self._client = None
+        self._client_loop = None
+
+    @property
+    def client(self):
+        """Keep-alive client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(timeout=self.TIMEOUT)
+            self._client_loop = loop
+        return self._client
+
+    async def upload(self, image_bytes, content_hash):
+        import cloudinary
+        import cloudinary.utils
+
+        config = cloudinary.config()
+        params = {
+            'folder': SCREENSHOT_FOLDER,
+            'public_id': content_hash,
+            'overwrite': 'true',
+            'timestamp': int(time.time()),
+        }
+        params['signature'] = cloudinary.utils.api_sign_request(params, config.api_secret)
+        params['api_key'] = config.api_key
+
+        response = await self.client.post(
+            self.UPLOAD_URL.format(cloud_name=config.cloud_name),
+            data=params,
+            files={'file': (content_hash, image_bytes)}
+        )
+        response.raise_for_status()
+        result = response.json()
+        return {'url': result['secure_url'], 'public_id': result['public_id']}
+
+
+class AsyncLocalStubScreenshotUploader(LocalStubScreenshotUploader):
+    """Offline uploader for the async path (writes under MEDIA_ROOT off the event loop)"""
+
+    async def upload(self, image_bytes, content_hash):
+        return await asyncio.to_thread(super().upload, image_bytes, content_hash)
+
+
+_uploader = None
+_async_uploader = None
+# Running async uploads (the event loop only keeps weak references to tasks)
+_upload_tasks = set()
+
+
+def get_uploader():
+    """Return the configured uploader instance (settings.SCREENSHOT_UPLOADER)"""
+    global _uploader
+    if _uploader is None:
+        _uploader = import_string(settings.SCREENSHOT_UPLOADER)()
+    return _uploader
+
+
+def get_async_uploader():
+    """Return the configured async uploader instance (settings.SCREENSHOT_ASYNC_UPLOADER)"""
+    global _async_uploader
+    if _async_uploader is None:
+        _async_uploader = import_string(settings.SCREENSHOT_ASYNC_UPLOADER)()
+    return _async_uploader
+
+
+get_executor = lazy_executor('SCREENSHOT_UPLOAD_WORKERS', 'screenshot-upload')
+
+
+# ================== HASHING & SPOOL ==================
+def compute_design_hash(component_ids):
+    """
+    MD5 of the component IDs in a fixed order.
+    Missing components are encoded as 'none' (same format as before the pipeline).
+    """
+    parts = [str(component_ids.get(field)) if component_ids.get(field) else 'none' for field in COMPONENT_FIELDS]
+    return hashlib.md5('|'.join(parts).encode()).hexdigest()
+
+
+def compute_content_hash(image_bytes):
+    """SHA-256 of the raw image bytes"""
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+def spool_path(design_hash):
+    """Local spool file for a screenshot that hasn't been uploaded yet"""
+    return os.path.join(settings.SCREENSHOT_SPOOL_DIR, design_hash)
+
+
+def write_spool_file(design_hash, image_bytes):
+    """Write image bytes to the spool atomically (temp file + rename)"""
+    os.makedirs(settings.SCREENSHOT_SPOOL_DIR, exist_ok=True)
+    path = spool_path(design_hash)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(image_bytes)
+    os.replace(tmp_path, path)
+    return path
+
+
+def remove_spool_file(design_hash):
+    try:
+        os.remove(spool_path(design_hash))
+    except FileNotFoundError:
+        pass
+
+
+def guess_content_type(image_bytes):
+    """Sniff the image type from its magic bytes (used when serving spooled files)"""
+    if image_bytes.startswith(b'\x89PNG'):
+        return 'image/png'
+    if image_bytes.startswith(b'\xff\xd8'):
+        return 'image/jpeg'
+    if image_bytes[:4] == b'RIFF' and image_bytes[8:12] == b'WEBP':
+        return 'image/webp'
+    if image_bytes.startswith(b'GIF8'):
+        return 'image/gif'
+    return 'application/octet-stream'
+
+
+def mark_reused(screenshot_id):
+    """Atomically bump the reuse counter (no read-modify-write race)"""
+    DesignScreenshot.objects.filter(pk=screenshot_id).update(
+        times_reused=F('times_reused') + 1,
+        last_accessed=timezone.now()
+    )
+
+
+def find_uploaded_twin(content_hash, exclude_id=None):
+    """Find an already uploaded screenshot with identical image content"""
+    queryset = DesignScreenshot.objects.filter(
+        content_hash=content_hash,
+        upload_status=DesignScreenshot.UPLOAD_STATUS_UPLOADED
+    )
+    if exclude_id:
+        queryset = queryset.exclude(pk=exclude_id)
+    return queryset.only('id', 'screenshot_url', 'cloudinary_public_id').first()
+
+
+# ================== PIPELINE ==================
+def submit_screenshot(design_hash, image_bytes, component_ids, enqueue=True):
+    """
+    Accept a screenshot for a design configuration.
+    Returns (screenshot, created). The upload itself happens on the worker pool
+    after the surrounding transaction commits; with enqueue=False the caller
+    schedules it (the async view runs it on the event loop).
+    """
+    content_hash = compute_content_hash(image_bytes)
+    twin = find_uploaded_twin(content_hash)
+
+    if not twin:
+        # Spool before creating the row so the worker always finds the file
+        write_spool_file(design_hash, image_bytes)
+
+    try:
+        with transaction.atomic():
+            screenshot = DesignScreenshot.objects.create(
+                design_hash=design_hash,
+                content_hash=content_hash,
+                screenshot_url=twin.screenshot_url if twin else '',
+                cloudinary_public_id=twin.cloudinary_public_id if twin else None,
+                upload_status=DesignScreenshot.UPLOAD_STATUS_UPLOADED if twin else DesignScreenshot.UPLOAD_STATUS_PENDING,
+                times_reused=0,
+                **{field: component_ids.get(field) for field in COMPONENT_FIELDS}
+            )
+    except IntegrityError:
+        # Another request for the same configuration won the race
+        screenshot = DesignScreenshot.objects.get(design_hash=design_hash)
+        mark_reused(screenshot.pk)
+        return screenshot, False
+
+    if twin:
+        mark_reused(twin.pk)
+        logger.info(f"Screenshot {design_hash[:8]} reuses identical image {content_hash[:8]}")
+    elif enqueue:
+        enqueue_upload(screenshot.pk)
+
+    return screenshot, True
+
+
+def enqueue_upload(screenshot_id):
+    """Schedule the upload on the worker pool once the current transaction commits"""
+    transaction.on_commit(lambda: get_executor().submit(process_screenshot, screenshot_id))
+
+
+def _prepare_upload(screenshot_id):
+    """
+    (screenshot, result, image_bytes) for a row still to upload: result is set
+    when an identical image is already uploaded, else image_bytes is the spool
+    file. (None, None, None) when the row is gone or already uploaded.
+    """
+    screenshot = DesignScreenshot.objects.filter(pk=screenshot_id).exclude(
+        upload_status=DesignScreenshot.UPLOAD_STATUS_UPLOADED
+    ).first()
+    if not screenshot:
+        return None, None, None
+
+    twin = find_uploaded_twin(screenshot.content_hash, exclude_id=screenshot.pk)
+    if twin:
+        mark_reused(twin.pk)
+        return screenshot, {'url': twin.screenshot_url, 'public_id': twin.cloudinary_public_id}, None
+
+    with open(spool_path(screenshot.design_hash), 'rb') as f:
+        return screenshot, None, f.read()
+
+
+def _record_upload(screenshot, result):
+    DesignScreenshot.objects.filter(pk=screenshot.pk).update(
+        screenshot_url=result['url'],
+        cloudinary_public_id=result['public_id'],
+        upload_status=DesignScreenshot.UPLOAD_STATUS_UPLOADED,
+        last_accessed=timezone.now()
+    )
+    remove_spool_file(screenshot.design_hash)
+    logger.info(f"Screenshot {screenshot.design_hash[:8]} uploaded: {result['public_id']}")
+
+
+def _record_failure(screenshot_id, error):
+    if isinstance(error, FileNotFoundError):
+        logger.error(f"Spool file missing for screenshot {screenshot_id}")
+    else:
+        # Keep the spool file so resume_pending_uploads() can retry later
+        logger.error(f"Screenshot upload failed for {screenshot_id}: {error}", exc_info=error)
+    DesignScreenshot.objects.filter(pk=screenshot_id).update(
+        upload_status=DesignScreenshot.UPLOAD_STATUS_FAILED
+    )
+
+
+def process_screenshot(screenshot_id):
+    """
+    Worker: upload one spooled screenshot and record the final URL.
+    Safe to run more than once for the same row (uploads are content-addressed).
+    """
+    close_old_connections()
+    try:
+        screenshot, result, image_bytes = _prepare_upload(screenshot_id)
+        if not screenshot:
+            return
+        if result is None:
+            result = get_uploader().upload(image_bytes, screenshot.content_hash)
+        _record_upload(screenshot, result)
+    except Exception as e:
+        _record_failure(screenshot_id, e)
+    finally:
+        close_old_connections()
+
+
+async def process_screenshot_async(screenshot_id):
+    """process_screenshot for the event loop: database work in a thread, the upload awaited"""
+    try:
+        screenshot, result, image_bytes = await sync_to_async(_prepare_upload)(screenshot_id)
+        if not screenshot:
+            return
+        if result is None:
+            result = await get_async_uploader().upload(image_bytes, screenshot.content_hash)
+        await sync_to_async(_record_upload)(screenshot, result)
+    except Exception as e:
+        await sync_to_async(_record_failure)(screenshot_id, e)
+
+
+def schedule_upload_async(screenshot_id):
+    """Run process_screenshot_async in the background on the running event loop"""
+    task = asyncio.get_running_loop().create_task(process_screenshot_async(screenshot_id))
+    _upload_tasks.add(task)
+    task.add_done_callback(_upload_tasks.discard)
+    return task
+
+
+def resume_pending_uploads(older_than_minutes=5, synchronous=False):
+    """
+    Re-queue screenshots stuck in pending/failed state (e.g. worker restart or
+    Cloudinary outage). Only rows whose spool file still exists are retried.
+    """
+    cutoff = timezone.now() - timedelta(minutes=older_than_minutes)
+    stuck_ids = DesignScreenshot.objects.filter(
+        Q(upload_status=DesignScreenshot.UPLOAD_STATUS_PENDING) | Q(upload_status=DesignScreenshot.UPLOAD_STATUS_FAILED),
+        created_at__lte=cutoff
+    ).values_list('id', 'design_hash')
+
+    resumed = 0
+    for screenshot_id, design_hash in stuck_ids.iterator():
+        if not os.path.exists(spool_path(design_hash)):
+            continue
+        if synchronous:
+            process_screenshot(screenshot_id)
+        else:
+            get_executor().submit(process_screenshot, screenshot_id)
+        resumed += 1
+
+    return resumed
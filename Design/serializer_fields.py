@@ -0,0 +1,101 @@
+"""
+Cloudinary Image URL Serializer Fields
+Replaces per-field `get_*_image` / `get_cover` SerializerMethodFields.
+
+- CloudinaryURLField: read-only field that renders a CloudinaryField as its URL
+- CloudinaryURLMixin: for ModelSerializers - every CloudinaryField on the model
+  (found once per model by introspection) is rendered with CloudinaryURLField
+- URLs are built through a process-wide memo keyed by the resource identity,
+  so the same image is only run through cloudinary_url() once per process
+- ImageVariantsField: the mixin also renders a model's `image_variants`
+  (thumbnail URLs and blurhash per image field, see image_processing.py),
+  leaving out images whose variants are still pending or failed
+"""
+from functools import lru_cache
+
+from cloudinary import CloudinaryImage, CloudinaryResource
+from cloudinary.models import CloudinaryField
+from rest_framework import serializers
+
+# Distinct images across the catalog, measurements and banners
+URL_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def _build_url(public_id, format, version, type, resource_type):
+    return CloudinaryResource(
+        public_id=public_id,
+        format=format,
+        version=version,
+        type=type,
+        resource_type=resource_type,
+    ).url
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def _build_url_from_public_id(public_id):
+    return CloudinaryImage(public_id).build_url()
+
+
+def cloudinary_url(value):
+    """URL for a CloudinaryField value (CloudinaryResource or a freshly assigned public_id string)"""
+    if not value:
+        return None
+    if isinstance(value, CloudinaryResource):
+        if value.url_options:
+            # Per-instance transformations: not worth memoizing
+            return value.url
+        return _build_url(value.public_id, value.format, value.version, value.type, value.resource_type)
+    if isinstance(value, str):
+        return _build_url_from_public_id(value)
+    return str(value)
+
+
+class CloudinaryURLField(serializers.Field):
+    """Read-only: renders a CloudinaryField as its (memoized) URL, or None when empty"""
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return cloudinary_url(value)
+
+
+class ImageVariantsField(serializers.Field):
+    """Read-only: an `image_variants` JSON field with only the finished entries"""
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return {
+            field_name: entry
+            for field_name, entry in (value or {}).items()
+            if not entry.get('status')
+        }
+
+
+@lru_cache(maxsize=None)
+def cloudinary_field_names(model):
+    """Names of the CloudinaryFields on a model (introspected once per model)"""
+    return frozenset(
+        field.name for field in model._meta.get_fields()
+        if isinstance(field, CloudinaryField)
+    )
+
+
+class CloudinaryURLMixin:
+    """
+    ModelSerializer mixin: every CloudinaryField included in the serializer is
+    rendered as a URL, without declaring a SerializerMethodField per image.
+    `image_variants`, where the model has it, is rendered with ImageVariantsField.
+    """
+
+    def build_field(self, field_name, info, model_class, nested_depth):
+        if field_name in cloudinary_field_names(model_class):
+            return CloudinaryURLField, {}
+        if field_name == 'image_variants':
+            return ImageVariantsField, {}
+        return super().build_field(field_name, info, model_class, nested_depth)
@@ -6,15 +6,14 @@ from .models import (
 )
 from Purchase.models import Item
 from django.db.models import Count
-import cloudinary
+from .serializer_fields import CloudinaryURLMixin
 # from .utils import discountPrice, check_discount_experition, check_discount_activation
 
 
 #================ NEW: FABRIC TYPE SERIALIZERS ================
 
-class FabricTypeSerializer(serializers.ModelSerializer):
+class FabricTypeSerializer(CloudinaryURLMixin, serializers.ModelSerializer):
     """Serializer for base fabric (without color)"""
-    cover = serializers.SerializerMethodField()
     colors_count = serializers.SerializerMethodField()
     season_display = serializers.SerializerMethodField()
     category_type_display = serializers.SerializerMethodField()
@@ -24,19 +23,6 @@ class FabricTypeSerializer(serializers.ModelSerializer):
         fields = "__all__"
         read_only_fields = ['id', 'timestamp']
 
-    def get_cover(self, obj):
-        if obj.cover:
-            # Handle case where cover might be a string (public_id) or CloudinaryResource
-            if hasattr(obj.cover, 'url'):
-                return obj.cover.url
-            elif isinstance(obj.cover, str):
-                # If it's a string (public_id), construct the Cloudinary URL
-                # Cloudinary URLs follow the pattern: https://res.cloudinary.com/{cloud_name}/image/upload/{public_id}
-                from cloudinary import CloudinaryImage
-                return CloudinaryImage(obj.cover).build_url()
-            return str(obj.cover)
-        return None
-
     def get_colors_count(self, obj):
         """Return number of available colors for this fabric"""
         return obj.colors.filter(inStock=True).count()
@@ -50,9 +36,8 @@ class FabricTypeSerializer(serializers.ModelSerializer):
         return obj.get_category_type_display() if obj.category_type else None
 
 
-class FabricColorSerializer(serializers.ModelSerializer):
+class FabricColorSerializer(CloudinaryURLMixin, serializers.ModelSerializer):
     """Serializer for fabric color variant"""
-    cover = serializers.SerializerMethodField()
     inStock = serializers.SerializerMethodField()
     total_price = serializers.SerializerMethodField()
     fabric_name_eng = serializers.CharField(source='fabric_type.fabric_name_eng', read_only=True)
@@ -64,17 +49,6 @@ class FabricColorSerializer(serializers.ModelSerializer):
         fields = "__all__"
         read_only_fields = ['id', 'timestamp']
 
-    def get_cover(self, obj):
-        if obj.cover:
-            # Handle case where cover might be a string (public_id) or CloudinaryResource
-            if hasattr(obj.cover, 'url'):
-                return obj.cover.url
-            elif isinstance(obj.cover, str):
-                from cloudinary import CloudinaryImage
-                return CloudinaryImage(obj.cover).build_url()
-            return str(obj.cover)
-        return None
-
     def get_inStock(self, obj):
         """Check if color is in stock based on quantity"""
         if obj.quantity == 0 or obj.inStock == False:
@@ -89,9 +63,8 @@ class FabricColorSerializer(serializers.ModelSerializer):
         return obj.total_price
 
 
-class FabricColorDetailSerializer(serializers.ModelSerializer):
+class FabricColorDetailSerializer(CloudinaryURLMixin, serializers.ModelSerializer):
     """Detailed serializer for fabric color with full fabric type details"""
-    cover = serializers.SerializerMethodField()
     inStock = serializers.SerializerMethodField()
     total_price = serializers.SerializerMethodField()
     fabric_type = FabricTypeSerializer(read_only=True)
@@ -101,17 +74,6 @@ class FabricColorDetailSerializer(serializers.ModelSerializer):
         fields = "__all__"
         read_only_fields = ['id', 'timestamp']
 
-    def get_cover(self, obj):
-        if obj.cover:
-            # Handle case where cover might be a string (public_id) or CloudinaryResource
-            if hasattr(obj.cover, 'url'):
-                return obj.cover.url
-            elif isinstance(obj.cover, str):
-                from cloudinary import CloudinaryImage
-                return CloudinaryImage(obj.cover).build_url()
-            return str(obj.cover)
-        return None
-
     def get_inStock(self, obj):
         if obj.quantity == 0 or obj.inStock == False:
             return False
@@ -124,120 +86,47 @@ class FabricColorDetailSerializer(serializers.ModelSerializer):
         return obj.total_price
 
 
-class GholaTypeSerializer(serializers.ModelSerializer):
-    cover = serializers.SerializerMethodField()
-    cover_option = serializers.SerializerMethodField()
-
+class GholaTypeSerializer(CloudinaryURLMixin, serializers.ModelSerializer):
     class Meta:
         model = GholaType
         fields = "__all__"
         read_only_fields = ['id']
 
-    def get_cover(self, obj):
-        if obj.cover:
-            return obj.cover.url
-        return None
-
-    def get_cover_option(self, obj):
-        if obj.cover_option:
-            return obj.cover_option.url
-        return None
-
-
-
-class SleevesTypeSerializer(serializers.ModelSerializer):
-    cover = serializers.SerializerMethodField()
-    cover_option = serializers.SerializerMethodField()
 
+class SleevesTypeSerializer(CloudinaryURLMixin, serializers.ModelSerializer):
     class Meta:
         model = SleevesType
         fields = "__all__"
         read_only_fields = ['id']
 
-    def get_cover(self, obj):
-        if obj.cover:
-            return obj.cover.url
-        return None
-
-    def get_cover_option(self, obj):
-        if obj.cover_option:
-            return obj.cover_option.url
-        return None
-
-class PocketTypeSerializer(serializers.ModelSerializer):
-    cover = serializers.SerializerMethodField()
-    cover_option = serializers.SerializerMethodField()
 
+class PocketTypeSerializer(CloudinaryURLMixin, serializers.ModelSerializer):
     class Meta:
         model = PocketType
         fields = "__all__"
         read_only_fields = ['id']
 
-    def get_cover(self, obj):
-        if obj.cover:
-            return obj.cover.url
-        return None
-
-    def get_cover_option(self, obj):
-        if obj.cover_option:
-            return obj.cover_option.url
-        return None
-
-class ButtonTypeSerializer(serializers.ModelSerializer):
-    cover = serializers.SerializerMethodField()
-    cover_option = serializers.SerializerMethodField()
 
+class ButtonTypeSerializer(CloudinaryURLMixin, serializers.ModelSerializer):
     class Meta:
         model = ButtonType
         fields = "__all__"
         read_only_fields = ['id']
 
-    def get_cover(self, obj):
-        if obj.cover:
-            return obj.cover.url
-        return None
-
-    def get_cover_option(self, obj):
-        if obj.cover_option:
-            return obj.cover_option.url
-        return None
-
-
-
-class BodyTypeSerializer(serializers.ModelSerializer):
-    cover = serializers.SerializerMethodField()
-    cover_option = serializers.SerializerMethodField()
 
+class BodyTypeSerializer(CloudinaryURLMixin, serializers.ModelSerializer):
     class Meta:
         model = BodyType
         fields = "__all__"
         read_only_fields = ['id']
 
-    def get_cover(self, obj):
-        if obj.cover:
-            return obj.cover.url
-        return None
-
-    def get_cover_option(self, obj):
-        if obj.cover_option:
-            return obj.cover_option.url
-        return None
-
-class HomePageSelectionCategorySerializer(serializers.ModelSerializer):
-    cover = serializers.SerializerMethodField()
 
+class HomePageSelectionCategorySerializer(CloudinaryURLMixin, serializers.ModelSerializer):
     class Meta:
         model = HomePageSelectionCategory
         fields = "__all__"
         read_only_fields = ['id']
 
-    def get_cover(self, obj):
-        if obj.cover:
-            if hasattr(obj.cover, 'url'):
-                return obj.cover.url
-            elif isinstance(obj.cover, str):
-                return f"https://res.cloudinary.com/drtdkkkbq/image/upload/{obj.cover}"
-        return None
 
 class UserDesignSerializer(serializers.ModelSerializer):
     initial_size_selected = HomePageSelectionCategorySerializer()
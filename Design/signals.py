@@ -1,82 +1,34 @@
 """
 Professional Cache Invalidation using Django Signals
-Automatically clears cache when design models are modified
+Automatically invalidates the cached catalog when design models are modified
 """
-from django.db.models.signals import post_save, post_delete, pre_delete
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
 from django.dispatch import receiver
-from django.core.cache import cache
-from django.conf import settings
 import logging
 
 from .models import (
     FabricType, FabricColor,
     GholaType, SleevesType, PocketType,
     ButtonType, BodyType,
-    HomePageSelectionCategory
+    HomePageSelectionCategory, UserDesign
 )
+from . import design_stats
+from .cache_invalidation import SCOPES, mark_dirty, model_changed
 from .fabric_notifications import (
     notify_main_category_changed
 )
+from .image_processing import schedule_image_variants
 
 logger = logging.getLogger(__name__)
 
 
 def invalidate_all_design_cache():
     """
-    Professional cache invalidation - clears all design-related caches
-    Uses multiple strategies to ensure cache is properly cleared
+    Invalidate every design cache scope (see cache_invalidation.py).
+    Takes effect after commit, once per request/batch however often it is called.
     """
-    try:
-        logger.info("🔥 Starting cache invalidation...")
-
-        # Strategy 1: Clear entire Django cache (most reliable)
-        cache.clear()
-        logger.info("✅ Django cache cleared")
-
-        # Strategy 2: If using Redis, flush the database
-        if 'django_redis' in settings.CACHES.get('default', {}).get('BACKEND', ''):
-            try:
-                from django_redis import get_redis_connection
-                redis_conn = get_redis_connection('default')
-
-                # Get all keys and delete them
-                all_keys = redis_conn.keys('*')
-                if all_keys:
-                    redis_conn.delete(*all_keys)
-                    logger.info(f"✅ Redis: Deleted {len(all_keys)} cache keys")
-                else:
-                    logger.info("✅ Redis: No keys to delete")
-
-            except Exception as redis_err:
-                logger.warning(f"⚠️ Redis specific clearing failed: {redis_err}")
-
-        # Strategy 3: Clear specific cache key patterns (if cache.clear() fails)
-        try:
-            # Clear view cache keys
-            cache_patterns = [
-                'views.decorators.cache.cache_page',
-                'design',
-                'fabric',
-                'collar',
-                'sleeves',
-                'pocket',
-                'button',
-                'body',
-            ]
-
-            for pattern in cache_patterns:
-                cache.delete_pattern(f'*{pattern}*')
-
-        except AttributeError:
-            # delete_pattern not available in all cache backends
-            pass
-
-        logger.info("🎯 Cache invalidation completed successfully")
-        return True
-
-    except Exception as e:
-        logger.error(f"❌ Cache invalidation failed: {e}")
-        return False
+    mark_dirty(*SCOPES)
+    return True
 
 
 # ==================== AUTO CACHE INVALIDATION SIGNALS ====================
@@ -86,7 +38,7 @@ def invalidate_all_design_cache():
 def fabric_type_changed(sender, instance, **kwargs):
     """Clear cache when FabricType is modified"""
     logger.info(f"📝 FabricType changed: {instance.fabric_name_eng}")
-    invalidate_all_design_cache()
+    model_changed(sender, deleted=kwargs.get('signal') is post_delete)
 
 
 @receiver(post_save, sender=FabricColor)
@@ -94,7 +46,7 @@ def fabric_type_changed(sender, instance, **kwargs):
 def fabric_color_changed(sender, instance, **kwargs):
     """Clear cache when FabricColor is modified"""
     logger.info(f"📝 FabricColor changed: {instance.color_name_eng}")
-    invalidate_all_design_cache()
+    model_changed(sender, deleted=kwargs.get('signal') is post_delete)
 
 
 @receiver(post_save, sender=GholaType)
@@ -102,7 +54,7 @@ def fabric_color_changed(sender, instance, **kwargs):
 def collar_changed(sender, instance, **kwargs):
     """Clear cache when Collar is modified"""
     logger.info(f"📝 Collar changed: {instance.ghola_type_name_eng}")
-    invalidate_all_design_cache()
+    model_changed(sender, deleted=kwargs.get('signal') is post_delete)
 
 
 @receiver(post_save, sender=SleevesType)
@@ -110,7 +62,7 @@ def collar_changed(sender, instance, **kwargs):
 def sleeves_changed(sender, instance, **kwargs):
     """Clear cache when Sleeves is modified"""
     logger.info(f"📝 Sleeves changed: {instance.sleeves_type_name_eng}")
-    invalidate_all_design_cache()
+    model_changed(sender, deleted=kwargs.get('signal') is post_delete)
 
 
 @receiver(post_save, sender=PocketType)
@@ -118,7 +70,7 @@ def sleeves_changed(sender, instance, **kwargs):
 def pocket_changed(sender, instance, **kwargs):
     """Clear cache when Pocket is modified"""
     logger.info(f"📝 Pocket changed: {instance.pocket_type_name_eng}")
-    invalidate_all_design_cache()
+    model_changed(sender, deleted=kwargs.get('signal') is post_delete)
 
 
 @receiver(post_save, sender=ButtonType)
@@ -126,7 +78,7 @@ def pocket_changed(sender, instance, **kwargs):
 def button_changed(sender, instance, **kwargs):
     """Clear cache when Button is modified"""
     logger.info(f"📝 Button changed: {instance.button_type_name_eng}")
-    invalidate_all_design_cache()
+    model_changed(sender, deleted=kwargs.get('signal') is post_delete)
 
 
 
@@ -137,7 +89,7 @@ def button_changed(sender, instance, **kwargs):
 def body_changed(sender, instance, **kwargs):
     """Clear cache when Body is modified"""
     logger.info(f"📝 Body changed: {instance.body_type_name_eng}")
-    invalidate_all_design_cache()
+    model_changed(sender, deleted=kwargs.get('signal') is post_delete)
 
 
 @receiver(post_save, sender=HomePageSelectionCategory)
@@ -145,8 +97,61 @@ def body_changed(sender, instance, **kwargs):
 def main_category_changed(sender, instance, **kwargs):
     """Clear cache and notify app when Main Category is modified"""
     logger.info(f"🏠 Main Category changed: {instance.main_category_name_eng}")
-    invalidate_all_design_cache()
+    model_changed(sender, deleted=kwargs.get('signal') is post_delete)
     notify_main_category_changed()
 
 
+# ==================== CATALOG IMAGE VARIANTS ====================
+
+CATALOG_IMAGE_FIELDS = {
+    HomePageSelectionCategory: ('cover',),
+    FabricType: ('cover',),
+    FabricColor: ('cover',),
+    GholaType: ('cover', 'cover_option'),
+    SleevesType: ('cover', 'cover_option'),
+    PocketType: ('cover', 'cover_option'),
+    ButtonType: ('cover', 'cover_option'),
+    BodyType: ('cover', 'cover_option'),
+}
+
+
+def catalog_image_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Generate thumbnail variants in the background when a catalog image changes"""
+    image_fields = CATALOG_IMAGE_FIELDS[sender]
+    if raw or (update_fields is not None and not update_fields.intersection(image_fields)):
+        # Fixture load, or a save that didn't touch the images (e.g. stock updates)
+        return
+    try:
+        schedule_image_variants(instance, image_fields)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not schedule image variants for {sender.__name__} #{instance.pk}: {e}")
+
+
+for catalog_model in CATALOG_IMAGE_FIELDS:
+    post_save.connect(
+        catalog_image_saved,
+        sender=catalog_model,
+        dispatch_uid=f"catalog_image_variants_{catalog_model.__name__}"
+    )
+
+
+# ==================== DESIGN CONFIGURATION STATS ====================
+
+@receiver(pre_save, sender=UserDesign)
+def remember_design_configuration(sender, instance, raw=False, **kwargs):
+    """Keep the stored configuration and price so post_save can move the counters"""
+    instance._stats_before = None if raw else design_stats.stored_state(instance)
+
+
+@receiver(post_save, sender=UserDesign)
+def user_design_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        design_stats.design_saved(instance, created, getattr(instance, '_stats_before', None))
+
+
+@receiver(post_delete, sender=UserDesign)
+def user_design_deleted(sender, instance, **kwargs):
+    design_stats.design_deleted(instance)
+
+
 logger.info("✅ Design cache invalidation signals registered successfully")
@@ -1,3 +1,359 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.response import Response
+
+from Purchase.models import Item, Purchase
+
+from . import catalog_cache, design_stats, image_processing, screenshot_pipeline
+from .inventory import cumulative_at, take_inventory_snapshot
+from .models import (
+    DesignConfigurationStats, DesignScreenshot, FabricColor, FabricType, HomePageSelectionCategory,
+    InventorySnapshot, InventoryTransaction, UserDesign
+)
+from .serializers import FabricColorSerializer
+
+
+@mock.patch.object(image_processing, 'get_executor')
+class ImageVariantSchedulingTests(TestCase):
+    """Variant jobs are queued once per image source"""
+
+    def setUp(self):
+        self.fabric = FabricType.objects.create(
+            fabric_name_eng='Cotton', fabric_name_arb='قطن', base_price=Decimal('10.000')
+        )
+
+    def create_color(self, cover='FabricColors/white'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return FabricColor.objects.create(
+                fabric_type=self.fabric, color_name_eng='White', color_name_arb='أبيض', cover=cover
+            )
+
+    def save_color(self, color, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            color.save(**kwargs)
+
+    def test_new_image_is_queued_once(self, get_executor):
+        color = self.create_color()
+
+        get_executor.return_value.submit.assert_called_once_with(
+            image_processing.process_image_field, FabricColor, color.pk, 'cover'
+        )
+        color.refresh_from_db()
+        self.assertEqual(color.image_variants, {'cover': {'source': 'FabricColors/white', 'status': 'pending'}})
+
+        # Full save of an unchanged image, and a stock-only save
+        self.save_color(FabricColor.objects.get(pk=color.pk))
+        color.quantity = 3
+        self.save_color(color, update_fields=['quantity'])
+
+        get_executor.return_value.submit.assert_called_once()
+
+    def test_replaced_image_is_queued(self, get_executor):
+        color = self.create_color()
+
+        color.cover = 'FabricColors/beige'
+        self.save_color(color)
+
+        self.assertEqual(get_executor.return_value.submit.call_count, 2)
+        color.refresh_from_db()
+        self.assertEqual(color.image_variants['cover']['source'], 'FabricColors/beige')
+
+    def test_failed_job_is_not_requeued_on_save(self, get_executor):
+        color = self.create_color()
+
+        with mock.patch.object(image_processing, 'build_variants_entry', side_effect=OSError('download failed')):
+            image_processing.process_image_field(FabricColor, color.pk, 'cover')
+
+        color.refresh_from_db()
+        self.assertEqual(color.image_variants, {'cover': {'source': 'FabricColors/white', 'status': 'failed'}})
+        self.save_color(color)
+        get_executor.return_value.submit.assert_called_once()
+
+        # The backfill command retries it
+        with mock.patch.object(image_processing, 'process_image_field') as process_image_field:
+            image_processing.schedule_image_variants(color, ('cover',), retry=True, synchronous=True)
+        process_image_field.assert_called_once_with(FabricColor, color.pk, 'cover')
+
+    def test_serializer_exposes_finished_variants_only(self, get_executor):
+        color = self.create_color()
+        color.refresh_from_db()
+        self.assertEqual(FabricColorSerializer(color).data['image_variants'], {})
+
+        entry = {'source': 'FabricColors/white', 'blurhash': 'LEHV6nWB2yk8', 'webp': {}, 'jpeg': {}}
+        with mock.patch.object(image_processing, 'build_variants_entry', return_value=entry):
+            image_processing.process_image_field(FabricColor, color.pk, 'cover')
+
+        color.refresh_from_db()
+        self.assertEqual(FabricColorSerializer(color).data['image_variants'], {'cover': entry})
+
+
+class DesignStatsOrderTests(TestCase):
+    """Order items created from the cart JSON count towards their configuration"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='buyer')
+        self.size = HomePageSelectionCategory.objects.create(initial_price=Decimal('5.000'))
+        fabric = FabricType.objects.create(fabric_name_eng='Cotton', fabric_name_arb='قطن', base_price=Decimal('10.000'))
+        self.color = FabricColor.objects.create(fabric_type=fabric, color_name_eng='White', color_name_arb='أبيض')
+        UserDesign.objects.create(
+            user=self.user, initial_size_selected=self.size, main_body_fabric_color=self.color,
+            design_Total=Decimal('15.000')
+        )
+        self.purchase = Purchase.objects.create(
+            user=self.user, phone_number='00000000', payment_option='cash', total_price=Decimal('30.000')
+        )
+        self.config_key = design_stats.config_key((self.size.id, self.color.id) + (None,) * 6)
+
+    def order(self, **details):
+        return Item.objects.create(
+            invoice=self.purchase, product_name='Dishdasha', unit_price=Decimal('15.000'),
+            net_amount=Decimal('30.000'), quantity=2, user_design=None,
+            design_details={'design_color_id': self.color.id, **details}
+        )
+
+    def stats(self):
+        return DesignConfigurationStats.objects.get(config_key=self.config_key)
+
+    def test_item_from_design_details_counts_towards_saved_configuration(self):
+        item = self.order()
+
+        stats = self.stats()
+        self.assertEqual((stats.design_count, stats.order_count, stats.revenue), (1, 1, Decimal('30.000')))
+
+        design_stats.rebuild_configuration_stats()
+        stats = self.stats()
+        self.assertEqual((stats.design_count, stats.order_count, stats.revenue), (1, 1, Decimal('30.000')))
+
+        item.delete()
+        self.assertEqual((self.stats().order_count, self.stats().revenue), (0, Decimal('0.000')))
+
+    def test_item_is_uncounted_from_the_row_it_was_counted_on(self):
+        item = self.order()
+        # The buyer saves the same components in another size before the item is deleted
+        other_size = HomePageSelectionCategory.objects.create(initial_price=Decimal('6.000'))
+        UserDesign.objects.create(
+            user=self.user, initial_size_selected=other_size, main_body_fabric_color=self.color,
+            design_Total=Decimal('16.000')
+        )
+
+        item.refresh_from_db()
+        self.assertEqual(item.stats_config_key, self.config_key)
+        item.delete()
+
+        self.assertEqual((self.stats().order_count, self.stats().revenue), (0, Decimal('0.000')))
+        self.assertFalse(DesignConfigurationStats.objects.filter(order_count__lt=0).exists())
+
+    def test_item_without_fabric_color_is_not_counted(self):
+        Item.objects.create(
+            invoice=self.purchase, product_name='Gift card', unit_price=Decimal('5.000'),
+            net_amount=Decimal('5.000'), design_details={'note': 'no design'}
+        )
+
+        self.assertEqual(self.stats().order_count, 0)
+        self.assertEqual(DesignConfigurationStats.objects.count(), 1)
+
+    def test_design_details_component_ids(self):
+        details = {
+            'design_color_id': 5, 'selected_coller_id': 2, 'sleeve_left_id': 3, 'sleeve_right_id': 4,
+            'pocket_id': 1, 'button_id': 7, 'body_type_id': 6, 'design_fabric_type_id': 9,
+        }
+
+        self.assertEqual(
+            design_stats.design_details_component_ids(details),
+            {'fabric_color': 5, 'collar': 2, 'sleeves': [3, 4], 'pocket': 1, 'button': 7, 'body': 6}
+        )
+        self.assertEqual(design_stats.details_components(details), (5, 2, 3, 4, 1, 7, 6))
+
+
+class InventorySnapshotTests(TestCase):
+    """Snapshots leave the newest ledger rows to the next snapshot"""
+
+    def setUp(self):
+        fabric = FabricType.objects.create(fabric_name_eng='Linen', fabric_name_arb='كتان', base_price=Decimal('8.000'))
+        self.color = FabricColor.objects.create(fabric_type=fabric, color_name_eng='Grey', color_name_arb='رمادي')
+        self.now = timezone.now()
+
+    def ledger(self, change, age):
+        entry = InventoryTransaction.objects.create(
+            fabric_color=self.color, transaction_type='ORDER', quantity_change=change,
+            quantity_before=0, quantity_after=0
+        )
+        InventoryTransaction.objects.filter(pk=entry.pk).update(timestamp=self.now - age)
+        return entry
+
+    def test_rows_inside_lag_are_folded_in_by_next_snapshot(self):
+        settled = self.ledger(-2, age=timedelta(hours=1))
+        self.ledger(-3, age=timedelta(seconds=10))
+
+        take_inventory_snapshot(now=self.now)
+
+        snapshot = InventorySnapshot.objects.get()
+        self.assertEqual(snapshot.last_transaction_id, settled.id)
+        self.assertEqual(snapshot.consumed_total, 2)
+        self.assertEqual(cumulative_at(self.now, [self.color.id])[self.color.id], (5, 0))
+
+        later = self.now + timedelta(days=1)
+        take_inventory_snapshot(now=later)
+
+        snapshot = InventorySnapshot.objects.get(taken_at=later)
+        self.assertEqual(snapshot.consumed_total, 5)
+        self.assertEqual(cumulative_at(later, [self.color.id])[self.color.id], (5, 0))
+
+    def test_watermark_never_moves_back(self):
+        settled = self.ledger(-1, age=timedelta(hours=1))
+        take_inventory_snapshot(now=self.now)
+
+        # Clock earlier than the previous watermark's rows: keep the watermark
+        take_inventory_snapshot(now=self.now - timedelta(hours=2))
+
+        self.assertEqual(
+            set(InventorySnapshot.objects.values_list('last_transaction_id', flat=True)), {settled.id}
+        )
+
+
+@mock.patch.object(screenshot_pipeline, 'close_old_connections')
+@mock.patch.object(screenshot_pipeline, 'get_executor')
+class ScreenshotPipelineTests(TestCase):
+    """submit_screenshot -> process_screenshot -> resume_pending_uploads against the local stub uploaders"""
+
+    PNG = b'\x89PNG\r\n\x1a\n' + b'\x00' * 32
+
+    def setUp(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir, ignore_errors=True)
+        settings_override = override_settings(
+            SCREENSHOT_SPOOL_DIR=os.path.join(tmp_dir, 'spool'),
+            MEDIA_ROOT=os.path.join(tmp_dir, 'media'),
+            SCREENSHOT_UPLOADER='Design.screenshot_pipeline.LocalStubScreenshotUploader',
+            SCREENSHOT_ASYNC_UPLOADER='Design.screenshot_pipeline.AsyncLocalStubScreenshotUploader',
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        for name in ('_uploader', '_async_uploader'):
+            patcher = mock.patch.object(screenshot_pipeline, name, None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(screenshot_pipeline.LocalStubScreenshotUploader, 'uploads', [])
+        self.uploads = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def submit(self, fabric_color_id, image_bytes=PNG):
+        component_ids = {'fabric_color_id': fabric_color_id, 'collar_id': 2}
+        design_hash = screenshot_pipeline.compute_design_hash(component_ids)
+        with self.captureOnCommitCallbacks(execute=True):
+            return screenshot_pipeline.submit_screenshot(design_hash, image_bytes, component_ids)
+
+    def run_queued(self, get_executor):
+        """Run the uploads handed to the worker pool"""
+        for call in get_executor.return_value.submit.call_args_list:
+            func, *args = call.args
+            func(*args)
+        get_executor.return_value.submit.reset_mock()
+
+    def test_upload_after_commit(self, get_executor, close_old_connections):
+        screenshot, created = self.submit(1)
+
+        self.assertTrue(created)
+        self.assertEqual(screenshot.upload_status, DesignScreenshot.UPLOAD_STATUS_PENDING)
+        self.assertTrue(os.path.exists(screenshot_pipeline.spool_path(screenshot.design_hash)))
+        get_executor.return_value.submit.assert_called_once_with(screenshot_pipeline.process_screenshot, screenshot.pk)
+
+        self.run_queued(get_executor)
+
+        screenshot.refresh_from_db()
+        public_id = f'user_designs/{screenshot.content_hash}'
+        self.assertEqual(screenshot.upload_status, DesignScreenshot.UPLOAD_STATUS_UPLOADED)
+        self.assertEqual(screenshot.cloudinary_public_id, public_id)
+        self.assertEqual(self.uploads, [public_id])
+        self.assertFalse(os.path.exists(screenshot_pipeline.spool_path(screenshot.design_hash)))
+
+        # Running the job again doesn't upload twice
+        screenshot_pipeline.process_screenshot(screenshot.pk)
+        self.assertEqual(len(self.uploads), 1)
+
+    def test_identical_image_reuses_upload(self, get_executor, close_old_connections):
+        first, _ = self.submit(1)
+        self.run_queued(get_executor)
+
+        second, created = self.submit(2)
+
+        self.assertTrue(created)
+        self.assertEqual(second.upload_status, DesignScreenshot.UPLOAD_STATUS_UPLOADED)
+        self.assertEqual(second.cloudinary_public_id, f'user_designs/{first.content_hash}')
+        get_executor.return_value.submit.assert_not_called()
+        self.assertEqual(len(self.uploads), 1)
+        first.refresh_from_db()
+        self.assertEqual(first.times_reused, 1)
+
+    def test_resume_retries_failed_upload(self, get_executor, close_old_connections):
+        screenshot, _ = self.submit(1)
+        with mock.patch.object(
+            screenshot_pipeline.LocalStubScreenshotUploader, 'upload', side_effect=OSError('Cloudinary unavailable')
+        ):
+            self.run_queued(get_executor)
+
+        screenshot.refresh_from_db()
+        self.assertEqual(screenshot.upload_status, DesignScreenshot.UPLOAD_STATUS_FAILED)
+        self.assertTrue(os.path.exists(screenshot_pipeline.spool_path(screenshot.design_hash)))
+
+        # Too recent to be considered stuck
+        self.assertEqual(screenshot_pipeline.resume_pending_uploads(synchronous=True), 0)
+
+        DesignScreenshot.objects.filter(pk=screenshot.pk).update(created_at=timezone.now() - timedelta(minutes=10))
+        self.assertEqual(screenshot_pipeline.resume_pending_uploads(synchronous=True), 1)
+
+        screenshot.refresh_from_db()
+        self.assertEqual(screenshot.upload_status, DesignScreenshot.UPLOAD_STATUS_UPLOADED)
+        self.assertEqual(len(self.uploads), 1)
+        # Nothing left to resume
+        self.assertEqual(screenshot_pipeline.resume_pending_uploads(older_than_minutes=0, synchronous=True), 0)
+
+    def test_resume_skips_rows_without_spool_file(self, get_executor, close_old_connections):
+        screenshot, _ = self.submit(1)
+        get_executor.return_value.submit.reset_mock()
+        screenshot_pipeline.remove_spool_file(screenshot.design_hash)
+
+        self.assertEqual(screenshot_pipeline.resume_pending_uploads(older_than_minutes=0), 0)
+        get_executor.return_value.submit.assert_not_called()
+
+    def test_async_upload(self, get_executor, close_old_connections):
+        component_ids = {'fabric_color_id': 1}
+        design_hash = screenshot_pipeline.compute_design_hash(component_ids)
+        with self.captureOnCommitCallbacks(execute=True):
+            screenshot, _ = screenshot_pipeline.submit_screenshot(
+                design_hash, self.PNG, component_ids, enqueue=False
+            )
+        get_executor.return_value.submit.assert_not_called()
+
+        async_to_sync(screenshot_pipeline.process_screenshot_async)(screenshot.pk)
+
+        screenshot.refresh_from_db()
+        self.assertEqual(screenshot.upload_status, DesignScreenshot.UPLOAD_STATUS_UPLOADED)
+        self.assertEqual(self.uploads, [f'user_designs/{screenshot.content_hash}'])
+        self.assertFalse(os.path.exists(screenshot_pipeline.spool_path(design_hash)))
+
+
+class CatalogResponseCacheTests(TestCase):
+    """Catalog misses with the cache unavailable"""
+
+    @mock.patch.object(catalog_cache, '_wait_for')
+    @mock.patch.object(catalog_cache.cache, 'add', return_value=None)
+    @mock.patch.object(catalog_cache.cache, 'get', return_value=None)
+    def test_miss_builds_inline_without_waiting(self, cache_get, cache_add, wait_for):
+        view = mock.Mock(return_value=Response({'fabrics': []}))
+
+        response = catalog_cache.catalog_response_cache('fabrics')(view)(RequestFactory().get('/fabrics/'))
+
+        self.assertEqual(response['X-Catalog-Cache'], 'miss')
+        view.assert_called_once()
+        wait_for.assert_not_called()
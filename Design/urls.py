@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from . import views
 from .views import (
@@ -8,9 +9,12 @@ from .views import (
     FetchFabricAPIView, FetchFabricDetailAPIView, FetchFabricColorsAPIView_New, FetchCollerAPIView, UserDesignAPIView, FetchSleevesRightAPIView,
     FetchSleevesLeftAPIView, FetchPocketAPIView, FetchButtonAPIView, FetchBodyAPIView,
     CalculateDesignPriceAPIView, DesignSummaryPreviewAPIView,
-    LowStockAlertAPIView, BulkUpdateInventoryAPIView, InventoryHistoryAPIView,
-    UploadDesignScreenshotAPIView
+    LowStockAlertAPIView, LowStockForecastAPIView, BulkUpdateInventoryAPIView, InventoryHistoryAPIView,
+    UploadDesignScreenshotAPIView, DesignScreenshotFileAPIView, AsyncUploadDesignScreenshotAPIView
 )
+
+# Async screenshot upload under ASGI (see ASYNC_IO_VIEWS in settings)
+UploadScreenshotView = AsyncUploadDesignScreenshotAPIView if settings.ASYNC_IO_VIEWS else UploadDesignScreenshotAPIView
 urlpatterns = [
     path('', views.all_design_view, name='all-designs'),
     #============ MAIN CATEGORY END-USER SIDE =======================================
@@ -37,7 +41,8 @@ urlpatterns = [
     path('preview/summary/', DesignSummaryPreviewAPIView.as_view()),
     path('create/design/', UserDesignAPIView.as_view()),
     path('edit/design/<int:pk>/', UserDesignAPIView.as_view()),
-    path('upload/screenshot/', UploadDesignScreenshotAPIView.as_view()),
+    path('upload/screenshot/', UploadScreenshotView.as_view()),
+    path('screenshot/<str:design_hash>/', DesignScreenshotFileAPIView.as_view(), name='design-screenshot'),
     #============ MAIN CATEGORY ADMIN SIDE =======================================
     path('detail/main/category/<int:pk>/', MainCatogeryAdminSideAPIView.as_view()),
     path('create/main/category/', MainCatogeryAdminSideAPIView.as_view()),
@@ -94,6 +99,7 @@ urlpatterns = [
 
     #============ INVENTORY MANAGEMENT (ADMIN SIDE) =======================================
     path('inventory/low-stock/', LowStockAlertAPIView.as_view(), name='inventory-low-stock'),
+    path('inventory/low-stock/forecast/', LowStockForecastAPIView.as_view(), name='inventory-low-stock-forecast'),
     path('inventory/bulk-update/', BulkUpdateInventoryAPIView.as_view(), name='inventory-bulk-update'),
     path('inventory/history/<int:pk>/', InventoryHistoryAPIView.as_view(), name='inventory-history'),
 
@@ -1,5 +1,8 @@
+import logging
 import cloudinary.uploader
 
+logger = logging.getLogger(__name__)
+
 def hableImageUpload(img):
     """
     Handle image upload from base64 encoded data to Cloudinary
@@ -36,8 +39,9 @@ def hableImageUpload(img):
             return upload_result.get('public_id') or upload_result.get('secure_url')
         else:
             # If not in expected format, return None or raise error
-            print(f"Warning: Invalid image format received: {type(img)}, {img}")
+            # Don't log the payload itself: it can be a multi-megabyte base64 string
+            logger.warning("⚠️ Invalid image format received: %s", type(img).__name__)
             return None
     except Exception as e:
-        print(f"Error in hableImageUpload: {str(e)}")
+        logger.error("❌ Error in hableImageUpload: %s", e)
         raise
\ No newline at end of file
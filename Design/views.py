@@ -1,3 +1,4 @@
+import logging
 from django.shortcuts import render
 from rest_framework.response import Response
 from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST, HTTP_401_UNAUTHORIZED
@@ -5,9 +6,11 @@ from rest_framework.views import APIView
 from rest_framework.permissions import IsAdminUser
 from rest_framework.authentication import SessionAuthentication, BasicAuthentication
 from django.db import transaction
-from django.views.decorators.cache import cache_page
 from django.utils.decorators import method_decorator
 from django.core.cache import cache
+from django.conf import settings
+from django.http import JsonResponse
+from asgiref.sync import sync_to_async
 
 
 # Custom SessionAuthentication that doesn't enforce CSRF for API calls
@@ -27,6 +30,9 @@ from .models import (
     HomePageSelectionCategory, UserDesign, InventoryTransaction
 )
 from .utils import hableImageUpload
+from .cache_invalidation import model_changed
+from .catalog_cache import catalog_response_cache
+from raggyBackend.async_views import AsyncAPIView
 from typing import Dict
 from decimal import Decimal
 
@@ -41,13 +47,16 @@ from .fabric_notifications import (
     notify_fabric_color_deleted,
 )
 
+logger = logging.getLogger(__name__)
+
 
 # ================== CACHE INVALIDATION HELPERS ==================
 def clear_design_cache():
     """
     Professional cache invalidation
     Uses Django signals for automatic clearing (see signals.py)
-    This function can also be called manually when needed.
+    This function can also be called manually when needed; it only marks the
+    design cache dirty, so calling it after a save that already signalled costs nothing extra.
     """
     from .signals import invalidate_all_design_cache
     return invalidate_all_design_cache()
@@ -61,7 +70,7 @@ def clear_fabric_cache():
 
 #================== END USER SIDE ====================================================
 class MainCatogeryUserSideAPIView(APIView):
-    @method_decorator(cache_page(60 * 10))  # Cache for 10 minutes
+    @method_decorator(catalog_response_cache('main_categories'))  # Stale-while-revalidate
     def get(self, request, pk=None, format=None):
         queryset = HomePageSelectionCategory.objects.filter(isHidden=False)
         serializer = HomePageSelectionCategorySerializer(
@@ -74,9 +83,9 @@ class FetchFabricAPIView(APIView):
     """
     NEW: Fetch all fabric types (base fabrics without colors)
     Returns list of FabricType objects
-    ✅ CACHED: 10 minutes (600 seconds)
+    ✅ CACHED: fresh for 10 minutes, then served stale while refreshing (catalog_cache.py)
     """
-    @method_decorator(cache_page(60 * 10))  # Cache for 10 minutes
+    @method_decorator(catalog_response_cache('fabrics'))  # Stale-while-revalidate
     def get(self, request, pk=None, format=None):
         queryset = FabricType.objects.filter(isHidden=False)
         serializer = FabricTypeSerializer(
@@ -89,9 +98,9 @@ class FetchFabricDetailAPIView(APIView):
     NEW: Fetch detailed information for a specific fabric (PUBLIC - no auth required)
     URL: /design/fetch/fabric/<fabric_id>/
     Returns single FabricType object with all details
-    ✅ CACHED: 10 minutes per fabric ID
+    ✅ CACHED: per fabric ID, stale-while-revalidate (catalog_cache.py)
     """
-    @method_decorator(cache_page(60 * 10))  # Cache for 10 minutes
+    @method_decorator(catalog_response_cache('fabrics'))  # Stale-while-revalidate
     def get(self, request, fabric_id=None, format=None):
         try:
             fabric = FabricType.objects.get(id=fabric_id, isHidden=False)
@@ -108,9 +117,9 @@ class FetchFabricColorsAPIView_New(APIView):
     NEW: Get all color variants for a specific fabric
     URL: /design/fetch/fabric/<fabric_id>/colors/
     Returns all FabricColor records for the given FabricType
-    ✅ CACHED: 10 minutes per fabric ID
+    ✅ CACHED: per fabric ID, stale-while-revalidate (catalog_cache.py)
     """
-    @method_decorator(cache_page(60 * 10))  # Cache for 10 minutes
+    @method_decorator(catalog_response_cache('fabrics'))  # Stale-while-revalidate
     def get(self, request, fabric_id=None, format=None):
         try:
             # Get the base fabric
@@ -143,9 +152,9 @@ class FetchCollerAPIView(APIView):
     Fetch collar options. Can filter by fabric_type_id (FabricType ID).
     Returns all collars for all colors of the specified fabric type.
     This allows users to mix and match colors.
-    ✅ CACHED: 10 minutes per fabric_type_id
+    ✅ CACHED: per fabric_type_id, stale-while-revalidate (catalog_cache.py)
     """
-    @method_decorator(cache_page(60 * 10))  # Cache for 10 minutes
+    @method_decorator(catalog_response_cache('components'))  # Stale-while-revalidate
     def get(self, request, pk=None, format=None):
         fabric_type_id = request.GET.get('fabric_type_id', None)
 
@@ -162,9 +171,9 @@ class FetchSleevesRightAPIView(APIView):
     """
     Fetch right sleeve options. Can filter by fabric_type_id (FabricType ID).
     Returns all right sleeves for all colors of the specified fabric type.
-    ✅ CACHED: 10 minutes per fabric_type_id
+    ✅ CACHED: per fabric_type_id, stale-while-revalidate (catalog_cache.py)
     """
-    @method_decorator(cache_page(60 * 10))  # Cache for 10 minutes
+    @method_decorator(catalog_response_cache('components'))  # Stale-while-revalidate
     def get(self, request, pk=None, format=None):
         fabric_type_id = request.GET.get('fabric_type_id', None)
 
@@ -180,9 +189,9 @@ class FetchSleevesLeftAPIView(APIView):
     """
     Fetch left sleeve options. Can filter by fabric_type_id (FabricType ID).
     Returns all left sleeves for all colors of the specified fabric type.
-    ✅ CACHED: 10 minutes per fabric_type_id
+    ✅ CACHED: per fabric_type_id, stale-while-revalidate (catalog_cache.py)
     """
-    @method_decorator(cache_page(60 * 10))  # Cache for 10 minutes
+    @method_decorator(catalog_response_cache('components'))  # Stale-while-revalidate
     def get(self, request, pk=None, format=None):
         fabric_type_id = request.GET.get('fabric_type_id', None)
 
@@ -198,9 +207,9 @@ class FetchPocketAPIView(APIView):
     """
     Fetch pocket options. Can filter by fabric_type_id (FabricType ID).
     Returns all pockets for all colors of the specified fabric type.
-    ✅ CACHED: 10 minutes per fabric_type_id
+    ✅ CACHED: per fabric_type_id, stale-while-revalidate (catalog_cache.py)
     """
-    @method_decorator(cache_page(60 * 10))  # Cache for 10 minutes
+    @method_decorator(catalog_response_cache('components'))  # Stale-while-revalidate
     def get(self, request, pk=None, format=None):
         fabric_type_id = request.GET.get('fabric_type_id', None)
 
@@ -216,9 +225,9 @@ class FetchButtonAPIView(APIView):
     """
     Fetch button options. Can filter by fabric_type_id (FabricType ID).
     Returns all buttons (including out of stock) for all colors of the specified fabric type.
-    ✅ CACHED: 10 minutes per fabric_type_id
+    ✅ CACHED: per fabric_type_id, stale-while-revalidate (catalog_cache.py)
     """
-    @method_decorator(cache_page(60 * 10))  # Cache for 10 minutes
+    @method_decorator(catalog_response_cache('components'))  # Stale-while-revalidate
     def get(self, request, pk=None, format=None):
         fabric_type_id = request.GET.get('fabric_type_id', None)
 
@@ -236,9 +245,9 @@ class FetchBodyAPIView(APIView):
     """
     Fetch body options. Can filter by fabric_type_id (FabricType ID).
     Returns all body types for all colors of the specified fabric type.
-    ✅ CACHED: 10 minutes per fabric_type_id
+    ✅ CACHED: per fabric_type_id, stale-while-revalidate (catalog_cache.py)
     """
-    @method_decorator(cache_page(60 * 10))  # Cache for 10 minutes
+    @method_decorator(catalog_response_cache('components'))  # Stale-while-revalidate
     def get(self, request, pk=None, format=None):
         fabric_type_id = request.GET.get('fabric_type_id', None)
 
@@ -562,9 +571,7 @@ class FabricTypeAdminSideAPIView(APIView):
             return Response(serializer.data, status=HTTP_200_OK, content_type='application/json; charset=utf-8')
 
         except Exception as e:
-            import traceback
-            error_message = f"Error creating fabric type: {str(e)}\n{traceback.format_exc()}"
-            print(error_message)
+            logger.exception("❌ Error creating fabric type: %s", e)
             return Response({'error': str(e)}, status=HTTP_400_BAD_REQUEST)
 
     # Update a FabricType
@@ -696,9 +703,7 @@ class FabricColorAdminSideAPIView(APIView):
                 serializer = FabricColorDetailSerializer(fabric_color, context={'request': request})
                 return Response(serializer.data, status=HTTP_200_OK, content_type='application/json; charset=utf-8')
             except Exception as e:
-                import traceback
-                error_message = f"Error creating fabric color: {str(e)}\n{traceback.format_exc()}"
-                print(error_message)
+                logger.exception("❌ Error creating fabric color: %s", e)
                 return Response({'error': str(e)}, status=HTTP_400_BAD_REQUEST)
 
         error_msg = 'Insufficient permissions. '
@@ -1492,6 +1497,43 @@ class LowStockAlertAPIView(APIView):
             }, status=HTTP_400_BAD_REQUEST)
 
 
+class LowStockForecastAPIView(APIView):
+    """
+    GET: Fabric colors projected to run out soon, from recent order velocity
+    Endpoint: /design/inventory/low-stock/forecast/
+    Query params: ?lookback_days=30 (default: INVENTORY_FORECAST_LOOKBACK_DAYS)
+                  ?horizon_days=14 (default: INVENTORY_FORECAST_HORIZON_DAYS)
+                  ?threshold=5 (also include colors at or below this stock, default: 0)
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        from .inventory import forecast_stockouts
+
+        try:
+            lookback_days = int(request.GET.get('lookback_days', settings.INVENTORY_FORECAST_LOOKBACK_DAYS))
+            horizon_days = int(request.GET.get('horizon_days', settings.INVENTORY_FORECAST_HORIZON_DAYS))
+            threshold = int(request.GET.get('threshold', 0))
+            if lookback_days < 1 or horizon_days < 1:
+                raise ValueError('lookback_days and horizon_days must be at least 1')
+
+            forecast = forecast_stockouts(lookback_days=lookback_days, horizon_days=horizon_days, threshold=threshold)
+
+            return Response({
+                'lookback_days': lookback_days,
+                'horizon_days': horizon_days,
+                'threshold': threshold,
+                'at_risk_count': len(forecast),
+                'fabrics': forecast
+            }, status=HTTP_200_OK)
+
+        except Exception as e:
+            return Response({
+                'error': 'Failed to build low stock forecast',
+                'message': str(e)
+            }, status=HTTP_400_BAD_REQUEST)
+
+
 class BulkUpdateInventoryAPIView(APIView):
     """
     PUT: Bulk update inventory quantities for multiple fabric colors
@@ -1502,74 +1544,53 @@ class BulkUpdateInventoryAPIView(APIView):
             {"fabric_color_id": 2, "quantity": 30}
         ]
     }
+    Or multipart with a CSV `file` (header: fabric_color_id,quantity[,notes]) of any
+    size - streamed in chunks, and the response lists counts and errors only.
+
+    Each chunk of INVENTORY_BULK_CHUNK_SIZE rows is applied set-based in its own
+    transaction (see Design/inventory.py).
     """
     permission_classes = [IsAdminUser]
 
-    @transaction.atomic
     def put(self, request):
-        try:
-            updates = request.data.get('updates', [])
+        from .inventory import apply_inventory_updates, chunked, iter_csv_updates
 
-            if not updates:
-                return Response({
-                    'error': 'No updates provided',
-                    'message': 'Please provide updates array'
-                }, status=HTTP_400_BAD_REQUEST)
+        try:
+            upload = request.FILES.get('file')
+            if upload is not None:
+                chunks = iter_csv_updates(upload)
+            else:
+                updates = request.data.get('updates', [])
+                if not updates:
+                    return Response({
+                        'error': 'No updates provided',
+                        'message': 'Please provide updates array or a CSV file'
+                    }, status=HTTP_400_BAD_REQUEST)
+                chunks = chunked(updates)
 
             updated_fabrics = []
+            updated_count = 0
             errors = []
-
-            for update in updates:
-                fabric_color_id = update.get('fabric_color_id')
-                new_quantity = update.get('quantity')
-                notes = update.get('notes', '')
-
-                if not fabric_color_id or new_quantity is None:
-                    errors.append({
-                        'fabric_color_id': fabric_color_id,
-                        'error': 'Missing fabric_color_id or quantity'
-                    })
-                    continue
-
-                try:
-                    fabric_color = FabricColor.objects.get(id=fabric_color_id)
-                    quantity_before = fabric_color.quantity
-                    quantity_change = new_quantity - quantity_before
-
-                    fabric_color.quantity = new_quantity
-                    fabric_color.inStock = new_quantity > 0
-                    fabric_color.save()
-
-                    # Log transaction
-                    InventoryTransaction.objects.create(
-                        fabric_color=fabric_color,
-                        transaction_type='RESTOCK' if quantity_change > 0 else 'ADJUSTMENT',
-                        quantity_change=quantity_change,
-                        quantity_before=quantity_before,
-                        quantity_after=new_quantity,
-                        notes=notes or f"Bulk update by admin",
-                        created_by=request.user
-                    )
-
-                    updated_fabrics.append({
-                        'id': fabric_color.id,
-                        'name': fabric_color.color_name_eng,
-                        'quantity_before': quantity_before,
-                        'quantity_after': new_quantity,
-                        'change': quantity_change
-                    })
-
-                except FabricColor.DoesNotExist:
-                    errors.append({
-                        'fabric_color_id': fabric_color_id,
-                        'error': 'Fabric color not found'
-                    })
-
-            return Response({
-                'message': f'Successfully updated {len(updated_fabrics)} fabric colors',
-                'updated': updated_fabrics,
+            try:
+                for chunk in chunks:
+                    updated, chunk_errors = apply_inventory_updates(chunk, user=request.user)
+                    updated_count += len(updated)
+                    errors.extend(chunk_errors)
+                    if upload is None:
+                        updated_fabrics.extend(updated)
+            finally:
+                # bulk_update skips post_save: mark the fabric scopes dirty once for everything applied
+                if updated_count:
+                    model_changed(FabricColor)
+
+            response = {
+                'message': f'Successfully updated {updated_count} fabric colors',
+                'updated_count': updated_count,
                 'errors': errors
-            }, status=HTTP_200_OK)
+            }
+            if upload is None:
+                response['updated'] = updated_fabrics
+            return Response(response, status=HTTP_200_OK)
 
         except Exception as e:
             return Response({
@@ -1583,6 +1604,7 @@ class InventoryHistoryAPIView(APIView):
     GET: Get inventory transaction history for a specific fabric color
     Endpoint: /design/inventory/history/<fabric_color_id>/
     Query params: ?limit=50 (default: 100)
+                  ?at=2025-01-31 or ISO datetime (adds the stock level at that time)
     """
     permission_classes = [IsAdminUser]
 
@@ -1615,7 +1637,7 @@ class InventoryHistoryAPIView(APIView):
                     'timestamp': transaction.timestamp
                 })
 
-            return Response({
+            response = {
                 'fabric_color': {
                     'id': fabric_color.id,
                     'name': fabric_color.color_name_eng,
@@ -1623,7 +1645,18 @@ class InventoryHistoryAPIView(APIView):
                 },
                 'transactions': data,
                 'count': len(data)
-            }, status=HTTP_200_OK)
+            }
+
+            at = request.GET.get('at')
+            if at:
+                from .inventory import parse_report_time, stock_at
+                at_time = parse_report_time(at)
+                response['stock_at'] = {
+                    'at': at_time,
+                    'quantity': stock_at(at_time, [fabric_color.id])[fabric_color.id]
+                }
+
+            return Response(response, status=HTTP_200_OK)
 
         except Exception as e:
             return Response({
@@ -1634,69 +1667,63 @@ class InventoryHistoryAPIView(APIView):
 
 class UploadDesignScreenshotAPIView(APIView):
     """
-    Upload design screenshot to Cloudinary with duplicate detection
+    Upload design screenshot with duplicate detection
     Receives base64 image and design component IDs from Flutter app
     If same design configuration exists, returns existing screenshot URL instead of uploading
+    New screenshots are spooled locally and uploaded to Cloudinary in the background;
+    the response carries a provisional URL that redirects to Cloudinary once uploaded
     """
     def post(self, request):
+        body, status_code, _ = self._accept(request, enqueue=True)
+        return Response(body, status=status_code)
+
+    def _accept(self, request, enqueue):
+        """
+        (response body, status, upload_id). With enqueue=False the upload isn't
+        queued on the worker pool; upload_id is then the screenshot the caller
+        has to upload (AsyncUploadDesignScreenshotAPIView), if any.
+        """
         import base64
-        import hashlib
-        import cloudinary.uploader
-        from io import BytesIO
         from .models import DesignScreenshot
+        from .screenshot_pipeline import (
+            COMPONENT_FIELDS, compute_design_hash, submit_screenshot, mark_reused, enqueue_upload
+        )
 
         try:
             # Get design component IDs (all optional)
-            fabric_color_id = request.data.get('fabric_color_id')
-            collar_id = request.data.get('collar_id')
-            sleeve_left_id = request.data.get('sleeve_left_id')
-            sleeve_right_id = request.data.get('sleeve_right_id')
-            pocket_id = request.data.get('pocket_id')
-            button_id = request.data.get('button_id')
-            body_id = request.data.get('body_id')
-
-            # Create hash from component IDs to identify unique design configurations
-            # Use sorted list to ensure consistent hash for same components
-            component_ids = [
-                str(fabric_color_id) if fabric_color_id else 'none',
-                str(collar_id) if collar_id else 'none',
-                str(sleeve_left_id) if sleeve_left_id else 'none',
-                str(sleeve_right_id) if sleeve_right_id else 'none',
-                str(pocket_id) if pocket_id else 'none',
-                str(button_id) if button_id else 'none',
-                str(body_id) if body_id else 'none',
-            ]
-
-            # Create MD5 hash of component IDs
-            design_hash = hashlib.md5('|'.join(component_ids).encode()).hexdigest()
+            component_ids = {field: request.data.get(field) for field in COMPONENT_FIELDS}
 
-            # Check if screenshot for this exact design configuration already exists
-            try:
-                existing_screenshot = DesignScreenshot.objects.get(design_hash=design_hash)
+            # Create MD5 hash of component IDs to identify unique design configurations
+            design_hash = compute_design_hash(component_ids)
 
-                # Increment reuse counter
-                existing_screenshot.times_reused += 1
-                existing_screenshot.save()
+            # Check if screenshot for this exact design configuration already exists
+            existing_screenshot = DesignScreenshot.objects.filter(design_hash=design_hash).first()
+            if existing_screenshot:
+                # Increment reuse counter atomically
+                mark_reused(existing_screenshot.pk)
+
+                # Retry uploads that failed earlier (spool file is kept on failure)
+                upload_id = None
+                if existing_screenshot.upload_status == DesignScreenshot.UPLOAD_STATUS_FAILED:
+                    if enqueue:
+                        enqueue_upload(existing_screenshot.pk)
+                    else:
+                        upload_id = existing_screenshot.pk
 
                 # Return existing screenshot URL without uploading
-                return Response({
-                    'success': True,
-                    'url': existing_screenshot.screenshot_url,
-                    'public_id': existing_screenshot.cloudinary_public_id,
-                    'reused': True,
-                    'message': 'Existing screenshot returned for identical design'
-                }, status=HTTP_200_OK)
-
-            except DesignScreenshot.DoesNotExist:
-                # No existing screenshot - proceed with upload
-                pass
+                return (
+                    self._screenshot_response(request, existing_screenshot, reused=True,
+                                              message='Existing screenshot returned for identical design'),
+                    HTTP_200_OK,
+                    upload_id
+                )
 
             # Get base64 image data from request
             image_data = request.data.get('image')
             if not image_data:
-                return Response({
+                return {
                     'error': 'No image data provided'
-                }, status=HTTP_400_BAD_REQUEST)
+                }, HTTP_400_BAD_REQUEST, None
 
             # Decode base64 image
             try:
@@ -1706,53 +1733,111 @@ class UploadDesignScreenshotAPIView(APIView):
 
                 image_bytes = base64.b64decode(image_data)
             except Exception as e:
-                return Response({
+                return {
                     'error': 'Invalid image data',
                     'message': str(e)
-                }, status=HTTP_400_BAD_REQUEST)
+                }, HTTP_400_BAD_REQUEST, None
 
-            # Upload to Cloudinary
+            # Spool locally and queue the Cloudinary upload
             try:
-                result = cloudinary.uploader.upload(
-                    image_bytes,
-                    folder='user_designs',
-                    resource_type='image'
-                )
-
-                # Save screenshot information to database for future reuse
-                DesignScreenshot.objects.create(
-                    design_hash=design_hash,
-                    screenshot_url=result['secure_url'],
-                    cloudinary_public_id=result['public_id'],
-                    fabric_color_id=fabric_color_id,
-                    collar_id=collar_id,
-                    sleeve_left_id=sleeve_left_id,
-                    sleeve_right_id=sleeve_right_id,
-                    pocket_id=pocket_id,
-                    button_id=button_id,
-                    body_id=body_id,
-                    times_reused=0
-                )
-
-                return Response({
-                    'success': True,
-                    'url': result['secure_url'],
-                    'public_id': result['public_id'],
-                    'reused': False,
-                    'message': 'New screenshot uploaded and saved'
-                }, status=HTTP_200_OK)
-
+                screenshot, created = submit_screenshot(design_hash, image_bytes, component_ids, enqueue=enqueue)
             except Exception as e:
-                return Response({
-                    'error': 'Failed to upload to Cloudinary',
+                return {
+                    'error': 'Failed to store screenshot',
                     'message': str(e)
-                }, status=HTTP_400_BAD_REQUEST)
+                }, HTTP_400_BAD_REQUEST, None
+
+            upload_id = None
+            if not created:
+                message = 'Existing screenshot returned for identical design'
+            elif screenshot.upload_status == DesignScreenshot.UPLOAD_STATUS_UPLOADED:
+                message = 'Identical screenshot already uploaded, reusing it'
+            else:
+                message = 'Screenshot accepted, upload in progress'
+                upload_id = None if enqueue else screenshot.pk
+
+            return (
+                self._screenshot_response(request, screenshot, reused=not created, message=message),
+                HTTP_200_OK,
+                upload_id
+            )
 
         except Exception as e:
-            return Response({
+            return {
                 'error': 'Upload failed',
                 'message': str(e)
-            }, status=HTTP_400_BAD_REQUEST)
+            }, HTTP_400_BAD_REQUEST, None
+
+    def _screenshot_response(self, request, screenshot, reused, message):
+        """Final Cloudinary URL when uploaded, otherwise the provisional spool URL"""
+        from django.urls import reverse
+        from .models import DesignScreenshot
+
+        if screenshot.upload_status == DesignScreenshot.UPLOAD_STATUS_UPLOADED and screenshot.screenshot_url:
+            url = screenshot.screenshot_url
+        else:
+            url = request.build_absolute_uri(
+                reverse('Design-api:design-screenshot', args=[screenshot.design_hash])
+            )
+
+        return {
+            'success': True,
+            'url': url,
+            'public_id': screenshot.cloudinary_public_id,
+            'screenshot_id': screenshot.design_hash,
+            'upload_status': screenshot.upload_status,
+            'reused': reused,
+            'message': message
+        }
+
+
+class AsyncUploadDesignScreenshotAPIView(AsyncAPIView):
+    """
+    UploadDesignScreenshotAPIView for ASGI deployments (same request and response).
+    Dedup and spooling run in one sync_to_async hop; the Cloudinary upload of a
+    new screenshot runs as a task on the event loop after the response is sent
+    (see screenshot_pipeline.process_screenshot_async).
+    """
+    async def post(self, request):
+        from .screenshot_pipeline import schedule_upload_async
+
+        body, status_code, upload_id = await sync_to_async(UploadDesignScreenshotAPIView()._accept)(
+            request, enqueue=False
+        )
+        if upload_id:
+            schedule_upload_async(upload_id)
+        return JsonResponse(body, status=status_code)
+
+
+class DesignScreenshotFileAPIView(APIView):
+    """
+    GET: Provisional screenshot URL returned by UploadDesignScreenshotAPIView
+    Endpoint: /design/screenshot/<design_hash>/
+    Redirects to Cloudinary once uploaded, serves the spooled file while pending
+    """
+    def get(self, request, design_hash):
+        import os
+        from django.http import FileResponse, Http404
+        from django.shortcuts import redirect
+        from .models import DesignScreenshot
+        from .screenshot_pipeline import spool_path, guess_content_type
+
+        screenshot = DesignScreenshot.objects.filter(design_hash=design_hash).only(
+            'design_hash', 'screenshot_url', 'upload_status'
+        ).first()
+        if not screenshot:
+            raise Http404('Screenshot not found')
+
+        if screenshot.upload_status == DesignScreenshot.UPLOAD_STATUS_UPLOADED and screenshot.screenshot_url:
+            return redirect(screenshot.screenshot_url)
+
+        path = spool_path(screenshot.design_hash)
+        if not os.path.exists(path):
+            raise Http404('Screenshot not available')
+
+        with open(path, 'rb') as f:
+            header = f.read(12)
+        return FileResponse(open(path, 'rb'), content_type=guess_content_type(header))
 
 
 def all_design_view(request):
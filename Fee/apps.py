@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class FeeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Fee'
+
+    def ready(self):
+        """
+        Import signals when Django starts
+        This keeps the in-process area index in sync with edits
+        """
+        import Fee.signals  # noqa
@@ -0,0 +1,152 @@
+"""
+Fee/Area Lookup Index
+The delivery fee table (Kuwait areas: small, rarely edited) held in process
+memory with an n-gram index over the English and Arabic area names, so the
+checkout area search answers every keystroke without a database query.
+
+- Built once per process per version: one query for the areas, one for the
+  fees with their area joined, serialized once with the API serializers
+- A search matches a substring of either name, like the icontains filters it
+  replaces, after folding case and Arabic letter variants (hamza forms of
+  alef, ta marbuta, alef maqsura, diacritics); names starting with the query
+  are listed first for autocomplete
+- The version lives in the shared cache and is bumped after commit by Fee/Area
+  saves and deletes (see Fee/signals.py); every process rebuilds on its next
+  lookup, which otherwise costs one cache read
+"""
+import re
+import threading
+import time
+from collections import defaultdict, namedtuple
+
+from django.core.cache import cache
+
+VERSION_KEY = 'fees:area_index:version'
+# Names are indexed by every 1..GRAM_SIZE character substring
+GRAM_SIZE = 3
+
+ARABIC_MARKS = re.compile('[\u0640\u064B-\u0652\u0670]')  # tatweel, tashkeel, superscript alef
+ARABIC_LETTERS = str.maketrans({'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا', 'ة': 'ه', 'ى': 'ي'})
+
+AreaIndex = namedtuple('AreaIndex', ['version', 'areas', 'names', 'fees', 'postings'])
+
+_memo = {'index': None}
+_build_lock = threading.Lock()
+
+
+# ================== VERSION KEY ==================
+def _get_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Seed from the clock so a cleared cache never reuses an old version number;
+        # with the cache unavailable every lookup gets a new version, i.e. rebuilds
+        cache.add(VERSION_KEY, int(time.time() * 1000), None)
+        version = cache.get(VERSION_KEY) or time.time_ns()
+    return version
+
+
+def bump_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # Key missing: the next read seeds a fresh version
+        pass
+
+
+# ================== INDEX ==================
+def normalize(text):
+    """Case-folded, Arabic-letter-folded, whitespace-collapsed form used for matching"""
+    text = ARABIC_MARKS.sub('', (text or '').casefold()).translate(ARABIC_LETTERS)
+    return ' '.join(text.split())
+
+
+def _grams(text, size):
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def _build_index(version):
+    from .models import Area, Fee
+    from .serializers import AreaSerializer, FeeSerializer
+
+    areas = list(Area.objects.order_by('id'))
+    fees = list(Fee.objects.select_related('area').order_by('id'))
+
+    names = {}
+    postings = defaultdict(set)
+    for area in areas:
+        area_names = tuple({normalize(area.area_name_eng), normalize(area.area_name_arb)} - {''})
+        names[area.id] = area_names
+        for name in area_names:
+            for size in range(1, GRAM_SIZE + 1):
+                for gram in _grams(name, size):
+                    postings[gram].add(area.id)
+
+    return AreaIndex(
+        version=version,
+        areas=dict(zip((area.id for area in areas), AreaSerializer(areas, many=True).data)),
+        names=names,
+        # (area id, available, serialized fee) in id order
+        fees=tuple(
+            (fee.area_id, fee.availble, data)
+            for fee, data in zip(fees, FeeSerializer(fees, many=True).data)
+        ),
+        postings={gram: frozenset(ids) for gram, ids in postings.items()},
+    )
+
+
+def get_index():
+    """The current AreaIndex, rebuilt from the database only when the version moved"""
+    version = _get_version()
+    index = _memo['index']
+    if index is not None and index.version == version:
+        return index
+
+    with _build_lock:
+        index = _memo['index']
+        if index is None or index.version != version:
+            index = _build_index(version)
+            _memo['index'] = index
+    return index
+
+
+def match_area_ids(index, query):
+    """Ids of the areas whose names contain the query, prefix matches first, else by id"""
+    query = normalize(query)
+    if not query:
+        return list(index.areas)
+
+    candidates = None
+    for gram in _grams(query, min(len(query), GRAM_SIZE)):
+        ids = index.postings.get(gram, frozenset())
+        candidates = ids if candidates is None else candidates & ids
+        if not candidates:
+            return []
+
+    matches = [
+        area_id for area_id in sorted(candidates)
+        if any(query in name for name in index.names[area_id])
+    ]
+
+    def is_prefix(area_id):
+        return any(name.startswith(query) or f' {query}' in name for name in index.names[area_id])
+
+    return sorted(matches, key=lambda area_id: not is_prefix(area_id))
+
+
+# ================== LOOKUPS ==================
+def search_areas(query=None):
+    """Serialized areas matching the query (all areas when it's empty)"""
+    index = get_index()
+    return [index.areas[area_id] for area_id in match_area_ids(index, query)]
+
+
+def search_fees(query=None, available_only=False):
+    """Serialized fees (with their area) whose area matches the query, in the areas' match order"""
+    index = get_index()
+    fees = [fee for fee in index.fees if fee[1] or not available_only]
+    if not normalize(query):
+        return [data for _, _, data in fees]
+
+    rank = {area_id: position for position, area_id in enumerate(match_area_ids(index, query))}
+    matched = [fee for fee in fees if fee[0] in rank]
+    return [data for _, _, data in sorted(matched, key=lambda fee: rank[fee[0]])]
@@ -0,0 +1,19 @@
+"""
+Fee/Area Index Invalidation using Django Signals
+Bumps the area index version when fees or areas change (see Fee/area_index.py)
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Area, Fee
+from .area_index import bump_version
+
+
+@receiver(post_save, sender=Area)
+@receiver(post_delete, sender=Area)
+@receiver(post_save, sender=Fee)
+@receiver(post_delete, sender=Fee)
+def fee_table_changed(sender, instance, **kwargs):
+    """Rebuild the index on next lookup (after commit, so it can't index uncommitted rows)"""
+    transaction.on_commit(bump_version)
@@ -1,3 +1,25 @@
+from unittest import mock
+
 from django.test import TestCase
 
-# Create your tests here.
+from . import area_index
+from .models import Area
+
+
+class AreaIndexVersionTests(TestCase):
+    """The in-process index follows Fee/Area edits"""
+
+    def setUp(self):
+        area_index._memo['index'] = None
+        Area.objects.create(area_name_eng='Salmiya', area_name_arb='السالمية')
+
+    @mock.patch.object(area_index.cache, 'add', return_value=None)
+    @mock.patch.object(area_index.cache, 'get', return_value=None)
+    def test_unavailable_cache_rebuilds(self, cache_get, cache_add):
+        self.assertEqual([area['area_name_eng'] for area in area_index.search_areas('sal')], ['Salmiya'])
+
+        Area.objects.create(area_name_eng='Salwa', area_name_arb='سلوى')
+
+        self.assertEqual(
+            [area['area_name_eng'] for area in area_index.search_areas('sal')], ['Salmiya', 'Salwa']
+        )
@@ -1,10 +1,10 @@
 from django.shortcuts import render
 from .models import Fee, Area
-from .serializers import FeeSerializer, AreaSerializer
+from .serializers import FeeSerializer
+from .area_index import bump_version, search_areas, search_fees
 from rest_framework.response import Response
 from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST, HTTP_401_UNAUTHORIZED
 from rest_framework.views import APIView
-from django.db.models import Q
 from django.db import transaction
 
 
@@ -29,6 +29,8 @@ class FeeABIVIew(APIView):
                 # Use the bulk_create method within a transaction to optimize the operation
                 with transaction.atomic():
                     created_fees = Fee.objects.bulk_create(fees_to_create)
+                    # bulk_create sends no post_save
+                    transaction.on_commit(bump_version)
                 serializer = FeeSerializer(
                     created_fees, context={'request': request}, many=True)
 
@@ -94,11 +96,8 @@ class FeeListAPIVIew(APIView):
         user = self.request.user
         name = self.request.query_params.get('name', None)
         if user.is_authenticated and user.profile.premission == "Admin" or user.profile.premission == "Data-Entry" or user.profile.premission == "Partner":
-            fee = Fee.objects.filter(
-                Q(area__area_name_eng__icontains=name) | Q(area__area_name_arb__icontains=name))
-            serializer = FeeSerializer(
-                fee, context={'request': request},  many=True)
-            return Response(serializer.data, status=HTTP_200_OK, content_type='application/json; charset=utf-8')
+            # Served from the in-process area index (see area_index.py)
+            return Response(search_fees(name), status=HTTP_200_OK, content_type='application/json; charset=utf-8')
         return Response('Something went wrong', status=HTTP_400_BAD_REQUEST)
 
 
@@ -108,15 +107,9 @@ class FeeListUserAPIVIew(APIView):
         user = self.request.user
 
         if user.is_authenticated: 
-            if name is not None:
-                fee = Fee.objects.filter((Q(area__area_name_eng__icontains=name) | Q(
-                    area__area_name_arb__icontains=name)), availble=True)
-            else:
-                fee = Fee.objects.filter(availble=True)
-
-            serializer = FeeSerializer(
-                fee, context={'request': request},  many=True)
-            return Response(serializer.data, status=HTTP_200_OK, content_type='application/json; charset=utf-8')
+            # Served from the in-process area index (see area_index.py)
+            fees = search_fees(name, available_only=True)
+            return Response(fees, status=HTTP_200_OK, content_type='application/json; charset=utf-8')
         return Response('Something went wrong', status=HTTP_400_BAD_REQUEST)
 
 
@@ -126,9 +119,6 @@ class FeeAreaAPIVIew(APIView):
         name = self.request.query_params.get('name', None)
 
         if user.is_authenticated and user.profile.premission == "Admin" or user.profile.premission == "Data-Entry" or user.profile.premission == "Partner":
-            area = Area.objects.filter(
-                (Q(area_name_eng__icontains=name) | Q(area_name_arb__icontains=name)))
-            serializer = AreaSerializer(
-                area, context={'request': request},  many=True)
-            return Response(serializer.data, status=HTTP_200_OK, content_type='application/json; charset=utf-8')
+            # Served from the in-process area index (see area_index.py)
+            return Response(search_areas(name), status=HTTP_200_OK, content_type='application/json; charset=utf-8')
         return Response('Something went wrong', status=HTTP_400_BAD_REQUEST)
@@ -1,7 +1,10 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.utils import timezone
-from .models import PromotionalNotification, NotificationLog, CartAbandonmentTracker
+from .models import (
+    PromotionalNotification, NotificationLog, CartAbandonmentTracker, NotificationOutbox,
+    NotificationLogArchive, NotificationDailyStat,
+)
 
 
 @admin.register(PromotionalNotification)
@@ -202,6 +205,9 @@ class NotificationLogAdmin(admin.ModelAdmin):
         'sent_at',
     ]
     date_hierarchy = 'created_at'
+    list_select_related = ['user__user']
+    # Skip the unfiltered COUNT(*) over the whole log on every changelist page
+    show_full_result_count = False
 
     def has_add_permission(self, request):
         """Disable manual creation - logs are auto-generated"""
@@ -385,3 +391,38 @@ class CartAbandonmentTrackerAdmin(admin.ModelAdmin):
             '<span style="background-color: #6B7280; color: white; padding: 3px 8px; border-radius: 8px; font-size: 10px; font-weight: 600;">⏳ ABANDONED</span>'
         )
     conversion_status_badge.short_description = 'Conversion'
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ['id', 'event_type', 'status', 'attempts', 'created_at', 'available_at', 'sent_at']
+    list_filter = ['status', 'event_type', 'created_at']
+    search_fields = ['event_type', 'last_error']
+    readonly_fields = ['event_type', 'payload', 'attempts', 'last_error', 'created_at', 'available_at', 'updated_at', 'sent_at']
+    ordering = ['-created_at']
+
+
+@admin.register(NotificationDailyStat)
+class NotificationDailyStatAdmin(admin.ModelAdmin):
+    """Per-day delivery counters (maintained on write, no scan of the raw log)"""
+    list_display = ['date', 'notification_type', 'channel', 'sent_count', 'failed_count']
+    list_filter = ['notification_type', 'channel', 'date']
+    date_hierarchy = 'date'
+    readonly_fields = ['date', 'notification_type', 'channel', 'sent_count', 'failed_count']
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(NotificationLogArchive)
+class NotificationLogArchiveAdmin(admin.ModelAdmin):
+    list_display = ['original_id', 'notification_type', 'user_id', 'title', 'was_sent', 'created_at']
+    list_filter = ['notification_type', 'was_sent']
+    search_fields = ['title']
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,172 @@
+"""
+Cart Abandonment Reminders
+Selects carts left for 24+ hours in SQL and delivers the reminders in batches.
+
+- The 24h cutoff is part of the query, so it runs as a range scan on the
+  (notification_sent, cart_last_updated) index instead of loading every unsent tracker
+- Trackers are streamed in keyset-paginated chunks; only users with an active
+  device token are selected
+- A reminder goes to every active device of the user (tokens for the whole
+  chunk are loaded in one query) and is sent with FCM batch calls
+  (messaging.send_each, up to 500 messages each)
+- Each chunk ends with one UPDATE for the delivered trackers and one INSERT for the logs
+- Per-token results feed the device token registry, so dead tokens stop being selected
+"""
+import logging
+from datetime import timedelta
+
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from firebase_admin import messaging
+
+from Notification.models import CartAbandonmentTracker, NotificationLog
+from Notification.notification_utils import initialize_firebase
+from Notification.retention import record_daily_counts
+from User.device_tokens import active_tokens_by_profile, record_send_results
+from User.models import DeviceToken
+
+logger = logging.getLogger(__name__)
+
+ABANDONMENT_DELAY = timedelta(hours=24)
+# FCM accepts at most 500 messages per batch request
+FCM_BATCH_SIZE = 500
+
+TITLE = 'Cart Reminder 🛒'
+BODY = 'You left {count} items in your cart — complete checkout to reserve them!'
+
+
+def due_trackers(now=None):
+    """Unsent, unconverted trackers older than 24h whose user has an active device token"""
+    cutoff = (now or timezone.now()) - ABANDONMENT_DELAY
+    return (
+        CartAbandonmentTracker.objects
+        .filter(notification_sent=False, cart_last_updated__lte=cutoff, order_completed=False)
+        .filter(Exists(DeviceToken.objects.filter(profile_id=OuterRef('user_id'), is_active=True)))
+        .only('id', 'cart_items_count', 'cart_total', 'cart_last_updated', 'user_id')
+        .order_by('cart_last_updated', 'id')
+    )
+
+
+def iter_due_chunks(chunk_size=FCM_BATCH_SIZE, now=None):
+    """
+    Stream due trackers in chunks using keyset pagination on (cart_last_updated, id).
+    Keyset (not OFFSET) keeps every chunk an index seek, and trackers that fail to
+    send in one chunk don't shift the window of the next one.
+    """
+    queryset = due_trackers(now)
+    last_updated, last_id = None, 0
+    while True:
+        page = queryset
+        if last_updated is not None:
+            page = page.filter(
+                Q(cart_last_updated__gt=last_updated) | Q(cart_last_updated=last_updated, id__gt=last_id)
+            )
+        chunk = list(page[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_updated, last_id = chunk[-1].cart_last_updated, chunk[-1].id
+        if len(chunk) < chunk_size:
+            return
+
+
+def build_message(tracker, token):
+    return messaging.Message(
+        notification=messaging.Notification(
+            title=TITLE,
+            body=BODY.format(count=tracker.cart_items_count),
+        ),
+        data={
+            'type': 'cart_abandoned',
+            'notification_type': 'cart_abandoned',
+            'cart_items_count': str(tracker.cart_items_count),
+            'cart_total': str(tracker.cart_total),
+            'priority': 'medium',
+        },
+        token=token,
+    )
+
+
+def send_chunk(trackers, send_batch=None):
+    """
+    Send one chunk of reminders to every active device of each user and record
+    the results. A reminder counts as sent when any of the user's devices accepted it.
+    Returns (sent_count, failed_count).
+    """
+    send_batch = send_batch or messaging.send_each
+    device_tokens = active_tokens_by_profile([tracker.user_id for tracker in trackers])
+    deliveries = [
+        (tracker, token)
+        for tracker in trackers
+        for token in device_tokens.get(tracker.user_id, [])
+    ]
+
+    delivered, errors = set(), {}
+    token_results = []
+    for start in range(0, len(deliveries), FCM_BATCH_SIZE):
+        batch = deliveries[start:start + FCM_BATCH_SIZE]
+        try:
+            responses = send_batch([build_message(tracker, token) for tracker, token in batch]).responses
+        except Exception as e:
+            logger.error(f"❌ Cart abandonment batch failed: {e}")
+            for tracker, _ in batch:
+                errors.setdefault(tracker.id, str(e))
+            continue
+        for (tracker, token), response in zip(batch, responses):
+            token_results.append((token, None if response.success else response.exception))
+            if response.success:
+                delivered.add(tracker.id)
+            else:
+                errors.setdefault(tracker.id, str(response.exception))
+
+    now = timezone.now()
+    sent_ids = []
+    logs = []
+    for tracker in trackers:
+        sent = tracker.id in delivered
+        if sent:
+            sent_ids.append(tracker.id)
+        logs.append(NotificationLog(
+            notification_type='cart_abandoned',
+            priority='medium',
+            channel='push',
+            user_id=tracker.user_id,
+            title=TITLE,
+            body=BODY.format(count=tracker.cart_items_count),
+            was_sent=sent,
+            error_message=None if sent else errors.get(tracker.id, 'No active device tokens'),
+            sent_at=now if sent else None,
+        ))
+
+    if sent_ids:
+        # Queryset update: doesn't bump the auto_now cart_last_updated like save() did
+        CartAbandonmentTracker.objects.filter(pk__in=sent_ids).update(
+            notification_sent=True,
+            notification_sent_at=now
+        )
+    NotificationLog.objects.bulk_create(logs)
+    record_daily_counts(logs)
+    record_send_results(token_results)
+
+    return len(sent_ids), len(trackers) - len(sent_ids)
+
+
+def send_due_reminders(chunk_size=FCM_BATCH_SIZE, dry_run=False, send_batch=None, now=None):
+    """
+    Send all due cart abandonment reminders.
+    Returns {'due': n, 'sent': n, 'failed': n, 'chunks': n}.
+    """
+    if not dry_run and send_batch is None:
+        initialize_firebase()
+
+    stats = {'due': 0, 'sent': 0, 'failed': 0, 'chunks': 0}
+    for chunk in iter_due_chunks(chunk_size=min(chunk_size, FCM_BATCH_SIZE), now=now):
+        stats['chunks'] += 1
+        stats['due'] += len(chunk)
+        if dry_run:
+            continue
+        sent, failed = send_chunk(chunk, send_batch=send_batch)
+        stats['sent'] += sent
+        stats['failed'] += failed
+
+    return stats
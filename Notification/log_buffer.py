@@ -0,0 +1,185 @@
+"""
+Buffered NotificationLog Writer
+Collects NotificationLog rows in memory and writes them with bulk_create,
+instead of one INSERT per notification sent.
+
+A flush happens when:
+- the buffer reaches NOTIFICATION_LOG_BUFFER_SIZE records
+- the oldest buffered record is older than NOTIFICATION_LOG_FLUSH_INTERVAL seconds
+  (checked on every add and by a background flusher thread)
+- the transaction that added records commits
+- a batch() block exits (campaigns, scheduler jobs, outbox drains)
+- the process exits (atexit), so records are not lost on worker shutdown
+
+Every flush also bumps the per-type NotificationDailyStat counters.
+
+If a flush fails because the database is unavailable the records are put back
+and retried on the next flush, up to NOTIFICATION_LOG_BUFFER_LIMIT records. If
+the database refuses a row (integrity or data error) the batch is written row by
+row and only the refused rows are dropped.
+"""
+import atexit
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import (
+    DataError, IntegrityError, InterfaceError, OperationalError, close_old_connections, connection, transaction
+)
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationLogBuffer:
+
+    def __init__(self, max_size=None, flush_interval=None, limit=None):
+        self.max_size = max_size or settings.NOTIFICATION_LOG_BUFFER_SIZE
+        self.flush_interval = flush_interval or settings.NOTIFICATION_LOG_FLUSH_INTERVAL
+        self.limit = limit or settings.NOTIFICATION_LOG_BUFFER_LIMIT
+
+        self._records = []
+        self._oldest = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._local = threading.local()
+        self._flusher = None
+
+    # ---------------- public API ----------------
+    def add(self, **fields):
+        """Buffer one log record. Returns the (unsaved) NotificationLog instance."""
+        from Notification.models import NotificationLog
+
+        record = NotificationLog(**fields)
+        with self._lock:
+            self._records.append(record)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            should_flush = len(self._records) >= self.max_size or self._is_stale()
+
+        self._ensure_flusher()
+
+        if getattr(self._local, 'depth', 0):
+            # Inside batch(): flushed when the block exits
+            if should_flush:
+                self.flush()
+        elif connection.in_atomic_block:
+            self._flush_on_commit()
+        elif should_flush:
+            self.flush()
+
+        return record
+
+    def flush(self):
+        """Write all buffered records with one bulk_create. Returns the number written."""
+        from Notification.models import NotificationLog
+        from Notification.retention import record_daily_counts
+
+        with self._flush_lock:
+            with self._lock:
+                records, self._records = self._records, []
+                self._oldest = None
+            if not records:
+                return 0
+
+            try:
+                NotificationLog.objects.bulk_create(records, batch_size=self.max_size)
+            except (OperationalError, InterfaceError) as e:
+                self._requeue(records)
+                logger.error(f"❌ Error flushing {len(records)} notification logs: {e}")
+                return 0
+            except (IntegrityError, DataError) as e:
+                # A bad row (user deleted since add(), value too long) must not block the rest
+                logger.warning(f"⚠️ Flushing {len(records)} notification logs row by row: {e}")
+                records = self._write_each(records)
+
+            record_daily_counts(records)
+            return len(records)
+
+    @contextmanager
+    def batch(self):
+        """Defer flushing until the block exits (per campaign / per worker batch)"""
+        self._local.depth = getattr(self._local, 'depth', 0) + 1
+        try:
+            yield self
+        finally:
+            self._local.depth -= 1
+            if not self._local.depth:
+                if connection.in_atomic_block:
+                    self._flush_on_commit()
+                else:
+                    self.flush()
+
+    def __len__(self):
+        return len(self._records)
+
+    # ---------------- internals ----------------
+    def _requeue(self, records):
+        """Put records back (oldest first) for the next flush, keeping the buffer bounded"""
+        with self._lock:
+            self._records = (records + self._records)[-self.limit:]
+            self._oldest = self._oldest or time.monotonic()
+
+    def _write_each(self, records):
+        """Insert records one at a time, dropping the ones the database refuses. Returns those written."""
+        from Notification.models import NotificationLog
+
+        written = []
+        for index, record in enumerate(records):
+            try:
+                with transaction.atomic():
+                    NotificationLog.objects.bulk_create([record])
+            except (IntegrityError, DataError) as e:
+                logger.error(
+                    f"❌ Dropping {record.notification_type} notification log for user {record.user_id}: {e}"
+                )
+                continue
+            except (OperationalError, InterfaceError) as e:
+                self._requeue(records[index:])
+                logger.error(f"❌ Error flushing {len(records) - index} notification logs: {e}")
+                break
+            written.append(record)
+        return written
+
+    def _is_stale(self):
+        return self._oldest is not None and time.monotonic() - self._oldest >= self.flush_interval
+
+    def _flush_on_commit(self):
+        """
+        Register one on_commit flush per transaction.
+        Checked against the connection's pending hooks rather than a flag, as a
+        rollback (of the transaction or of the savepoint that registered it)
+        discards the hook without running it.
+        """
+        if any(func == self.flush for _, func, _ in connection.run_on_commit):
+            return
+        transaction.on_commit(self.flush)
+
+    def _ensure_flusher(self):
+        if self._flusher is None:
+            with self._lock:
+                if self._flusher is None:
+                    self._flusher = threading.Thread(
+                        target=self._run_flusher,
+                        name='notification-log-flusher',
+                        daemon=True
+                    )
+                    self._flusher.start()
+
+    def _run_flusher(self):
+        """Background thread: flush records that have waited longer than flush_interval"""
+        while True:
+            time.sleep(min(1.0, self.flush_interval))
+            if not self._records or not self._is_stale():
+                continue
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+
+notification_log_buffer = NotificationLogBuffer()
+
+# Drain whatever is left when the worker shuts down
+atexit.register(notification_log_buffer.flush)
@@ -0,0 +1,45 @@
+"""
+Management command to archive old notification logs and maintain daily stats
+
+Usage:
+    python manage.py archive_notification_logs
+    python manage.py archive_notification_logs --days 30 --batch-size 5000
+    python manage.py archive_notification_logs --rebuild-stats     # backfill NotificationDailyStat
+"""
+
+from django.core.management.base import BaseCommand
+from Notification.retention import archive_old_logs, prune_archive, rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = 'Move NotificationLog rows past the retention window to the archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Keep this many days in the live log (default: NOTIFICATION_LOG_RETENTION_DAYS)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Rows moved per transaction (default: NOTIFICATION_LOG_ARCHIVE_BATCH_SIZE)',
+        )
+        parser.add_argument(
+            '--rebuild-stats',
+            action='store_true',
+            help='Recompute the daily counters from the live log and archive before archiving',
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild_stats']:
+            rows = rebuild_daily_stats()
+            self.stdout.write(self.style.SUCCESS(f'📊 Rebuilt {rows} daily stat rows'))
+
+        archived = archive_old_logs(retention_days=options['days'], batch_size=options['batch_size'])
+        pruned = prune_archive(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Archived {archived} notification logs, pruned {pruned} archived rows'
+        ))
@@ -0,0 +1,129 @@
+"""
+Management command to benchmark cart abandonment selection and delivery
+
+Seeds N trackers (inside a transaction that is rolled back at the end), then
+times the previous per-row loop against the SQL-side batched implementation.
+FCM is replaced by an in-process sender that accepts every message, so the
+numbers measure the database side only.
+
+Usage:
+    python manage.py benchmark_cart_abandonment
+    python manage.py benchmark_cart_abandonment --trackers 100000 --skip-legacy
+"""
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from Notification.cart_abandonment import send_due_reminders
+from Notification.models import CartAbandonmentTracker, NotificationLog
+from User.models import DeviceToken, Profile
+
+
+class _AcceptedResponse:
+    success = True
+    exception = None
+
+
+class _BatchResponse:
+    def __init__(self, count):
+        self.responses = [_AcceptedResponse()] * count
+
+
+def accept_all(messages):
+    """Stand-in for messaging.send_each"""
+    return _BatchResponse(len(messages))
+
+
+class Command(BaseCommand):
+    help = 'Benchmark cart abandonment reminders over a seeded set of trackers (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--trackers', type=int, default=100_000, help='Trackers to seed (default: 100000)')
+        parser.add_argument('--skip-legacy', action='store_true', help='Skip the previous per-row implementation')
+
+    def handle(self, *args, **options):
+        total = options['trackers']
+
+        with transaction.atomic():
+            self._seed(total)
+
+            if not options['skip_legacy']:
+                sid = transaction.savepoint()
+                self._measure('Per-row loop (previous)', self._legacy)
+                transaction.savepoint_rollback(sid)
+
+            self._measure('SQL cutoff + batches', lambda: send_due_reminders(send_batch=accept_all)['sent'])
+
+            transaction.set_rollback(True)
+
+        self.stdout.write('🧹 Seed data rolled back')
+
+    def _seed(self, total):
+        started = time.perf_counter()
+        prefix = f"bench{int(time.time())}"
+        User.objects.bulk_create(
+            [User(username=f"{prefix}_{i}", email=f"{prefix}_{i}@example.com") for i in range(total)],
+            batch_size=2000
+        )
+        users = User.objects.filter(username__startswith=f"{prefix}_").only('id')
+        Profile.objects.bulk_create(
+            # 10% of users have no FCM token
+            [Profile(user_id=u.id, fcm_token=None if u.id % 10 == 0 else f"token-{u.id}") for u in users],
+            batch_size=2000
+        )
+        profiles = list(Profile.objects.filter(user__username__startswith=f"{prefix}_").values_list('id', 'fcm_token'))
+        profile_ids = [pid for pid, _ in profiles]
+        DeviceToken.objects.bulk_create(
+            [DeviceToken(profile_id=pid, token=token) for pid, token in profiles if token],
+            batch_size=2000
+        )
+        CartAbandonmentTracker.objects.bulk_create(
+            [CartAbandonmentTracker(user_id=pid, cart_items_count=3, cart_total=12) for pid in profile_ids],
+            batch_size=2000
+        )
+        # 80% of carts are older than 24h
+        now = timezone.now()
+        trackers = CartAbandonmentTracker.objects.filter(user_id__in=profile_ids)
+        trackers.update(cart_last_updated=now - timedelta(hours=30))
+        recent_ids = list(trackers.values_list('id', flat=True)[:total // 5])
+        CartAbandonmentTracker.objects.filter(id__in=recent_ids).update(cart_last_updated=now - timedelta(hours=2))
+
+        self.stdout.write(f"🌱 Seeded {total} trackers in {time.perf_counter() - started:.1f}s")
+
+    def _legacy(self):
+        sent = 0
+        for cart in CartAbandonmentTracker.objects.filter(notification_sent=False, order_completed=False):
+            if not cart.should_send_notification():
+                continue
+            user = cart.user
+            if not user or not user.fcm_token:
+                continue
+            accept_all([user.fcm_token])
+            NotificationLog.objects.create(
+                notification_type='cart_abandoned', priority='medium', channel='push', user=user,
+                title='Cart Reminder 🛒', body='', was_sent=True, sent_at=timezone.now()
+            )
+            cart.notification_sent = True
+            cart.notification_sent_at = timezone.now()
+            cart.save()
+            sent += 1
+        return sent
+
+    def _measure(self, label, run):
+        query_count = [0]
+
+        def count_queries(execute, sql, params, many, context):
+            query_count[0] += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count_queries):
+            started = time.perf_counter()
+            sent = run()
+            elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {label}: {sent} reminders in {elapsed:.2f}s, {query_count[0]} queries"
+        ))
@@ -9,15 +9,13 @@ notifications every hour without needing external crontab!
 import logging
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.utils import timezone
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
 from django_apscheduler.jobstores import DjangoJobStore
 from django_apscheduler.models import DjangoJobExecution
 from django_apscheduler import util
 
-from Notification.models import CartAbandonmentTracker
-from Notification.notification_utils import send_cart_abandoned_notification
+from Notification.cart_abandonment import send_due_reminders
 
 logger = logging.getLogger(__name__)
 
@@ -30,40 +28,104 @@ def send_cart_abandoned_notifications_job():
     """
     logger.info("🔍 Checking for abandoned carts...")
 
-    # Find carts that need abandonment notifications
-    abandoned_carts = CartAbandonmentTracker.objects.filter(
-        notification_sent=False,
-        order_completed=False,
+    stats = send_due_reminders()
+
+    logger.info(
+        f"📊 Sent {stats['sent']} cart abandonment notifications "
+        f"({stats['failed']} failed, {stats['chunks']} batches)"
     )
 
-    sent_count = 0
 
-    for cart in abandoned_carts:
-        # Check if 24 hours have passed
-        if not cart.should_send_notification():
-            continue
+@util.close_old_connections
+def resume_screenshot_uploads_job():
+    """
+    Retry design screenshot uploads stuck in the local spool
+    Runs every 15 minutes
+    """
+    from Design.screenshot_pipeline import resume_pending_uploads
 
-        user = cart.user
-        if not user or not user.fcm_token:
-            continue
+    resumed = resume_pending_uploads(older_than_minutes=5, synchronous=True)
+    if resumed:
+        logger.info(f"📸 Resumed {resumed} spooled screenshot uploads")
 
-        # Send notification
-        success = send_cart_abandoned_notification(
-            user_fcm_token=user.fcm_token,
-            cart_items_count=cart.cart_items_count,
-            cart_total=cart.cart_total,
-            user_profile=user,
+
+@util.close_old_connections
+def reconcile_pending_payments_job():
+    """
+    Poll Payzah for payments stuck in 'pending' (callback never arrived)
+    Runs every 10 minutes
+    """
+    from Purchase.payment_processing import reconcile_pending_payments
+
+    stats = reconcile_pending_payments(older_than_minutes=15)
+    if stats['checked'] or stats['backlog']:
+        logger.info(
+            f"💳 Reconciled pending payments: checked={stats['checked']} captured={stats['captured']} "
+            f"failed={stats['failed']} expired={stats['expired']} errors={stats['errors']} "
+            f"throughput={stats['throughput_per_second']}/s backlog={stats['backlog']} "
+            f"oldest={stats['oldest_pending_seconds']}s"
         )
 
-        if success:
-            # Mark as sent
-            cart.notification_sent = True
-            cart.notification_sent_at = timezone.now()
-            cart.save()
-            sent_count += 1
-            logger.info(f"✅ Cart abandoned notification sent to {user.user.email if user.user else 'Unknown'}")
 
-    logger.info(f"📊 Sent {sent_count} cart abandonment notifications")
+@util.close_old_connections
+def drain_notification_outbox_job():
+    """
+    Retry push notifications left in the outbox (worker restart, FCM outage)
+    Runs every 5 minutes
+    """
+    from Notification.outbox import drain_outbox
+
+    delivered = drain_outbox()
+    if delivered:
+        logger.info(f"📬 Delivered {delivered} queued outbox notifications")
+
+
+@util.close_old_connections
+def archive_notification_logs_job():
+    """
+    Move old NotificationLog rows to the archive and prune the archive
+    Runs daily at 3:00 AM
+    """
+    from Notification.retention import run_retention
+
+    stats = run_retention()
+    logger.info(f"🗄️ Archived {stats['archived']} notification logs, pruned {stats['pruned']} archived rows")
+
+
+@util.close_old_connections
+def prune_device_tokens_job():
+    """
+    Deactivate stale FCM tokens and delete long-deactivated ones
+    Runs daily at 3:30 AM
+    """
+    from User.device_tokens import prune_device_tokens
+
+    stats = prune_device_tokens()
+    logger.info(f"📱 Deactivated {stats['deactivated']} stale device tokens, deleted {stats['deleted']}")
+
+
+@util.close_old_connections
+def snapshot_inventory_job():
+    """
+    Snapshot stock levels and consumption totals for every fabric color
+    Runs daily at 0:15 AM
+    """
+    from Design.inventory import take_inventory_snapshot
+
+    count = take_inventory_snapshot()
+    logger.info(f"📦 Took inventory snapshots for {count} fabric colors")
+
+
+@util.close_old_connections
+def rebuild_design_stats_job():
+    """
+    Recompute design configuration stats (corrects drift from component deletes)
+    Runs daily at 0:30 AM
+    """
+    from Design.design_stats import rebuild_configuration_stats
+
+    count = rebuild_configuration_stats()
+    logger.info(f"📊 Rebuilt stats for {count} design configurations")
 
 
 # This decorator ensures that if a job execution fails, it won't stop the scheduler
@@ -97,6 +159,104 @@ class Command(BaseCommand):
             )
         )
 
+        # Add screenshot spool retry job - runs every 15 minutes
+        scheduler.add_job(
+            resume_screenshot_uploads_job,
+            trigger=CronTrigger(minute="*/15"),
+            id="resume_screenshot_uploads",
+            max_instances=1,
+            replace_existing=True,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "✅ Added job: 'resume_screenshot_uploads' - runs every 15 minutes"
+            )
+        )
+
+        # Add pending payment reconciliation job - runs every 10 minutes
+        scheduler.add_job(
+            reconcile_pending_payments_job,
+            trigger=CronTrigger(minute="*/10"),
+            id="reconcile_pending_payments",
+            max_instances=1,
+            replace_existing=True,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "✅ Added job: 'reconcile_pending_payments' - runs every 10 minutes"
+            )
+        )
+
+        # Add notification outbox retry job - runs every 5 minutes
+        scheduler.add_job(
+            drain_notification_outbox_job,
+            trigger=CronTrigger(minute="*/5"),
+            id="drain_notification_outbox",
+            max_instances=1,
+            replace_existing=True,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "✅ Added job: 'drain_notification_outbox' - runs every 5 minutes"
+            )
+        )
+
+        # Add notification log retention job - runs daily at 3:00 AM
+        scheduler.add_job(
+            archive_notification_logs_job,
+            trigger=CronTrigger(hour=3, minute=0),
+            id="archive_notification_logs",
+            max_instances=1,
+            replace_existing=True,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "✅ Added job: 'archive_notification_logs' - runs daily at 3:00 AM"
+            )
+        )
+
+        # Add device token pruning job - runs daily at 3:30 AM
+        scheduler.add_job(
+            prune_device_tokens_job,
+            trigger=CronTrigger(hour=3, minute=30),
+            id="prune_device_tokens",
+            max_instances=1,
+            replace_existing=True,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "✅ Added job: 'prune_device_tokens' - runs daily at 3:30 AM"
+            )
+        )
+
+        # Add inventory snapshot job - runs daily at 0:15 AM
+        scheduler.add_job(
+            snapshot_inventory_job,
+            trigger=CronTrigger(hour=0, minute=15),
+            id="snapshot_inventory",
+            max_instances=1,
+            replace_existing=True,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "✅ Added job: 'snapshot_inventory' - runs daily at 0:15 AM"
+            )
+        )
+
+        # Add design stats rebuild job - runs daily at 0:30 AM
+        scheduler.add_job(
+            rebuild_design_stats_job,
+            trigger=CronTrigger(hour=0, minute=30),
+            id="rebuild_design_stats",
+            max_instances=1,
+            replace_existing=True,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "✅ Added job: 'rebuild_design_stats' - runs daily at 0:30 AM"
+            )
+        )
+
         # Add job to delete old job executions - runs daily at 12:00 AM
         scheduler.add_job(
             delete_old_job_executions,
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.4 on 2026-10-19 00:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Notification', '0002_notification_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('notification_type', models.CharField(choices=[('order_placed', 'Order Placed'), ('order_confirmed', 'Order Confirmed'), ('order_packed', 'Order Packed'), ('out_for_delivery', 'Out for Delivery'), ('order_delivered', 'Order Delivered'), ('order_cancelled', 'Order Cancelled'), ('cart_abandoned', 'Cart Abandoned'), ('promotional', 'Promotional Offer'), ('payment_success', 'Payment Success'), ('payment_failed', 'Payment Failed')], max_length=30)),
+                ('channel', models.CharField(choices=[('push', 'Push Notification'), ('email', 'Email'), ('in_app', 'In-App')], max_length=10)),
+                ('sent_count', models.IntegerField(default=0)),
+                ('failed_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Notification Daily Stat',
+                'verbose_name_plural': 'Notification Daily Stats',
+                'ordering': ['-date', 'notification_type'],
+                'constraints': [models.UniqueConstraint(fields=('date', 'notification_type', 'channel'), name='unique_notification_daily_stat')],
+            },
+        ),
+        migrations.CreateModel(
+            name='NotificationLogArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField(unique=True)),
+                ('notification_type', models.CharField(choices=[('order_placed', 'Order Placed'), ('order_confirmed', 'Order Confirmed'), ('order_packed', 'Order Packed'), ('out_for_delivery', 'Out for Delivery'), ('order_delivered', 'Order Delivered'), ('order_cancelled', 'Order Cancelled'), ('cart_abandoned', 'Cart Abandoned'), ('promotional', 'Promotional Offer'), ('payment_success', 'Payment Success'), ('payment_failed', 'Payment Failed')], max_length=30)),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')], max_length=10)),
+                ('channel', models.CharField(choices=[('push', 'Push Notification'), ('email', 'Email'), ('in_app', 'In-App')], max_length=10)),
+                ('user_id', models.IntegerField()),
+                ('title', models.CharField(max_length=200)),
+                ('body', models.TextField()),
+                ('order_id', models.IntegerField(blank=True, null=True)),
+                ('promotional_notification_id', models.IntegerField(blank=True, null=True)),
+                ('was_sent', models.BooleanField(default=False)),
+                ('error_message', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Archived Notification Log',
+                'verbose_name_plural': 'Archived Notification Logs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['created_at'], name='Notificatio_created_843c45_idx')],
+            },
+        ),
+    ]
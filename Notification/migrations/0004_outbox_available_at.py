@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-19 01:51
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Notification', '0003_notification_log_retention'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificationoutbox',
+            name='available_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, help_text='Not delivered before this time (debounced broadcasts)'),
+        ),
+    ]
@@ -109,30 +109,41 @@ class PromotionalNotification(models.Model):
 
     def send_notification(self):
         """Send this promotional notification to target users"""
+        from Notification.log_buffer import notification_log_buffer
         from Notification.notification_utils import send_promotional_notification
+        from User.device_tokens import active_tokens_by_profile
+        from User.models import DeviceToken
 
-        # Get target users
-        if self.send_to_all:
-            users = Profile.objects.filter(fcm_token__isnull=False).exclude(fcm_token='')
-        else:
-            users = self.target_users.filter(fcm_token__isnull=False).exclude(fcm_token='')
+        # Get target users: every profile with an active device
+        users = Profile.objects.all() if self.send_to_all else self.target_users.all()
+        users = list(users.filter(
+            models.Exists(DeviceToken.objects.filter(profile_id=models.OuterRef('pk'), is_active=True))
+        ))
+        device_tokens = active_tokens_by_profile([user.id for user in users])
 
-        # Send to each user
+        # Send to each user's devices (log rows are written in bulk when the batch ends)
         success_count = 0
-        for user in users:
-            try:
-                success = send_promotional_notification(
-                    user_fcm_token=user.fcm_token,
-                    title=self.title,
-                    message=self.message,
-                    promo_code=self.promo_code,
-                    discount_percentage=self.discount_percentage,
-                    priority=self.priority,
-                )
-                if success:
-                    success_count += 1
-            except Exception as e:
-                print(f"❌ Error sending notification to user {user.id}: {e}")
+        with notification_log_buffer.batch():
+            for user in users:
+                tokens = device_tokens.get(user.id)
+                if not tokens:
+                    continue
+                try:
+                    success = send_promotional_notification(
+                        user_fcm_token=tokens[0],
+                        device_tokens=tokens,
+                        title=self.title,
+                        message=self.message,
+                        promo_code=self.promo_code,
+                        discount_percentage=self.discount_percentage,
+                        priority=self.priority,
+                        user_profile=user,
+                        promotional_notification_obj=self,
+                    )
+                    if success:
+                        success_count += 1
+                except Exception as e:
+                    print(f"❌ Error sending notification to user {user.id}: {e}")
 
         # Update status
         self.is_sent = True
@@ -202,6 +213,66 @@ class NotificationLog(models.Model):
         return f"{self.notification_type} - {self.user.user.email if self.user.user else 'Unknown'} ({self.created_at})"
 
 
+class NotificationLogArchive(models.Model):
+    """
+    Rolling archive of NotificationLog rows past the retention window.
+    Rows are moved here in batches by Notification/retention.py so the live log
+    (and its three indexes) stays small. References are stored as plain IDs:
+    no foreign key checks on insert and no cascades from Profile deletes.
+    """
+    original_id = models.BigIntegerField(unique=True)
+    notification_type = models.CharField(max_length=30, choices=NotificationType.choices)
+    priority = models.CharField(max_length=10, choices=NotificationPriority.choices)
+    channel = models.CharField(max_length=10, choices=NotificationChannel.choices)
+
+    user_id = models.IntegerField()
+    title = models.CharField(max_length=200)
+    body = models.TextField()
+    order_id = models.IntegerField(blank=True, null=True)
+    promotional_notification_id = models.IntegerField(blank=True, null=True)
+
+    was_sent = models.BooleanField(default=False)
+    error_message = models.TextField(blank=True, null=True)
+
+    created_at = models.DateTimeField()
+    sent_at = models.DateTimeField(blank=True, null=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Archived Notification Log'
+        verbose_name_plural = 'Archived Notification Logs'
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.notification_type} - user #{self.user_id} ({self.created_at})"
+
+
+class NotificationDailyStat(models.Model):
+    """
+    Per-day, per-type delivery counters.
+    Incremented when log rows are written, so stats never scan the raw log.
+    """
+    date = models.DateField()
+    notification_type = models.CharField(max_length=30, choices=NotificationType.choices)
+    channel = models.CharField(max_length=10, choices=NotificationChannel.choices)
+    sent_count = models.IntegerField(default=0)
+    failed_count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['-date', 'notification_type']
+        verbose_name = 'Notification Daily Stat'
+        verbose_name_plural = 'Notification Daily Stats'
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'notification_type', 'channel'], name='unique_notification_daily_stat'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.notification_type}: {self.sent_count} sent, {self.failed_count} failed"
+
+
 class CartAbandonmentTracker(models.Model):
     """
     Track cart abandonment for sending reminders after 24 hours
@@ -247,3 +318,44 @@ class CartAbandonmentTracker(models.Model):
         # Check if 24 hours have passed
         time_elapsed = timezone.now() - self.cart_last_updated
         return time_elapsed.total_seconds() >= 24 * 60 * 60  # 24 hours in seconds
+
+
+class NotificationOutbox(models.Model):
+    """
+    Durable queue of push notifications.
+    Entries are written in the same transaction as the state change that triggers
+    them (e.g. a captured payment) and delivered after commit by a background worker,
+    so request handlers never wait on FCM and no notification is lost on a crash.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_SENDING = 'sending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = (
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENDING, 'Sending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+    )
+
+    event_type = models.CharField(max_length=50, help_text="Outbox handler key, e.g. 'payment_success'")
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+
+    available_at = models.DateTimeField(default=timezone.now, help_text="Not delivered before this time (debounced broadcasts)")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['created_at']
+        verbose_name = 'Notification Outbox Entry'
+        verbose_name_plural = 'Notification Outbox'
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} #{self.id} ({self.status})"
@@ -7,12 +7,17 @@ Complete notification utilities for all notification types:
 - Promotional: Admin-controlled messages
 """
 
+import logging
 import firebase_admin
 from firebase_admin import credentials, messaging
 import os
 from django.conf import settings
 from django.utils import timezone
 
+from User.device_tokens import send_push
+
+logger = logging.getLogger(__name__)
+
 
 # Initialize Firebase Admin SDK (if not already initialized)
 def initialize_firebase():
@@ -24,20 +29,19 @@ def initialize_firebase():
             if os.path.exists(cred_path):
                 cred = credentials.Certificate(cred_path)
                 firebase_admin.initialize_app(cred)
-                print("✅ Firebase Admin SDK initialized")
+                logger.info("✅ Firebase Admin SDK initialized")
             else:
-                print("⚠️ Warning: firebase_service_account.json not found")
-                print(f"Expected path: {cred_path}")
+                logger.warning("⚠️ firebase_service_account.json not found (expected at %s)", cred_path)
         except Exception as e:
-            print(f"❌ Firebase initialization error: {e}")
+            logger.error("❌ Firebase initialization error: %s", e)
 
 
 def log_notification(notification_type, priority, channel, user, title, body, order_id=None, promotional_notification=None, was_sent=False, error_message=None):
-    """Log notification to database"""
+    """Log notification to database (buffered, written in bulk - see log_buffer.py)"""
     try:
-        from Notification.models import NotificationLog
+        from Notification.log_buffer import notification_log_buffer
 
-        log = NotificationLog.objects.create(
+        return notification_log_buffer.add(
             notification_type=notification_type,
             priority=priority,
             channel=channel,
@@ -50,9 +54,8 @@ def log_notification(notification_type, priority, channel, user, title, body, or
             error_message=error_message,
             sent_at=timezone.now() if was_sent else None,
         )
-        return log
     except Exception as e:
-        print(f"❌ Error logging notification: {e}")
+        logger.error("❌ Error logging notification: %s", e)
         return None
 
 
@@ -82,8 +85,8 @@ def send_order_placed_notification(user_fcm_token, order, user_profile=None):
             token=user_fcm_token,
         )
 
-        response = messaging.send(message)
-        print(f'✅ Order Placed notification sent: {response}')
+        response = send_push(message)
+        logger.info("✅ Order Placed notification sent: %s", response)
 
         # Log notification
         if user_profile:
@@ -100,7 +103,7 @@ def send_order_placed_notification(user_fcm_token, order, user_profile=None):
 
         return True
     except Exception as e:
-        print(f'❌ Error sending order placed notification: {e}')
+        logger.error("❌ Error sending order placed notification: %s", e)
         if user_profile:
             log_notification(
                 notification_type='order_placed',
@@ -140,8 +143,8 @@ def send_order_confirmed_notification(user_fcm_token, order, user_profile=None):
             token=user_fcm_token,
         )
 
-        response = messaging.send(message)
-        print(f'✅ Order Confirmed notification sent: {response}')
+        response = send_push(message)
+        logger.info("✅ Order Confirmed notification sent: %s", response)
 
         if user_profile:
             log_notification(
@@ -157,7 +160,7 @@ def send_order_confirmed_notification(user_fcm_token, order, user_profile=None):
 
         return True
     except Exception as e:
-        print(f'❌ Error sending order confirmed notification: {e}')
+        logger.error("❌ Error sending order confirmed notification: %s", e)
         if user_profile:
             log_notification(
                 notification_type='order_confirmed',
@@ -197,8 +200,8 @@ def send_order_packed_notification(user_fcm_token, order, user_profile=None):
             token=user_fcm_token,
         )
 
-        response = messaging.send(message)
-        print(f'✅ Order Packed notification sent: {response}')
+        response = send_push(message)
+        logger.info("✅ Order Packed notification sent: %s", response)
 
         if user_profile:
             log_notification(
@@ -214,7 +217,7 @@ def send_order_packed_notification(user_fcm_token, order, user_profile=None):
 
         return True
     except Exception as e:
-        print(f'❌ Error sending order packed notification: {e}')
+        logger.error("❌ Error sending order packed notification: %s", e)
         if user_profile:
             log_notification(
                 notification_type='order_packed',
@@ -257,8 +260,8 @@ def send_out_for_delivery_notification(user_fcm_token, order, user_profile=None)
             token=user_fcm_token,
         )
 
-        response = messaging.send(message)
-        print(f'✅ Out for Delivery notification sent: {response}')
+        response = send_push(message)
+        logger.info("✅ Out for Delivery notification sent: %s", response)
 
         if user_profile:
             log_notification(
@@ -274,7 +277,7 @@ def send_out_for_delivery_notification(user_fcm_token, order, user_profile=None)
 
         return True
     except Exception as e:
-        print(f'❌ Error sending out for delivery notification: {e}')
+        logger.error("❌ Error sending out for delivery notification: %s", e)
         if user_profile:
             log_notification(
                 notification_type='out_for_delivery',
@@ -314,8 +317,8 @@ def send_order_delivered_notification(user_fcm_token, order, user_profile=None):
             token=user_fcm_token,
         )
 
-        response = messaging.send(message)
-        print(f'✅ Order Delivered notification sent: {response}')
+        response = send_push(message)
+        logger.info("✅ Order Delivered notification sent: %s", response)
 
         if user_profile:
             log_notification(
@@ -331,7 +334,7 @@ def send_order_delivered_notification(user_fcm_token, order, user_profile=None):
 
         return True
     except Exception as e:
-        print(f'❌ Error sending order delivered notification: {e}')
+        logger.error("❌ Error sending order delivered notification: %s", e)
         if user_profile:
             log_notification(
                 notification_type='order_delivered',
@@ -378,8 +381,8 @@ def send_order_cancelled_notification(user_fcm_token, order, reason=None, user_p
             token=user_fcm_token,
         )
 
-        response = messaging.send(message)
-        print(f'✅ Order Cancelled notification sent: {response}')
+        response = send_push(message)
+        logger.info("✅ Order Cancelled notification sent: %s", response)
 
         if user_profile:
             log_notification(
@@ -395,7 +398,7 @@ def send_order_cancelled_notification(user_fcm_token, order, reason=None, user_p
 
         return True
     except Exception as e:
-        print(f'❌ Error sending order cancelled notification: {e}')
+        logger.error("❌ Error sending order cancelled notification: %s", e)
         if user_profile:
             log_notification(
                 notification_type='order_cancelled',
@@ -434,8 +437,8 @@ def send_payment_success_notification(user_fcm_token, order, user_profile=None):
             token=user_fcm_token,
         )
 
-        response = messaging.send(message)
-        print(f'✅ Payment Success notification sent: {response}')
+        response = send_push(message)
+        logger.info("✅ Payment Success notification sent: %s", response)
 
         if user_profile:
             log_notification(
@@ -451,7 +454,7 @@ def send_payment_success_notification(user_fcm_token, order, user_profile=None):
 
         return True
     except Exception as e:
-        print(f'❌ Error sending payment success notification: {e}')
+        logger.error("❌ Error sending payment success notification: %s", e)
         return False
 
 
@@ -482,8 +485,8 @@ def send_payment_failed_notification(user_fcm_token, order, error_message=None,
             token=user_fcm_token,
         )
 
-        response = messaging.send(message)
-        print(f'✅ Payment Failed notification sent: {response}')
+        response = send_push(message)
+        logger.info("✅ Payment Failed notification sent: %s", response)
 
         if user_profile:
             log_notification(
@@ -499,7 +502,7 @@ def send_payment_failed_notification(user_fcm_token, order, error_message=None,
 
         return True
     except Exception as e:
-        print(f'❌ Error sending payment failed notification: {e}')
+        logger.error("❌ Error sending payment failed notification: %s", e)
         return False
 
 
@@ -528,8 +531,8 @@ def send_cart_abandoned_notification(user_fcm_token, cart_items_count, cart_tota
             token=user_fcm_token,
         )
 
-        response = messaging.send(message)
-        print(f'✅ Cart Abandoned notification sent: {response}')
+        response = send_push(message)
+        logger.info("✅ Cart Abandoned notification sent: %s", response)
 
         if user_profile:
             log_notification(
@@ -544,7 +547,7 @@ def send_cart_abandoned_notification(user_fcm_token, cart_items_count, cart_tota
 
         return True
     except Exception as e:
-        print(f'❌ Error sending cart abandoned notification: {e}')
+        logger.error("❌ Error sending cart abandoned notification: %s", e)
         if user_profile:
             log_notification(
                 notification_type='cart_abandoned',
@@ -561,11 +564,12 @@ def send_cart_abandoned_notification(user_fcm_token, cart_items_count, cart_tota
 
 # ========== PROMOTIONAL NOTIFICATIONS ==========
 
-def send_promotional_notification(user_fcm_token, title, message, promo_code=None, discount_percentage=None, priority='high', user_profile=None, promotional_notification_obj=None):
+def send_promotional_notification(user_fcm_token, title, message, promo_code=None, discount_percentage=None, priority='high', user_profile=None, promotional_notification_obj=None, device_tokens=None):
     """
     Promotional - Admin Controlled - High Priority - Push/Email
     Admins can send promotional messages anytime
     Examples: "Happy Ramadan", "New Sale: Up to 30% off"
+    Sent to every active device of the user (`device_tokens` when already loaded)
     """
     try:
         initialize_firebase()
@@ -590,8 +594,8 @@ def send_promotional_notification(user_fcm_token, title, message, promo_code=Non
             token=user_fcm_token,
         )
 
-        response = messaging.send(message_obj)
-        print(f'✅ Promotional notification sent: {response}')
+        response = send_push(message_obj, tokens=device_tokens)
+        logger.info("✅ Promotional notification sent: %s", response)
 
         if user_profile:
             log_notification(
@@ -607,7 +611,7 @@ def send_promotional_notification(user_fcm_token, title, message, promo_code=Non
 
         return True
     except Exception as e:
-        print(f'❌ Error sending promotional notification: {e}')
+        logger.error("❌ Error sending promotional notification: %s", e)
         if user_profile:
             log_notification(
                 notification_type='promotional',
@@ -637,7 +641,7 @@ def send_order_status_notification(user_fcm_token, order, new_status, user_profi
         **kwargs: Additional parameters (estimated_days, reason, etc.)
     """
     if not user_fcm_token:
-        print("⚠️ Warning: No FCM token provided")
+        logger.warning("⚠️ No FCM token provided")
         return False
 
     initialize_firebase()
@@ -661,5 +665,5 @@ def send_order_status_notification(user_fcm_token, order, new_status, user_profi
     if handler:
         return handler()
     else:
-        print(f"⚠️ Warning: No notification handler for status '{new_status}'")
+        logger.warning("⚠️ No notification handler for status '%s'", new_status)
         return False
@@ -0,0 +1,207 @@
+"""
+Notification Outbox
+Transactional outbox for push notifications that must not delay (or be lost by)
+the request that triggers them.
+
+Usage (inside the transaction that changes state):
+    enqueue_notification('payment_success', {'purchase_id': purchase.id})
+
+The entry is delivered by a worker thread right after commit (or, with
+`delay`, once its available_at passes). Anything left behind (worker crash or
+restart, FCM outage) is retried by drain_outbox(), which runs from the
+scheduler (see start_scheduler.py).
+"""
+import logging
+import threading
+from datetime import timedelta
+
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from Notification.models import NotificationOutbox
+from raggyBackend.executors import lazy_executor
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+# Entries stuck in 'sending' longer than this are assumed orphaned by a dead worker
+SENDING_TIMEOUT_MINUTES = 10
+
+get_executor = lazy_executor('NOTIFICATION_OUTBOX_WORKERS', 'notification-outbox')
+
+
+# ================== HANDLERS ==================
+def _get_purchase_and_token(payload):
+    from Purchase.models import Purchase
+
+    purchase = Purchase.objects.select_related('user__profile').get(pk=payload['purchase_id'])
+    profile = getattr(purchase.user, 'profile', None) if purchase.user else None
+    return purchase, (profile.fcm_token if profile else None)
+
+
+def handle_payment_success(payload):
+    from Purchase.notification_utils import send_payment_success_notification
+
+    purchase, fcm_token = _get_purchase_and_token(payload)
+    if not fcm_token:
+        logger.warning(f"⚠️ No FCM token found for purchase {purchase.id}, skipping payment success notification")
+        return True
+    return send_payment_success_notification(user_fcm_token=fcm_token, order=purchase)
+
+
+def handle_payment_failed(payload):
+    from Purchase.notification_utils import send_payment_failed_notification
+
+    purchase, fcm_token = _get_purchase_and_token(payload)
+    if not fcm_token:
+        logger.warning(f"⚠️ No FCM token found for purchase {purchase.id}, skipping payment failed notification")
+        return True
+    return send_payment_failed_notification(
+        user_fcm_token=fcm_token,
+        order=purchase,
+        error_message=payload.get('error_message')
+    )
+
+
+def handle_topic_subscription(payload):
+    from Design.fabric_notifications import update_catalog_topic_subscription
+
+    return update_catalog_topic_subscription(payload['token'], payload.get('old_token'))
+
+
+def handle_catalog_signal(payload):
+    from Design.fabric_notifications import send_to_catalog_topic
+
+    return send_to_catalog_topic(payload) is not None
+
+
+OUTBOX_HANDLERS = {
+    'payment_success': handle_payment_success,
+    'payment_failed': handle_payment_failed,
+    'fcm_topic_subscription': handle_topic_subscription,
+    'catalog_signal': handle_catalog_signal,
+}
+
+
+# ================== ENQUEUE & DELIVERY ==================
+def enqueue_notification(event_type, payload, delay=None):
+    """
+    Write an outbox entry in the current transaction and schedule its delivery
+    for after commit. If the transaction rolls back, nothing is sent.
+    With `delay` (seconds) the entry isn't delivered before now + delay; if the
+    process exits before then, drain_outbox() delivers it.
+    """
+    if event_type not in OUTBOX_HANDLERS:
+        raise ValueError(f"Unknown outbox event type: {event_type}")
+
+    entry = NotificationOutbox.objects.create(
+        event_type=event_type, payload=payload, available_at=timezone.now() + timedelta(seconds=delay or 0)
+    )
+
+    def submit():
+        get_executor().submit(deliver_outbox_entry, entry.pk)
+
+    if delay:
+        def submit_later():
+            timer = threading.Timer(delay, submit)
+            timer.daemon = True
+            timer.start()
+        transaction.on_commit(submit_later)
+    else:
+        transaction.on_commit(submit)
+    return entry
+
+
+def enqueue_notifications(events):
+    """
+    Bulk variant of enqueue_notification for batch jobs.
+    `events` is an iterable of (event_type, payload); one INSERT for all of them.
+    """
+    entries = []
+    for event_type, payload in events:
+        if event_type not in OUTBOX_HANDLERS:
+            raise ValueError(f"Unknown outbox event type: {event_type}")
+        entries.append(NotificationOutbox(event_type=event_type, payload=payload))
+    if not entries:
+        return []
+
+    entries = NotificationOutbox.objects.bulk_create(entries)
+    entry_ids = [entry.pk for entry in entries if entry.pk]
+
+    def submit_all():
+        executor = get_executor()
+        for entry_id in entry_ids:
+            executor.submit(deliver_outbox_entry, entry_id)
+
+    # Backends without RETURNING leave pk unset; drain_outbox() picks those up
+    transaction.on_commit(submit_all)
+    return entries
+
+
+def _claim(entry_id):
+    """Move an entry to 'sending'. Only one worker can win the conditional update."""
+    stale_before = timezone.now() - timedelta(minutes=SENDING_TIMEOUT_MINUTES)
+    return NotificationOutbox.objects.filter(
+        Q(status=NotificationOutbox.STATUS_PENDING) |
+        Q(status=NotificationOutbox.STATUS_SENDING, updated_at__lte=stale_before),
+        pk=entry_id,
+        attempts__lt=MAX_ATTEMPTS,
+        available_at__lte=timezone.now(),
+    ).update(
+        status=NotificationOutbox.STATUS_SENDING,
+        attempts=F('attempts') + 1,
+        updated_at=timezone.now()
+    ) == 1
+
+
+def deliver_outbox_entry(entry_id):
+    """Worker: deliver one outbox entry (no-op if another worker already claimed it)"""
+    close_old_connections()
+    try:
+        if not _claim(entry_id):
+            return False
+
+        entry = NotificationOutbox.objects.get(pk=entry_id)
+        try:
+            delivered = OUTBOX_HANDLERS[entry.event_type](entry.payload)
+            error = None if delivered else 'Handler reported failure'
+        except Exception as e:
+            delivered, error = False, str(e)
+
+        if delivered:
+            NotificationOutbox.objects.filter(pk=entry_id).update(
+                status=NotificationOutbox.STATUS_SENT,
+                sent_at=timezone.now(),
+                last_error=None,
+                updated_at=timezone.now()
+            )
+        else:
+            # Back to pending for a retry, or give up after MAX_ATTEMPTS
+            NotificationOutbox.objects.filter(pk=entry_id).update(
+                status=NotificationOutbox.STATUS_FAILED if entry.attempts >= MAX_ATTEMPTS else NotificationOutbox.STATUS_PENDING,
+                last_error=error,
+                updated_at=timezone.now()
+            )
+            logger.warning(f"⚠️ Outbox entry {entry_id} ({entry.event_type}) failed: {error}")
+
+        return delivered
+    finally:
+        close_old_connections()
+
+
+def drain_outbox(limit=200):
+    """Deliver pending (and orphaned 'sending') entries synchronously. Returns number delivered."""
+    stale_before = timezone.now() - timedelta(minutes=SENDING_TIMEOUT_MINUTES)
+    entry_ids = list(
+        NotificationOutbox.objects.filter(
+            Q(status=NotificationOutbox.STATUS_PENDING) |
+            Q(status=NotificationOutbox.STATUS_SENDING, updated_at__lte=stale_before),
+            attempts__lt=MAX_ATTEMPTS,
+            available_at__lte=timezone.now(),
+        ).order_by('created_at').values_list('id', flat=True)[:limit]
+    )
+    from Notification.log_buffer import notification_log_buffer
+
+    with notification_log_buffer.batch():
+        return sum(1 for entry_id in entry_ids if deliver_outbox_entry(entry_id))
@@ -0,0 +1,167 @@
+"""
+NotificationLog Retention
+- Moves log rows older than NOTIFICATION_LOG_RETENTION_DAYS into
+  NotificationLogArchive in bounded batches (one INSERT + one DELETE per batch)
+- Prunes archive rows older than NOTIFICATION_LOG_ARCHIVE_RETENTION_DAYS
+- Maintains NotificationDailyStat counters as logs are written
+
+Runs daily from the scheduler (see start_scheduler.py) and from the
+archive_notification_logs command.
+"""
+import logging
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from Notification.models import NotificationDailyStat, NotificationLog, NotificationLogArchive
+
+logger = logging.getLogger(__name__)
+
+ARCHIVED_FIELDS = (
+    'id', 'notification_type', 'priority', 'channel', 'user_id', 'title', 'body', 'order_id',
+    'promotional_notification_id', 'was_sent', 'error_message', 'created_at', 'sent_at',
+)
+
+
+# ================== DAILY COUNTERS ==================
+def _increment(date, notification_type, channel, sent, failed):
+    updated = NotificationDailyStat.objects.filter(
+        date=date, notification_type=notification_type, channel=channel
+    ).update(sent_count=F('sent_count') + sent, failed_count=F('failed_count') + failed)
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            NotificationDailyStat.objects.create(
+                date=date, notification_type=notification_type, channel=channel,
+                sent_count=sent, failed_count=failed
+            )
+    except IntegrityError:
+        # Another writer created the row first
+        NotificationDailyStat.objects.filter(
+            date=date, notification_type=notification_type, channel=channel
+        ).update(sent_count=F('sent_count') + sent, failed_count=F('failed_count') + failed)
+
+
+def record_daily_counts(logs):
+    """Add a batch of freshly written NotificationLog rows to the daily counters"""
+    sent, failed = Counter(), Counter()
+    for log in logs:
+        key = (timezone.localdate(log.created_at or timezone.now()), log.notification_type, log.channel)
+        if log.was_sent:
+            sent[key] += 1
+        else:
+            failed[key] += 1
+
+    for key in set(sent) | set(failed):
+        try:
+            _increment(*key, sent=sent[key], failed=failed[key])
+        except Exception as e:
+            logger.error(f"❌ Error updating notification daily stats for {key}: {e}")
+
+
+def rebuild_daily_stats(since=None):
+    """
+    Recompute counters from the live log and the archive (backfill / repair).
+    Only days >= `since` are rebuilt when given.
+    """
+    totals = {}
+    for model in (NotificationLog, NotificationLogArchive):
+        queryset = model.objects.all()
+        if since:
+            queryset = queryset.filter(created_at__date__gte=since)
+        rows = (
+            queryset.annotate(day=TruncDate('created_at'))
+            .values('day', 'notification_type', 'channel')
+            .annotate(sent=Count('id', filter=Q(was_sent=True)), failed=Count('id', filter=Q(was_sent=False)))
+            .order_by()
+        )
+        for row in rows:
+            key = (row['day'], row['notification_type'], row['channel'])
+            previous = totals.get(key, (0, 0))
+            totals[key] = (previous[0] + row['sent'], previous[1] + row['failed'])
+
+    with transaction.atomic():
+        stale = NotificationDailyStat.objects.all()
+        if since:
+            stale = stale.filter(date__gte=since)
+        stale.delete()
+        NotificationDailyStat.objects.bulk_create([
+            NotificationDailyStat(date=day, notification_type=notification_type, channel=channel,
+                                  sent_count=sent, failed_count=failed)
+            for (day, notification_type, channel), (sent, failed) in totals.items()
+        ])
+
+    return len(totals)
+
+
+# ================== ARCHIVAL ==================
+def archive_old_logs(retention_days=None, batch_size=None, max_batches=None):
+    """
+    Move log rows older than `retention_days` to the archive, oldest first,
+    `batch_size` rows per transaction. Returns the number of rows moved.
+    """
+    retention_days = retention_days if retention_days is not None else settings.NOTIFICATION_LOG_RETENTION_DAYS
+    batch_size = batch_size or settings.NOTIFICATION_LOG_ARCHIVE_BATCH_SIZE
+    cutoff = timezone.now() - timedelta(days=retention_days)
+
+    moved = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            rows = list(
+                NotificationLog.objects.filter(created_at__lt=cutoff)
+                .order_by('created_at')
+                .values(*ARCHIVED_FIELDS)[:batch_size]
+            )
+            if not rows:
+                break
+
+            ids = [row.pop('id') for row in rows]
+            NotificationLogArchive.objects.bulk_create(
+                [NotificationLogArchive(original_id=log_id, **row) for log_id, row in zip(ids, rows)],
+                ignore_conflicts=True
+            )
+            NotificationLog.objects.filter(id__in=ids).delete()
+
+        moved += len(rows)
+        batches += 1
+        if len(rows) < batch_size:
+            break
+
+    return moved
+
+
+def prune_archive(retention_days=None, batch_size=None):
+    """Delete archived rows past the archive retention window in batches"""
+    retention_days = retention_days if retention_days is not None else settings.NOTIFICATION_LOG_ARCHIVE_RETENTION_DAYS
+    batch_size = batch_size or settings.NOTIFICATION_LOG_ARCHIVE_BATCH_SIZE
+    cutoff = timezone.now() - timedelta(days=retention_days)
+
+    deleted = 0
+    while True:
+        ids = list(
+            NotificationLogArchive.objects.filter(created_at__lt=cutoff)
+            .order_by('created_at').values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        NotificationLogArchive.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
+        if len(ids) < batch_size:
+            break
+
+    return deleted
+
+
+def run_retention():
+    """Archive old logs and prune the archive. Returns counts for logging."""
+    return {
+        'archived': archive_old_logs(),
+        'pruned': prune_archive(),
+    }
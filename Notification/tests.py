@@ -1,3 +1,161 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.db import IntegrityError, OperationalError, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from Design import fabric_notifications
+from User.device_tokens import register_device_token
+from User.models import DeviceToken
+
+from .cart_abandonment import send_due_reminders
+from .log_buffer import NotificationLogBuffer
+from .models import CartAbandonmentTracker, NotificationLog, NotificationOutbox
+from .outbox import drain_outbox
+
+
+@override_settings(FCM_CATALOG_DEBOUNCE_SECONDS=30)
+@mock.patch('Notification.outbox.threading.Timer')
+class CatalogSignalDebounceTests(TestCase):
+    """Catalog broadcasts are debounced per update type through the outbox"""
+
+    def broadcast(self, update_type, **extra):
+        with self.captureOnCommitCallbacks(execute=True):
+            fabric_notifications.broadcast_catalog_signal(update_type, **extra)
+
+    def test_window_coalesces_by_update_type(self, timer):
+        self.broadcast('fabric_detail_update', fabric_id=1)
+        self.broadcast('fabric_detail_update', fabric_id=2)
+        self.broadcast('fabric_detail_update', fabric_id=1)
+        self.broadcast('fabric_color_update')
+
+        entries = NotificationOutbox.objects.filter(event_type='catalog_signal').order_by('id')
+        self.assertEqual(
+            [entry.payload for entry in entries],
+            [{'type': 'fabric_detail_update', 'fabric_ids': '1,2'}, {'type': 'fabric_color_update'}]
+        )
+        self.assertEqual(timer.call_count, 2)
+
+    @mock.patch.object(fabric_notifications, 'send_to_catalog_topic', return_value='projects/x/messages/1')
+    def test_pending_broadcast_survives_lost_timer(self, send_to_catalog_topic, timer):
+        self.broadcast('fabric_list_update')
+
+        # Window still open: not delivered yet
+        self.assertEqual(drain_outbox(), 0)
+
+        # The process that opened the window exited before its timer fired
+        entry = NotificationOutbox.objects.get()
+        NotificationOutbox.objects.filter(pk=entry.pk).update(available_at=entry.available_at - timedelta(seconds=31))
+        self.assertEqual(drain_outbox(), 1)
+        send_to_catalog_topic.assert_called_once_with({'type': 'fabric_list_update'})
+
+        # A signal after the window opens a new one
+        self.broadcast('fabric_list_update')
+        self.assertEqual(NotificationOutbox.objects.filter(status=NotificationOutbox.STATUS_PENDING).count(), 1)
+
+
+class _Response:
+    def __init__(self, exception=None):
+        self.success = exception is None
+        self.exception = exception
+
+
+class CartAbandonmentDeviceTests(TestCase):
+    """Reminders go to every active device of the user"""
+
+    def setUp(self):
+        self.profile = User.objects.create_user(username='shopper').profile
+        register_device_token(self.profile, 'phone-token', device_id='phone')
+        register_device_token(self.profile, 'tablet-token', device_id='tablet')
+        tracker = CartAbandonmentTracker.objects.create(user=self.profile, cart_items_count=2, cart_total=10)
+        CartAbandonmentTracker.objects.filter(pk=tracker.pk).update(
+            cart_last_updated=timezone.now() - timedelta(hours=30)
+        )
+
+    def test_reminder_sent_to_every_active_device(self):
+        sent_to = []
+
+        def send_batch(messages):
+            sent_to.extend(message.token for message in messages)
+            return mock.Mock(responses=[_Response(), _Response(ValueError('device offline'))])
+
+        stats = send_due_reminders(send_batch=send_batch)
+
+        self.assertEqual(sorted(sent_to), ['phone-token', 'tablet-token'])
+        self.assertEqual((stats['sent'], stats['failed']), (1, 0))
+        log = NotificationLog.objects.get()
+        self.assertTrue(log.was_sent)
+        self.assertEqual(DeviceToken.objects.filter(failure_count=1).count(), 1)
+
+    def test_users_without_active_devices_are_not_selected(self):
+        DeviceToken.objects.update(is_active=False)
+
+        self.assertEqual(send_due_reminders(send_batch=mock.Mock())['due'], 0)
+
+
+@mock.patch.object(NotificationLogBuffer, '_ensure_flusher')
+class NotificationLogBufferTests(TestCase):
+    """Records added inside a transaction are flushed when it commits"""
+
+    def setUp(self):
+        self.profile = User.objects.create_user(username='reader').profile
+        self.buffer = NotificationLogBuffer(max_size=100, flush_interval=3600, limit=1000)
+
+    def add(self, title='Sale'):
+        self.buffer.add(
+            notification_type='promotional', priority='low', channel='push',
+            user=self.profile, title=title, body='Sale'
+        )
+
+    def test_one_flush_per_transaction(self, ensure_flusher):
+        with self.captureOnCommitCallbacks() as callbacks:
+            with transaction.atomic():
+                self.add()
+                self.add()
+
+        self.assertEqual(callbacks, [self.buffer.flush])
+
+    def test_rollback_does_not_block_next_flush(self, ensure_flusher):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    self.add()
+                    raise ValueError('rolled back')
+            except ValueError:
+                pass
+
+            with transaction.atomic():
+                self.add()
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(len(self.buffer), 0)
+        self.assertEqual(NotificationLog.objects.filter(user=self.profile).count(), 2)
+
+    def test_refused_row_is_dropped_alone(self, ensure_flusher):
+        bulk_create = NotificationLog.objects.bulk_create
+
+        def refuse_bad_rows(records, **kwargs):
+            if any(record.title == 'bad' for record in records):
+                raise IntegrityError('FOREIGN KEY constraint failed')
+            return bulk_create(records, **kwargs)
+
+        for title in ('first', 'bad', 'last'):
+            self.add(title)
+        with mock.patch.object(NotificationLog.objects, 'bulk_create', side_effect=refuse_bad_rows):
+            self.assertEqual(self.buffer.flush(), 2)
+
+        self.assertEqual(len(self.buffer), 0)
+        self.assertEqual(
+            sorted(NotificationLog.objects.filter(user=self.profile).values_list('title', flat=True)), ['first', 'last']
+        )
+
+    def test_records_are_kept_while_database_is_unavailable(self, ensure_flusher):
+        self.add()
+        self.add()
+        with mock.patch.object(NotificationLog.objects, 'bulk_create', side_effect=OperationalError('server closed')):
+            self.assertEqual(self.buffer.flush(), 0)
+
+        self.assertEqual(len(self.buffer), 2)
+        self.assertEqual(self.buffer.flush(), 2)
@@ -13,7 +13,7 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 
 from .models import Purchase, Item
-from Design.models import FabricColor, FabricType, UserDesign
+from Design.models import DesignConfigurationStats, FabricColor, FabricType
 from django.contrib.auth.models import User
 
 
@@ -188,24 +188,29 @@ class PopularFabricsAPIView(APIView):
         try:
             limit = int(request.GET.get('limit', 10))
 
-            # Get most used fabrics from UserDesign linked to orders
-            popular_fabrics = UserDesign.objects.filter(
-                order_items__isnull=False
+            # Most used fabrics in orders, from the precomputed per-configuration stats
+            popular_fabrics = DesignConfigurationStats.objects.filter(
+                order_count__gt=0,
+                main_body_fabric_color_id__isnull=False
             ).values(
-                'main_body_fabric_color__id',
-                'main_body_fabric_color__color_name_eng',
-                'main_body_fabric_color__fabric_type__fabric_name_eng'
+                'main_body_fabric_color_id'
             ).annotate(
-                usage_count=Count('id')
+                usage_count=Sum('order_count')
             ).order_by('-usage_count')[:limit]
+            popular_fabrics = list(popular_fabrics)
+
+            fabric_colors = FabricColor.objects.select_related('fabric_type').in_bulk(
+                [fabric['main_body_fabric_color_id'] for fabric in popular_fabrics]
+            )
 
             data = []
             for fabric in popular_fabrics:
-                if fabric['main_body_fabric_color__id']:
+                fabric_color = fabric_colors.get(fabric['main_body_fabric_color_id'])
+                if fabric_color:
                     data.append({
-                        'fabric_color_id': fabric['main_body_fabric_color__id'],
-                        'fabric_type': fabric['main_body_fabric_color__fabric_type__fabric_name_eng'],
-                        'color_name': fabric['main_body_fabric_color__color_name_eng'],
+                        'fabric_color_id': fabric_color.id,
+                        'fabric_type': fabric_color.fabric_type.fabric_name_eng if fabric_color.fabric_type else None,
+                        'color_name': fabric_color.color_name_eng,
                         'usage_count': fabric['usage_count']
                     })
 
@@ -329,13 +334,18 @@ class InventoryStatusTableAPIView(APIView):
 
             fabrics = FabricColor.objects.select_related('fabric_type').order_by('quantity')
 
+            # Usage (times ordered) per fabric color, from the precomputed configuration stats
+            usage_counts = dict(
+                DesignConfigurationStats.objects.filter(order_count__gt=0).values(
+                    'main_body_fabric_color_id'
+                ).annotate(
+                    usage_count=Sum('order_count')
+                ).values_list('main_body_fabric_color_id', 'usage_count')
+            )
+
             data = []
             for fabric in fabrics:
-                # Calculate usage (times ordered)
-                usage_count = UserDesign.objects.filter(
-                    order_items__isnull=False,
-                    main_body_fabric_color=fabric
-                ).count()
+                usage_count = usage_counts.get(fabric.id, 0)
 
                 data.append({
                     'id': fabric.id,
@@ -7,3 +7,4 @@ class PurchaseConfig(AppConfig):
 
     def ready(self):
         import Purchase.signals  # Register signals when app starts
+        import Purchase.content  # noqa - launch-time content responses invalidate on save
@@ -0,0 +1,57 @@
+"""
+Launch-time Content
+About Us, Terms and Conditions and delivery settings as pre-rendered,
+conditional-GET responses (see raggyBackend/static_content.py).
+Imported by PurchaseConfig.ready() so edits invalidate them in every process.
+"""
+from raggyBackend.static_content import StaticContent
+
+from .models import AboutUs, DeliverySettings, TermsAndConditions
+from .serializers import AboutUsSerializer, TermsAndConditionsSerializer
+
+# Returned when no delivery settings exist yet
+DEFAULT_DELIVERY_SETTINGS = {
+    'id': 0,
+    'delivery_days': 5,
+    'delivery_cost': '2.000',
+    'whatsapp_support': '',
+    'is_active': True,
+    'created_at': None,
+    'updated_at': None
+}
+
+
+def _build_delivery_settings():
+    settings = DeliverySettings.objects.filter(is_active=True).first()
+    if not settings:
+        return DEFAULT_DELIVERY_SETTINGS, 200, []
+
+    return {
+        'id': settings.id,
+        'delivery_days': settings.delivery_days,
+        'delivery_cost': str(settings.delivery_cost),
+        'whatsapp_support': settings.whatsapp_support or '',
+        'is_active': settings.is_active,
+        'created_at': settings.created_at.isoformat() if settings.created_at else None,
+        'updated_at': settings.updated_at.isoformat() if settings.updated_at else None
+    }, 200, [settings]
+
+
+def _page_builder(model, serializer_class, title):
+    def build():
+        page = model.objects.filter(is_active=True).first()
+        if not page:
+            return {
+                'error': f'No {title} content found',
+                'message': f'Please add {title} content from admin panel'
+            }, 404, []
+        return serializer_class(page).data, 200, [page]
+    return build
+
+
+delivery_settings = StaticContent('delivery_settings', (DeliverySettings,), _build_delivery_settings)
+about_us = StaticContent('about_us', (AboutUs,), _page_builder(AboutUs, AboutUsSerializer, 'About Us'))
+terms_and_conditions = StaticContent(
+    'terms_and_conditions', (TermsAndConditions,),
+    _page_builder(TermsAndConditions, TermsAndConditionsSerializer, 'Terms and Conditions')
+)
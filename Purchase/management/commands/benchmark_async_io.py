@@ -0,0 +1,246 @@
+"""
+Management command to load test the sync vs async (ASGI) views of the fan-out
+I/O endpoints offline, against the local stub Payzah gateway
+
+Runs in a throwaway test database (never the configured one) with an isolated
+local-memory cache and email backend. Requests go through the full middleware
+stack in-process (httpx WSGI / ASGI transports, no sockets on our side):
+- sync: the WSGI application on --workers threads (a threaded sync worker)
+- async: the ASGI application on one event loop with --concurrency requests in flight
+
+Endpoints (mounted under /sync/ and /async/ by this module's URLconf, as the
+payment views aren't routed in the project URLconf):
+- payment-verify: manual verify of a pending payment (one Payzah call)
+- payment-initiate: payment initiation for a purchase (one Payzah call)
+- otp-send: signup OTP email (SMTP latency simulated with --smtp-latency-ms)
+
+The screenshot upload isn't included: in both modes the Cloudinary upload
+happens after the response, so its request path doesn't wait on I/O.
+
+On SQLite every write queues on one database lock, which caps both modes well
+below what they reach on PostgreSQL; the gap between them is what to read.
+
+Usage:
+    python manage.py benchmark_async_io
+    python manage.py benchmark_async_io --endpoint payment-initiate --requests 1000 --latency-ms 300
+    python manage.py benchmark_async_io --workers 16 --concurrency 200
+"""
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import httpx
+from django.contrib.auth.models import User
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.urls import include, path
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from Purchase.models import Payment, Purchase
+from Purchase.payment_views import (
+    AsyncInitiatePaymentAPIView, AsyncVerifyPaymentAPIView, InitiatePaymentAPIView, VerifyPaymentAPIView
+)
+from Purchase.services.payzah_stub import start_stub_server
+from User.otp_views import AsyncSendEmailOTPAPIView, SendEmailOTPAPIView
+
+ENDPOINTS = {
+    'payment-verify': 'payment/verify/',
+    'payment-initiate': 'payment/initiate/',
+    'otp-send': 'otp/send/',
+}
+
+# URLconf used while the benchmark runs (the project's, plus both versions of each endpoint)
+urlpatterns = [
+    path('', include('raggyBackend.urls')),
+    path('sync/payment/verify/', VerifyPaymentAPIView.as_view()),
+    path('sync/payment/initiate/', InitiatePaymentAPIView.as_view()),
+    path('sync/otp/send/', SendEmailOTPAPIView.as_view()),
+    path('async/payment/verify/', AsyncVerifyPaymentAPIView.as_view()),
+    path('async/payment/initiate/', AsyncInitiatePaymentAPIView.as_view()),
+    path('async/otp/send/', AsyncSendEmailOTPAPIView.as_view()),
+]
+
+
+class SlowEmailBackend(EmailBackend):
+    """locmem email backend that takes `latency` seconds per send, like an SMTP round trip"""
+    latency = 0.0
+
+    def send_messages(self, messages):
+        time.sleep(self.latency)
+        return super().send_messages(messages)
+
+
+class Command(BaseCommand):
+    help = 'Load test the sync vs async views of the payment / OTP endpoints against local stubs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoint', choices=sorted(ENDPOINTS), default='payment-verify')
+        parser.add_argument('--requests', type=int, default=400, help='Requests per mode (default: 400)')
+        parser.add_argument('--workers', type=int, default=8,
+                            help='Sync mode: worker threads (default: 8)')
+        parser.add_argument('--concurrency', type=int, default=100,
+                            help='Async mode: requests in flight (default: 100)')
+        parser.add_argument('--latency-ms', type=int, default=200, help='Stub Payzah latency (default: 200)')
+        parser.add_argument('--smtp-latency-ms', type=int, default=200,
+                            help='Simulated SMTP send latency for otp-send (default: 200)')
+        parser.add_argument('--skip-sync', action='store_true', help='Only run the async mode')
+
+    def handle(self, *args, **options):
+        server = start_stub_server(latency_ms=options['latency_ms'])
+        self.stdout.write(f"🧪 Stub Payzah server listening on {server.url}")
+        SlowEmailBackend.latency = options['smtp_latency_ms'] / 1000.0
+
+        setup_test_environment()
+        if connection.vendor == 'sqlite':
+            # The in-memory test database fails concurrent writes ("table is locked")
+            # instead of waiting for the lock: use a file with a busy timeout, and take
+            # the write lock at BEGIN so select_for_update transactions queue instead of failing
+            connection.settings_dict['TEST']['NAME'] = os.path.join(tempfile.gettempdir(), 'benchmark_async_io.sqlite3')
+            connection.settings_dict['OPTIONS'].update(timeout=30, transaction_mode='IMMEDIATE')
+        # Data migrations print progress; keep it out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(
+                ROOT_URLCONF=__name__,
+                CACHES={'default': {
+                    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                    'LOCATION': 'async-io-benchmark',
+                }},
+                EMAIL_BACKEND=f'{__name__}.SlowEmailBackend',
+                REQUEST_PROFILING_ENABLED=False,
+                ALLOWED_HOSTS=['*'],
+            ):
+                self._run_modes(server, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+            server.shutdown()
+
+    def _run_modes(self, server, options):
+        from Purchase.services.payzahService import payzah_service
+        from Purchase.services.payzah_async import async_payzah_service
+
+        for service in (payzah_service, async_payzah_service):
+            service.base_url = server.url
+            service.retry_backoff = 0.01
+        # Sync: one pooled connection per worker thread, as in a threaded worker
+        payzah_service.pool_size = options['workers']
+        payzah_service._session = None
+        async_payzah_service.pool_size = options['concurrency']
+
+        endpoint = options['endpoint']
+        total = options['requests']
+        modes = ['async'] if options['skip_sync'] else ['sync', 'async']
+        for mode in modes:
+            requests = self._seed(endpoint, mode, total)
+            self.stdout.write(f"🏁 {mode}: {total} x POST {ENDPOINTS[endpoint]}")
+            if mode == 'sync':
+                elapsed, latencies, statuses = self._run_sync(requests, options['workers'])
+                label = f"sync  ({options['workers']} worker threads)"
+            else:
+                elapsed, latencies, statuses = asyncio.run(self._run_async(requests, options['concurrency']))
+                label = f"async ({options['concurrency']} in flight)"
+            self._report(label, total, elapsed, latencies, statuses)
+
+        self.stdout.write(f"   Stub server handled {server.stats['requests']} HTTP requests")
+
+    # ================== DATA ==================
+    def _seed(self, endpoint, mode, total):
+        """(path, json body, headers) for every request of one mode"""
+        url = f"/{mode}/{ENDPOINTS[endpoint]}"
+        if endpoint == 'otp-send':
+            return [
+                (url, {'email': f'bench-{mode}-{i}@example.com', 'purpose': 'signup'}, {})
+                for i in range(total)
+            ]
+
+        user = User.objects.create_user(username=f'bench-{mode}', email=f'bench-{mode}@example.com')
+        headers = {'Authorization': f'Bearer {RefreshToken.for_user(user).access_token}'}
+        purchases = Purchase.objects.bulk_create([
+            Purchase(
+                user=user, full_name='Bench User', email=user.email, phone_number='00000000',
+                payment_option='online', total_price=Decimal('12.500'), invoice_number=f'BENCH-{mode}-{i}'
+            )
+            for i in range(total)
+        ])
+
+        if endpoint == 'payment-initiate':
+            return [
+                (url, {
+                    'purchase_id': purchase.pk,
+                    'success_url': 'https://example.com/success',
+                    'error_url': 'https://example.com/error',
+                }, headers)
+                for purchase in purchases
+            ]
+
+        Payment.objects.bulk_create([
+            Payment(
+                user=user, purchase=purchase, amount=purchase.total_price,
+                track_id=f'RAGY-BENCH-{mode}-{purchase.pk}', payzah_payment_id='STUB'
+            )
+            for purchase in purchases
+        ])
+        return [(url, {'track_id': f'RAGY-BENCH-{mode}-{purchase.pk}'}, headers) for purchase in purchases]
+
+    # ================== RUNNERS ==================
+    def _run_sync(self, requests, workers):
+        from raggyBackend.wsgi import application
+
+        latencies, statuses = [], []
+
+        def call(request):
+            url, body, headers = request
+            with httpx.Client(transport=httpx.WSGITransport(app=application), base_url='http://testserver') as client:
+                started = time.perf_counter()
+                response = client.post(url, json=body, headers=headers)
+                latencies.append(time.perf_counter() - started)
+                statuses.append(response.status_code)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(call, requests))
+        return time.perf_counter() - started, latencies, statuses
+
+    async def _run_async(self, requests, concurrency):
+        from raggyBackend.asgi import application
+
+        latencies, statuses = [], []
+        semaphore = asyncio.Semaphore(concurrency)
+        transport = httpx.ASGITransport(app=application)
+
+        async with httpx.AsyncClient(transport=transport, base_url='http://testserver', timeout=None) as client:
+            async def call(request):
+                url, body, headers = request
+                async with semaphore:
+                    started = time.perf_counter()
+                    response = await client.post(url, json=body, headers=headers)
+                    latencies.append(time.perf_counter() - started)
+                    statuses.append(response.status_code)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(call(request) for request in requests))
+            elapsed = time.perf_counter() - started
+
+        from Purchase.services.payzah_async import async_payzah_service
+        await async_payzah_service.aclose()
+        return elapsed, latencies, statuses
+
+    def _report(self, label, total, elapsed, latencies, statuses):
+        latencies = sorted(latencies)
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0
+        errors = sum(1 for code in statuses if code >= 400)
+        line = (
+            f"✅ {label}: {total} requests in {elapsed:.2f}s ({total / elapsed:.0f} req/s) "
+            f"p50={statistics.median(latencies) * 1000:.0f}ms p95={p95 * 1000:.0f}ms errors={errors}"
+        )
+        self.stdout.write(self.style.SUCCESS(line) if not errors else self.style.WARNING(line))
@@ -0,0 +1,90 @@
+"""
+Management command to benchmark PayzahService offline against the local stub gateway
+
+Usage:
+    python manage.py benchmark_payzah
+    python manage.py benchmark_payzah --requests 2000 --concurrency 16 --latency-ms 20
+    python manage.py benchmark_payzah --error-rate 0.1        # exercise retries
+    python manage.py benchmark_payzah --serve --port 8765     # only run the stub gateway
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.core.management.base import BaseCommand
+
+from Purchase.services.payzahService import PayzahService
+from Purchase.services.payzah_stub import start_stub_server
+
+
+class Command(BaseCommand):
+    help = 'Benchmark PayzahService (pooled session) against a local stub Payzah server'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Status checks to send (default: 500)')
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent callers (default: 8)')
+        parser.add_argument('--latency-ms', type=int, default=5, help='Stub server latency per request (default: 5)')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of stub responses that are 503')
+        parser.add_argument('--port', type=int, default=0, help='Stub server port (default: random free port)')
+        parser.add_argument('--serve', action='store_true', help='Only run the stub server until Ctrl+C')
+        parser.add_argument(
+            '--skip-unpooled',
+            action='store_true',
+            help='Skip the baseline run that opens a new connection per call',
+        )
+
+    def handle(self, *args, **options):
+        server = start_stub_server(
+            port=options['port'],
+            latency_ms=options['latency_ms'],
+            error_rate=options['error_rate']
+        )
+        self.stdout.write(f"🧪 Stub Payzah server listening on {server.url}")
+
+        if options['serve']:
+            try:
+                while True:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                server.shutdown()
+            return
+
+        total = options['requests']
+        concurrency = options['concurrency']
+        track_ids = [f"RAGY-BENCH-{i}" for i in range(total)]
+
+        service = PayzahService(base_url=server.url, private_key='stub-key')
+        service.pool_size = concurrency
+        service.retry_backoff = 0.01
+
+        elapsed = self._run(concurrency, track_ids, lambda t: service.check_payment_status(t, 'STUB'))
+        self._report('Pooled session', total, elapsed)
+        for endpoint, stats in service.get_latency_stats().items():
+            self.stdout.write(
+                f"   {endpoint}: count={stats['count']} errors={stats['errors']} avg={stats['avg_ms']}ms "
+                f"p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms p99={stats['p99_ms']}ms max={stats['max_ms']}ms"
+            )
+
+        if not options['skip_unpooled']:
+            url = f"{server.url}/ws/paymentgateway/get-payment-details"
+
+            def unpooled(track_id):
+                # Previous behaviour: module-level requests.post, new connection every call
+                return requests.post(url, json={'trackid': track_id, 'payment_id': 'STUB'}, timeout=15)
+
+            elapsed = self._run(concurrency, track_ids, unpooled)
+            self._report('New connection per call', total, elapsed)
+
+        self.stdout.write(f"   Stub server handled {server.stats['requests']} HTTP requests")
+        server.shutdown()
+
+    def _run(self, concurrency, track_ids, call):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(call, track_ids))
+        return time.perf_counter() - started
+
+    def _report(self, label, total, elapsed):
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {label}: {total} calls in {elapsed:.2f}s ({total / elapsed:.0f} req/s)"
+        ))
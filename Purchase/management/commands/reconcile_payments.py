@@ -0,0 +1,50 @@
+"""
+Management command to reconcile payments stuck in 'pending' with Payzah
+(callback never arrived or the gateway was unreachable during the callback)
+
+Usage:
+    python manage.py reconcile_payments
+    python manage.py reconcile_payments --older-than 0 --batch-size 200 --workers 16
+"""
+
+from django.core.management.base import BaseCommand
+from Purchase.payment_processing import reconcile_pending_payments
+
+
+class Command(BaseCommand):
+    help = 'Check pending payments against Payzah and apply the gateway status'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Number of payments loaded per chunk (default: PAYMENT_RECONCILE_BATCH_SIZE)',
+        )
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            default=15,
+            help='Only check payments created at least this many minutes ago (default: 15)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Concurrent gateway lookups (default: PAYMENT_RECONCILE_WORKERS)',
+        )
+
+    def handle(self, *args, **options):
+        stats = reconcile_pending_payments(
+            batch_size=options['batch_size'],
+            older_than_minutes=options['older_than'],
+            max_workers=options['workers']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Checked {stats['checked']} payments in {stats['elapsed_seconds']}s "
+            f"({stats['throughput_per_second']}/s): captured {stats['captured']}, failed {stats['failed']}, "
+            f"expired {stats['expired']}, still pending {stats['still_pending']}, errors {stats['errors']}"
+        ))
+        self.stdout.write(
+            f"📊 Backlog: {stats['backlog']} pending, oldest {stats['oldest_pending_seconds']}s"
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-19 02:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Purchase', '0026_alter_item_selected_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='item',
+            name='stats_config_key',
+            field=models.CharField(blank=True, editable=False, max_length=200, null=True),
+        ),
+    ]
@@ -116,6 +116,9 @@ class Item(models.Model):
     # Store size details as JSON (measurements)
     size_details = models.JSONField(null=True, blank=True)
 
+    # DesignConfigurationStats row this item was counted on (see Design/design_stats.py)
+    stats_config_key = models.CharField(max_length=200, null=True, blank=True, editable=False)
+
     def __str__(self):
         return f"{self.product_name} - {self.invoice.invoice_number}"
 
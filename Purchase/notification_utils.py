@@ -6,11 +6,16 @@ Sends push notifications for critical events:
 - New Discounts/Promos (1 type)
 """
 
+import logging
 import firebase_admin
 from firebase_admin import credentials, messaging
 import os
 from django.conf import settings
 
+from User.device_tokens import send_push
+
+logger = logging.getLogger(__name__)
+
 
 # Initialize Firebase Admin SDK (if not already initialized)
 def initialize_firebase():
@@ -23,12 +28,11 @@ def initialize_firebase():
             if os.path.exists(cred_path):
                 cred = credentials.Certificate(cred_path)
                 firebase_admin.initialize_app(cred)
-                print("✅ Firebase Admin SDK initialized")
+                logger.info("✅ Firebase Admin SDK initialized")
             else:
-                print("⚠️ Warning: firebase_service_account.json not found")
-                print(f"Expected path: {cred_path}")
+                logger.warning("⚠️ firebase_service_account.json not found (expected at %s)", cred_path)
         except Exception as e:
-            print(f"❌ Firebase initialization error: {e}")
+            logger.error("❌ Firebase initialization error: %s", e)
 
 
 # ========== ORDER STATUS NOTIFICATIONS ==========
@@ -50,11 +54,11 @@ def send_order_pending_notification(user_fcm_token, order):
             token=user_fcm_token,
         )
 
-        response = messaging.send(message)
-        print(f'✅ Pending notification sent: {response}')
+        response = send_push(message)
+        logger.info("✅ Pending notification sent: %s", response)
         return True
     except Exception as e:
-        print(f'❌ Error sending pending notification: {e}')
+        logger.error("❌ Error sending pending notification: %s", e)
         return False
 
 
@@ -75,11 +79,11 @@ def send_order_confirmed_notification(user_fcm_token, order):
             token=user_fcm_token,
         )
 
-        response = messaging.send(message)
-        print(f'✅ Confirmed notification sent: {response}')
+        response = send_push(message)
+        logger.info("✅ Confirmed notification sent: %s", response)
         return True
     except Exception as e:
-        print(f'❌ Error sending confirmed notification: {e}')
+        logger.error("❌ Error sending confirmed notification: %s", e)
         return False
 
 
@@ -101,11 +105,11 @@ def send_order_working_notification(user_fcm_token, order, estimated_days=0):
             token=user_fcm_token,
         )
 
-        response = messaging.send(message)
-        print(f'✅ Working notification sent: {response}')
+        response = send_push(message)
+        logger.info("✅ Working notification sent: %s", response)
         return True
     except Exception as e:
-        print(f'❌ Error sending working notification: {e}')
+        logger.error("❌ Error sending working notification: %s", e)
         return False
 
 
@@ -129,11 +133,11 @@ def send_order_shipping_notification(user_fcm_token, order):
             token=user_fcm_token,
         )
 
-        response = messaging.send(message)
-        print(f'✅ Shipping notification sent: {response}')
+        response = send_push(message)
+        logger.info("✅ Shipping notification sent: %s", response)
         return True
     except Exception as e:
-        print(f'❌ Error sending shipping notification: {e}')
+        logger.error("❌ Error sending shipping notification: %s", e)
         return False
 
 
@@ -154,11 +158,11 @@ def send_order_delivered_notification(user_fcm_token, order):
             token=user_fcm_token,
         )
 
-        response = messaging.send(message)
-        print(f'✅ Delivered notification sent: {response}')
+        response = send_push(message)
+        logger.info("✅ Delivered notification sent: %s", response)
         return True
     except Exception as e:
-        print(f'❌ Error sending delivered notification: {e}')
+        logger.error("❌ Error sending delivered notification: %s", e)
         return False
 
 
@@ -186,11 +190,11 @@ def send_order_cancelled_notification(user_fcm_token, order, reason=None):
             token=user_fcm_token,
         )
 
-        response = messaging.send(message)
-        print(f'✅ Cancelled notification sent: {response}')
+        response = send_push(message)
+        logger.info("✅ Cancelled notification sent: %s", response)
         return True
     except Exception as e:
-        print(f'❌ Error sending cancelled notification: {e}')
+        logger.error("❌ Error sending cancelled notification: %s", e)
         return False
 
 
@@ -213,11 +217,11 @@ def send_payment_success_notification(user_fcm_token, order):
             token=user_fcm_token,
         )
 
-        response = messaging.send(message)
-        print(f'✅ Payment success notification sent: {response}')
+        response = send_push(message)
+        logger.info("✅ Payment success notification sent: %s", response)
         return True
     except Exception as e:
-        print(f'❌ Error sending payment success notification: {e}')
+        logger.error("❌ Error sending payment success notification: %s", e)
         return False
 
 
@@ -244,11 +248,11 @@ def send_payment_failed_notification(user_fcm_token, order, error_message=None):
             token=user_fcm_token,
         )
 
-        response = messaging.send(message)
-        print(f'✅ Payment failed notification sent: {response}')
+        response = send_push(message)
+        logger.info("✅ Payment failed notification sent: %s", response)
         return True
     except Exception as e:
-        print(f'❌ Error sending payment failed notification: {e}')
+        logger.error("❌ Error sending payment failed notification: %s", e)
         return False
 
 
@@ -265,7 +269,7 @@ def send_order_status_notification(user_fcm_token, order, new_status, **kwargs):
         **kwargs: Additional parameters (estimated_days, reason, etc.)
     """
     if not user_fcm_token:
-        print("⚠️ Warning: No FCM token provided")
+        logger.warning("⚠️ No FCM token provided")
         return False
 
     # Initialize Firebase if not already done
@@ -287,5 +291,5 @@ def send_order_status_notification(user_fcm_token, order, new_status, **kwargs):
     if handler:
         return handler()
     else:
-        print(f"⚠️ Warning: No notification handler for status '{new_status}'")
+        logger.warning("⚠️ No notification handler for status '%s'", new_status)
         return False
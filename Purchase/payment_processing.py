@@ -0,0 +1,285 @@
+"""
+Payment State Transitions
+Single place where a Payzah verification result is applied to a Payment.
+
+Every transition runs under a row lock (select_for_update) on the payment, so
+duplicate gateway callbacks, the manual verify endpoint and the reconciliation
+worker can race freely: the first one finalizes the payment, the others see a
+finalized row and short-circuit. Notifications are written to the notification
+outbox in the same transaction and delivered after commit.
+
+Stale pending payments are swept by reconcile_pending_payments(), which checks
+them against Payzah concurrently and applies the results in bulk per chunk.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from Notification.outbox import enqueue_notification, enqueue_notifications
+
+from .models import Payment, Purchase
+from .services.payzahService import payzah_service
+
+logger = logging.getLogger(__name__)
+
+FINAL_STATUSES = ('captured', 'failed', 'canceled', 'refunded')
+
+
+def is_finalized(payment):
+    """A payment is final once captured, or once the gateway confirmed a terminal status"""
+    if payment.status == 'captured':
+        return True
+    return payment.status in FINAL_STATUSES and payment.verified_with_gateway
+
+
+def apply_verification(payment_pk, verification, raw_status=None):
+    """
+    Apply a verify_payment/check_payment_status result to a payment.
+
+    Returns (payment, changed). `changed` is False when the payment was already
+    finalized by someone else, or when there was no answer from the gateway.
+
+    Only an explicit refusal from Payzah (`rejected`) fails the payment; any
+    other unsuccessful result (network error, unexpected response) leaves it
+    pending for reconciliation to retry.
+    """
+    with transaction.atomic():
+        payment = Payment.objects.select_for_update().get(pk=payment_pk)
+
+        if is_finalized(payment):
+            return payment, False
+
+        if not verification.get('success'):
+            if not verification.get('rejected'):
+                # No answer from the gateway - keep pending, reconciliation will retry
+                Payment.objects.filter(pk=payment.pk).update(
+                    gateway_verification_attempts=payment.gateway_verification_attempts + 1
+                )
+                return payment, False
+
+            # Gateway explicitly rejected the verification - that answer is final,
+            # so duplicate callbacks short-circuit instead of re-notifying
+            payment.status = 'failed'
+            payment.verified_with_gateway = True
+            payment.payment_status_raw = raw_status or payment.payment_status_raw
+            payment.gateway_verification_attempts += 1
+            payment.save(update_fields=[
+                'status', 'verified_with_gateway', 'payment_status_raw', 'gateway_verification_attempts', 'updated_at'
+            ])
+            _enqueue_failed(payment, verification.get('error') or 'Payment verification failed')
+            return payment, True
+
+        internal_status = _set_verification_fields(payment, verification)
+        if internal_status == 'captured':
+            payment.completed_at = payment.completed_at or timezone.now()
+            if payment.purchase_id:
+                # Queryset update: the order status signal would send FCM inline,
+                # the payment_success outbox entry covers that notification
+                Purchase.objects.filter(pk=payment.purchase_id).update(status='Processing')
+                enqueue_notification('payment_success', {'purchase_id': payment.purchase_id})
+                logger.info(f"Purchase {payment.purchase_id} marked as Processing")
+        elif internal_status != 'pending':
+            _enqueue_failed(payment, f"Payment status: {internal_status}")
+
+        payment.save()
+        logger.info(f"Payment {payment.track_id} status updated to {internal_status}")
+
+    return payment, True
+
+
+VERIFICATION_FIELDS = [
+    'status', 'verified_with_gateway', 'gateway_verification_attempts', 'payzah_reference_code',
+    'knet_payment_id', 'transaction_number', 'payment_date', 'payment_status_raw', 'completed_at', 'updated_at',
+]
+
+
+def _set_verification_fields(payment, verification):
+    """Copy a successful gateway result onto the payment (no save). Returns the internal status."""
+    payzah_status = verification.get('payment_status')
+    internal_status = payzah_service.map_payment_status(payzah_status)
+
+    payment.status = internal_status
+    payment.verified_with_gateway = True
+    payment.gateway_verification_attempts += 1
+    payment.payzah_reference_code = verification.get('payzah_reference_code')
+    payment.knet_payment_id = verification.get('knet_payment_id')
+    payment.transaction_number = verification.get('transaction_number')
+    payment.payment_date = verification.get('payment_date')
+    payment.payment_status_raw = payzah_status
+    return internal_status
+
+
+def _enqueue_failed(payment, error_message):
+    if payment.purchase_id:
+        enqueue_notification('payment_failed', {
+            'purchase_id': payment.purchase_id,
+            'error_message': error_message,
+        })
+
+
+# ================== RECONCILIATION ==================
+RECONCILIATION_METRICS_KEY = 'payment_reconciliation:last_run'
+
+
+def _check_status(row):
+    """Worker: one gateway lookup (HTTP only, no DB access)"""
+    payment_pk, track_id, payzah_payment_id = row
+    try:
+        result = payzah_service.check_payment_status(track_id, payzah_payment_id)
+    except Exception as e:
+        result = {'success': False, 'error': str(e), 'code': 'STATUS_CHECK_ERROR'}
+    return payment_pk, result
+
+
+def apply_verifications_bulk(results, expire_before=None):
+    """
+    Apply a chunk of gateway results in one transaction.
+
+    Payments are locked in id order (consistent lock ordering with other
+    writers), rows finalized in the meantime are skipped, and all transitions
+    are written with a single bulk_update. Pending payments created before
+    `expire_before` are canceled when the gateway answers that they are still
+    pending; a failed status check never cancels a payment.
+
+    Returns a dict of transition counts.
+    """
+    counts = {'captured': 0, 'failed': 0, 'expired': 0, 'still_pending': 0, 'errors': 0}
+    results = dict(results)
+    if not results:
+        return counts
+
+    now = timezone.now()
+    with transaction.atomic():
+        payments = list(
+            Payment.objects.select_for_update().filter(pk__in=results.keys(), status='pending').order_by('id')
+        )
+
+        changed, captured_purchase_ids, events = [], [], []
+        for payment in payments:
+            verification = results[payment.pk]
+
+            if not verification.get('success'):
+                # No usable answer (gateway down, unexpected response): the payment
+                # may have been captured, so it stays pending whatever its age
+                counts['errors'] += 1
+                payment.gateway_verification_attempts += 1
+                payment.updated_at = now
+                changed.append(payment)
+                continue
+
+            internal_status = _set_verification_fields(payment, verification)
+            if internal_status == 'captured':
+                payment.completed_at = payment.completed_at or now
+                counts['captured'] += 1
+                if payment.purchase_id:
+                    captured_purchase_ids.append(payment.purchase_id)
+                    events.append(('payment_success', {'purchase_id': payment.purchase_id}))
+            elif internal_status == 'pending':
+                if expire_before and payment.created_at <= expire_before:
+                    # The gateway still reports it pending: abandoned, stop polling it
+                    payment.status = 'canceled'
+                    counts['expired'] += 1
+                else:
+                    counts['still_pending'] += 1
+            else:
+                counts['failed'] += 1
+                if payment.purchase_id:
+                    events.append(('payment_failed', {
+                        'purchase_id': payment.purchase_id,
+                        'error_message': f"Payment status: {internal_status}",
+                    }))
+
+            payment.updated_at = now
+            changed.append(payment)
+
+        Payment.objects.bulk_update(changed, VERIFICATION_FIELDS)
+        if captured_purchase_ids:
+            Purchase.objects.filter(pk__in=captured_purchase_ids).update(status='Processing')
+        enqueue_notifications(events)
+
+    return counts
+
+
+def get_reconciliation_backlog(older_than_minutes=15):
+    """Number of stale pending payments and the age (seconds) of the oldest one"""
+    cutoff = timezone.now() - timedelta(minutes=older_than_minutes)
+    backlog = Payment.objects.filter(status='pending', created_at__lte=cutoff).aggregate(
+        count=Count('id'),
+        oldest=Min('created_at')
+    )
+    oldest = backlog['oldest']
+    return {
+        'backlog': backlog['count'],
+        'oldest_pending_seconds': int((timezone.now() - oldest).total_seconds()) if oldest else 0,
+    }
+
+
+def reconcile_pending_payments(batch_size=None, older_than_minutes=15, max_workers=None, expire_after_hours=None):
+    """
+    Poll Payzah for payments stuck in 'pending' (user closed the browser, callback
+    never arrived, gateway timed out during the callback) and apply the result.
+
+    Stale payments are selected in keyset-paginated chunks over the status and
+    created_at indexes, checked concurrently on a bounded worker pool and
+    applied with one bulk write per chunk.
+
+    Returns a metrics dict (also cached under RECONCILIATION_METRICS_KEY).
+    """
+    batch_size = batch_size or settings.PAYMENT_RECONCILE_BATCH_SIZE
+    max_workers = max_workers or settings.PAYMENT_RECONCILE_WORKERS
+    if expire_after_hours is None:
+        expire_after_hours = settings.PAYMENT_RECONCILE_EXPIRE_HOURS
+
+    started = time.perf_counter()
+    now = timezone.now()
+    cutoff = now - timedelta(minutes=older_than_minutes)
+    expire_before = now - timedelta(hours=expire_after_hours) if expire_after_hours else None
+
+    stats = {'checked': 0, 'updated': 0, 'captured': 0, 'failed': 0, 'expired': 0, 'still_pending': 0, 'errors': 0}
+    last_created_at, last_id = None, 0
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='payment-reconcile') as executor:
+        while True:
+            queryset = Payment.objects.filter(status='pending', created_at__lte=cutoff)
+            if last_created_at is not None:
+                queryset = queryset.filter(
+                    Q(created_at__gt=last_created_at) | Q(created_at=last_created_at, id__gt=last_id)
+                )
+            chunk = list(
+                queryset.order_by('created_at', 'id')
+                .values_list('id', 'track_id', 'payzah_payment_id', 'created_at')[:batch_size]
+            )
+            if not chunk:
+                break
+            last_id, last_created_at = chunk[-1][0], chunk[-1][3]
+
+            results = list(executor.map(_check_status, [row[:3] for row in chunk]))
+            try:
+                counts = apply_verifications_bulk(results, expire_before=expire_before)
+            except Exception as e:
+                logger.error(f"Reconciliation chunk failed: {e}", exc_info=True)
+                counts = {'errors': len(chunk)}
+
+            stats['checked'] += len(chunk)
+            for key, value in counts.items():
+                stats[key] += value
+            stats['updated'] += counts.get('captured', 0) + counts.get('failed', 0) + counts.get('expired', 0)
+
+            if len(chunk) < batch_size:
+                break
+
+    elapsed = time.perf_counter() - started
+    stats['elapsed_seconds'] = round(elapsed, 3)
+    stats['throughput_per_second'] = round(stats['checked'] / elapsed, 2) if elapsed else 0
+    stats.update(get_reconciliation_backlog(older_than_minutes))
+    stats['finished_at'] = timezone.now().isoformat()
+
+    cache.set(RECONCILIATION_METRICS_KEY, stats, None)
+    return stats
@@ -1,16 +1,23 @@
 """
 Payment Views for Payzah Payment Gateway Integration
 Handles payment initialization, callback processing, and verification
+
+Initiate and verify also have async versions (AsyncInitiatePaymentAPIView,
+AsyncVerifyPaymentAPIView) for ASGI deployments: same request/response
+contract, but the Payzah round trip is awaited on the event loop through
+AsyncPayzahService instead of holding a worker thread.
 """
 
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
 from django.shortcuts import redirect
 from django.db import transaction
-from django.utils import timezone
 from django.conf import settings
+from django.core.cache import cache
 import logging
 import uuid
 
@@ -23,7 +30,9 @@ from .serializers import (
     PaymentStatusSerializer
 )
 from .services.payzahService import payzah_service
-from .notification_utils import send_payment_success_notification, send_payment_failed_notification
+from .services.payzah_async import async_payzah_service
+from .payment_processing import apply_verification, is_finalized
+from raggyBackend.async_views import AsyncAPIView
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +47,89 @@ def get_client_ip(request):
     return ip
 
 
+# ================== SHARED (SYNC + ASYNC VIEWS) ==================
+def get_payable_purchase(purchase_id, user):
+    """
+    (purchase, None) for the user's purchase if it has no captured payment yet,
+    otherwise (None, (error body, status code))
+    """
+    try:
+        purchase = Purchase.objects.select_related('payment').get(id=purchase_id, user=user)
+    except Purchase.DoesNotExist:
+        return None, ({
+            'success': False,
+            'error': 'Purchase not found or unauthorized'
+        }, status.HTTP_404_NOT_FOUND)
+
+    # Check if purchase already has a captured payment
+    if hasattr(purchase, 'payment') and purchase.payment:
+        if purchase.payment.status == 'captured':
+            return None, ({
+                'success': False,
+                'error': 'Payment already completed for this purchase'
+            }, status.HTTP_400_BAD_REQUEST)
+
+    return purchase, None
+
+
+def build_payment_data(purchase, user, track_id, success_url, error_url):
+    """Payment data for PayzahService.initiate_payment"""
+    return {
+        'amount': purchase.total_price,
+        'success_url': success_url,
+        'error_url': error_url,
+        'track_id': track_id,
+        'user_name': purchase.full_name,
+        'user_email': purchase.email or user.email,
+        'invoice_number': purchase.invoice_number,
+        'order_details': f'Raggey Order - {purchase.invoice_number}'
+    }
+
+
+def record_initiated_payment(request, purchase, track_id, payzah_response, success_url, error_url):
+    """Create the pending Payment for a successful initiation (replacing a pending one)"""
+    with transaction.atomic():
+        # Delete existing pending payment if exists
+        if hasattr(purchase, 'payment') and purchase.payment:
+            if purchase.payment.status == 'pending':
+                purchase.payment.delete()
+
+        payment = Payment.objects.create(
+            user=request.user,
+            purchase=purchase,
+            amount=purchase.total_price,
+            currency='KWD',
+            track_id=track_id,
+            payzah_payment_id=payzah_response.get('payment_id', ''),
+            status='pending',
+            redirect_url=payzah_response.get('redirect_url'),
+            success_url=success_url,
+            error_url=error_url,
+            # Generate idempotency key
+            idempotency_key=str(uuid.uuid4()),
+            user_agent=request.META.get('HTTP_USER_AGENT', ''),
+            ip_address=get_client_ip(request),
+            # Store order details in UDF fields
+            udf1=purchase.invoice_number,
+            udf2=purchase.full_name,
+            udf3=purchase.email or request.user.email,
+            udf5=f'Raggey Order - {purchase.invoice_number}'
+        )
+
+        logger.info(f"Payment initiated successfully: {track_id}")
+    return payment
+
+
+def initiated_payment_body(track_id, payzah_response):
+    return {
+        'success': True,
+        'redirect_url': payzah_response.get('redirect_url'),
+        'track_id': track_id,
+        'payment_id': payzah_response.get('payment_id'),
+        'is_transit': payzah_response.get('is_transit', True)
+    }
+
+
 class InitiatePaymentAPIView(APIView):
     """
     POST /api/payment/initiate/
@@ -76,43 +168,17 @@ class InitiatePaymentAPIView(APIView):
             success_url = serializer.validated_data['success_url']
             error_url = serializer.validated_data['error_url']
 
-            # Get purchase
-            try:
-                purchase = Purchase.objects.get(id=purchase_id, user=request.user)
-            except Purchase.DoesNotExist:
-                return Response({
-                    'success': False,
-                    'error': 'Purchase not found or unauthorized'
-                }, status=status.HTTP_404_NOT_FOUND)
-
-            # Check if purchase already has a captured payment
-            if hasattr(purchase, 'payment') and purchase.payment:
-                if purchase.payment.status == 'captured':
-                    return Response({
-                        'success': False,
-                        'error': 'Payment already completed for this purchase'
-                    }, status=status.HTTP_400_BAD_REQUEST)
-
-            # Generate idempotency key
-            idempotency_key = str(uuid.uuid4())
+            purchase, error = get_payable_purchase(purchase_id, request.user)
+            if error:
+                return Response(error[0], status=error[1])
 
             # Generate track ID
             track_id = payzah_service.generate_track_id()
 
-            # Prepare payment data for Payzah
-            payment_data = {
-                'amount': purchase.total_price,
-                'success_url': success_url,
-                'error_url': error_url,
-                'track_id': track_id,
-                'user_name': purchase.full_name,
-                'user_email': purchase.email or request.user.email,
-                'invoice_number': purchase.invoice_number,
-                'order_details': f'Raggey Order - {purchase.invoice_number}'
-            }
-
             # Call Payzah service to initiate payment
-            payzah_response = payzah_service.initiate_payment(payment_data)
+            payzah_response = payzah_service.initiate_payment(
+                build_payment_data(purchase, request.user, track_id, success_url, error_url)
+            )
 
             if not payzah_response.get('success'):
                 logger.error(f"Payzah payment initiation failed: {payzah_response.get('error')}")
@@ -122,42 +188,9 @@ class InitiatePaymentAPIView(APIView):
                 }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
             # Create payment record in database
-            with transaction.atomic():
-                # Delete existing pending payment if exists
-                if hasattr(purchase, 'payment') and purchase.payment:
-                    if purchase.payment.status == 'pending':
-                        purchase.payment.delete()
-
-                payment = Payment.objects.create(
-                    user=request.user,
-                    purchase=purchase,
-                    amount=purchase.total_price,
-                    currency='KWD',
-                    track_id=track_id,
-                    payzah_payment_id=payzah_response.get('payment_id', ''),
-                    status='pending',
-                    redirect_url=payzah_response.get('redirect_url'),
-                    success_url=success_url,
-                    error_url=error_url,
-                    idempotency_key=idempotency_key,
-                    user_agent=request.META.get('HTTP_USER_AGENT', ''),
-                    ip_address=get_client_ip(request),
-                    # Store order details in UDF fields
-                    udf1=purchase.invoice_number,
-                    udf2=purchase.full_name,
-                    udf3=purchase.email or request.user.email,
-                    udf5=f'Raggey Order - {purchase.invoice_number}'
-                )
+            record_initiated_payment(request, purchase, track_id, payzah_response, success_url, error_url)
 
-                logger.info(f"Payment initiated successfully: {track_id}")
-
-            return Response({
-                'success': True,
-                'redirect_url': payzah_response.get('redirect_url'),
-                'track_id': track_id,
-                'payment_id': payzah_response.get('payment_id'),
-                'is_transit': payzah_response.get('is_transit', True)
-            }, status=status.HTTP_200_OK)
+            return Response(initiated_payment_body(track_id, payzah_response), status=status.HTTP_200_OK)
 
         except Exception as e:
             logger.error(f"Payment initiation error: {str(e)}", exc_info=True)
@@ -173,6 +206,11 @@ class PaymentCallbackAPIView(APIView):
     Handle payment callback from Payzah
     Verifies payment and updates order status
 
+    Idempotent: duplicate callbacks for the same track ID are short-circuited once
+    the payment is finalized, and concurrent callbacks are collapsed with a
+    short-lived cache lock. Notifications go through the notification outbox, so
+    the redirect is sent as soon as the new state is committed.
+
     Query Parameters (from Payzah):
     - trackid: Payment track ID
     - payment_id: Payzah payment ID
@@ -185,6 +223,8 @@ class PaymentCallbackAPIView(APIView):
     """
     permission_classes = [AllowAny]  # Callback from Payzah doesn't have auth
 
+    CALLBACK_LOCK_TIMEOUT = 30  # seconds
+
     def get(self, request):
         try:
             # Log callback data
@@ -199,86 +239,46 @@ class PaymentCallbackAPIView(APIView):
 
             # Get payment record
             try:
-                payment = Payment.objects.select_related('purchase', 'user').get(track_id=track_id)
+                payment = Payment.objects.only(
+                    'id', 'track_id', 'status', 'verified_with_gateway', 'payzah_reference_code',
+                    'success_url', 'error_url'
+                ).get(track_id=track_id)
             except Payment.DoesNotExist:
                 logger.error(f"Payment not found for track ID: {track_id}")
                 return redirect(f"{settings.FRONTEND_URL}/payment/error?error=payment_not_found")
 
-            # Verify payment with Payzah API
-            verification = payzah_service.verify_payment(
-                track_id=track_id,
-                payment_id=request.GET.get('payment_id')
-            )
+            # Already finalized (duplicate callback) - no gateway call, no writes
+            if is_finalized(payment):
+                logger.info(f"Payment {track_id} already finalized ({payment.status}), skipping callback")
+                return self._redirect_for(payment)
 
-            if not verification.get('success') or not verification.get('verified'):
-                logger.error(f"Payment verification failed: {verification.get('error')}")
-                payment.status = 'failed'
-                payment.payment_status_raw = request.GET.get('paymentStatus', '')
-                payment.save()
-
-                return redirect(f"{payment.error_url}?track_id={track_id}&error=verification_failed")
-
-            # Payment verified successfully
-            payzah_status = verification.get('payment_status')
-            internal_status = payzah_service.map_payment_status(payzah_status)
-
-            # Update payment record
-            with transaction.atomic():
-                payment.status = internal_status
-                payment.verified_with_gateway = True
-                payment.gateway_verification_attempts += 1
-                payment.payzah_reference_code = verification.get('payzah_reference_code')
-                payment.knet_payment_id = verification.get('knet_payment_id')
-                payment.transaction_number = verification.get('transaction_number')
-                payment.payment_date = verification.get('payment_date')
-                payment.payment_status_raw = payzah_status
-
-                if internal_status == 'captured':
-                    payment.completed_at = timezone.now()
-                    # Update purchase status to Processing
-                    if payment.purchase:
-                        payment.purchase.status = 'Processing'
-                        payment.purchase.save()
-                        logger.info(f"Purchase {payment.purchase.invoice_number} marked as Processing")
-
-                        # Send payment success notification
-                        try:
-                            user_profile = getattr(payment.purchase.user, 'profile', None)
-                            if user_profile and user_profile.fcm_token:
-                                send_payment_success_notification(
-                                    user_fcm_token=user_profile.fcm_token,
-                                    order=payment.purchase
-                                )
-                                logger.info(f"🔔 Payment success notification sent to user {payment.purchase.user.id}")
-                            else:
-                                logger.warning(f"⚠️ No FCM token found for user {payment.purchase.user.id}")
-                        except Exception as e:
-                            logger.warning(f"⚠️ Could not send payment success notification: {e}")
-
-                payment.save()
-                logger.info(f"Payment {track_id} status updated to {internal_status}")
-
-            # Redirect based on payment status
-            if internal_status == 'captured':
-                return redirect(f"{payment.success_url}?track_id={track_id}&status=success")
-            else:
-                # Send payment failed notification
-                if payment.purchase:
-                    try:
-                        user_profile = getattr(payment.purchase.user, 'profile', None)
-                        if user_profile and user_profile.fcm_token:
-                            send_payment_failed_notification(
-                                user_fcm_token=user_profile.fcm_token,
-                                order=payment.purchase,
-                                error_message=f"Payment status: {internal_status}"
-                            )
-                            logger.info(f"🔔 Payment failed notification sent to user {payment.purchase.user.id}")
-                        else:
-                            logger.warning(f"⚠️ No FCM token found for user {payment.purchase.user.id}")
-                    except Exception as e:
-                        logger.warning(f"⚠️ Could not send payment failed notification: {e}")
-
-                return redirect(f"{payment.error_url}?track_id={track_id}&status={internal_status}")
+            # Another callback for this track ID is being processed right now. With
+            # the cache unavailable add() returns None: go on, apply_verification's
+            # row lock still serializes the callbacks
+            lock_key = f'payment_callback:{track_id}'
+            if cache.add(lock_key, 1, self.CALLBACK_LOCK_TIMEOUT) is False:
+                logger.info(f"Payment {track_id} callback already in progress")
+                return redirect(f"{payment.success_url}?track_id={track_id}&status=processing")
+
+            try:
+                # Verify payment with Payzah API (no DB lock held during the HTTP call)
+                verification = payzah_service.verify_payment(
+                    track_id=track_id,
+                    payment_id=request.GET.get('payment_id')
+                )
+
+                if not verification.get('success') or not verification.get('verified'):
+                    logger.error(f"Payment verification failed: {verification.get('error')}")
+
+                payment, _ = apply_verification(
+                    payment.pk,
+                    verification,
+                    raw_status=request.GET.get('paymentStatus', '')
+                )
+            finally:
+                cache.delete(lock_key)
+
+            return self._redirect_for(payment)
 
         except Exception as e:
             logger.error(f"Payment callback error: {str(e)}", exc_info=True)
@@ -288,6 +288,19 @@ class PaymentCallbackAPIView(APIView):
         """Handle POST callback (some gateways send POST)"""
         return self.get(request)
 
+    @staticmethod
+    def _redirect_for(payment):
+        """Redirect based on payment status"""
+        if payment.status == 'captured':
+            return redirect(f"{payment.success_url}?track_id={payment.track_id}&status=success")
+        if payment.status == 'pending':
+            # Gateway unreachable - reconciliation will finalize the payment
+            return redirect(f"{payment.error_url}?track_id={payment.track_id}&status=pending")
+        if not payment.verified_with_gateway or (payment.status == 'failed' and not payment.payzah_reference_code):
+            # Never verified, or the gateway rejected the verification (no payment details)
+            return redirect(f"{payment.error_url}?track_id={payment.track_id}&error=verification_failed")
+        return redirect(f"{payment.error_url}?track_id={payment.track_id}&status={payment.status}")
+
 
 class VerifyPaymentAPIView(APIView):
     """
@@ -330,7 +343,7 @@ class VerifyPaymentAPIView(APIView):
 
             # Get payment record
             try:
-                payment = Payment.objects.select_related('purchase').get(
+                payment = Payment.objects.get(
                     track_id=track_id,
                     user=request.user
                 )
@@ -340,8 +353,8 @@ class VerifyPaymentAPIView(APIView):
                     'error': 'Payment not found or unauthorized'
                 }, status=status.HTTP_404_NOT_FOUND)
 
-            # If payment already captured, return current status
-            if payment.status == 'captured' and payment.verified_with_gateway:
+            # If payment already finalized, return current status
+            if is_finalized(payment):
                 return Response({
                     'success': True,
                     'message': 'Payment already verified',
@@ -362,29 +375,9 @@ class VerifyPaymentAPIView(APIView):
                 }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
             # Update payment with verification result
-            payzah_status = verification.get('payment_status')
-            internal_status = payzah_service.map_payment_status(payzah_status)
-
-            with transaction.atomic():
-                payment.status = internal_status
-                payment.verified_with_gateway = True
-                payment.gateway_verification_attempts += 1
-                payment.payzah_reference_code = verification.get('payzah_reference_code')
-                payment.knet_payment_id = verification.get('knet_payment_id')
-                payment.transaction_number = verification.get('transaction_number')
-                payment.payment_date = verification.get('payment_date')
-                payment.payment_status_raw = payzah_status
-
-                if internal_status == 'captured' and not payment.completed_at:
-                    payment.completed_at = timezone.now()
-                    # Update purchase status
-                    if payment.purchase:
-                        payment.purchase.status = 'Processing'
-                        payment.purchase.save()
-
-                payment.save()
-
-            logger.info(f"Payment {track_id} verified: {internal_status}")
+            payment, _ = apply_verification(payment.pk, verification)
+
+            logger.info(f"Payment {track_id} verified: {payment.status}")
 
             return Response({
                 'success': True,
@@ -473,3 +466,123 @@ class UserPaymentsListAPIView(APIView):
                 'success': False,
                 'error': 'An error occurred while retrieving payments'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# ================== ASYNC (ASGI) VIEWS ==================
+class AsyncInitiatePaymentAPIView(AsyncAPIView):
+    """
+    POST /api/payment/initiate/ (async)
+    InitiatePaymentAPIView for ASGI: same request and response, the Payzah
+    call is awaited on the event loop
+    """
+    permission_classes = [IsAuthenticated]
+
+    async def post(self, request):
+        try:
+            # purchase_id validation queries the database
+            serializer = PaymentInitiateSerializer(data=request.data)
+            if not await sync_to_async(serializer.is_valid)():
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Invalid request data',
+                    'details': serializer.errors
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            purchase_id = serializer.validated_data['purchase_id']
+            success_url = serializer.validated_data['success_url']
+            error_url = serializer.validated_data['error_url']
+
+            purchase, error = await sync_to_async(get_payable_purchase)(purchase_id, request.user)
+            if error:
+                return JsonResponse(error[0], status=error[1])
+
+            track_id = async_payzah_service.generate_track_id()
+            payzah_response = await async_payzah_service.initiate_payment(
+                build_payment_data(purchase, request.user, track_id, success_url, error_url)
+            )
+
+            if not payzah_response.get('success'):
+                logger.error(f"Payzah payment initiation failed: {payzah_response.get('error')}")
+                return JsonResponse({
+                    'success': False,
+                    'error': payzah_response.get('error', 'Failed to initiate payment')
+                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+            await sync_to_async(record_initiated_payment)(
+                request, purchase, track_id, payzah_response, success_url, error_url
+            )
+
+            return JsonResponse(initiated_payment_body(track_id, payzah_response), status=status.HTTP_200_OK)
+
+        except Exception as e:
+            logger.error(f"Payment initiation error: {str(e)}", exc_info=True)
+            return JsonResponse({
+                'success': False,
+                'error': 'An error occurred while initiating payment'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class AsyncVerifyPaymentAPIView(AsyncAPIView):
+    """
+    POST /api/payment/verify/ (async)
+    VerifyPaymentAPIView for ASGI: same request and response, the Payzah
+    call is awaited on the event loop
+    """
+    permission_classes = [IsAuthenticated]
+
+    async def post(self, request):
+        try:
+            serializer = PaymentVerifySerializer(data=request.data)
+            if not serializer.is_valid():
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Invalid request data',
+                    'details': serializer.errors
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            track_id = serializer.validated_data['track_id']
+            payment_id = serializer.validated_data.get('payment_id')
+
+            payment = await Payment.objects.filter(track_id=track_id, user=request.user).afirst()
+            if payment is None:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Payment not found or unauthorized'
+                }, status=status.HTTP_404_NOT_FOUND)
+
+            # If payment already finalized, return current status
+            if is_finalized(payment):
+                return JsonResponse({
+                    'success': True,
+                    'message': 'Payment already verified',
+                    'payment': PaymentStatusSerializer(payment).data
+                }, status=status.HTTP_200_OK)
+
+            verification = await async_payzah_service.verify_payment(
+                track_id=track_id,
+                payment_id=payment_id or payment.payzah_payment_id
+            )
+
+            if not verification.get('success'):
+                logger.error(f"Payment verification API failed: {verification.get('error')}")
+                return JsonResponse({
+                    'success': False,
+                    'error': verification.get('error', 'Verification failed')
+                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+            payment, _ = await sync_to_async(apply_verification)(payment.pk, verification)
+
+            logger.info(f"Payment {track_id} verified: {payment.status}")
+
+            return JsonResponse({
+                'success': True,
+                'verified': verification.get('verified'),
+                'payment': PaymentStatusSerializer(payment).data
+            }, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            logger.error(f"Payment verification error: {str(e)}", exc_info=True)
+            return JsonResponse({
+                'success': False,
+                'error': 'An error occurred while verifying payment'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
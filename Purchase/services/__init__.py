@@ -1,3 +1,4 @@
 from .payzahService import PayzahService
+from .payzah_async import AsyncPayzahService
 
-__all__ = ['PayzahService']
+__all__ = ['PayzahService', 'AsyncPayzahService']
@@ -0,0 +1,84 @@
+"""
+Per-endpoint latency histogram for outbound gateway calls.
+Thread-safe, in-process and cheap enough to record every call.
+"""
+import threading
+
+# Bucket upper bounds in seconds (last bucket catches everything slower)
+DEFAULT_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram keyed by endpoint name.
+
+    Usage:
+        histogram.record('verify_payment', 0.132)
+        histogram.record('verify_payment', 3.05, error=True)
+        histogram.snapshot()
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def _new_series(self):
+        return {
+            'count': 0,
+            'errors': 0,
+            'total': 0.0,
+            'max': 0.0,
+            'counts': [0] * len(self.buckets),
+        }
+
+    def record(self, endpoint, seconds, error=False):
+        with self._lock:
+            series = self._series.get(endpoint)
+            if series is None:
+                series = self._series[endpoint] = self._new_series()
+            series['count'] += 1
+            series['errors'] += int(error)
+            series['total'] += seconds
+            series['max'] = max(series['max'], seconds)
+            for index, upper in enumerate(self.buckets):
+                if seconds <= upper:
+                    series['counts'][index] += 1
+                    break
+
+    def _percentile(self, series, fraction):
+        """Upper bound of the bucket that contains the given percentile"""
+        target = series['count'] * fraction
+        seen = 0
+        for upper, count in zip(self.buckets, series['counts']):
+            seen += count
+            if seen >= target:
+                return min(upper, series['max'])
+        return series['max']
+
+    def snapshot(self):
+        """Return {endpoint: {count, errors, avg_ms, max_ms, p50_ms, p95_ms, p99_ms, buckets}}"""
+        with self._lock:
+            series_copy = {name: dict(s, counts=list(s['counts'])) for name, s in self._series.items()}
+
+        result = {}
+        for name, series in series_copy.items():
+            count = series['count']
+            result[name] = {
+                'count': count,
+                'errors': series['errors'],
+                'avg_ms': round(series['total'] / count * 1000, 2) if count else 0,
+                'max_ms': round(series['max'] * 1000, 2),
+                'p50_ms': round(self._percentile(series, 0.50) * 1000, 2),
+                'p95_ms': round(self._percentile(series, 0.95) * 1000, 2),
+                'p99_ms': round(self._percentile(series, 0.99) * 1000, 2),
+                'buckets': {
+                    ('+Inf' if upper == float('inf') else f'{upper}'): c
+                    for upper, c in zip(self.buckets, series['counts'])
+                },
+            }
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
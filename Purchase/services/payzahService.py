@@ -1,4 +1,6 @@
 import requests
+from requests.adapters import HTTPAdapter
+import threading
 import time
 import random
 import string
@@ -6,6 +8,8 @@ from decimal import Decimal
 from django.conf import settings
 import logging
 
+from .latency import LatencyHistogram
+
 logger = logging.getLogger(__name__)
 
 
@@ -16,16 +20,92 @@ class PayzahService:
     Supports K-Net, Credit Card, and Apple Pay through unified transit page
     """
 
-    def __init__(self):
+    # Responses worth retrying on idempotent status checks
+    RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+    def __init__(self, base_url=None, private_key=None):
         """Initialize Payzah service with configuration from Django settings"""
-        self.base_url = getattr(settings, 'PAYZAH_BASE_URL', 'https://api.payzah.com')
-        self.private_key = getattr(settings, 'PAYZAH_PRIVATE_KEY', '')
+        self.base_url = base_url or getattr(settings, 'PAYZAH_BASE_URL', 'https://api.payzah.com')
+        self.private_key = private_key if private_key is not None else getattr(settings, 'PAYZAH_PRIVATE_KEY', '')
         self.currency = getattr(settings, 'PAYZAH_CURRENCY', 'KWD')
         self.language = getattr(settings, 'PAYZAH_LANGUAGE', 'en')
 
         # Authorization header (Base64 encoded private key)
         self.auth_header = self.private_key
 
+        # Connection pool / timeouts / retries
+        self.pool_size = getattr(settings, 'PAYZAH_POOL_SIZE', 10)
+        self.connect_timeout = getattr(settings, 'PAYZAH_CONNECT_TIMEOUT', 3.05)
+        self.initiate_read_timeout = getattr(settings, 'PAYZAH_INITIATE_READ_TIMEOUT', 30)
+        self.status_read_timeout = getattr(settings, 'PAYZAH_STATUS_READ_TIMEOUT', 10)
+        self.status_retries = getattr(settings, 'PAYZAH_STATUS_RETRIES', 2)
+        self.retry_backoff = getattr(settings, 'PAYZAH_RETRY_BACKOFF', 0.25)
+
+        self.latency = LatencyHistogram()
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """
+        Shared keep-alive session (created on first use).
+        The pool is bounded and blocks when exhausted, so a burst of callbacks
+        can't open an unbounded number of connections to the gateway.
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=1,
+                        pool_maxsize=self.pool_size,
+                        pool_block=True,
+                        max_retries=0
+                    )
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    session.headers.update({
+                        'Content-Type': 'application/json',
+                        'Authorization': self.auth_header,
+                    })
+                    self._session = session
+        return self._session
+
+    def _post(self, endpoint_name, path, payload, read_timeout, retries=0):
+        """
+        POST to Payzah through the pooled session, recording latency per endpoint.
+
+        Only idempotent calls should pass retries > 0. Connection errors, timeouts
+        and 429/5xx responses are retried with full-jitter exponential backoff.
+        """
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                response = self.session.post(
+                    f"{self.base_url}{path}",
+                    json=payload,
+                    timeout=(self.connect_timeout, read_timeout)
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self.latency.record(endpoint_name, time.perf_counter() - started, error=True)
+                if attempt >= retries:
+                    raise
+            else:
+                retryable = response.status_code in self.RETRYABLE_STATUS_CODES
+                self.latency.record(endpoint_name, time.perf_counter() - started, error=retryable)
+                if not retryable or attempt >= retries:
+                    return response
+
+            attempt += 1
+            delay = random.uniform(0, self.retry_backoff * (2 ** attempt))
+            logger.warning(f"Payzah {endpoint_name} attempt {attempt} failed, retrying in {delay:.2f}s")
+            time.sleep(delay)
+
+    def get_latency_stats(self):
+        """Per-endpoint latency histogram snapshot"""
+        return self.latency.snapshot()
+
     def generate_track_id(self):
         """
         Generate unique track ID for payment transaction
@@ -64,93 +144,24 @@ class PayzahService:
                 - error (str, optional): Error message if failed
         """
         try:
-            amount = payment_data.get('amount')
-            success_url = payment_data.get('success_url')
-            error_url = payment_data.get('error_url')
-            track_id = payment_data.get('track_id') or self.generate_track_id()
-
-            # Format amount to 3 decimal places for KWD
-            if isinstance(amount, (int, float, Decimal)):
-                formatted_amount = f"{float(amount):.3f}"
-            else:
-                formatted_amount = str(amount)
-
-            # Build request payload for Payzah
-            request_payload = {
-                'trackid': track_id,
-                'amount': formatted_amount,
-                'success_url': success_url,
-                'error_url': error_url,
-                'language': self.language,
-                'currency': self.currency,
-                'payment_type': '3',  # REQUIRED: "3" for transit_url (unified payment page)
-                                      # Transit page shows: K-Net, Credit Card, Apple Pay
-                'udf1': payment_data.get('invoice_number', ''),
-                'udf2': payment_data.get('user_name', ''),
-                'udf3': payment_data.get('user_email', ''),
-                'udf5': payment_data.get('order_details', f'Raggey Order - {track_id}'),
-                'customer_name': payment_data.get('user_name', ''),
-                'customer_email': payment_data.get('user_email', ''),
-            }
-
+            track_id, request_payload = self._initiate_payload(payment_data)
             logger.info(f"Payzah Payment Initialization Request: {request_payload}")
 
             # Make API call to Payzah
-            response = requests.post(
-                f"{self.base_url}/ws/paymentgateway/index",
-                json=request_payload,
-                headers={
-                    'Content-Type': 'application/json',
-                    'Authorization': self.auth_header,
-                },
-                timeout=30
+            response = self._post(
+                'initiate_payment',
+                '/ws/paymentgateway/index',
+                request_payload,
+                read_timeout=self.initiate_read_timeout
             )
 
             response_data = response.json()
             logger.info(f"Payzah Payment Initialization Response: {response_data}")
-
-            if response_data.get('status') is True:
-                # Always use transit_url for unified payment page
-                transit_url = response_data.get('data', {}).get('transit_url')
-
-                if not transit_url:
-                    raise Exception("Transit URL not provided by Payzah. Please contact support.")
-
-                logger.info("✅ Payment initialized successfully - Redirecting to Transit Page")
-
-                return {
-                    'success': True,
-                    'track_id': track_id,
-                    'payment_id': response_data.get('data', {}).get('PaymentID'),
-                    'redirect_url': transit_url,
-                    'payment_url': response_data.get('data', {}).get('PaymentUrl'),
-                    'is_transit': True,
-                }
-            else:
-                error_msg = response_data.get('message', 'Payment initialization failed')
-                logger.error(f"Payzah initialization failed: {error_msg}")
-                raise Exception(error_msg)
+            return self._initiate_result(track_id, response_data)
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Payzah Payment Error: {str(e)}")
-
-            error_message = "Payment initialization failed"
-            if hasattr(e, 'response') and e.response is not None:
-                try:
-                    error_data = e.response.json()
-                    error_message = f"{error_data.get('message', error_message)} (Code: {error_data.get('code', 'UNKNOWN')})"
-                except:
-                    pass
-            elif 'Connection' in str(e):
-                error_message = "Cannot connect to payment gateway. Please try again."
-            elif 'Timeout' in str(e):
-                error_message = "Payment gateway timeout. Please try again."
-
-            return {
-                'success': False,
-                'error': error_message,
-                'code': 'PAYMENT_INIT_ERROR'
-            }
+            return self._initiate_error(e)
 
         except Exception as e:
             logger.error(f"Payzah Payment Exception: {str(e)}")
@@ -181,63 +192,32 @@ class PayzahService:
                 - track_id (str): Track ID
                 - udf1-udf5 (str): User defined fields
                 - error (str, optional): Error message if failed
+                - rejected (bool, optional): True when Payzah itself refused the verification
         """
         try:
-            request_payload = {
-                'trackid': track_id,
-            }
-
-            # Add payment_id if provided
-            if payment_id:
-                request_payload['payment_id'] = payment_id
-
+            request_payload = self._details_payload(track_id, payment_id)
             logger.info(f"Payzah Payment Verification Request: {request_payload}")
 
-            response = requests.post(
-                f"{self.base_url}/ws/paymentgateway/get-payment-details",
-                json=request_payload,
-                headers={
-                    'Content-Type': 'application/json',
-                    'Authorization': self.auth_header,
-                },
-                timeout=15
+            response = self._post(
+                'verify_payment',
+                '/ws/paymentgateway/get-payment-details',
+                request_payload,
+                read_timeout=self.status_read_timeout,
+                retries=self.status_retries
             )
 
             response_data = response.json()
             logger.info(f"Payzah Payment Verification Response: {response_data}")
 
-            if response_data.get('status') is True:
-                data = response_data.get('data', {})
-                return {
-                    'success': True,
-                    'verified': True,
-                    'payment_status': data.get('paymentStatus'),
-                    'payzah_reference_code': data.get('payzahRefrenceCode'),
-                    'knet_payment_id': data.get('knetPaymentId'),
-                    'transaction_number': data.get('transactionNumber'),
-                    'payment_date': data.get('paymentDate'),
-                    'track_id': data.get('trackId'),
-                    'udf1': data.get('UDF1'),
-                    'udf2': data.get('UDF2'),
-                    'udf3': data.get('UDF3'),
-                    'udf4': data.get('UDF4'),
-                    'udf5': data.get('UDF5'),
-                }
-            else:
-                error_msg = response_data.get('message', 'Payment verification failed')
-                logger.error(f"Payzah verification failed: {error_msg}")
-                return {
-                    'success': False,
-                    'verified': False,
-                    'error': error_msg
-                }
+            return self._verify_result(response_data)
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Payzah Verification Error: {str(e)}")
             return {
                 'success': False,
                 'verified': False,
-                'error': 'Failed to verify payment'
+                'error': 'Failed to verify payment',
+                'code': 'VERIFICATION_ERROR'
             }
 
         except Exception as e:
@@ -265,46 +245,20 @@ class PayzahService:
                 'trackid': track_id,
                 'payment_id': payment_id,
             }
-
             logger.info(f"Payzah Payment Status Check Request: {request_payload}")
 
-            response = requests.post(
-                f"{self.base_url}/ws/paymentgateway/get-payment-details",
-                json=request_payload,
-                headers={
-                    'Content-Type': 'application/json',
-                    'Authorization': self.auth_header,
-                },
-                timeout=15
+            response = self._post(
+                'check_payment_status',
+                '/ws/paymentgateway/get-payment-details',
+                request_payload,
+                read_timeout=self.status_read_timeout,
+                retries=self.status_retries
             )
 
             response_data = response.json()
             logger.info(f"Payzah Payment Status Check Response: {response_data}")
 
-            if response_data.get('status') is True:
-                data = response_data.get('data', {})
-                return {
-                    'success': True,
-                    'payment_status': data.get('paymentStatus'),
-                    'payzah_reference_code': data.get('payzahRefrenceCode'),
-                    'knet_payment_id': data.get('knetPaymentId'),
-                    'transaction_number': data.get('transactionNumber'),
-                    'payment_date': data.get('paymentDate'),
-                    'track_id': data.get('trackId'),
-                    'udf1': data.get('UDF1'),
-                    'udf2': data.get('UDF2'),
-                    'udf3': data.get('UDF3'),
-                    'udf4': data.get('UDF4'),
-                    'udf5': data.get('UDF5'),
-                }
-            else:
-                error_msg = response_data.get('message', 'Payment status check failed')
-                logger.error(f"Payzah status check failed: {error_msg}")
-                return {
-                    'success': False,
-                    'error': error_msg,
-                    'code': response_data.get('code')
-                }
+            return self._status_result(response_data)
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Payzah Status Check Error: {str(e)}")
@@ -322,6 +276,140 @@ class PayzahService:
                 'code': 'UNKNOWN_ERROR'
             }
 
+    # ================== REQUEST / RESPONSE MAPPING ==================
+    # Shared with AsyncPayzahService (payzah_async.py), which only swaps the transport
+
+    def _initiate_payload(self, payment_data):
+        """(track_id, request payload) for initiate_payment"""
+        amount = payment_data.get('amount')
+        track_id = payment_data.get('track_id') or self.generate_track_id()
+
+        # Format amount to 3 decimal places for KWD
+        if isinstance(amount, (int, float, Decimal)):
+            formatted_amount = f"{float(amount):.3f}"
+        else:
+            formatted_amount = str(amount)
+
+        return track_id, {
+            'trackid': track_id,
+            'amount': formatted_amount,
+            'success_url': payment_data.get('success_url'),
+            'error_url': payment_data.get('error_url'),
+            'language': self.language,
+            'currency': self.currency,
+            'payment_type': '3',  # REQUIRED: "3" for transit_url (unified payment page)
+                                  # Transit page shows: K-Net, Credit Card, Apple Pay
+            'udf1': payment_data.get('invoice_number', ''),
+            'udf2': payment_data.get('user_name', ''),
+            'udf3': payment_data.get('user_email', ''),
+            'udf5': payment_data.get('order_details', f'Raggey Order - {track_id}'),
+            'customer_name': payment_data.get('user_name', ''),
+            'customer_email': payment_data.get('user_email', ''),
+        }
+
+    def _initiate_result(self, track_id, response_data):
+        """initiate_payment result from Payzah's response body (raises on a gateway refusal)"""
+        if response_data.get('status') is not True:
+            error_msg = response_data.get('message', 'Payment initialization failed')
+            logger.error(f"Payzah initialization failed: {error_msg}")
+            raise Exception(error_msg)
+
+        # Always use transit_url for unified payment page
+        transit_url = response_data.get('data', {}).get('transit_url')
+        if not transit_url:
+            raise Exception("Transit URL not provided by Payzah. Please contact support.")
+
+        logger.info("✅ Payment initialized successfully - Redirecting to Transit Page")
+        return {
+            'success': True,
+            'track_id': track_id,
+            'payment_id': response_data.get('data', {}).get('PaymentID'),
+            'redirect_url': transit_url,
+            'payment_url': response_data.get('data', {}).get('PaymentUrl'),
+            'is_transit': True,
+        }
+
+    @staticmethod
+    def _initiate_error(error):
+        """initiate_payment result for a transport error (requests or httpx)"""
+        error_message = "Payment initialization failed"
+        response = getattr(error, 'response', None)
+        if response is not None:
+            try:
+                error_data = response.json()
+                error_message = f"{error_data.get('message', error_message)} (Code: {error_data.get('code', 'UNKNOWN')})"
+            except Exception:
+                pass
+        elif 'Connect' in type(error).__name__ or 'Connection' in str(error):
+            error_message = "Cannot connect to payment gateway. Please try again."
+        elif 'Timeout' in type(error).__name__ or 'Timeout' in str(error):
+            error_message = "Payment gateway timeout. Please try again."
+
+        return {
+            'success': False,
+            'error': error_message,
+            'code': 'PAYMENT_INIT_ERROR'
+        }
+
+    @staticmethod
+    def _details_payload(track_id, payment_id=None):
+        """Request payload for get-payment-details (payment_id added if provided)"""
+        request_payload = {'trackid': track_id}
+        if payment_id:
+            request_payload['payment_id'] = payment_id
+        return request_payload
+
+    @staticmethod
+    def _payment_details(data):
+        return {
+            'payment_status': data.get('paymentStatus'),
+            'payzah_reference_code': data.get('payzahRefrenceCode'),
+            'knet_payment_id': data.get('knetPaymentId'),
+            'transaction_number': data.get('transactionNumber'),
+            'payment_date': data.get('paymentDate'),
+            'track_id': data.get('trackId'),
+            'udf1': data.get('UDF1'),
+            'udf2': data.get('UDF2'),
+            'udf3': data.get('UDF3'),
+            'udf4': data.get('UDF4'),
+            'udf5': data.get('UDF5'),
+        }
+
+    def _verify_result(self, response_data):
+        """verify_payment result from Payzah's response body"""
+        if response_data.get('status') is True:
+            return {
+                'success': True,
+                'verified': True,
+                **self._payment_details(response_data.get('data', {})),
+            }
+
+        error_msg = response_data.get('message', 'Payment verification failed')
+        logger.error(f"Payzah verification failed: {error_msg}")
+        return {
+            'success': False,
+            'verified': False,
+            'rejected': True,
+            'error': error_msg
+        }
+
+    def _status_result(self, response_data):
+        """check_payment_status result from Payzah's response body"""
+        if response_data.get('status') is True:
+            return {
+                'success': True,
+                **self._payment_details(response_data.get('data', {})),
+            }
+
+        error_msg = response_data.get('message', 'Payment status check failed')
+        logger.error(f"Payzah status check failed: {error_msg}")
+        return {
+            'success': False,
+            'rejected': True,
+            'error': error_msg,
+            'code': response_data.get('code')
+        }
+
     def map_payment_status(self, payzah_status):
         """
         Map Payzah payment status to internal system status
@@ -0,0 +1,197 @@
+"""
+Async Payzah client for the ASGI views (see Purchase/payment_views.py).
+
+Same requests, responses and result dicts as PayzahService - it subclasses it
+and only swaps the transport: an httpx.AsyncClient instead of the requests
+session, so a gateway call parks a coroutine on the event loop instead of
+holding a worker thread for the whole round trip.
+
+- The connection pool is bounded (PAYZAH_ASYNC_POOL_SIZE); callers beyond it
+  wait for a free connection, up to the connect timeout
+- Retries (idempotent calls only) back off with asyncio.sleep
+- Latency is recorded in the same per-endpoint histogram
+- The client is bound to the event loop it was created on and is recreated
+  when called from another one (e.g. successive asyncio.run() in a command)
+"""
+import asyncio
+import logging
+import random
+import time
+
+import httpx
+from django.conf import settings
+
+from .payzahService import PayzahService
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncPayzahService(PayzahService):
+    """
+    Payzah Payment Gateway Service (asyncio)
+    Coroutine versions of initiate_payment, verify_payment and check_payment_status
+    """
+
+    def __init__(self, base_url=None, private_key=None):
+        super().__init__(base_url=base_url, private_key=private_key)
+        self.pool_size = getattr(settings, 'PAYZAH_ASYNC_POOL_SIZE', 100)
+        self._client = None
+        self._client_loop = None
+
+    @property
+    def client(self):
+        """Shared keep-alive client for the running event loop (created on first use)"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={
+                    'Content-Type': 'application/json',
+                    'Authorization': self.auth_header,
+                },
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size
+                ),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
+
+    async def _post(self, endpoint_name, path, payload, read_timeout, retries=0):
+        """
+        POST to Payzah through the pooled client, recording latency per endpoint.
+
+        Only idempotent calls should pass retries > 0. Connection errors, timeouts
+        and 429/5xx responses are retried with full-jitter exponential backoff.
+        """
+        timeout = httpx.Timeout(read_timeout, connect=self.connect_timeout, pool=self.connect_timeout)
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                response = await self.client.post(path, json=payload, timeout=timeout)
+            except httpx.TransportError:
+                self.latency.record(endpoint_name, time.perf_counter() - started, error=True)
+                if attempt >= retries:
+                    raise
+            else:
+                retryable = response.status_code in self.RETRYABLE_STATUS_CODES
+                self.latency.record(endpoint_name, time.perf_counter() - started, error=retryable)
+                if not retryable or attempt >= retries:
+                    return response
+
+            attempt += 1
+            delay = random.uniform(0, self.retry_backoff * (2 ** attempt))
+            logger.warning(f"Payzah {endpoint_name} attempt {attempt} failed, retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    async def initiate_payment(self, payment_data):
+        """Initialize payment with Payzah gateway (see PayzahService.initiate_payment)"""
+        try:
+            track_id, request_payload = self._initiate_payload(payment_data)
+            logger.info(f"Payzah Payment Initialization Request: {request_payload}")
+
+            response = await self._post(
+                'initiate_payment',
+                '/ws/paymentgateway/index',
+                request_payload,
+                read_timeout=self.initiate_read_timeout
+            )
+
+            response_data = response.json()
+            logger.info(f"Payzah Payment Initialization Response: {response_data}")
+            return self._initiate_result(track_id, response_data)
+
+        except httpx.HTTPError as e:
+            logger.error(f"Payzah Payment Error: {str(e)}")
+            return self._initiate_error(e)
+
+        except Exception as e:
+            logger.error(f"Payzah Payment Exception: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e),
+                'code': 'UNKNOWN_ERROR'
+            }
+
+    async def verify_payment(self, track_id, payment_id=None):
+        """Verify payment status with Payzah gateway (see PayzahService.verify_payment)"""
+        try:
+            request_payload = self._details_payload(track_id, payment_id)
+            logger.info(f"Payzah Payment Verification Request: {request_payload}")
+
+            response = await self._post(
+                'verify_payment',
+                '/ws/paymentgateway/get-payment-details',
+                request_payload,
+                read_timeout=self.status_read_timeout,
+                retries=self.status_retries
+            )
+
+            response_data = response.json()
+            logger.info(f"Payzah Payment Verification Response: {response_data}")
+            return self._verify_result(response_data)
+
+        except httpx.HTTPError as e:
+            logger.error(f"Payzah Verification Error: {str(e)}")
+            return {
+                'success': False,
+                'verified': False,
+                'error': 'Failed to verify payment',
+                'code': 'VERIFICATION_ERROR'
+            }
+
+        except Exception as e:
+            logger.error(f"Payzah Verification Exception: {str(e)}")
+            return {
+                'success': False,
+                'verified': False,
+                'error': str(e)
+            }
+
+    async def check_payment_status(self, track_id, payment_id):
+        """Check payment status with Payzah gateway (see PayzahService.check_payment_status)"""
+        try:
+            request_payload = {
+                'trackid': track_id,
+                'payment_id': payment_id,
+            }
+            logger.info(f"Payzah Payment Status Check Request: {request_payload}")
+
+            response = await self._post(
+                'check_payment_status',
+                '/ws/paymentgateway/get-payment-details',
+                request_payload,
+                read_timeout=self.status_read_timeout,
+                retries=self.status_retries
+            )
+
+            response_data = response.json()
+            logger.info(f"Payzah Payment Status Check Response: {response_data}")
+            return self._status_result(response_data)
+
+        except httpx.HTTPError as e:
+            logger.error(f"Payzah Status Check Error: {str(e)}")
+            return {
+                'success': False,
+                'error': 'Failed to check payment status',
+                'code': 'STATUS_CHECK_ERROR'
+            }
+
+        except Exception as e:
+            logger.error(f"Payzah Status Check Exception: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e),
+                'code': 'UNKNOWN_ERROR'
+            }
+
+
+# Singleton instance
+async_payzah_service = AsyncPayzahService()
@@ -0,0 +1,112 @@
+"""
+Local stub of the Payzah gateway API for offline development and benchmarks.
+
+Implements the two endpoints PayzahService calls:
+- POST /ws/paymentgateway/index               -> transit URL for a new payment
+- POST /ws/paymentgateway/get-payment-details -> payment details for a track ID
+
+Artificial latency and a failure rate (HTTP 503) can be configured to exercise
+timeouts and retries. Runs on HTTP/1.1 so clients can reuse connections.
+
+Usage:
+    server = start_stub_server(port=0, latency_ms=20)
+    PayzahService(base_url=server.url)
+    ...
+    server.shutdown()
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class PayzahStubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are separate writes; without TCP_NODELAY keep-alive
+    # connections stall on delayed ACKs and the benchmark measures Nagle, not us
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        # Silence the default per-request stderr logging
+        pass
+
+    def _send_json(self, status_code, body):
+        data = json.dumps(body).encode()
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            payload = {}
+
+        server = self.server
+        with server.stats_lock:
+            server.stats['requests'] += 1
+
+        if server.latency_ms:
+            time.sleep(server.latency_ms / 1000.0)
+
+        if server.error_rate and random.random() < server.error_rate:
+            self._send_json(503, {'status': False, 'message': 'Service temporarily unavailable'})
+            return
+
+        track_id = payload.get('trackid', '')
+
+        if self.path == '/ws/paymentgateway/index':
+            payment_id = f"STUB{random.randint(100000, 999999)}"
+            self._send_json(200, {
+                'status': True,
+                'data': {
+                    'PaymentID': payment_id,
+                    'transit_url': f"{server.url}/transit/{payment_id}",
+                    'PaymentUrl': f"{server.url}/pay/{payment_id}",
+                },
+            })
+        elif self.path == '/ws/paymentgateway/get-payment-details':
+            self._send_json(200, {
+                'status': True,
+                'data': {
+                    'paymentStatus': server.payment_status,
+                    'payzahRefrenceCode': f"REF-{track_id}",
+                    'knetPaymentId': '100000000000000',
+                    'transactionNumber': '200000000000000',
+                    'paymentDate': time.strftime('%Y-%m-%d %H:%M:%S'),
+                    'trackId': track_id,
+                },
+            })
+        else:
+            self._send_json(404, {'status': False, 'message': 'Not found'})
+
+
+class PayzahStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Listen backlog: the default (5) drops connects from a burst of async callers
+    request_queue_size = 256
+
+    def __init__(self, address, latency_ms=0, error_rate=0.0, payment_status='CAPTURED'):
+        super().__init__(address, PayzahStubHandler)
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.payment_status = payment_status
+        self.stats = {'requests': 0}
+        self.stats_lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_stub_server(host='127.0.0.1', port=0, **options):
+    """Start the stub in a daemon thread. port=0 picks a free port."""
+    server = PayzahStubServer((host, port), **options)
+    thread = threading.Thread(target=server.serve_forever, name='payzah-stub', daemon=True)
+    thread.start()
+    return server
@@ -1,11 +1,17 @@
-from django.db.models.signals import post_save, pre_save
+import logging
+from django.db.models.signals import post_save, pre_delete, pre_save
 from django.dispatch import receiver
-from .models import Purchase
+from .models import Item, Purchase
 from firebase_admin import messaging
 import firebase_admin
 from firebase_admin import credentials
 import os
 
+from Design.design_stats import item_ordered, item_removed
+from User.device_tokens import send_push
+
+logger = logging.getLogger(__name__)
+
 
 # Initialize Firebase Admin SDK (do this only once)
 def initialize_firebase():
@@ -18,11 +24,11 @@ def initialize_firebase():
             if os.path.exists(cred_path):
                 cred = credentials.Certificate(cred_path)
                 firebase_admin.initialize_app(cred)
-                print("✅ Firebase Admin SDK initialized")
+                logger.info("✅ Firebase Admin SDK initialized")
             else:
-                print(f"⚠️ Firebase credentials not found at {cred_path}")
+                logger.warning("⚠️ Firebase credentials not found at %s", cred_path)
         except Exception as e:
-            print(f"❌ Firebase initialization error: {e}")
+            logger.error("❌ Firebase initialization error: %s", e)
 
 
 # Initialize on module load
@@ -80,19 +86,19 @@ def send_order_status_notification(sender, instance, created, **kwargs):
 
     # Get user's FCM token
     if not instance.user:
-        print(f"⚠️ Order {instance.invoice_number} has no user")
+        logger.warning("⚠️ Order %s has no user", instance.invoice_number)
         return
 
     try:
         # Get FCM token from user profile
         if not hasattr(instance.user, 'profile'):
-            print(f"⚠️ User {instance.user.username} has no profile")
+            logger.warning("⚠️ User %s has no profile", instance.user.username)
             return
 
         fcm_token = instance.user.profile.fcm_token
 
         if not fcm_token:
-            print(f"⚠️ User {instance.user.username} has no FCM token")
+            logger.warning("⚠️ User %s has no FCM token", instance.user.username)
             return
 
         # Get status display names
@@ -125,8 +131,21 @@ def send_order_status_notification(sender, instance, created, **kwargs):
         )
 
         # Send message
-        response = messaging.send(message)
-        print(f"✅ FCM notification sent for order {instance.invoice_number}: {response}")
+        response = send_push(message)
+        logger.info("✅ FCM notification sent for order %s: %s", instance.invoice_number, response)
 
     except Exception as e:
-        print(f"❌ Error sending FCM notification: {e}")
+        logger.error("❌ Error sending FCM notification: %s", e)
+
+
+@receiver(post_save, sender=Item)
+def count_ordered_design(sender, instance, created, raw=False, **kwargs):
+    """Add order items to their design configuration stats (saved design or design_details)"""
+    if created and not raw:
+        item_ordered(instance)
+
+
+@receiver(pre_delete, sender=Item)
+def uncount_ordered_design(sender, instance, **kwargs):
+    # pre_delete: on a cascading UserDesign delete, the design row may be gone by post_delete
+    item_removed(instance)
@@ -1,3 +1,122 @@
-from django.test import TestCase
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from Notification.models import NotificationOutbox
+
+from .models import Payment, Purchase
+from .payment_processing import apply_verification, is_finalized, reconcile_pending_payments
+from .payment_views import PaymentCallbackAPIView
+
+REJECTED = {'success': False, 'verified': False, 'rejected': True, 'error': 'Invalid track id'}
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'purchase-tests'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class GatewayRejectionTests(TestCase):
+    """A verification the gateway rejects finalizes the payment once"""
+
+    def setUp(self):
+        user = User.objects.create_user(username='buyer', email='buyer@example.com')
+        purchase = Purchase.objects.create(
+            user=user, full_name='Buyer', phone_number='00000000', payment_option='online',
+            total_price=Decimal('12.500'), invoice_number='TEST-1'
+        )
+        self.payment = Payment.objects.create(
+            user=user, purchase=purchase, amount=purchase.total_price, track_id='RAGY-TEST-1',
+            success_url='https://example.com/success', error_url='https://example.com/error'
+        )
+
+    def test_rejection_is_final(self):
+        payment, changed = apply_verification(self.payment.pk, REJECTED, raw_status='NOT CAPTURED')
+
+        self.assertTrue(changed)
+        self.assertEqual(payment.status, 'failed')
+        self.assertTrue(is_finalized(payment))
+        self.assertEqual(NotificationOutbox.objects.filter(event_type='payment_failed').count(), 1)
+
+        payment, changed = apply_verification(self.payment.pk, REJECTED)
+
+        self.assertFalse(changed)
+        payment.refresh_from_db()
+        self.assertEqual(payment.gateway_verification_attempts, 1)
+        self.assertEqual(NotificationOutbox.objects.filter(event_type='payment_failed').count(), 1)
+
+    @mock.patch('Purchase.payment_views.payzah_service.verify_payment', return_value=REJECTED)
+    def test_duplicate_callback_skips_gateway(self, verify_payment):
+        # Not routed in the project URLconf: call the view directly
+        callback = PaymentCallbackAPIView.as_view()
+        for _ in range(2):
+            response = callback(RequestFactory().get('/api/payment/callback/', {'trackid': 'RAGY-TEST-1'}))
+            self.assertEqual(
+                response['Location'], 'https://example.com/error?track_id=RAGY-TEST-1&error=verification_failed'
+            )
+
+        verify_payment.assert_called_once()
+        self.assertEqual(NotificationOutbox.objects.filter(event_type='payment_failed').count(), 1)
+
+    @mock.patch('Purchase.payment_views.cache.add', return_value=None)
+    @mock.patch('Purchase.payment_views.payzah_service.verify_payment', return_value=REJECTED)
+    def test_callback_verifies_with_cache_unavailable(self, verify_payment, cache_add):
+        response = PaymentCallbackAPIView.as_view()(
+            RequestFactory().get('/api/payment/callback/', {'trackid': 'RAGY-TEST-1'})
+        )
+
+        self.assertEqual(
+            response['Location'], 'https://example.com/error?track_id=RAGY-TEST-1&error=verification_failed'
+        )
+        verify_payment.assert_called_once()
+
+    def test_unexpected_error_leaves_payment_pending(self):
+        # verify_payment's catch-all: our own exception, not an answer from Payzah
+        result = {'success': False, 'verified': False, 'error': "'NoneType' object has no attribute 'get'"}
+
+        payment, changed = apply_verification(self.payment.pk, result)
+
+        self.assertFalse(changed)
+        payment.refresh_from_db()
+        self.assertEqual((payment.status, payment.verified_with_gateway), ('pending', False))
+        self.assertEqual(payment.gateway_verification_attempts, 1)
+        self.assertFalse(NotificationOutbox.objects.filter(event_type='payment_failed').exists())
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ReconciliationExpiryTests(TestCase):
+    """Stale pending payments are only canceled on the gateway's word"""
+
+    def setUp(self):
+        user = User.objects.create_user(username='buyer')
+        purchase = Purchase.objects.create(
+            user=user, full_name='Buyer', phone_number='00000000', payment_option='online',
+            total_price=Decimal('12.500'), invoice_number='TEST-2'
+        )
+        self.payment = Payment.objects.create(
+            user=user, purchase=purchase, amount=purchase.total_price, track_id='RAGY-TEST-2', payzah_payment_id='P2'
+        )
+        Payment.objects.filter(pk=self.payment.pk).update(created_at=timezone.now() - timedelta(hours=72))
+
+    def reconcile(self):
+        stats = reconcile_pending_payments(max_workers=1, expire_after_hours=48)
+        self.payment.refresh_from_db()
+        return stats
+
+    @mock.patch('Purchase.payment_processing.payzah_service.check_payment_status',
+                side_effect=ConnectionError('gateway down'))
+    def test_old_payment_stays_pending_while_gateway_is_down(self, check_payment_status):
+        stats = self.reconcile()
+
+        self.assertEqual((stats['errors'], stats['expired']), (1, 0))
+        self.assertEqual(self.payment.status, 'pending')
+        self.assertEqual(self.payment.gateway_verification_attempts, 1)
+
+    @mock.patch('Purchase.payment_processing.payzah_service.check_payment_status',
+                return_value={'success': True, 'payment_status': 'INITIATED'})
+    def test_old_payment_the_gateway_reports_pending_is_expired(self, check_payment_status):
+        stats = self.reconcile()
+
+        self.assertEqual(stats['expired'], 1)
+        self.assertEqual(self.payment.status, 'canceled')
@@ -1,3 +1,4 @@
+import logging
 from django.shortcuts import render
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -6,7 +7,8 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from django.db import transaction
 from decimal import Decimal
 
-from .models import Purchase, Item, DeliverySettings, AboutUs, TermsAndConditions
+from .models import Purchase, Item
+from .content import about_us, delivery_settings, terms_and_conditions
 from Sizes.models import Sizes
 from Coupon.models import Coupon, CouponUsage
 from Design.models import (
@@ -36,6 +38,8 @@ from .utils import (
 )
 from .notification_utils import send_order_status_notification, initialize_firebase
 
+logger = logging.getLogger(__name__)
+
 
 # ================ USER-SIDE VIEWS ================
 
@@ -102,9 +106,9 @@ class CreateOrderAPIView(APIView):
                 ).first()
 
                 if selected_address:
-                    print(f"✅ Found matching saved address: {selected_address}")
+                    logger.debug("✅ Found matching saved address: %s", selected_address)
                 else:
-                    print(f"ℹ️ No matching saved address found for area={area}, block={block}, street={street}")
+                    logger.debug("ℹ️ No matching saved address found for area=%s, block=%s, street=%s", area, block, street)
 
             # Create Purchase (Order)
             purchase = Purchase.objects.create(
@@ -161,7 +165,7 @@ class CreateOrderAPIView(APIView):
 
                 # NOTE: Sizes and UserDesign entries are created via BulkSaveCartData API (from cart screen)
                 # Order creation only stores data in JSON fields (design_details, size_details)
-                print(f"📦 Order Item: {product_name} - Storing in JSON only (no UserDesign/Sizes tables)")
+                logger.debug("📦 Order Item: %s - Storing in JSON only (no UserDesign/Sizes tables)", product_name)
 
                 # Create Item with JSON fields only (no separate table entries)
                 Item.objects.create(
@@ -210,11 +214,11 @@ class CreateOrderAPIView(APIView):
                                     notes=f"Order placed: {product_name}",
                                     created_by=user
                                 )
-                                print(f"📦 Inventory: Deducted {abs(quantity_change)} unit(s) of {fabric_color.color_name_eng} (Stock: {quantity_before} → {fabric_color.quantity})")
+                                logger.info("📦 Inventory: Deducted %s unit(s) of %s (Stock: %s → %s)", abs(quantity_change), fabric_color.color_name_eng, quantity_before, fabric_color.quantity)
                             else:
-                                print(f"⚠️ Warning: Fabric color ID {fabric_color_id} not found")
+                                logger.warning("⚠️ Fabric color ID %s not found", fabric_color_id)
                     except Exception as e:
-                        print(f"⚠️ Warning: Could not create inventory transaction: {e}")
+                        logger.warning("⚠️ Could not create inventory transaction: %s", e)
                         # Don't fail order if inventory tracking fails
 
             # Create CouponUsage entry if coupon was applied
@@ -230,11 +234,11 @@ class CreateOrderAPIView(APIView):
                                 discount_amount=purchase.discount_amount,
                                 order_amount=purchase.total_price + purchase.discount_amount  # Total before discount
                             )
-                            print(f"🎫 CouponUsage created: {purchase.coupon_code} - Discount: {purchase.discount_amount} KWD")
+                            logger.info("🎫 CouponUsage created: %s - Discount: %s KWD", purchase.coupon_code, purchase.discount_amount)
                         else:
-                            print(f"⚠️ Warning: Coupon '{purchase.coupon_code}' not found in database")
+                            logger.warning("⚠️ Coupon '%s' not found in database", purchase.coupon_code)
                 except Exception as e:
-                    print(f"⚠️ Warning: Could not create coupon usage: {e}")
+                    logger.warning("⚠️ Could not create coupon usage: %s", e)
                     # Don't fail order if coupon tracking fails
 
             # Send "Order Pending" notification
@@ -247,11 +251,11 @@ class CreateOrderAPIView(APIView):
                         order=purchase,
                         new_status='Pending'
                     )
-                    print(f"🔔 Order Pending notification sent to user {user.id}")
+                    logger.info("🔔 Order Pending notification sent to user %s", user.id)
                 else:
-                    print(f"⚠️ No FCM token found for user {user.id}")
+                    logger.warning("⚠️ No FCM token found for user %s", user.id)
             except Exception as e:
-                print(f"⚠️ Warning: Could not send order notification: {e}")
+                logger.warning("⚠️ Could not send order notification: %s", e)
                 # Don't fail order if notification fails
 
             # Return created order
@@ -375,20 +379,20 @@ class CancelOrderAPIView(APIView):
                                 notes=f"Order cancelled: {item.product_name}",
                                 created_by=user
                             )
-                            print(f"♻️ Inventory restored: +{quantity_change} unit(s) of {fabric_color.color_name_eng} (Stock: {quantity_before} → {fabric_color.quantity})")
+                            logger.info("♻️ Inventory restored: +%s unit(s) of %s (Stock: %s → %s)", quantity_change, fabric_color.color_name_eng, quantity_before, fabric_color.quantity)
                     except Exception as e:
-                        print(f"⚠️ Warning: Could not restore inventory for item {item.id}: {e}")
+                        logger.warning("⚠️ Could not restore inventory for item %s: %s", item.id, e)
 
             # Delete CouponUsage entry if coupon was used
             if order.coupon_code:
                 try:
                     deleted_count = CouponUsage.objects.filter(order_id=order.invoice_number).delete()[0]
                     if deleted_count > 0:
-                        print(f"🎫 CouponUsage deleted: {order.coupon_code} for order {order.invoice_number}")
+                        logger.info("🎫 CouponUsage deleted: %s for order %s", order.coupon_code, order.invoice_number)
                     else:
-                        print(f"⚠️ No CouponUsage found for order {order.invoice_number}")
+                        logger.warning("⚠️ No CouponUsage found for order %s", order.invoice_number)
                 except Exception as e:
-                    print(f"⚠️ Warning: Could not delete coupon usage: {e}")
+                    logger.warning("⚠️ Could not delete coupon usage: %s", e)
 
             # Update order status
             order.status = 'Cancelled'
@@ -411,46 +415,16 @@ class DeliverySettingsAPIView(APIView):
     """
     GET: Get current delivery settings (days and cost)
     Endpoint: /purchase/delivery-settings/
+    Pre-rendered with ETag/Last-Modified, 304 when unchanged (see content.py)
     """
     permission_classes = []  # Public endpoint
 
     def get(self, request):
         try:
-            # Get active delivery settings
-            settings = DeliverySettings.objects.filter(is_active=True).first()
-
-            if not settings:
-                # Return default values if no settings exist
-                return Response({
-                    'id': 0,
-                    'delivery_days': 5,
-                    'delivery_cost': '2.000',
-                    'whatsapp_support': '',
-                    'is_active': True,
-                    'created_at': None,
-                    'updated_at': None
-                }, status=status.HTTP_200_OK)
-
-            response_data = {
-                'id': settings.id,
-                'delivery_days': settings.delivery_days,
-                'delivery_cost': str(settings.delivery_cost),
-                'whatsapp_support': settings.whatsapp_support or '',
-                'is_active': settings.is_active,
-                'created_at': settings.created_at.isoformat() if settings.created_at else None,
-                'updated_at': settings.updated_at.isoformat() if settings.updated_at else None
-            }
-
-            # Add no-cache headers
-            response = Response(response_data, status=status.HTTP_200_OK)
-            response['Cache-Control'] = 'no-cache, no-store, must-revalidate, max-age=0'
-            response['Pragma'] = 'no-cache'
-            response['Expires'] = '0'
-
-            return response
+            return delivery_settings.response(request)
 
         except Exception as e:
-            print(f"❌ Error fetching delivery settings: {e}")
+            logger.error("❌ Error fetching delivery settings: %s", e)
             return Response({
                 'error': 'Failed to fetch delivery settings',
                 'message': str(e)
@@ -557,11 +531,11 @@ class AdminUpdateOrderStatusAPIView(APIView):
                         order=order,
                         new_status=new_status
                     )
-                    print(f"🔔 Order {new_status} notification sent to user {order.user.id}")
+                    logger.info("🔔 Order %s notification sent to user %s", new_status, order.user.id)
                 else:
-                    print(f"⚠️ No FCM token found for user {order.user.id}")
+                    logger.warning("⚠️ No FCM token found for user %s", order.user.id)
             except Exception as e:
-                print(f"⚠️ Warning: Could not send status update notification: {e}")
+                logger.warning("⚠️ Could not send status update notification: %s", e)
                 # Don't fail status update if notification fails
 
             response_serializer = PurchaseSerializer(order)
@@ -636,20 +610,20 @@ class AdminCancelOrderAPIView(APIView):
                                 notes=f"Order cancelled: {item.product_name}",
                                 created_by=user
                             )
-                            print(f"♻️ Inventory restored: +{quantity_change} unit(s) of {fabric_color.color_name_eng} (Stock: {quantity_before} → {fabric_color.quantity})")
+                            logger.info("♻️ Inventory restored: +%s unit(s) of %s (Stock: %s → %s)", quantity_change, fabric_color.color_name_eng, quantity_before, fabric_color.quantity)
                     except Exception as e:
-                        print(f"⚠️ Warning: Could not restore inventory for item {item.id}: {e}")
+                        logger.warning("⚠️ Could not restore inventory for item %s: %s", item.id, e)
 
             # Delete CouponUsage entry if coupon was used
             if order.coupon_code:
                 try:
                     deleted_count = CouponUsage.objects.filter(order_id=order.invoice_number).delete()[0]
                     if deleted_count > 0:
-                        print(f"🎫 CouponUsage deleted: {order.coupon_code} for order {order.invoice_number}")
+                        logger.info("🎫 CouponUsage deleted: %s for order %s", order.coupon_code, order.invoice_number)
                     else:
-                        print(f"⚠️ No CouponUsage found for order {order.invoice_number}")
+                        logger.warning("⚠️ No CouponUsage found for order %s", order.invoice_number)
                 except Exception as e:
-                    print(f"⚠️ Warning: Could not delete coupon usage: {e}")
+                    logger.warning("⚠️ Could not delete coupon usage: %s", e)
 
             # Update order status
             order.status = 'Cancelled'
@@ -667,11 +641,11 @@ class AdminCancelOrderAPIView(APIView):
                         new_status='Cancelled',
                         reason=cancellation_reason
                     )
-                    print(f"🔔 Order Cancelled notification sent to user {order.user.id}")
+                    logger.info("🔔 Order Cancelled notification sent to user %s", order.user.id)
                 else:
-                    print(f"⚠️ No FCM token found for user {order.user.id}")
+                    logger.warning("⚠️ No FCM token found for user %s", order.user.id)
             except Exception as e:
-                print(f"⚠️ Warning: Could not send cancellation notification: {e}")
+                logger.warning("⚠️ Could not send cancellation notification: %s", e)
                 # Don't fail cancellation if notification fails
 
             serializer = PurchaseSerializer(order)
@@ -752,7 +726,7 @@ class UpdateOrderAddressAPIView(APIView):
             order.latitude = str(address.latitude) if address.latitude else ''
             order.save()
 
-            print(f"✅ Order {invoice_number} address updated to: {address}")
+            logger.info("✅ Order %s address updated to: %s", invoice_number, address)
 
             serializer = PurchaseSerializer(order)
             return Response({
@@ -761,7 +735,7 @@ class UpdateOrderAddressAPIView(APIView):
             }, status=status.HTTP_200_OK)
 
         except Exception as e:
-            print(f"❌ Error updating order address: {e}")
+            logger.error("❌ Error updating order address: %s", e)
             return Response({
                 'error': 'Failed to update order address',
                 'message': str(e)
@@ -773,33 +747,16 @@ class AboutUsAPIView(APIView):
     GET: Get About Us content
     Endpoint: /purchase/about-us/
     Public endpoint - no authentication required
+    Pre-rendered with ETag/Last-Modified, 304 when unchanged (see content.py)
     """
     permission_classes = []  # Public endpoint
 
     def get(self, request):
         try:
-            # Get active about us content
-            about_us = AboutUs.objects.filter(is_active=True).first()
-
-            if not about_us:
-                return Response({
-                    'error': 'No About Us content found',
-                    'message': 'Please add About Us content from admin panel'
-                }, status=status.HTTP_404_NOT_FOUND)
-
-            from .serializers import AboutUsSerializer
-            serializer = AboutUsSerializer(about_us)
-
-            # Create response with no-cache headers
-            response = Response(serializer.data, status=status.HTTP_200_OK)
-            response['Cache-Control'] = 'no-cache, no-store, must-revalidate, max-age=0'
-            response['Pragma'] = 'no-cache'
-            response['Expires'] = '0'
-
-            return response
+            return about_us.response(request)
 
         except Exception as e:
-            print(f"❌ Error fetching About Us content: {e}")
+            logger.error("❌ Error fetching About Us content: %s", e)
             return Response({
                 'error': 'Failed to fetch About Us content',
                 'message': str(e)
@@ -811,33 +768,16 @@ class TermsAndConditionsAPIView(APIView):
     GET: Get Terms and Conditions content
     Endpoint: /purchase/terms-and-conditions/
     Public endpoint - no authentication required
+    Pre-rendered with ETag/Last-Modified, 304 when unchanged (see content.py)
     """
     permission_classes = []  # Public endpoint
 
     def get(self, request):
         try:
-            # Get active terms and conditions content
-            terms = TermsAndConditions.objects.filter(is_active=True).first()
-
-            if not terms:
-                return Response({
-                    'error': 'No Terms and Conditions content found',
-                    'message': 'Please add Terms and Conditions content from admin panel'
-                }, status=status.HTTP_404_NOT_FOUND)
-
-            from .serializers import TermsAndConditionsSerializer
-            serializer = TermsAndConditionsSerializer(terms)
-
-            # Create response with no-cache headers
-            response = Response(serializer.data, status=status.HTTP_200_OK)
-            response['Cache-Control'] = 'no-cache, no-store, must-revalidate, max-age=0'
-            response['Pragma'] = 'no-cache'
-            response['Expires'] = '0'
-
-            return response
+            return terms_and_conditions.response(request)
 
         except Exception as e:
-            print(f"❌ Error fetching Terms and Conditions content: {e}")
+            logger.error("❌ Error fetching Terms and Conditions content: %s", e)
             return Response({
                 'error': 'Failed to fetch Terms and Conditions content',
                 'message': str(e)
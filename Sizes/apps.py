@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class SizesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Sizes'
+
+    def ready(self):
+        """
+        Import signals when Django starts
+        This keeps the cached measurement lists in sync with edits
+        """
+        import Sizes.signals  # noqa
@@ -0,0 +1,144 @@
+"""
+Measurement List Caching
+Prebuilt, versioned payloads for the measurement selection screens.
+
+- Default catalog: the active DefaultMeasurement rows are serialized once into an
+  immutable payload (rendered JSON for the list endpoint + a summary for the
+  combined list), cached under a catalog version key and memoized in-process
+- Custom lists: each user's CustomMeasurement list is cached under a per-user
+  version key, so one user's edit never evicts anyone else's list
+- Versions are bumped by signals (see Sizes/signals.py) after the transaction
+  commits - admin edits, API edits and deletes all invalidate
+
+Old versions are never overwritten, they just stop being read and expire.
+"""
+import heapq
+import threading
+import time
+from collections import namedtuple
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+
+DEFAULT_VERSION_KEY = 'measurements:default:version'
+CUSTOM_VERSION_KEY = 'measurements:custom:{user_id}:version'
+
+DefaultCatalog = namedtuple('DefaultCatalog', ['version', 'content', 'summary'])
+
+_memo = {'catalog': None}
+_memo_lock = threading.Lock()
+
+
+# ================== VERSION KEYS ==================
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so a cleared cache never reuses an old version number
+        cache.add(key, int(time.time() * 1000), None)
+        version = cache.get(key) or 0
+    return version
+
+
+def _bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Key missing: the next read seeds a fresh version
+        pass
+
+
+def bump_default_version():
+    _bump_version(DEFAULT_VERSION_KEY)
+
+
+def bump_custom_version(user_id):
+    _bump_version(CUSTOM_VERSION_KEY.format(user_id=user_id))
+
+
+# ================== DEFAULT CATALOG ==================
+def _build_default_catalog(version):
+    from .models import DefaultMeasurement
+    from .serializers import DefaultMeasurementSerializer
+
+    measurements = list(DefaultMeasurement.objects.filter(is_active=True))
+    content = JSONRenderer().render(DefaultMeasurementSerializer(measurements, many=True).data)
+    summary = tuple(
+        {
+            'id': m.id,
+            'size_name': m.size_name,
+            'is_custom': False,
+            'is_default': True,
+            'timestamp': m.timestamp,
+        }
+        for m in sorted(measurements, key=lambda m: m.timestamp, reverse=True)
+    )
+    return DefaultCatalog(version, content, summary)
+
+
+def get_default_catalog():
+    """
+    The active default measurements as an immutable DefaultCatalog:
+    `content` is the rendered JSON list, `summary` the selection rows (newest first).
+    Costs one cache read per call while the catalog is unchanged.
+    """
+    version = _get_version(DEFAULT_VERSION_KEY)
+
+    catalog = _memo['catalog']
+    if catalog is not None and catalog.version == version:
+        return catalog
+
+    key = f'measurements:default:v{version}'
+    catalog = cache.get(key)
+    if catalog is None:
+        catalog = _build_default_catalog(version)
+        cache.set(key, catalog, settings.MEASUREMENTS_CACHE_TIMEOUT)
+
+    with _memo_lock:
+        _memo['catalog'] = catalog
+    return catalog
+
+
+# ================== CUSTOM LISTS ==================
+def _build_custom_measurements(user_id):
+    from .models import CustomMeasurement
+    from .serializers import CustomMeasurementSerializer
+
+    measurements = list(CustomMeasurement.objects.filter(user_id=user_id))
+    summary = tuple(
+        {
+            'id': f"custom_{m.id}",  # Prefix to differentiate from default
+            'custom_id': m.id,  # Actual ID for fetching details
+            'size_name': m.size_name,
+            'is_custom': True,
+            'is_default': False,
+            'timestamp': m.timestamp,
+        }
+        for m in measurements  # Model ordering is already newest first
+    )
+    return {
+        'content': JSONRenderer().render(CustomMeasurementSerializer(measurements, many=True).data),
+        'summary': summary,
+    }
+
+
+def get_custom_measurements(user_id):
+    """A user's custom measurements: {'content': rendered JSON, 'summary': rows newest first}"""
+    version = _get_version(CUSTOM_VERSION_KEY.format(user_id=user_id))
+    key = f'measurements:custom:{user_id}:v{version}'
+
+    payload = cache.get(key)
+    if payload is None:
+        payload = _build_custom_measurements(user_id)
+        cache.set(key, payload, settings.MEASUREMENTS_CACHE_TIMEOUT)
+    return payload
+
+
+def get_combined_measurements(user_id=None):
+    """Default + custom selection rows merged newest first (both inputs are already sorted)"""
+    rows = [get_default_catalog().summary]
+    if user_id is not None:
+        rows.append(get_custom_measurements(user_id)['summary'])
+    # Copies, so callers can't mutate the cached rows
+    return [dict(row) for row in heapq.merge(*rows, key=itemgetter('timestamp'), reverse=True)]
@@ -1,8 +1,10 @@
+from django.http import HttpResponse
 from rest_framework.response import Response
 from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST, HTTP_201_CREATED, HTTP_404_NOT_FOUND
 from rest_framework.views import APIView
 from .serializers import DefaultMeasurementSerializer, CustomMeasurementSerializer, CombinedMeasurementSerializer
 from .models import DefaultMeasurement, CustomMeasurement
+from .measurement_cache import get_combined_measurements, get_custom_measurements, get_default_catalog
 from Design.utils import hableImageUpload
 from typing import Dict
 
@@ -12,11 +14,11 @@ from typing import Dict
 class DefaultMeasurementListAPIView(APIView):
     """
     GET: List all active default measurements (public - visible to all users)
+    Served from the prebuilt catalog payload (rebuilt after admin edits)
     """
     def get(self, request, format=None):
-        queryset = DefaultMeasurement.objects.filter(is_active=True)
-        serializer = DefaultMeasurementSerializer(queryset, context={'request': request}, many=True)
-        return Response(serializer.data, status=HTTP_200_OK, content_type='application/json; charset=utf-8')
+        catalog = get_default_catalog()
+        return HttpResponse(catalog.content, status=HTTP_200_OK, content_type='application/json; charset=utf-8')
 
 
 class DefaultMeasurementDetailAPIView(APIView):
@@ -167,9 +169,9 @@ class CustomMeasurementListAPIView(APIView):
         if not user.is_authenticated:
             return Response({'error': 'Authentication required'}, status=HTTP_400_BAD_REQUEST)
 
-        queryset = CustomMeasurement.objects.filter(user=user)
-        serializer = CustomMeasurementSerializer(queryset, context={'request': request}, many=True)
-        return Response(serializer.data, status=HTTP_200_OK, content_type='application/json; charset=utf-8')
+        # Cached per user, invalidated when this user's measurements change
+        payload = get_custom_measurements(user.id)
+        return HttpResponse(payload['content'], status=HTTP_200_OK, content_type='application/json; charset=utf-8')
 
     def post(self, request, format=None):
         user = request.user
@@ -314,37 +316,8 @@ class AllMeasurementsListAPIView(APIView):
     def get(self, request, format=None):
         user = request.user
 
-        # Get all active default measurements
-        default_measurements = DefaultMeasurement.objects.filter(is_active=True).values('id', 'size_name', 'timestamp')
-
-        # Prepare response list
-        measurements = []
-
-        # Add default measurements
-        for dm in default_measurements:
-            measurements.append({
-                'id': dm['id'],
-                'size_name': dm['size_name'],
-                'is_custom': False,
-                'is_default': True,
-                'timestamp': dm['timestamp']
-            })
-
-        # Add user's custom measurements if authenticated
-        if user.is_authenticated:
-            custom_measurements = CustomMeasurement.objects.filter(user=user).values('id', 'size_name', 'timestamp')
-            for cm in custom_measurements:
-                measurements.append({
-                    'id': f"custom_{cm['id']}",  # Prefix to differentiate from default
-                    'custom_id': cm['id'],  # Actual ID for fetching details
-                    'size_name': cm['size_name'],
-                    'is_custom': True,
-                    'is_default': False,
-                    'timestamp': cm['timestamp']
-                })
-
-        # Sort by timestamp (newest first)
-        measurements.sort(key=lambda x: x['timestamp'], reverse=True)
+        # Cached default catalog merged with the user's cached custom list (newest first)
+        measurements = get_combined_measurements(user.id if user.is_authenticated else None)
 
         return Response(measurements, status=HTTP_200_OK, content_type='application/json; charset=utf-8')
 
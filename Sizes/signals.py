@@ -0,0 +1,30 @@
+"""
+Measurement Cache Invalidation using Django Signals
+Bumps the cached measurement list versions when measurements change
+(see Sizes/measurement_cache.py)
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+import logging
+
+from .models import DefaultMeasurement, CustomMeasurement
+from .measurement_cache import bump_custom_version, bump_default_version
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=DefaultMeasurement)
+@receiver(post_delete, sender=DefaultMeasurement)
+def default_measurement_changed(sender, instance, **kwargs):
+    """Rebuild the default catalog on next read (after commit, so it can't cache uncommitted rows)"""
+    logger.info(f"📝 DefaultMeasurement changed: {instance.size_name}")
+    transaction.on_commit(bump_default_version)
+
+
+@receiver(post_save, sender=CustomMeasurement)
+@receiver(post_delete, sender=CustomMeasurement)
+def custom_measurement_changed(sender, instance, **kwargs):
+    """Invalidate only the owning user's cached list"""
+    user_id = instance.user_id
+    transaction.on_commit(lambda: bump_custom_version(user_id))
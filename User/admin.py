@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Address, Profile
+from .models import Address, DeviceToken, Profile
 
 
 @admin.register(Address)
@@ -30,3 +30,12 @@ class AddressAdmin(admin.ModelAdmin):
 
 
 admin.site.register(Profile)
+
+
+@admin.register(DeviceToken)
+class DeviceTokenAdmin(admin.ModelAdmin):
+    list_display = ('profile', 'device_type', 'device_name', 'is_active', 'failure_count', 'last_success_at', 'last_failure_at', 'updated_at')
+    list_filter = ('is_active', 'device_type', 'deactivation_reason')
+    search_fields = ('token', 'device_id', 'device_name', 'profile__user__username', 'profile__user__email')
+    readonly_fields = ('last_success_at', 'last_failure_at', 'failure_count', 'deactivated_at', 'created_at', 'updated_at')
+    list_select_related = ('profile__user',)
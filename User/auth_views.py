@@ -167,6 +167,7 @@ class UserLogoutAPIView(APIView):
     POST: Logout user
     Endpoint: /user/auth/logout/
     Clears FCM token from backend
+    Optional body: {"fcm_token": "..."} to sign out only that device
     """
     permission_classes = [IsAuthenticated]
 
@@ -174,12 +175,18 @@ class UserLogoutAPIView(APIView):
         try:
             # Get user profile
             from .models import Profile
+            from .device_tokens import deactivate_profile_tokens
             profile = Profile.objects.filter(user=request.user).first()
             
             if profile:
+                # Deactivate this device's token (all devices if none given).
+                # Profile.fcm_token is repointed at another active device, if any
+                fcm_token = request.data.get('fcm_token')
+                deactivate_profile_tokens([profile], reason='logout', token=fcm_token)
+
                 # Clear FCM token
-                profile.fcm_token = ''
-                profile.save()
+                if not fcm_token or profile.fcm_token == fcm_token:
+                    Profile.objects.filter(pk=profile.pk, fcm_token=profile.fcm_token).update(fcm_token='')
                 
                 print(f'✅ Logout: FCM token cleared for user {request.user.email}')
                 
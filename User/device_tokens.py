@@ -0,0 +1,238 @@
+"""
+FCM Device Token Registry
+Multiple devices per user, with per-token health tracking.
+
+- register_device_token(): upsert on app launch / token refresh
+- send_push(): send a per-user message to every active device of that user
+- active_tokens_by_profile(): active tokens of many profiles in one query, for
+  fan-outs that batch their own sends (promotions, cart reminders)
+- record_send_results(): record success/failure per token after any send, and
+  deactivate tokens FCM reports as unregistered or invalid
+- prune_device_tokens(): deactivate stale tokens and delete long-deactivated ones
+  (daily, from the scheduler and the prune_device_tokens command)
+
+Profile.fcm_token is kept as a mirror of the user's most recent active token,
+for code that only needs one token per user.
+"""
+import copy
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, OuterRef, Q, Subquery
+from django.utils import timezone
+from firebase_admin import exceptions, messaging
+
+from .models import DeviceToken, Profile
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the token will never work again
+DEAD_TOKEN_ERRORS = (messaging.UnregisteredError, messaging.SenderIdMismatchError)
+
+
+def is_dead_token_error(exception):
+    if isinstance(exception, DEAD_TOKEN_ERRORS):
+        return True
+    # INVALID_ARGUMENT is also used for bad payloads - only trust it when it's about the token
+    return isinstance(exception, exceptions.InvalidArgumentError) and 'registration token' in str(exception).lower()
+
+
+# ================== REGISTRATION ==================
+def register_device_token(profile, token, device_id=None, device_name=None, device_type=None):
+    """
+    Register (or re-activate) a device token for a profile.
+    A token moves to the new profile if another account registered it before, and
+    an older token for the same device_id is deactivated as replaced.
+    """
+    with transaction.atomic():
+        device, created = DeviceToken.objects.update_or_create(
+            token=token,
+            defaults={
+                'profile': profile,
+                'device_id': device_id or None,
+                'device_name': device_name or None,
+                'device_type': device_type or None,
+                'is_active': True,
+                'failure_count': 0,
+                'deactivated_at': None,
+                'deactivation_reason': None,
+            }
+        )
+        if device_id:
+            replaced = list(
+                DeviceToken.objects.filter(profile=profile, device_id=device_id, is_active=True)
+                .exclude(pk=device.pk).values_list('token', flat=True)
+            )
+            if replaced:
+                deactivate_tokens(replaced, reason='replaced')
+
+        # Drop the token from any other profile that still mirrors it, and mirror it here
+        Profile.objects.filter(fcm_token=token).exclude(pk=profile.pk).update(fcm_token=None)
+        Profile.objects.filter(pk=profile.pk).update(fcm_token=token)
+
+    return device, created
+
+
+def deactivate_tokens(tokens, reason):
+    """Deactivate tokens and repoint Profile.fcm_token mirrors at a remaining active device"""
+    tokens = list(tokens)
+    if not tokens:
+        return 0
+
+    now = timezone.now()
+    with transaction.atomic():
+        count = DeviceToken.objects.filter(token__in=tokens, is_active=True).update(
+            is_active=False,
+            deactivated_at=now,
+            deactivation_reason=reason,
+            updated_at=now
+        )
+        refresh_profile_mirrors(Profile.objects.filter(fcm_token__in=tokens))
+
+    if count:
+        logger.info(f"🔕 Deactivated {count} FCM tokens ({reason})")
+    return count
+
+
+def deactivate_profile_tokens(profiles, reason, token=None):
+    """Deactivate all tokens of the given profiles (or just `token`), e.g. on logout"""
+    queryset = DeviceToken.objects.filter(profile__in=profiles, is_active=True)
+    if token:
+        queryset = queryset.filter(token=token)
+    return deactivate_tokens(queryset.values_list('token', flat=True), reason)
+
+
+def refresh_profile_mirrors(profiles):
+    """Point Profile.fcm_token at the most recently updated active token (or None), in one UPDATE"""
+    latest = (
+        DeviceToken.objects.filter(profile_id=OuterRef('pk'), is_active=True)
+        .order_by('-updated_at').values('token')[:1]
+    )
+    return profiles.update(fcm_token=Subquery(latest))
+
+
+# ================== HEALTH ==================
+def record_send_results(results):
+    """
+    Record the outcome of a send for each token.
+    `results` is an iterable of (token, exception_or_None). The number of
+    queries doesn't depend on how many tokens or profiles were involved: one
+    UPDATE per outcome, plus deactivate_tokens() (at most a SELECT and two UPDATEs) for
+    worn-out and dead tokens.
+    """
+    now = timezone.now()
+    succeeded, failed, dead = [], [], []
+    for token, exception in results:
+        if exception is None:
+            succeeded.append(token)
+        elif is_dead_token_error(exception):
+            dead.append(token)
+        else:
+            failed.append(token)
+
+    if succeeded:
+        DeviceToken.objects.filter(token__in=succeeded).update(last_success_at=now, failure_count=0)
+    if failed:
+        DeviceToken.objects.filter(token__in=failed).update(
+            last_failure_at=now,
+            failure_count=F('failure_count') + 1
+        )
+        worn_out = DeviceToken.objects.filter(
+            token__in=failed,
+            is_active=True,
+            failure_count__gte=settings.FCM_TOKEN_MAX_FAILURES
+        ).values_list('token', flat=True)
+        deactivate_tokens(worn_out, reason='too_many_failures')
+    if dead:
+        DeviceToken.objects.filter(token__in=dead).update(last_failure_at=now)
+        deactivate_tokens(dead, reason='unregistered')
+
+
+def prune_device_tokens(stale_days=None, prune_days=None):
+    """
+    Deactivate active tokens that haven't worked for `stale_days` and delete
+    tokens deactivated more than `prune_days` ago. Returns counts for logging.
+    """
+    stale_days = stale_days if stale_days is not None else settings.FCM_TOKEN_STALE_DAYS
+    prune_days = prune_days if prune_days is not None else settings.FCM_TOKEN_PRUNE_DAYS
+    now = timezone.now()
+
+    stale_cutoff = now - timedelta(days=stale_days)
+    stale = DeviceToken.objects.filter(is_active=True, updated_at__lt=stale_cutoff).filter(
+        Q(last_success_at__isnull=True) | Q(last_success_at__lt=stale_cutoff)
+    ).values_list('token', flat=True)
+    deactivated = deactivate_tokens(stale, reason='stale')
+
+    deleted, _ = DeviceToken.objects.filter(
+        is_active=False,
+        deactivated_at__lt=now - timedelta(days=prune_days)
+    ).delete()
+
+    return {'deactivated': deactivated, 'deleted': deleted}
+
+
+# ================== SENDING ==================
+def active_tokens_like(token):
+    """All active tokens of the profile that owns `token` (the token itself if unknown)"""
+    tokens = list(
+        DeviceToken.objects.filter(is_active=True, profile__device_tokens__token=token)
+        .values_list('token', flat=True).distinct()
+    )
+    if tokens:
+        return tokens
+    if DeviceToken.objects.filter(token=token).exists():
+        # Known token, deactivated, and the user has no other active device
+        return []
+    return [token]
+
+
+def active_tokens_by_profile(profile_ids):
+    """{profile_id: [active tokens, most recently updated first]} in one query"""
+    tokens = {}
+    for profile_id, token in (
+        DeviceToken.objects.filter(profile_id__in=profile_ids, is_active=True)
+        .order_by('profile_id', '-updated_at').values_list('profile_id', 'token')
+    ):
+        tokens.setdefault(profile_id, []).append(token)
+    return tokens
+
+
+def send_push(message, tokens=None):
+    """
+    Drop-in replacement for messaging.send() for per-user messages.
+    Delivers `message` to every active device of the user owning message.token
+    (or to `tokens`, when the caller already loaded them) and records token
+    health. Returns the first message ID; raises the first error if no device
+    accepted it.
+    """
+    if tokens is None:
+        tokens = active_tokens_like(message.token)
+    if not tokens:
+        raise messaging.UnregisteredError('No active device tokens for this user')
+
+    if len(tokens) == 1:
+        try:
+            response = messaging.send(message if message.token == tokens[0] else _retarget(message, tokens[0]))
+        except Exception as e:
+            record_send_results([(tokens[0], e)])
+            raise
+        record_send_results([(tokens[0], None)])
+        return response
+
+    batch = messaging.send_each([_retarget(message, token) for token in tokens])
+    record_send_results(
+        (token, None if result.success else result.exception)
+        for token, result in zip(tokens, batch.responses)
+    )
+    for result in batch.responses:
+        if result.success:
+            return result.message_id
+    raise batch.responses[0].exception
+
+
+def _retarget(message, token):
+    retargeted = copy.copy(message)
+    retargeted.token = token
+    return retargeted
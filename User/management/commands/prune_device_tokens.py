@@ -0,0 +1,34 @@
+"""
+Management command to prune the FCM device token registry
+
+Usage:
+    python manage.py prune_device_tokens
+    python manage.py prune_device_tokens --stale-days 60 --prune-days 7
+"""
+
+from django.core.management.base import BaseCommand
+from User.device_tokens import prune_device_tokens
+
+
+class Command(BaseCommand):
+    help = 'Deactivate stale FCM device tokens and delete long-deactivated ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stale-days',
+            type=int,
+            default=None,
+            help='Deactivate tokens without a successful send for this many days (default: FCM_TOKEN_STALE_DAYS)',
+        )
+        parser.add_argument(
+            '--prune-days',
+            type=int,
+            default=None,
+            help='Delete tokens deactivated more than this many days ago (default: FCM_TOKEN_PRUNE_DAYS)',
+        )
+
+    def handle(self, *args, **options):
+        stats = prune_device_tokens(stale_days=options['stale_days'], prune_days=options['prune_days'])
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Deactivated {stats['deactivated']} stale device tokens, deleted {stats['deleted']}"
+        ))
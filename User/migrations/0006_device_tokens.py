@@ -0,0 +1,39 @@
+# Generated by Django 5.1.4 on 2026-10-19 00:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('User', '0005_forcelogoutuser'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeviceToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=512, unique=True)),
+                ('device_id', models.CharField(blank=True, max_length=200, null=True)),
+                ('device_name', models.CharField(blank=True, max_length=200, null=True)),
+                ('device_type', models.CharField(blank=True, max_length=50, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('last_success_at', models.DateTimeField(blank=True, null=True)),
+                ('last_failure_at', models.DateTimeField(blank=True, null=True)),
+                ('failure_count', models.IntegerField(default=0, help_text='Consecutive failed sends')),
+                ('deactivated_at', models.DateTimeField(blank=True, null=True)),
+                ('deactivation_reason', models.CharField(blank=True, max_length=100, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='device_tokens', to='User.profile')),
+            ],
+            options={
+                'verbose_name': 'Device Token',
+                'verbose_name_plural': 'Device Tokens',
+                'ordering': ['-updated_at'],
+                'indexes': [models.Index(condition=models.Q(('is_active', True)), fields=['profile'], name='user_devicetoken_active_idx')],
+            },
+        ),
+    ]
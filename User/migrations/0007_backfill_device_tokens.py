@@ -0,0 +1,47 @@
+# Generated migration to copy existing Profile.fcm_token values into DeviceToken
+from django.db import migrations
+
+
+def backfill_device_tokens(apps, schema_editor):
+    """
+    Create one active DeviceToken per profile that has an FCM token.
+    If several profiles share a token, the most recently updated profile keeps it.
+    """
+    Profile = apps.get_model('User', 'Profile')
+    DeviceToken = apps.get_model('User', 'DeviceToken')
+
+    tokens = {}
+    profiles = (
+        Profile.objects.filter(fcm_token__isnull=False).exclude(fcm_token='')
+        .order_by('last_fcm_update')
+        .values('id', 'fcm_token', 'device_id', 'device_name', 'device_type')
+    )
+    for profile in profiles.iterator():
+        if len(profile['fcm_token']) > 512:
+            continue
+        tokens[profile['fcm_token']] = DeviceToken(
+            profile_id=profile['id'],
+            token=profile['fcm_token'],
+            device_id=profile['device_id'],
+            device_name=profile['device_name'],
+            device_type=profile['device_type'],
+        )
+
+    DeviceToken.objects.bulk_create(tokens.values(), batch_size=1000, ignore_conflicts=True)
+
+
+def reverse_backfill(apps, schema_editor):
+    """Reverse migration - tokens stay on Profile.fcm_token"""
+    DeviceToken = apps.get_model('User', 'DeviceToken')
+    DeviceToken.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('User', '0006_device_tokens'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_device_tokens, reverse_backfill),
+    ]
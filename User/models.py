@@ -98,6 +98,45 @@ def create_user_profile(sender, instance, created, **kwargs):
         Profile.objects.create(user=instance, premission=permission)
 
 
+class DeviceToken(models.Model):
+    """
+    FCM registration token for one device.
+    A user can have several devices; Profile.fcm_token mirrors the most recently
+    registered active token for code that only needs one.
+    Tokens reported as unregistered/invalid by FCM are deactivated automatically
+    (see User/device_tokens.py) and drop out of every fan-out.
+    """
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='device_tokens')
+    token = models.CharField(max_length=512, unique=True)
+
+    device_id = models.CharField(max_length=200, null=True, blank=True)
+    device_name = models.CharField(max_length=200, null=True, blank=True)
+    device_type = models.CharField(max_length=50, null=True, blank=True)
+
+    # Health
+    is_active = models.BooleanField(default=True)
+    last_success_at = models.DateTimeField(null=True, blank=True)
+    last_failure_at = models.DateTimeField(null=True, blank=True)
+    failure_count = models.IntegerField(default=0, help_text="Consecutive failed sends")
+    deactivated_at = models.DateTimeField(null=True, blank=True)
+    deactivation_reason = models.CharField(max_length=100, null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-updated_at']
+        verbose_name = 'Device Token'
+        verbose_name_plural = 'Device Tokens'
+        indexes = [
+            # Fan-outs only ever read active tokens
+            models.Index(fields=['profile'], condition=models.Q(is_active=True), name='user_devicetoken_active_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.profile} - {self.device_type or 'device'} ({'active' if self.is_active else 'inactive'})"
+
+
 class ForceLogoutUser(models.Model):
     """
     Users in this table will be force logged out on next API request
@@ -11,12 +11,16 @@ from django.core.mail import send_mail, EmailMultiAlternatives
 from django.template.loader import render_to_string
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.http import JsonResponse
+from asgiref.sync import sync_to_async
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from raggyBackend.async_views import AsyncAPIView, run_blocking
+
 
 # OTP Settings (with defaults)
 OTP_EXPIRY_MINUTES = getattr(settings, 'OTP_EXPIRY_MINUTES', 5)
@@ -62,20 +66,33 @@ class SendEmailOTPAPIView(APIView):
     def post(self, request):
         email = request.data.get('email', '').lower().strip()
         purpose = request.data.get('purpose', 'login')
-        
+
+        otp, error = self._issue_otp(email, purpose)
+        if error:
+            return Response(error[0], status=error[1])
+
+        try:
+            self._build_email(email, otp, purpose).send(fail_silently=False)
+        except Exception as e:
+            error = self._send_failed(email, otp, e)
+            if error:
+                return Response(error[0], status=error[1])
+
+        return Response(self._sent_body())
+
+    # Shared with AsyncSendEmailOTPAPIView: (body, status) errors so each view renders its own response
+    def _issue_otp(self, email: str, purpose: str):
+        """Validate and rate limit the request, then store a new OTP: (otp, None) or (None, error)"""
         # Validate email
         if not email or '@' not in email:
-            return Response(
-                {'error': 'Valid email address is required'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+            return None, ({'error': 'Valid email address is required'}, status.HTTP_400_BAD_REQUEST)
         
         # Validate purpose
         valid_purposes = ['login', 'signup', 'address_verification']
         if purpose not in valid_purposes:
-            return Response(
+            return None, (
                 {'error': f'Invalid purpose. Must be one of: {", ".join(valid_purposes)}'},
-                status=status.HTTP_400_BAD_REQUEST
+                status.HTTP_400_BAD_REQUEST
             )
         
         # Check rate limiting
@@ -83,12 +100,12 @@ class SendEmailOTPAPIView(APIView):
         request_count = cache.get(rate_key, 0)
         
         if request_count >= OTP_RATE_LIMIT_PER_HOUR:
-            return Response(
+            return None, (
                 {
                     'error': 'Too many OTP requests. Please try again later.',
                     'retry_after_seconds': 3600
                 },
-                status=status.HTTP_429_TOO_MANY_REQUESTS
+                status.HTTP_429_TOO_MANY_REQUESTS
             )
         
         # Check resend interval
@@ -100,20 +117,20 @@ class SendEmailOTPAPIView(APIView):
             remaining = OTP_RESEND_INTERVAL_SECONDS - elapsed
             
             if remaining > 0:
-                return Response(
+                return None, (
                     {
                         'error': 'Please wait before requesting a new code',
                         'resend_after_seconds': int(remaining)
                     },
-                    status=status.HTTP_429_TOO_MANY_REQUESTS
+                    status.HTTP_429_TOO_MANY_REQUESTS
                 )
         
         # For login, check if user exists
         if purpose == 'login':
             if not User.objects.filter(email=email).exists():
-                return Response(
+                return None, (
                     {'error': 'No account found with this email. Please sign up first.'},
-                    status=status.HTTP_404_NOT_FOUND
+                    status.HTTP_404_NOT_FOUND
                 )
         
         # Generate OTP
@@ -131,39 +148,42 @@ class SendEmailOTPAPIView(APIView):
         
         # Increment rate limit counter
         cache.set(rate_key, request_count + 1, 3600)  # 1 hour TTL
-        
-        # Send email
+        return otp, None
+
+    def _build_email(self, email: str, otp: str, purpose: str) -> EmailMultiAlternatives:
         subject = self._get_email_subject(purpose)
         plain_message = self._get_email_message(otp, purpose)
         html_message = self._render_html_email(otp, purpose)
 
-        try:
-            msg = EmailMultiAlternatives(
-                subject=subject,
-                body=plain_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                to=[email],
-            )
-            if html_message:
-                msg.attach_alternative(html_message, "text/html")
-            msg.send(fail_silently=False)
-        except Exception as e:
-            print(f"❌ Failed to send OTP email: {e}")
-            # In development, print OTP to console
-            if settings.DEBUG:
-                print(f"🔐 OTP for {email}: {otp}")
-            else:
-                return Response(
-                    {'error': 'Failed to send verification email. Please try again.'},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-        
-        return Response({
+        msg = EmailMultiAlternatives(
+            subject=subject,
+            body=plain_message,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[email],
+        )
+        if html_message:
+            msg.attach_alternative(html_message, "text/html")
+        return msg
+
+    def _send_failed(self, email: str, otp: str, error: Exception):
+        """Error to return when the email couldn't be sent (None in development)"""
+        print(f"❌ Failed to send OTP email: {error}")
+        # In development, print OTP to console
+        if settings.DEBUG:
+            print(f"🔐 OTP for {email}: {otp}")
+            return None
+        return (
+            {'error': 'Failed to send verification email. Please try again.'},
+            status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    def _sent_body(self) -> dict:
+        return {
             'success': True,
             'message': 'Verification code sent to your email',
-            'expires_in_seconds': expiry_seconds,
+            'expires_in_seconds': OTP_EXPIRY_MINUTES * 60,
             'resend_after_seconds': OTP_RESEND_INTERVAL_SECONDS
-        })
+        }
     
     def _get_email_subject(self, purpose: str) -> str:
         subjects = {
@@ -449,6 +469,41 @@ class ResendEmailOTPAPIView(APIView):
         return send_view.post(request)
 
 
+class AsyncSendEmailOTPAPIView(AsyncAPIView):
+    """
+    Send (or resend) OTP to user's email address - async, for ASGI deployments
+
+    POST /user/auth/otp/send/
+    POST /user/auth/otp/resend/
+    Same request and response as SendEmailOTPAPIView. The checks and the OTP
+    storage run in one sync_to_async hop; the SMTP send (the slow part) runs on
+    the blocking I/O pool (run_blocking), so concurrent sends don't block the
+    event loop or queue behind the request's database work.
+    """
+    permission_classes = [AllowAny]
+
+    async def post(self, request):
+        email = request.data.get('email', '').lower().strip()
+        purpose = request.data.get('purpose', 'login')
+        otp_view = SendEmailOTPAPIView()
+
+        otp, error = await sync_to_async(otp_view._issue_otp)(email, purpose)
+        if error:
+            return JsonResponse(error[0], status=error[1])
+
+        def send():
+            otp_view._build_email(email, otp, purpose).send(fail_silently=False)
+
+        try:
+            await run_blocking(send)
+        except Exception as e:
+            error = otp_view._send_failed(email, otp, e)
+            if error:
+                return JsonResponse(error[0], status=error[1])
+
+        return JsonResponse(otp_view._sent_body())
+
+
 class CheckOTPStatusAPIView(APIView):
     """
     Check OTP status for an email
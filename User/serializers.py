@@ -1,4 +1,5 @@
-from .models import Address, Profile
+from .models import Address, DeviceToken, Profile
+from .device_tokens import register_device_token
 from django.contrib.auth.models import User
 from rest_framework import serializers
 from Purchase.models import Purchase
@@ -7,6 +8,7 @@ from Design.models import UserDesign
 from Purchase.serializers import PurchaseListSerializer
 from Sizes.serializers import CustomMeasurementSerializer, SizesSerializer
 from Sizes.models import CustomMeasurement, Sizes
+from Notification.outbox import enqueue_notification
 
 
 class AddressSerializer(serializers.ModelSerializer):
@@ -196,8 +198,14 @@ class UpdateFCMTokenSerializer(serializers.Serializer):
 
         # Get or create profile
         profile, created = Profile.objects.get_or_create(user=user)
+        old_token = profile.fcm_token
 
-        # Update FCM token and device info
+        # Register the device (other devices of this user stay active)
+        register_device_token(
+            profile, fcm_token, device_id=device_id, device_name=device_name, device_type=device_type
+        )
+
+        # Profile.fcm_token mirrors the latest registered token
         profile.fcm_token = fcm_token
         if device_name:
             profile.device_name = device_name
@@ -207,6 +215,13 @@ class UpdateFCMTokenSerializer(serializers.Serializer):
             profile.device_type = device_type
         profile.save()
 
+        # Subscribe the new token to catalog-change broadcasts (delivered in the background).
+        # The previous token is only unsubscribed if it no longer belongs to an active device.
+        if fcm_token != old_token:
+            if old_token and DeviceToken.objects.filter(token=old_token, is_active=True).exists():
+                old_token = None
+            enqueue_notification('fcm_topic_subscription', {'token': fcm_token, 'old_token': old_token})
+
         return {
             'success': True,
             'message': 'FCM token updated successfully',
@@ -1,3 +1,36 @@
+from django.contrib.auth.models import User
 from django.test import TestCase
 
-# Create your tests here.
+from .device_tokens import deactivate_tokens, register_device_token
+from .models import DeviceToken, Profile
+
+
+class DeviceTokenMirrorTests(TestCase):
+    """Profile.fcm_token follows the latest active device token"""
+
+    def create_profile(self, username):
+        return User.objects.create_user(username=username).profile
+
+    def test_deactivation_repoints_mirrors_in_constant_queries(self):
+        profiles = [self.create_profile(f'user-{i}') for i in range(5)]
+        for profile in profiles:
+            register_device_token(profile, f'{profile.user.username}-phone', device_id='phone')
+            register_device_token(profile, f'{profile.user.username}-tablet', device_id='tablet')
+        tablets = [f'{profile.user.username}-tablet' for profile in profiles]
+
+        # SAVEPOINT, UPDATE tokens, one UPDATE for every mirror, RELEASE
+        with self.assertNumQueries(4):
+            deactivate_tokens(tablets, reason='unregistered')
+
+        mirrors = dict(Profile.objects.values_list('id', 'fcm_token'))
+        self.assertEqual(mirrors, {profile.id: f'{profile.user.username}-phone' for profile in profiles})
+
+    def test_last_token_deactivated_clears_mirror(self):
+        profile = self.create_profile('single')
+        register_device_token(profile, 'only-token')
+
+        deactivate_tokens(['only-token'], reason='logout')
+
+        profile.refresh_from_db()
+        self.assertIsNone(profile.fcm_token)
+        self.assertFalse(DeviceToken.objects.get(token='only-token').is_active)
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from .views import (
     AddressAPIView, DefaultAddressAPIView, UserInfoAPIView,
@@ -9,9 +10,17 @@ from .otp_views import (
     SendEmailOTPAPIView, 
     VerifyEmailOTPAPIView, 
     ResendEmailOTPAPIView,
-    CheckOTPStatusAPIView
+    CheckOTPStatusAPIView,
+    AsyncSendEmailOTPAPIView
 )
 
+# Async send/resend under ASGI (see ASYNC_IO_VIEWS in settings)
+if settings.ASYNC_IO_VIEWS:
+    otp_send_view = otp_resend_view = AsyncSendEmailOTPAPIView.as_view()
+else:
+    otp_send_view = SendEmailOTPAPIView.as_view()
+    otp_resend_view = ResendEmailOTPAPIView.as_view()
+
 urlpatterns = [
     # ================ AUTHENTICATION ================
     path('auth/signup/', UserSignupAPIView.as_view(), name='signup'),
@@ -19,9 +28,9 @@ urlpatterns = [
     path('auth/logout/', UserLogoutAPIView.as_view(), name='logout'),
 
     # ================ OTP AUTHENTICATION ================
-    path('auth/otp/send/', SendEmailOTPAPIView.as_view(), name='otp-send'),
+    path('auth/otp/send/', otp_send_view, name='otp-send'),
     path('auth/otp/verify/', VerifyEmailOTPAPIView.as_view(), name='otp-verify'),
-    path('auth/otp/resend/', ResendEmailOTPAPIView.as_view(), name='otp-resend'),
+    path('auth/otp/resend/', otp_resend_view, name='otp-resend'),
     path('auth/otp/status/', CheckOTPStatusAPIView.as_view(), name='otp-status'),
 
     # ================ ADDRESS MANAGEMENT ================
@@ -1,3 +1,4 @@
+import logging
 from django.shortcuts import render
 from .serializers import AddressSerializer, userBasicInfoSerializer, UserProfileSerializer, UpdateFCMTokenSerializer
 from rest_framework.response import Response
@@ -9,6 +10,8 @@ from django.db import transaction
 from Design.models import UserDesign, HomePageSelectionCategory, FabricColor, GholaType, SleevesType, PocketType, ButtonType, BodyType
 from Sizes.models import Sizes
 
+logger = logging.getLogger(__name__)
+
 # Create your views here.
 class AddressAPIView(APIView):
     def get(self, request, pk=None, format=None):
@@ -495,7 +498,7 @@ class BulkSaveCartDataAPIView(APIView):
                                 'created': False,
                                 'message': 'Reusing existing measurement'
                             }
-                            print(f"♻️ BulkSave: Reusing existing measurement (ID: {existing_measurement.id})")
+                            logger.debug("♻️ BulkSave: Reusing existing measurement (ID: %s)", existing_measurement.id)
                         else:
                             # Create new custom measurement
                             new_measurement = Sizes.objects.create(
@@ -525,13 +528,13 @@ class BulkSaveCartDataAPIView(APIView):
                                 'created': True,
                                 'message': 'Custom measurement saved successfully'
                             }
-                            print(f"✅ BulkSave: Created new custom measurement (ID: {new_measurement.id})")
+                            logger.debug("✅ BulkSave: Created new custom measurement (ID: %s)", new_measurement.id)
                     except Exception as e:
                         response_data['saved_items']['measurement'] = {
                             'error': 'Failed to save custom measurement',
                             'message': str(e)
                         }
-                        print(f"⚠️ BulkSave: Error saving custom measurement: {e}")
+                        logger.warning("⚠️ BulkSave: Error saving custom measurement: %s", e)
                 else:
                     # Default measurement - just acknowledge
                     response_data['saved_items']['measurement'] = {
@@ -628,11 +631,11 @@ class BulkSaveCartDataAPIView(APIView):
                                 'name': existing_design.design_name,
                                 'created': False
                             })
-                            print(f"♻️ BulkSave: Reusing existing design (ID: {existing_design.id})")
+                            logger.debug("♻️ BulkSave: Reusing existing design (ID: %s)", existing_design.id)
                         else:
                             # Create new design
                             design_total = item_data.get('design_total', 0.0)
-                            print(f"💰 BulkSave: Saving design with design_total: {design_total}")
+                            logger.debug("💰 BulkSave: Saving design with design_total: %s", design_total)
 
                             new_design = UserDesign.objects.create(
                                 user=user,
@@ -653,9 +656,9 @@ class BulkSaveCartDataAPIView(APIView):
                                 'name': new_design.design_name,
                                 'created': True
                             })
-                            print(f"✅ BulkSave: Created new design (ID: {new_design.id})")
+                            logger.debug("✅ BulkSave: Created new design (ID: %s)", new_design.id)
                     except Exception as e:
-                        print(f"⚠️ BulkSave: Error saving design '{item_data.get('design_name')}': {e}")
+                        logger.warning("⚠️ BulkSave: Error saving design '%s': %s", item_data.get('design_name'), e)
                         continue
 
                 response_data['saved_items']['designs'] = {
@@ -0,0 +1,413 @@
+"""
+API Performance Benchmark
+Seeds a synthetic dataset and measures every GET endpoint routed from
+raggyBackend/urls.py through the Django test client.
+
+Per endpoint it records:
+- queries: SQL statements per request (median of the timed runs; cold = first run)
+- db_ms: time spent executing SQL
+- serialize_ms: time in DRF serializer .data, renderers and template rendering
+  (includes any lazy queries those trigger)
+- p50_ms / p95_ms: wall-clock latency through the full middleware stack
+
+Driven by the benchmark_api management command, which also handles the
+throwaway test database and the JSON baseline.
+"""
+import contextlib
+import io
+import logging
+import math
+import re
+import statistics
+import threading
+import time
+import warnings
+from collections import namedtuple
+from decimal import Decimal
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import timezone
+
+DatasetSize = namedtuple('DatasetSize', [
+    'users', 'fabric_types', 'colors_per_fabric', 'components', 'designs', 'orders', 'notification_logs',
+])
+
+SCALES = {
+    # Production-like volume: thousands of fabrics/colors, 100k orders, 1M notification logs
+    'full': DatasetSize(users=2000, fabric_types=1000, colors_per_fabric=5, components=200,
+                        designs=5000, orders=100_000, notification_logs=1_000_000),
+    'medium': DatasetSize(users=500, fabric_types=200, colors_per_fabric=5, components=50,
+                          designs=1000, orders=10_000, notification_logs=100_000),
+    'small': DatasetSize(users=50, fabric_types=20, colors_per_fabric=3, components=10,
+                         designs=100, orders=500, notification_logs=2000),
+}
+
+# Routes that are never requested: Django admin, static files, and GETs with side effects
+SKIPPED_ROUTES = re.compile(r'^(admin/|static/|media/)|logout|delete')
+
+BATCH_SIZE = 5000
+
+
+# ================== DATASET ==================
+BenchmarkContext = namedtuple('BenchmarkContext', ['user', 'params'])
+
+
+def seed_dataset(size, log=print):
+    """
+    Bulk-insert a synthetic dataset (signals don't fire, so nothing is sent or invalidated).
+    The benchmark user is created first and owns the first row of every per-user table,
+    so id 1 resolves for every <pk> route.
+    """
+    from Banner.models import Banner
+    from Coupon.models import Coupon
+    from Design.models import (
+        BodyType, ButtonType, DesignScreenshot, FabricColor, FabricType, GholaType,
+        HomePageSelectionCategory, PocketType, SleevesType, UserDesign
+    )
+    from Fee.models import Area, Fee
+    from Notification.models import NotificationLog
+    from Purchase.models import AboutUs, DeliverySettings, Item, Purchase, TermsAndConditions
+    from Sizes.models import CustomMeasurement, DefaultMeasurement, Sizes
+    from User.models import Address, Profile
+
+    started = time.perf_counter()
+    now = timezone.now()
+
+    user = User.objects.create_superuser('bench_admin', 'bench_admin@example.com', 'bench-password')
+    User.objects.bulk_create(
+        [User(username=f"bench_{i}", email=f"bench_{i}@example.com") for i in range(1, size.users)],
+        batch_size=BATCH_SIZE
+    )
+    user_ids = list(User.objects.order_by('id').values_list('id', flat=True))
+    # The benchmark user's profile comes from the post_save signal
+    Profile.objects.bulk_create(
+        [Profile(user_id=uid, full_name=f"User {uid}", premission='User', fcm_token=f"bench-token-{uid}")
+         for uid in user_ids if uid != user.id],
+        batch_size=BATCH_SIZE
+    )
+    profile_ids = list(Profile.objects.order_by('id').values_list('id', flat=True))
+    Address.objects.bulk_create(
+        [Address(user_id=uid, phone_number='+96550000000', governorate='Capital', area='Sharq', isDefault=True)
+         for uid in user_ids],
+        batch_size=BATCH_SIZE
+    )
+    log(f"🌱 {len(user_ids)} users")
+
+    # ---- catalog ----
+    HomePageSelectionCategory.objects.bulk_create([
+        HomePageSelectionCategory(main_category_name_eng=f"Category {i}", initial_price=Decimal('10.000'), priority=i)
+        for i in range(10)
+    ])
+    FabricType.objects.bulk_create(
+        [FabricType(fabric_name_eng=f"Fabric {i}", fabric_name_arb=f"قماش {i}", base_price=Decimal('5.000'),
+                    features=['Easy Iron'], priority=i)
+         for i in range(size.fabric_types)],
+        batch_size=BATCH_SIZE
+    )
+    fabric_ids = list(FabricType.objects.order_by('id').values_list('id', flat=True))
+    FabricColor.objects.bulk_create(
+        [FabricColor(fabric_type_id=fid, color_name_eng=f"Color {c}", color_name_arb=f"لون {c}",
+                     quantity=(fid + c) % 40, inStock=True, price_adjustment=Decimal('0.500'), priority=c)
+         for fid in fabric_ids for c in range(size.colors_per_fabric)],
+        batch_size=BATCH_SIZE
+    )
+    color_ids = list(FabricColor.objects.order_by('id').values_list('id', flat=True))
+
+    component_models = (
+        (GholaType, 'ghola_type_name'), (SleevesType, 'sleeves_type_name'), (PocketType, 'pocket_type_name'),
+        (ButtonType, 'button_type_name'), (BodyType, 'body_type_name'),
+    )
+    for model, name_field in component_models:
+        model.objects.bulk_create(
+            [model(**{f"{name_field}_eng": f"{model.__name__} {i}", f"{name_field}_arb": f"{i}",
+                      'initial_price': Decimal('1.000'), 'fabric_type_id': fabric_ids[i % len(fabric_ids)],
+                      'fabric_color_id': color_ids[i % len(color_ids)]})
+             for i in range(size.components)],
+            batch_size=BATCH_SIZE
+        )
+    log(f"🌱 {len(fabric_ids)} fabrics, {len(color_ids)} colors, {size.components} of each component")
+
+    UserDesign.objects.bulk_create(
+        [UserDesign(user_id=user_ids[i % len(user_ids)] if i >= 20 else user.id,
+                    design_name=f"Design {i}", initial_size_selected_id=1,
+                    main_body_fabric_color_id=color_ids[i % len(color_ids)],
+                    selected_coller_type_id=1, selected_sleeve_left_type_id=1, selected_sleeve_right_type_id=1,
+                    selected_pocket_type_id=1, selected_button_type_id=1, selected_body_type_id=1,
+                    design_Total=Decimal('25.000'))
+         for i in range(size.designs)],
+        batch_size=BATCH_SIZE
+    )
+    DesignScreenshot.objects.create(design_hash='bench', screenshot_url='https://example.com/bench.png')
+
+    # ---- measurements ----
+    measurement_fields = {
+        name: '10' for name in (
+            'front_height', 'back_height', 'neck_size', 'around_legs', 'full_chest', 'half_chest', 'full_belly',
+            'half_belly', 'neck_to_center_belly', 'neck_to_chest_pocket', 'shoulder_width', 'arm_tall',
+            'arm_width_1', 'arm_width_2', 'arm_width_3', 'arm_width_4',
+        )
+    }
+    DefaultMeasurement.objects.bulk_create(
+        [DefaultMeasurement(size_name=f"Size {i}", **measurement_fields) for i in range(16)]
+    )
+    CustomMeasurement.objects.bulk_create(
+        [CustomMeasurement(user_id=uid, size_name='Mine', **measurement_fields) for uid in user_ids],
+        batch_size=BATCH_SIZE
+    )
+    Sizes.objects.bulk_create([
+        Sizes(user_id=user.id, size_name='Legacy', front_hight='1', back_hight='1', around_neck='1',
+              around_legs='1', full_chest='1', half_chest='1', full_belly='1', half_belly='1',
+              neck_to_center_belly='1', neck_to_chest='1', shoulders_width='1', arm_tall='1',
+              arm_width_one='1', arm_width_two='1', arm_width_three='1', arm_width_four='1')
+    ])
+
+    # ---- orders ----
+    statuses = ('Pending', 'Confirmed', 'Working', 'Shipping', 'Delivered', 'Cancelled')
+    for start in range(0, size.orders, BATCH_SIZE):
+        count = min(BATCH_SIZE, size.orders - start)
+        orders = Purchase.objects.bulk_create([
+            Purchase(user_id=user.id if i < 50 else user_ids[i % len(user_ids)],
+                     invoice_number=f"BENCH-{i}", full_name='Bench', phone_number='+96550000000',
+                     payment_option='knet', total_price=Decimal('25.000'), status=statuses[i % len(statuses)])
+            for i in range(start, start + count)
+        ])
+        Item.objects.bulk_create([
+            Item(invoice=order, user_design_id=1, product_name='Dishdasha',
+                 unit_price=Decimal('25.000'), net_amount=Decimal('25.000'), quantity=1,
+                 design_details={'fabric': color_ids[order.pk % len(color_ids)]})
+            for order in orders
+        ])
+    # Spread order dates over the last 180 days for the analytics endpoints
+    Purchase.objects.update(timestamp=now)
+    for days in range(0, 180, 30):
+        Purchase.objects.filter(id__gt=days * size.orders // 180).update(timestamp=now - timedelta(days=days))
+    log(f"🌱 {size.orders} orders")
+
+    # ---- notification logs ----
+    for start in range(0, size.notification_logs, BATCH_SIZE):
+        count = min(BATCH_SIZE, size.notification_logs - start)
+        NotificationLog.objects.bulk_create([
+            NotificationLog(notification_type='order_placed', priority='high', channel='push',
+                            user_id=profile_ids[i % len(profile_ids)], title='Order placed', body='Bench',
+                            was_sent=True, sent_at=now)
+            for i in range(start, start + count)
+        ])
+    log(f"🌱 {size.notification_logs} notification logs")
+
+    # ---- singletons / misc ----
+    Area.objects.bulk_create([Area(area_name_eng=f"Area {i}", area_name_arb=f"منطقة {i}") for i in range(100)])
+    Fee.objects.bulk_create([Fee(area_id=i + 1, fee=Decimal('1.000'), availble=True) for i in range(100)])
+    Coupon.objects.bulk_create([
+        Coupon(code=f"BENCH{i}", name_en=f"Coupon {i}", name_ar=f"{i}", discount_value=Decimal('10'))
+        for i in range(20)
+    ])
+    Banner.objects.bulk_create([Banner(title=f"Banner {i}", order=i) for i in range(5)])
+    DeliverySettings.objects.create()
+    AboutUs.objects.create(content_en='About', content_ar='About')
+    TermsAndConditions.objects.create(content_en='Terms', content_ar='Terms')
+
+    log(f"🌱 Dataset seeded in {time.perf_counter() - started:.1f}s")
+
+    params = {
+        'pk': 1, 'user_id': user.id, 'order_id': 1, 'design_id': 1, 'item_id': 1, 'address_id': 1,
+        'fabric_id': fabric_ids[0], 'fabric_type_id': fabric_ids[0], 'coupon_id': 1, 'banner_id': 1,
+        'component_type': 'fabric_types', 'design_hash': 'bench',
+    }
+    return BenchmarkContext(user=user, params=params)
+
+
+# ================== ENDPOINTS ==================
+_ROUTE_PARAM = re.compile(r'<(?:\w+:)?(\w+)>')
+_REGEX_PARAM = re.compile(r'\(\?P<(\w+)>[^)]*\)')
+
+
+def _route_to_path(route, params):
+    """Turn a route ('orders/<int:order_id>/') or router regex into a concrete path, or None"""
+    missing = []
+
+    def fill(match):
+        name = match.group(1)
+        if name not in params:
+            missing.append(name)
+            return ''
+        return str(params[name])
+
+    path = _ROUTE_PARAM.sub(fill, route)
+    path = _REGEX_PARAM.sub(fill, path)
+    path = path.replace('^', '').replace('$', '').replace('\\', '')
+    if missing or 'format' in route or any(ch in path for ch in '()?*+['):
+        return None
+    return '/' + path
+
+
+def discover_endpoints(params, only=None):
+    """Concrete GET paths for every pattern under ROOT_URLCONF, in urlconf order"""
+    routes = []
+
+    def walk(patterns, prefix):
+        for pattern in patterns:
+            route = prefix + str(pattern.pattern)
+            if isinstance(pattern, URLResolver):
+                walk(pattern.url_patterns, route)
+            elif isinstance(pattern, URLPattern):
+                routes.append(route)
+
+    walk(get_resolver().url_patterns, '')
+
+    paths = []
+    for route in routes:
+        if SKIPPED_ROUTES.search(route.lstrip('^')):
+            continue
+        path = _route_to_path(route, params)
+        if path and path not in paths and (not only or only in path):
+            paths.append(path)
+    return paths
+
+
+# ================== INSTRUMENTATION ==================
+class Instrumentation:
+    """Counts queries / DB time and times serialization while installed"""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self._local = threading.local()
+        self._patches = []
+
+    def reset(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+
+    def _execute(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - started
+
+    def _timed(self, func):
+        instrumentation = self
+
+        def wrapper(*args, **kwargs):
+            depth = getattr(instrumentation._local, 'depth', 0)
+            instrumentation._local.depth = depth + 1
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                instrumentation._local.depth = depth
+                if depth == 0:
+                    instrumentation.serialize_time += time.perf_counter() - started
+        return wrapper
+
+    def _patch(self, owner, name, wrap_property=False):
+        original = owner.__dict__[name]
+        patched = property(self._timed(original.fget)) if wrap_property else self._timed(original)
+        setattr(owner, name, patched)
+        self._patches.append((owner, name, original))
+
+    @contextlib.contextmanager
+    def installed(self):
+        from django.template.backends.django import Template
+        from rest_framework.renderers import JSONRenderer
+        from rest_framework.serializers import ListSerializer, Serializer
+
+        self._patch(Serializer, 'data', wrap_property=True)
+        self._patch(ListSerializer, 'data', wrap_property=True)
+        self._patch(JSONRenderer, 'render')
+        self._patch(Template, 'render')
+        try:
+            with connection.execute_wrapper(self._execute):
+                yield self
+        finally:
+            for owner, name, original in reversed(self._patches):
+                setattr(owner, name, original)
+            self._patches = []
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def measure_endpoints(context, paths, iterations=10, log=print):
+    """
+    Request each path once cold and `iterations` times warm.
+    Returns {path: metrics}; paths that don't answer GET (405) are left out and
+    paths that error (5xx) are reported once with their status.
+    """
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    client = Client(raise_request_exception=False)
+    client.force_login(context.user)
+    headers = {'HTTP_AUTHORIZATION': f"Bearer {RefreshToken.for_user(context.user).access_token}"}
+    instrumentation = Instrumentation()
+    results = {}
+
+    # Server errors are reported per path, not as log tracebacks
+    request_logger = logging.getLogger('django.request')
+    disabled, request_logger.disabled = request_logger.disabled, True
+
+    try:
+        with instrumentation.installed():
+            for path in paths:
+                samples = []
+                for run in range(iterations + 1):
+                    instrumentation.reset()
+                    started = time.perf_counter()
+                    # Views print debug output and warnings; keep them out of the report
+                    with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+                        warnings.simplefilter('ignore')
+                        response = client.get(path, **headers)
+                    elapsed = time.perf_counter() - started
+                    samples.append((elapsed, instrumentation.queries, instrumentation.db_time,
+                                    instrumentation.serialize_time))
+                    if response.status_code == 405 or response.status_code >= 500:
+                        break
+
+                if response.status_code == 405:
+                    continue
+
+                cold, warm = samples[0], samples[1:] or samples[:1]
+                latencies = [s[0] * 1000 for s in warm]
+                results[path] = {
+                    'status': response.status_code,
+                    'queries': int(statistics.median(s[1] for s in warm)),
+                    'cold_queries': cold[1],
+                    'db_ms': round(statistics.median(s[2] for s in warm) * 1000, 2),
+                    'serialize_ms': round(statistics.median(s[3] for s in warm) * 1000, 2),
+                    'p50_ms': round(_percentile(latencies, 0.50), 2),
+                    'p95_ms': round(_percentile(latencies, 0.95), 2),
+                }
+                log(path, results[path])
+
+    finally:
+        request_logger.disabled = disabled
+
+    return results
+
+
+# ================== BASELINE ==================
+def find_regressions(results, baseline, threshold=0.25, min_delta_ms=2.0, query_slack=0):
+    """
+    Compare against a baseline's endpoints. A regression is more queries than the
+    baseline (+ query_slack), or a p95 more than `threshold` (and `min_delta_ms`) slower.
+    """
+    regressions = []
+    for path, current in results.items():
+        previous = baseline.get(path)
+        if not previous:
+            continue
+        if current['queries'] > previous['queries'] + query_slack:
+            regressions.append(f"{path}: queries {previous['queries']} → {current['queries']}")
+        slower = current['p95_ms'] - previous['p95_ms']
+        if slower > min_delta_ms and current['p95_ms'] > previous['p95_ms'] * (1 + threshold):
+            regressions.append(f"{path}: p95 {previous['p95_ms']}ms → {current['p95_ms']}ms")
+    return regressions
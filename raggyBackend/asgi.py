@@ -3,6 +3,19 @@ ASGI config for raggyBackend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+ASGI deployment mode: serve this application and set ASYNC_IO_VIEWS=True so the
+fan-out I/O endpoints (OTP email send/resend, design screenshot upload) route to
+their async views (raggyBackend/async_views.py), which await SMTP / Cloudinary /
+Payzah instead of holding a worker thread per in-flight request:
+
+    ASYNC_IO_VIEWS=True uvicorn raggyBackend.asgi:application \
+        --workers 4 --loop uvloop --lifespan off
+
+Everything else keeps running as sync views (Django runs them in a thread).
+Leave REQUEST_PROFILING_ENABLED off here: the profiling middleware is sync-only
+and would route every request through a sync adapter. Measure the difference
+offline with `python manage.py benchmark_async_io`.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 """
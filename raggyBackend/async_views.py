@@ -0,0 +1,87 @@
+"""
+Async API Views
+Base class for the async-native versions of the fan-out I/O endpoints
+(payment initiate/verify, OTP email send, design screenshot upload), served
+when the project runs under ASGI (see raggyBackend/asgi.py, ASYNC_IO_VIEWS).
+
+DRF's APIView is sync-only, so AsyncAPIView is a Django async View that keeps
+the parts of the DRF request cycle these endpoints rely on:
+- The same authentication (CustomJWTAuthentication, with its force-logout
+  check), parsers and permission classes, run once per request in a single
+  sync_to_async hop together with body parsing, so the handler receives a DRF
+  Request whose .user and .data are already resolved
+- Authentication / permission / parse errors go through the project's
+  exception handler, so clients still get the force_logout 401 payload
+- Like APIView, views are CSRF exempt (token authentication only)
+
+Handlers are `async def` and return a JsonResponse; anything that touches the
+database goes through sync_to_async (or the async ORM methods). Blocking calls
+with no async client (SMTP) run on run_blocking()'s pool: sized by
+ASYNC_BLOCKING_IO_WORKERS rather than the event loop's CPU-sized default
+executor, and separate from the per-request database threads.
+"""
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from raggyBackend.executors import lazy_executor
+
+get_executor = lazy_executor('ASYNC_BLOCKING_IO_WORKERS', 'async-blocking-io')
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Await a blocking, database-free call on the blocking I/O pool"""
+    return await sync_to_async(func, thread_sensitive=False, executor=get_executor())(*args, **kwargs)
+
+
+class AsyncAPIView(View):
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES
+    permission_classes = api_settings.DEFAULT_PERMISSION_CLASSES
+
+    # Methods whose body is parsed up front (off the event loop)
+    BODY_METHODS = ('POST', 'PUT', 'PATCH')
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    def initial(self, request):
+        """Sync: wrap, authenticate, check permissions and parse the body"""
+        drf_request = Request(
+            request,
+            parsers=[parser() for parser in self.parser_classes],
+            authenticators=[authenticator() for authenticator in self.authentication_classes],
+        )
+        # Authenticate eagerly, as APIView does (an invalid token fails even on AllowAny views)
+        drf_request.user
+        for permission in [permission() for permission in self.permission_classes]:
+            if not permission.has_permission(drf_request, self):
+                if drf_request.authenticators and not drf_request.successful_authenticator:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, 'message', None))
+
+        if request.method in self.BODY_METHODS:
+            drf_request.data
+        return drf_request
+
+    async def dispatch(self, request, *args, **kwargs):
+        method = request.method.lower()
+        if method == 'options' or method not in self.http_method_names or not hasattr(self, method):
+            return await super().dispatch(request, *args, **kwargs)
+
+        try:
+            self.request = await sync_to_async(self.initial)(request)
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc)
+        return await getattr(self, method)(self.request, *args, **kwargs)
+
+    def handle_exception(self, exc):
+        """Render a DRF exception through the configured EXCEPTION_HANDLER"""
+        context = {'view': self, 'args': self.args, 'kwargs': self.kwargs, 'request': self.request}
+        response = api_settings.EXCEPTION_HANDLER(exc, context)
+        return JsonResponse(response.data, status=response.status_code, safe=False)
@@ -0,0 +1,35 @@
+"""
+Cache Invalidation Middleware
+Runs every request inside one design cache invalidation batch
+(see Design/cache_invalidation.py): however many catalog rows a request
+saves - an admin change form, an import-export upload, a dashboard edit -
+each dirty cache scope is invalidated once, after the request's writes
+have committed.
+
+Sync and async capable, so under ASGI it doesn't force the async views
+through a sync adapter.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from Design.cache_invalidation import abatched_invalidation, batched_invalidation
+
+
+class CacheInvalidationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with batched_invalidation():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        async with abatched_invalidation():
+            return await self.get_response(request)
@@ -2,9 +2,13 @@
 Custom JWT Authentication with Force Logout Check
 Extends JWTAuthentication to check if user should be force logged out
 """
+import logging
+
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 
+logger = logging.getLogger(__name__)
+
 
 class CustomJWTAuthentication(JWTAuthentication):
     """
@@ -12,30 +16,28 @@ class CustomJWTAuthentication(JWTAuthentication):
     """
 
     def authenticate(self, request):
-        print(f'🔍 CustomJWTAuthentication called for: {request.path}')
+        # Runs on every API request: tracing is debug-level (off by default)
+        # and uses %-style args so it costs nothing when disabled
+        logger.debug("🔍 CustomJWTAuthentication called for: %s", request.path)
 
         # First, use default JWT authentication
         result = super().authenticate(request)
-        print(f'   JWT Auth result: {result is not None}')
 
         if result is not None:
             user, token = result
-            print(f'   ✅ User: {user.username} (ID: {user.id})')
+            logger.debug("✅ JWT user: %s (ID: %s)", user.username, user.id)
 
             # Check if user should be force logged out
             try:
                 from User.models import ForceLogoutUser
                 should_logout = ForceLogoutUser.should_logout(user)
-                print(f'   🔒 Force logout check: {should_logout}')
 
                 if should_logout:
-                    print(f'   🚨 FORCING LOGOUT for user: {user.username}')
+                    logger.info("🚨 Forcing logout for user: %s", user.username)
                     # Remove from force logout list (they'll need to login again)
                     ForceLogoutUser.remove_user(user)
-                    print(f'   ✅ Removed from force logout table')
 
                     # Raise authentication error - will trigger force logout on client
-                    print(f'   ❌ Raising AuthenticationFailed')
                     raise AuthenticationFailed(
                         {
                             'success': False,
@@ -46,18 +48,14 @@ class CustomJWTAuthentication(JWTAuthentication):
                     )
             except AuthenticationFailed:
                 # Re-raise AuthenticationFailed - this is what we want!
-                print(f'   🔄 Re-raising AuthenticationFailed')
                 raise
             except ImportError as e:
                 # ForceLogoutUser model not available yet (migration pending)
-                print(f'   ⚠️  ImportError: {e}')
-                pass
-            except Exception as e:
+                logger.warning("⚠️ ForceLogoutUser unavailable: %s", e)
+            except Exception:
                 # Any other error - log but don't break authentication
-                print(f'   ⚠️  Warning: Force logout check failed: {e}')
-                import traceback
-                traceback.print_exc()
-                pass
+                logger.exception("⚠️ Force logout check failed")
+        else:
+            logger.debug("JWT auth: no credentials for %s", request.path)
 
-        print(f'   ↩️  Returning result')
         return result
@@ -0,0 +1,33 @@
+"""
+Background Worker Pools
+Per-process ThreadPoolExecutors for work handed off the request path (outbox
+delivery, image variants, screenshot uploads, catalog refreshes, blocking I/O
+awaited by async views).
+
+Each pool is created on first use, so management commands and test runs that
+never submit work don't start threads, and is sized by a setting read at that
+point.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+
+def lazy_executor(workers_setting, thread_name_prefix):
+    """get_executor() for a pool of settings.<workers_setting> threads named `thread_name_prefix`"""
+    executor = None
+    lock = threading.Lock()
+
+    def get_executor():
+        nonlocal executor
+        if executor is None:
+            with lock:
+                if executor is None:
+                    executor = ThreadPoolExecutor(
+                        max_workers=getattr(settings, workers_setting),
+                        thread_name_prefix=thread_name_prefix
+                    )
+        return executor
+
+    return get_executor
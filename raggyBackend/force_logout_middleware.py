@@ -2,21 +2,35 @@
 Force Logout Middleware
 Automatically adds force_logout flag to all 401 responses
 This ensures Flutter app redirects to login on any authentication failure
+Sync and async capable (ASGI)
 """
 import json
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
 
 class ForceLogoutMiddleware:
     """
     Middleware that intercepts 401 responses and adds force_logout flag
     """
+    sync_capable = True
+    async_capable = True
 
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        response = self.get_response(request)
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.process_response(self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(await self.get_response(request))
 
+    def process_response(self, response):
         # Check if response is 401 Unauthorized
         if response.status_code == 401:
             # Check if response has JSON content
@@ -0,0 +1,111 @@
+"""
+Logging Pipeline
+Non-blocking, structured application logging (wired up in settings.LOGGING).
+
+- QueueListenerHandler: request threads only put the record on an in-memory
+  queue; a background QueueListener thread does formatting and stream I/O
+- JSONFormatter: one JSON object per line (timestamp, level, logger, message,
+  any `extra=` fields), for log shippers; TextFormatter for local development
+- build_logging_config(): the dictConfig for settings, with a root level and
+  per-module overrides (LOG_LEVEL / LOG_MODULE_LEVELS)
+
+Log with %-style arguments (`logger.debug("User %s", user.id)`) so disabled
+levels cost no string formatting at all.
+"""
+import atexit
+import copy
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# LogRecord attributes that are not `extra=` fields
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record; `extra=` fields become top-level keys"""
+
+    def format(self, record):
+        payload = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info:
+            payload['exc'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)-7s %(name)s: %(message)s', datefmt='%H:%M:%S')
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    QueueHandler that owns its QueueListener. The listener thread writes to
+    `stream` (default stderr) as `log_format` ('json' or 'text'); the calling
+    thread only snapshots the message.
+    """
+
+    def __init__(self, log_format='json', stream=None):
+        super().__init__(queue.SimpleQueue())
+        target = logging.StreamHandler(stream or sys.stderr)
+        target.setFormatter(JSONFormatter() if log_format == 'json' else TextFormatter())
+        self.listener = QueueListener(self.queue, target)
+        self.listener.start()
+        # Flush what's queued on interpreter exit (management commands, worker restarts)
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Flush queued records and stop the listener thread (idempotent)"""
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def prepare(self, record):
+        # Resolve the message now (args may be mutated after the call returns),
+        # but leave formatting - timestamps, JSON, tracebacks - to the listener thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def parse_module_levels(value):
+    """'Purchase=WARNING, raggyBackend.custom_auth=DEBUG' -> {'Purchase': 'WARNING', ...}"""
+    levels = {}
+    for item in value.split(','):
+        if '=' in item:
+            module, level = item.split('=', 1)
+            levels[module.strip()] = level.strip().upper()
+    return levels
+
+
+def build_logging_config(level='INFO', log_format='json', module_levels=None):
+    """dictConfig for settings.LOGGING: everything goes through one queue handler"""
+    loggers = {
+        # Django's default config also sends these to its own console handler
+        'django': {'handlers': ['queue'], 'level': 'INFO', 'propagate': False},
+    }
+    for module, module_level in (module_levels or {}).items():
+        loggers.setdefault(module, {})['level'] = module_level
+
+    return {
+        'version': 1,
+        'disable_existing_loggers': False,
+        'handlers': {
+            'queue': {
+                '()': 'raggyBackend.log_handlers.QueueListenerHandler',
+                'log_format': log_format,
+            },
+        },
+        'root': {'handlers': ['queue'], 'level': level},
+        'loggers': loggers,
+    }
@@ -0,0 +1,377 @@
+"""
+Request Profiling Middleware
+Opt-in, sampled per-request instrumentation (REQUEST_PROFILING_ENABLED).
+
+For a sampled request it records:
+- SQL query count, total DB time and duplicate queries (same SQL after
+  normalization - a repeat count >= REQUEST_PROFILING_N_PLUS_ONE_THRESHOLD is
+  reported as a likely N+1)
+- cache hits/misses and time spent in the cache
+- outbound HTTP time to Firebase, Payzah and Cloudinary (urllib3 level, so it
+  covers requests sessions, firebase_admin and the cloudinary uploader)
+
+and reports them as a `Server-Timing` header (REQUEST_PROFILING_SERVER_TIMING),
+one structured JSON log line, and per-endpoint aggregates in the cache that
+staff can read from SlowestEndpointsAPIView.
+
+Unsampled requests cost one random() call; with profiling disabled the
+middleware removes itself at startup. It is sync-only: enabled under ASGI,
+requests (async views included) run through a sync adapter.
+"""
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+ENDPOINTS_INDEX_KEY = 'profiling:endpoints'
+ENDPOINT_KEY = 'profiling:endpoint:{method}:{route}'
+# Durations kept per endpoint for the percentile columns
+RECENT_SAMPLES = 100
+STATS_TIMEOUT = 7 * 24 * 3600
+
+_current = ContextVar('request_profile', default=None)
+_install_lock = threading.Lock()
+_installed = {'done': False}
+
+# `IN (%s, %s, %s)` with any number of placeholders is the same query
+_IN_LIST_RE = re.compile(r'\((?:%s|\?)(?:\s*,\s*(?:%s|\?))+\)')
+_NUMBER_RE = re.compile(r'\b\d+\b')
+
+
+def normalize_sql(sql):
+    return _NUMBER_RE.sub('N', _IN_LIST_RE.sub('(...)', sql))
+
+
+class RequestProfile:
+    """Counters for one sampled request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.sql = Counter()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_time = 0.0
+        self.outbound = Counter()
+        self.outbound_calls = Counter()
+        self._outbound_depth = 0
+
+    def record_query(self, sql, elapsed):
+        self.queries += 1
+        self.db_time += elapsed
+        self.sql[normalize_sql(sql)] += 1
+
+    def duplicates(self):
+        """(normalized sql, count) for every query run more than once, most repeated first"""
+        return [(sql, count) for sql, count in self.sql.most_common() if count > 1]
+
+
+# ================== COLLECTORS ==================
+def _query_wrapper(execute, sql, params, many, context):
+    profile = _current.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.record_query(sql, time.perf_counter() - started)
+
+
+def _wrap_cache_get(original):
+    def get(self, key, *args, **kwargs):
+        profile = _current.get()
+        if profile is None:
+            return original(self, key, *args, **kwargs)
+        started = time.perf_counter()
+        value = original(self, key, *args, **kwargs)
+        profile.cache_time += time.perf_counter() - started
+        if value is None:
+            profile.cache_misses += 1
+        else:
+            profile.cache_hits += 1
+        return value
+    return get
+
+
+def _wrap_cache_get_many(original):
+    def get_many(self, keys, *args, **kwargs):
+        profile = _current.get()
+        if profile is None:
+            return original(self, keys, *args, **kwargs)
+        keys = list(keys)
+        started = time.perf_counter()
+        values = original(self, keys, *args, **kwargs)
+        profile.cache_time += time.perf_counter() - started
+        profile.cache_hits += len(values)
+        profile.cache_misses += len(keys) - len(values)
+        return values
+    return get_many
+
+
+def _wrap_cache_write(original):
+    def write(self, *args, **kwargs):
+        profile = _current.get()
+        if profile is None:
+            return original(self, *args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            profile.cache_time += time.perf_counter() - started
+    return write
+
+
+def _outbound_service(host):
+    host = (host or '').lower()
+    if host.endswith('googleapis.com'):
+        return 'firebase'
+    if 'cloudinary' in host:
+        return 'cloudinary'
+    if host == urlparse(settings.PAYZAH_BASE_URL).hostname:
+        return 'payzah'
+    return 'http'
+
+
+def _wrap_urlopen(original):
+    def urlopen(self, *args, **kwargs):
+        profile = _current.get()
+        # Retries and redirects re-enter urlopen; only time the outer call
+        if profile is None or profile._outbound_depth:
+            return original(self, *args, **kwargs)
+        service = _outbound_service(self.host)
+        profile._outbound_depth += 1
+        started = time.perf_counter()
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            profile._outbound_depth -= 1
+            profile.outbound[service] += time.perf_counter() - started
+            profile.outbound_calls[service] += 1
+    return urlopen
+
+
+def install_collectors():
+    """
+    Patch the cache backend and urllib3 once per process. The wrappers only
+    do work while a sampled request is active in the current context.
+    """
+    with _install_lock:
+        if _installed['done']:
+            return
+
+        backend = type(caches['default'])
+        backend.get = _wrap_cache_get(backend.get)
+        backend.get_many = _wrap_cache_get_many(backend.get_many)
+        for name in ('set', 'add', 'delete', 'set_many', 'delete_many', 'incr'):
+            setattr(backend, name, _wrap_cache_write(getattr(backend, name)))
+
+        from urllib3.connectionpool import HTTPConnectionPool
+        HTTPConnectionPool.urlopen = _wrap_urlopen(HTTPConnectionPool.urlopen)
+
+        _installed['done'] = True
+
+
+# ================== MIDDLEWARE ==================
+class RequestProfilingMiddleware:
+    """
+    Samples REQUEST_PROFILING_SAMPLE_RATE of requests and profiles them.
+    Put it first in MIDDLEWARE so the other middleware's queries are included.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_PROFILING_SAMPLE_RATE
+        install_collectors()
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        try:
+            with connection.execute_wrapper(_query_wrapper):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        total = time.perf_counter() - profile.started
+        route = _route_for(request)
+
+        if settings.REQUEST_PROFILING_SERVER_TIMING:
+            response['Server-Timing'] = _server_timing(profile, total)
+
+        _log_profile(request, response, route, profile, total)
+        try:
+            record_endpoint(request.method, route, total, profile.queries)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not record endpoint stats for {route}: {e}")
+
+        return response
+
+
+def _route_for(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    # re_path() routes keep their regex anchors
+    return '/' + match.route.replace('^', '').replace('$', '') if match.route else request.path
+
+
+def _server_timing(profile, total):
+    metrics = [
+        f'db;dur={profile.db_time * 1000:.1f};desc="{profile.queries} queries"',
+        f'cache;dur={profile.cache_time * 1000:.1f};desc="{profile.cache_hits} hit {profile.cache_misses} miss"',
+    ]
+    for service, elapsed in sorted(profile.outbound.items()):
+        metrics.append(f'{service};dur={elapsed * 1000:.1f};desc="{profile.outbound_calls[service]} calls"')
+    metrics.append(f'total;dur={total * 1000:.1f}')
+    return ', '.join(metrics)
+
+
+def _log_profile(request, response, route, profile, total):
+    duplicates = profile.duplicates()
+    worst = duplicates[0] if duplicates else None
+    n_plus_one = bool(worst and worst[1] >= settings.REQUEST_PROFILING_N_PLUS_ONE_THRESHOLD)
+
+    record = {
+        'method': request.method,
+        'path': request.path,
+        'route': route,
+        'status': response.status_code,
+        'total_ms': round(total * 1000, 1),
+        'queries': profile.queries,
+        'db_ms': round(profile.db_time * 1000, 1),
+        'duplicate_queries': sum(count - 1 for _, count in duplicates),
+        'n_plus_one': n_plus_one,
+        'cache_hits': profile.cache_hits,
+        'cache_misses': profile.cache_misses,
+        'cache_ms': round(profile.cache_time * 1000, 1),
+        'outbound_ms': {service: round(elapsed * 1000, 1) for service, elapsed in profile.outbound.items()},
+    }
+    if n_plus_one:
+        record['repeated_sql'] = worst[0][:300]
+        record['repeated_count'] = worst[1]
+
+    slow = total * 1000 >= settings.REQUEST_PROFILING_SLOW_MS
+    level = logging.WARNING if slow or n_plus_one else logging.INFO
+    logger.log(level, f"📊 request_profile {json.dumps(record)}")
+
+
+# ================== ENDPOINT STATS ==================
+def _endpoint_key(endpoint):
+    method, route = endpoint.split(' ', 1)
+    return ENDPOINT_KEY.format(method=method, route=route)
+
+
+def record_endpoint(method, route, total, queries):
+    """
+    Fold one sampled request into the endpoint's aggregate.
+    Read-modify-write without locking: concurrent samples of the same endpoint
+    can occasionally overwrite each other, which is fine for sampled stats.
+    """
+    endpoint = f"{method} {route}"
+    key = _endpoint_key(endpoint)
+    stats = cache.get(key) or {
+        'endpoint': endpoint,
+        'count': 0,
+        'total_ms': 0.0,
+        'max_ms': 0.0,
+        'total_queries': 0,
+        'max_queries': 0,
+        'recent_ms': [],
+    }
+    elapsed_ms = total * 1000
+    stats['count'] += 1
+    stats['total_ms'] += elapsed_ms
+    stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+    stats['total_queries'] += queries
+    stats['max_queries'] = max(stats['max_queries'], queries)
+    stats['recent_ms'] = (stats['recent_ms'] + [round(elapsed_ms, 1)])[-RECENT_SAMPLES:]
+    cache.set(key, stats, STATS_TIMEOUT)
+
+    index = cache.get(ENDPOINTS_INDEX_KEY) or []
+    if endpoint not in index:
+        cache.set(ENDPOINTS_INDEX_KEY, index + [endpoint], STATS_TIMEOUT)
+
+
+def slowest_endpoints(sort='p95_ms', limit=20):
+    """Aggregated endpoint stats, slowest first by `sort`"""
+    index = cache.get(ENDPOINTS_INDEX_KEY) or []
+    stored = cache.get_many([_endpoint_key(endpoint) for endpoint in index])
+
+    rows = []
+    for stats in stored.values():
+        recent = sorted(stats['recent_ms'])
+        rows.append({
+            'endpoint': stats['endpoint'],
+            'samples': stats['count'],
+            'avg_ms': round(stats['total_ms'] / stats['count'], 1),
+            'p50_ms': recent[len(recent) // 2],
+            'p95_ms': recent[min(len(recent) - 1, int(len(recent) * 0.95))],
+            'max_ms': round(stats['max_ms'], 1),
+            'avg_queries': round(stats['total_queries'] / stats['count'], 1),
+            'max_queries': stats['max_queries'],
+        })
+    rows.sort(key=lambda row: row[sort], reverse=True)
+    return rows[:limit]
+
+
+def reset_endpoint_stats():
+    index = cache.get(ENDPOINTS_INDEX_KEY) or []
+    cache.delete_many([_endpoint_key(endpoint) for endpoint in index] + [ENDPOINTS_INDEX_KEY])
+    return len(index)
+
+
+class SlowestEndpointsAPIView(APIView):
+    """
+    GET: Slowest endpoints seen by the profiling middleware (sampled requests)
+    DELETE: Reset the collected stats
+    Endpoint: /profiling/slowest-endpoints/
+    Query params: ?sort=p95_ms|p50_ms|avg_ms|max_ms|avg_queries|max_queries (default: p95_ms)
+                  ?limit=20
+    """
+    permission_classes = [IsAdminUser]
+    SORT_FIELDS = ('p95_ms', 'p50_ms', 'avg_ms', 'max_ms', 'avg_queries', 'max_queries', 'samples')
+
+    def get(self, request):
+        sort = request.GET.get('sort', 'p95_ms')
+        if sort not in self.SORT_FIELDS:
+            return Response({
+                'success': False,
+                'message': f"sort must be one of: {', '.join(self.SORT_FIELDS)}"
+            }, status=400)
+        try:
+            limit = max(1, min(int(request.GET.get('limit', 20)), 200))
+        except ValueError:
+            limit = 20
+
+        return Response({
+            'success': True,
+            'enabled': settings.REQUEST_PROFILING_ENABLED,
+            'sample_rate': settings.REQUEST_PROFILING_SAMPLE_RATE,
+            'endpoints': slowest_endpoints(sort=sort, limit=limit),
+        })
+
+    def delete(self, request):
+        cleared = reset_endpoint_stats()
+        return Response({'success': True, 'cleared': cleared})
@@ -18,6 +18,8 @@ import cloudinary.uploader
 import cloudinary.api
 from decouple import config
 
+from raggyBackend.log_handlers import build_logging_config, parse_module_levels
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -73,6 +75,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'raggyBackend.profiling_middleware.RequestProfilingMiddleware',  # Opt-in sampled SQL/cache/outbound timing
+    'raggyBackend.cache_invalidation_middleware.CacheInvalidationMiddleware',  # One design cache invalidation per request
     'django.middleware.security.SecurityMiddleware',
     'django.middleware.gzip.GZipMiddleware',  # Enable GZip compression for faster page loads
     'corsheaders.middleware.CorsMiddleware',
@@ -250,6 +254,80 @@ cloudinary.config(
 # Use Cloudinary for media files
 DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
 
+# ================== DESIGN SCREENSHOT UPLOAD PIPELINE ==================
+# Screenshots are spooled locally and uploaded to Cloudinary by a background worker pool
+SCREENSHOT_SPOOL_DIR = config('SCREENSHOT_SPOOL_DIR', default=os.path.join(BASE_DIR, 'spool', 'screenshots'))
+SCREENSHOT_UPLOAD_WORKERS = config('SCREENSHOT_UPLOAD_WORKERS', default=4, cast=int)
+# Use 'Design.screenshot_pipeline.LocalStubScreenshotUploader' for tests / offline development
+SCREENSHOT_UPLOADER = config('SCREENSHOT_UPLOADER', default='Design.screenshot_pipeline.CloudinaryScreenshotUploader')
+# Uploader for the async (ASGI) view; 'Design.screenshot_pipeline.AsyncLocalStubScreenshotUploader' offline
+SCREENSHOT_ASYNC_UPLOADER = config(
+    'SCREENSHOT_ASYNC_UPLOADER', default='Design.screenshot_pipeline.AsyncCloudinaryScreenshotUploader'
+)
+
+# Background thumbnail/variant generation for catalog images (see Design/image_processing.py)
+IMAGE_PROCESSING_WORKERS = config('IMAGE_PROCESSING_WORKERS', default=2, cast=int)
+
+# ================== INVENTORY ==================
+# Rows per transaction for set-based bulk stock updates (see Design/inventory.py)
+INVENTORY_BULK_CHUNK_SIZE = config('INVENTORY_BULK_CHUNK_SIZE', default=500, cast=int)
+# Daily stock snapshots for stock-at-date / consumption reports (kept this many days)
+INVENTORY_SNAPSHOT_RETENTION_DAYS = config('INVENTORY_SNAPSHOT_RETENTION_DAYS', default=730, cast=int)
+# Snapshots leave out ledger rows newer than this, so rows from transactions still open can't be skipped
+INVENTORY_SNAPSHOT_LAG_SECONDS = config('INVENTORY_SNAPSHOT_LAG_SECONDS', default=300, cast=int)
+# Low-stock forecast: order velocity over the lookback window, reorder to cover the horizon
+INVENTORY_FORECAST_LOOKBACK_DAYS = config('INVENTORY_FORECAST_LOOKBACK_DAYS', default=30, cast=int)
+INVENTORY_FORECAST_HORIZON_DAYS = config('INVENTORY_FORECAST_HORIZON_DAYS', default=14, cast=int)
+
+# ================== MEASUREMENT LIST CACHE ==================
+# Prebuilt default catalog and per-user custom lists (see Sizes/measurement_cache.py).
+# Entries are versioned and invalidated on edit, so this only bounds memory for idle users
+MEASUREMENTS_CACHE_TIMEOUT = config('MEASUREMENTS_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)
+
+# ================== CATALOG RESPONSE CACHE ==================
+# Public catalog endpoints are stale-while-revalidate (see Design/catalog_cache.py):
+# fresh for the soft TTL, then served stale while one background refresh rebuilds them
+CATALOG_CACHE_SOFT_TTL = config('CATALOG_CACHE_SOFT_TTL', default=60 * 10, cast=int)
+# Entries are dropped after the hard TTL; the next request rebuilds inline
+CATALOG_CACHE_HARD_TTL = config('CATALOG_CACHE_HARD_TTL', default=60 * 60 * 24, cast=int)
+# Single-flight refresh lock; expires on its own if a refresh dies
+CATALOG_CACHE_LOCK_TIMEOUT = config('CATALOG_CACHE_LOCK_TIMEOUT', default=30, cast=int)
+CATALOG_CACHE_REFRESH_WORKERS = config('CATALOG_CACHE_REFRESH_WORKERS', default=2, cast=int)
+
+# ================== DASHBOARD DESIGN CATALOG ==================
+# Rows per page on the design components screen (further pages load as the table scrolls)
+DASHBOARD_CATALOG_PAGE_SIZE = config('DASHBOARD_CATALOG_PAGE_SIZE', default=50, cast=int)
+# Tab counts and fabric dropdown options; also cleared on every design cache invalidation
+DASHBOARD_CATALOG_CACHE_TIMEOUT = config('DASHBOARD_CATALOG_CACHE_TIMEOUT', default=60 * 10, cast=int)
+
+# ================== FCM DEVICE TOKENS ==================
+# Tokens are deactivated after this many consecutive non-fatal send failures (see User/device_tokens.py)
+FCM_TOKEN_MAX_FAILURES = config('FCM_TOKEN_MAX_FAILURES', default=10, cast=int)
+# Active tokens with no successful send (or registration) for this long are deactivated as stale
+FCM_TOKEN_STALE_DAYS = config('FCM_TOKEN_STALE_DAYS', default=270, cast=int)
+# Deactivated tokens are deleted after this many days
+FCM_TOKEN_PRUNE_DAYS = config('FCM_TOKEN_PRUNE_DAYS', default=30, cast=int)
+
+# ================== CATALOG CHANGE BROADCASTS ==================
+# Catalog-change signals go to one FCM topic; bursts within the window are sent once
+FCM_CATALOG_TOPIC = config('FCM_CATALOG_TOPIC', default='catalog_updates')
+FCM_CATALOG_DEBOUNCE_SECONDS = config('FCM_CATALOG_DEBOUNCE_SECONDS', default=3, cast=float)
+
+# ================== NOTIFICATION OUTBOX ==================
+# Push notifications queued by payment processing are delivered by this worker pool after commit
+NOTIFICATION_OUTBOX_WORKERS = config('NOTIFICATION_OUTBOX_WORKERS', default=2, cast=int)
+
+# NotificationLog rows are buffered and written with bulk_create (see Notification/log_buffer.py)
+NOTIFICATION_LOG_BUFFER_SIZE = config('NOTIFICATION_LOG_BUFFER_SIZE', default=200, cast=int)
+NOTIFICATION_LOG_FLUSH_INTERVAL = config('NOTIFICATION_LOG_FLUSH_INTERVAL', default=5, cast=float)
+# Upper bound kept in memory while the database is unavailable
+NOTIFICATION_LOG_BUFFER_LIMIT = config('NOTIFICATION_LOG_BUFFER_LIMIT', default=10000, cast=int)
+
+# NotificationLog retention: rows older than this move to NotificationLogArchive (see Notification/retention.py)
+NOTIFICATION_LOG_RETENTION_DAYS = config('NOTIFICATION_LOG_RETENTION_DAYS', default=90, cast=int)
+NOTIFICATION_LOG_ARCHIVE_RETENTION_DAYS = config('NOTIFICATION_LOG_ARCHIVE_RETENTION_DAYS', default=365, cast=int)
+NOTIFICATION_LOG_ARCHIVE_BATCH_SIZE = config('NOTIFICATION_LOG_ARCHIVE_BATCH_SIZE', default=1000, cast=int)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -259,6 +337,34 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 LOGIN_URL = '/dashboard/login/'
 LOGOUT_REDIRECT_URL = '/dashboard/login/'
 
+# ================== LOGGING ==================
+# Application logs go through a queue to a background writer thread (raggyBackend/log_handlers.py)
+# Debug traces (e.g. per-request auth tracing) are off unless LOG_LEVEL / LOG_MODULE_LEVELS enable them
+LOG_LEVEL = config('LOG_LEVEL', default='INFO').upper()
+LOG_FORMAT = config('LOG_FORMAT', default='text' if DEBUG else 'json')
+# Per-module overrides, e.g. "raggyBackend.custom_auth=DEBUG,Purchase=WARNING"
+LOG_MODULE_LEVELS = config('LOG_MODULE_LEVELS', default='', cast=parse_module_levels)
+LOGGING = build_logging_config(level=LOG_LEVEL, log_format=LOG_FORMAT, module_levels=LOG_MODULE_LEVELS)
+
+# ================== REQUEST PROFILING ==================
+# Sampled per-request SQL / cache / outbound timing (see raggyBackend/profiling_middleware.py)
+REQUEST_PROFILING_ENABLED = config('REQUEST_PROFILING_ENABLED', default=False, cast=bool)
+REQUEST_PROFILING_SAMPLE_RATE = config('REQUEST_PROFILING_SAMPLE_RATE', default=0.01, cast=float)
+# Expose timings to clients in a Server-Timing header on sampled responses
+REQUEST_PROFILING_SERVER_TIMING = config('REQUEST_PROFILING_SERVER_TIMING', default=DEBUG, cast=bool)
+# Sampled requests slower than this, or repeating one query this often, log as warnings
+REQUEST_PROFILING_SLOW_MS = config('REQUEST_PROFILING_SLOW_MS', default=1000, cast=int)
+REQUEST_PROFILING_N_PLUS_ONE_THRESHOLD = config('REQUEST_PROFILING_N_PLUS_ONE_THRESHOLD', default=5, cast=int)
+
+# ================== ASYNC (ASGI) I/O VIEWS ==================
+# Route the fan-out I/O endpoints (OTP email send, design screenshot upload) to their
+# async views, which await the gateway / Cloudinary / SMTP instead of holding a worker
+# thread. Only enable when serving raggyBackend.asgi:application (see raggyBackend/asgi.py);
+# under WSGI each async view would run on its own throwaway event loop.
+ASYNC_IO_VIEWS = config('ASYNC_IO_VIEWS', default=False, cast=bool)
+# Threads per process for blocking calls the async views await without an async client (OTP SMTP sends)
+ASYNC_BLOCKING_IO_WORKERS = config('ASYNC_BLOCKING_IO_WORKERS', default=32, cast=int)
+
 # ================== PAYZAH PAYMENT GATEWAY CONFIGURATION ==================
 # Payzah is a Kuwait-based payment gateway supporting K-Net, Credit Card, and Apple Pay
 # Configuration values should be stored in environment variables for security
@@ -268,6 +374,24 @@ PAYZAH_PRIVATE_KEY = config('PAYZAH_PRIVATE_KEY', default='')  # Base64 encoded
 PAYZAH_CURRENCY = config('PAYZAH_CURRENCY', default='KWD')
 PAYZAH_LANGUAGE = config('PAYZAH_LANGUAGE', default='en')
 
+# Outbound HTTP: pooled keep-alive session, split connect/read timeouts (seconds)
+# and jittered retries for the idempotent payment-details lookups
+PAYZAH_POOL_SIZE = config('PAYZAH_POOL_SIZE', default=10, cast=int)
+PAYZAH_CONNECT_TIMEOUT = config('PAYZAH_CONNECT_TIMEOUT', default=3.05, cast=float)
+PAYZAH_INITIATE_READ_TIMEOUT = config('PAYZAH_INITIATE_READ_TIMEOUT', default=30, cast=float)
+PAYZAH_STATUS_READ_TIMEOUT = config('PAYZAH_STATUS_READ_TIMEOUT', default=10, cast=float)
+PAYZAH_STATUS_RETRIES = config('PAYZAH_STATUS_RETRIES', default=2, cast=int)
+PAYZAH_RETRY_BACKOFF = config('PAYZAH_RETRY_BACKOFF', default=0.25, cast=float)
+# Connection limit of the async client (Purchase/services/payzah_async.py), shared by all
+# in-flight requests of one ASGI worker
+PAYZAH_ASYNC_POOL_SIZE = config('PAYZAH_ASYNC_POOL_SIZE', default=100, cast=int)
+
+# Reconciliation of stale pending payments (see Purchase/payment_processing.py)
+PAYMENT_RECONCILE_BATCH_SIZE = config('PAYMENT_RECONCILE_BATCH_SIZE', default=100, cast=int)
+PAYMENT_RECONCILE_WORKERS = config('PAYMENT_RECONCILE_WORKERS', default=8, cast=int)
+# Pending payments older than this that Payzah still can't confirm are canceled (0 disables)
+PAYMENT_RECONCILE_EXPIRE_HOURS = config('PAYMENT_RECONCILE_EXPIRE_HOURS', default=48, cast=int)
+
 # Frontend URL for payment redirects
 FRONTEND_URL = config('FRONTEND_URL', default='http://localhost:3000')
 
@@ -0,0 +1,115 @@
+"""
+Static Content Responses
+Pre-rendered, conditional-GET responses for public endpoints backed by
+singleton / low-churn models (banners, About Us, terms, delivery settings)
+that the app requests on every launch.
+
+- A StaticContent builds its payload once per process per version: one query,
+  serialized and rendered to JSON bytes, with an ETag (hash of the bytes) and
+  a Last-Modified (latest updated_at of the rows, or of the last change, so
+  deletes and deactivations move it too)
+- Requests cost one cache read for the version; a matching If-None-Match /
+  If-Modified-Since gets a 304 with no body
+- The version lives in the shared cache and is bumped after commit by a
+  save/delete of any of its models (signals connected on construction), so
+  every process rebuilds on its next request
+- Responses are `Cache-Control: no-cache`: clients may keep them but must
+  revalidate, so edits still show on the next launch
+"""
+import hashlib
+import threading
+import time
+from collections import namedtuple
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.renderers import JSONRenderer
+
+Payload = namedtuple('Payload', ['version', 'content', 'status', 'etag', 'last_modified'])
+
+
+class StaticContent:
+    """
+    `build()` returns (data, status, rows): the response data, its status code
+    and the model instances it was built from (for Last-Modified). data None
+    means the content can't be pre-rendered right now (e.g. it no longer fits
+    one page): response() then returns None and the view serves it normally.
+    Create instances at import time of a module the app's ready() imports,
+    so the invalidation signals are connected in every process.
+    """
+
+    def __init__(self, name, models, build):
+        self.name = name
+        self.build = build
+        self.version_key = f'static_content:{name}:version'
+        self._memo = None
+        self._lock = threading.Lock()
+        for model in models:
+            for signal in (post_save, post_delete):
+                signal.connect(
+                    self.changed, sender=model, weak=False,
+                    dispatch_uid=f'static_content_{name}_{signal is post_save}_{model.__name__}'
+                )
+
+    # ================== VERSION ==================
+    def version(self):
+        """Millisecond timestamp of the last change (or of the first read after a cache flush)"""
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, int(time.time() * 1000), None)
+            version = cache.get(self.version_key) or int(time.time() * 1000)
+        return version
+
+    def bump(self):
+        cache.set(self.version_key, int(time.time() * 1000), None)
+
+    def changed(self, sender, **kwargs):
+        """Signal receiver: rebuild on next request, after the write commits"""
+        transaction.on_commit(self.bump)
+
+    # ================== PAYLOAD ==================
+    def _build_payload(self, version):
+        data, status, rows = self.build()
+        if data is None:
+            return Payload(version, None, status, None, None)
+        content = JSONRenderer().render(data)
+        if status != 200:
+            return Payload(version, content, status, None, None)
+
+        changed_at = version / 1000
+        last_modified = max([row.updated_at.timestamp() for row in rows if row.updated_at] + [changed_at])
+        etag = f'"{hashlib.md5(content).hexdigest()}"'
+        return Payload(version, content, status, etag, int(last_modified))
+
+    def payload(self):
+        version = self.version()
+        payload = self._memo
+        if payload is not None and payload.version == version:
+            return payload
+
+        with self._lock:
+            payload = self._memo
+            if payload is None or payload.version != version:
+                payload = self._build_payload(version)
+                self._memo = payload
+        return payload
+
+    def response(self, request):
+        """200 with the pre-rendered payload, 304 when the client's copy is current, None if not pre-rendered"""
+        payload = self.payload()
+        if payload.content is None:
+            return None
+        response = HttpResponse(payload.content, status=payload.status, content_type='application/json')
+        if payload.etag is None:
+            return response
+
+        response['ETag'] = payload.etag
+        response['Last-Modified'] = http_date(payload.last_modified)
+        response['Cache-Control'] = 'no-cache'
+        return get_conditional_response(
+            request, etag=payload.etag, last_modified=payload.last_modified, response=response
+        )
@@ -21,6 +21,8 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.http import JsonResponse
 
+from raggyBackend.profiling_middleware import SlowestEndpointsAPIView
+
 def home(request):
     return JsonResponse({
         "status": "OK",
@@ -41,6 +43,7 @@ urlpatterns = [
     path("purchase/", include('Purchase.urls',  namespace='Purchase-api')),
     path("api/", include('Coupon.urls')),
     path("banners/", include('Banner.urls')),
+    path('profiling/slowest-endpoints/', SlowestEndpointsAPIView.as_view(), name='slowest-endpoints'),
 ]
 
 # Serve media files in development